@@ -70,33 +70,23 @@ from .framework.dtype import (
 Tensor = framework.core.eager.Tensor
 Tensor.__qualname__ = 'Tensor'
 
-import paddle.distributed.fleet  # noqa: F401
-
 from paddle import (  # noqa: F401
-    distributed,
     sysconfig,
     distribution,
     nn,
     optimizer,
     metric,
     regularizer,
-    incubate,
     autograd,
     device,
     decomposition,
     jit,
     amp,
     dataset,
-    inference,
     io,
-    onnx,
     reader,
     static,
-    vision,
-    audio,
-    geometric,
     sparse,
-    quantization,
 )
 
 from .tensor.attribute import (
@@ -472,8 +462,6 @@ from .framework import (
     save,
     load,
 )
-from .distributed import DataParallel
-
 from .framework import (
     set_default_dtype,
     get_default_dtype,
@@ -504,21 +492,40 @@ from .device import (  # noqa: F401
 
 # high-level api
 from . import (  # noqa: F401
-    callbacks,
-    hub,
     linalg,
     fft,
     signal,
     _pir_ops,
 )
-from .hapi import (
-    Model,
-    summary,
-    flops,
-)
 
-import paddle.text  # noqa: F401
-import paddle.vision  # noqa: F401
+# NOTE: The heavy optional subpackages are imported on first access, to
+# speed up `import paddle`, see `paddle.utils.lazy_import.lazy_module_attrs`.
+from .utils.lazy_import import lazy_module_attrs
+
+__getattr__, __dir__ = lazy_module_attrs(
+    __name__,
+    globals(),
+    submodules=[
+        'distributed',
+        'incubate',
+        'inference',
+        'onnx',
+        'vision',
+        'text',
+        'audio',
+        'geometric',
+        'quantization',
+        'callbacks',
+        'hub',
+        'hapi',
+    ],
+    attributes={
+        'DataParallel': 'distributed',
+        'Model': 'hapi',
+        'summary': 'hapi',
+        'flops': 'hapi',
+    },
+)
 
 from .tensor.random import check_shape
 from .nn.initializer.lazy_init import LazyGuard
@@ -95,6 +95,11 @@ from .sharding import (  # noqa: F401
 
 from . import rpc  # noqa: F401
 
+from .checkpoint import (
+    save_state_dict,
+    load_state_dict,
+)
+
 __all__ = [
     "io",
     "spawn",
@@ -144,4 +149,6 @@ __all__ = [
     "dtensor_from_fn",
     "reshard",
     "shard_layer",
+    "save_state_dict",
+    "load_state_dict",
 ]
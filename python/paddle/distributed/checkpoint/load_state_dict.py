@@ -0,0 +1,161 @@
+# Copyright (c) 2023 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import os
+import pickle
+
+import numpy as np
+
+import paddle
+from paddle.base.framework import convert_np_dtype_to_dtype_
+from paddle.framework import in_dynamic_mode
+
+from .metadata import LocalTensorIndex
+from .utils import (
+    METADATA_FILE_NAME,
+    compute_overlap,
+    flatten_state_dict,
+    get_local_tensor_metadata,
+    is_tensor,
+    set_nested_value,
+    slices_numel,
+    structure_keys,
+)
+
+__all__ = []
+
+
+def _load_metadata(path):
+    metadata_path = os.path.join(path, METADATA_FILE_NAME)
+    if not os.path.exists(metadata_path):
+        raise ValueError(
+            f"The metadata file {metadata_path} is not found, {path} is not a checkpoint or is still being saved."
+        )
+    with open(metadata_path, 'rb') as f:
+        return pickle.load(f)
+
+
+def _plan_reads(metadata, key, local_metadata):
+    """
+    Returns the saved shards overlapping with the local shard of a tensor,
+    as a list of (index, local slices, saved slices).
+    """
+    if key not in metadata.state_dict_metadata:
+        raise ValueError(f"The key {key} is not found in the checkpoint.")
+    reads = []
+    covered = 0
+    for saved in metadata.state_dict_metadata[key]:
+        if len(saved.local_shape) != len(local_metadata.local_shape):
+            raise ValueError(
+                f"The rank of {key} is {len(local_metadata.local_shape)}, but it is {len(saved.local_shape)} in the checkpoint."
+            )
+        overlap = compute_overlap(
+            local_metadata.global_offset,
+            local_metadata.local_shape,
+            saved.global_offset,
+            saved.local_shape,
+        )
+        if overlap is None:
+            continue
+        reads.append((LocalTensorIndex(key, saved.global_offset), *overlap))
+        covered += slices_numel(overlap[0])
+    if covered != int(np.prod(local_metadata.local_shape)):
+        raise ValueError(
+            f"The shard of {key} at offset {local_metadata.global_offset} with shape {local_metadata.local_shape} is not covered by the checkpoint."
+        )
+    return reads
+
+
+def load_state_dict(state_dict, path):
+    """
+    Loads a checkpoint saved by ``paddle.distributed.save_state_dict`` into
+    the tensors of a state dict in place.
+
+    The checkpoint can be saved with a different degree of tensor parallel,
+    pipeline parallel or sharding stage 1, as long as the state dict is
+    structured as when saving, e.g. the state dicts of model and optimizer
+    are loaded together. Each rank reads from the data files only the
+    parts of saved shards overlapping with its local shards, the global
+    tensors are never materialized. The data files are memory-mapped, so
+    only the pages of the needed parts are read from disk.
+
+    Args:
+        state_dict(dict): the state dict to load into, whose tensors are
+            set in place, e.g. ``model.state_dict()``.
+        path(str): the directory of the checkpoint.
+
+    Examples:
+        .. code-block:: python
+
+            >>> # doctest: +SKIP('run in distributed mode')
+            >>> import paddle
+            >>> import paddle.distributed as dist
+
+            >>> dist.init_parallel_env()
+            >>> model = paddle.nn.Linear(8, 8)
+            >>> state_dict = model.state_dict()
+            >>> dist.load_state_dict(state_dict, "./checkpoint")
+    """
+    assert (
+        in_dynamic_mode()
+    ), "load_state_dict doesn't support static graph mode."
+
+    # NOTE: the checkpoint is on a file system shared by ranks, every rank
+    # reads the metadata rather than receiving it from the coordinator
+    metadata = _load_metadata(path)
+    flat_state_dict, mapping = flatten_state_dict(state_dict)
+    flat_state_dict, mapping, params = structure_keys(flat_state_dict, mapping)
+    tensors = {k: v for k, v in flat_state_dict.items() if is_tensor(v)}
+    local_metadata = get_local_tensor_metadata(tensors, params)
+
+    plans = {
+        key: _plan_reads(metadata, key, local_metadata[key]) for key in tensors
+    }
+    file_keys = {}
+    for reads in plans.values():
+        for index, _, _ in reads:
+            file_name = metadata.storage_metadata[index]
+            file_keys.setdefault(file_name, []).append(index.storage_key)
+
+    shards = {}
+    for file_name, keys in file_keys.items():
+        shards.update(
+            paddle.load(
+                os.path.join(path, file_name),
+                keys=keys,
+                mmap=True,
+                return_numpy=True,
+            )
+        )
+
+    for key, tensor in tensors.items():
+        reads = plans[key]
+        if not reads:
+            # an empty tensor
+            continue
+        saved_dtype = shards[reads[0][0].storage_key].dtype
+        buffer = np.empty(local_metadata[key].local_shape, dtype=saved_dtype)
+        for index, local_slices, saved_slices in reads:
+            buffer[local_slices] = shards[index.storage_key][saved_slices]
+        # NOTE: bfloat16 is saved as uint16, which is converted to bfloat16
+        if convert_np_dtype_to_dtype_(saved_dtype) == tensor.dtype:
+            value = buffer
+        else:
+            value = paddle.to_tensor(buffer).astype(tensor.dtype)
+        tensor.set_value(value)
+
+    for key, value in metadata.non_tensor_values.items():
+        if key in mapping:
+            set_nested_value(state_dict, mapping[key], value)
@@ -0,0 +1,64 @@
+# Copyright (c) 2023 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Tuple
+
+__all__ = []
+
+
+@dataclass(frozen=True)
+class LocalTensorMetadata:
+    """
+    The shard of a tensor held by a rank.
+    """
+
+    # the offset of the shard in the global tensor
+    global_offset: Tuple[int, ...]
+    local_shape: Tuple[int, ...]
+    dtype: str
+
+
+@dataclass(frozen=True)
+class LocalTensorIndex:
+    """
+    The index of a saved shard, a shard is identified by the key of the
+    tensor and its offset in the global tensor.
+    """
+
+    tensor_key: str
+    global_offset: Tuple[int, ...]
+
+    @property
+    def storage_key(self):
+        # the key of the shard in its data file
+        offset = ','.join(str(i) for i in self.global_offset)
+        return f"{self.tensor_key}@{offset}"
+
+
+@dataclass
+class Metadata:
+    """
+    The global index of a checkpoint, written by the coordinator rank.
+    """
+
+    # tensor key -> the saved shards of the tensor
+    state_dict_metadata: Dict[str, List[LocalTensorMetadata]] = field(
+        default_factory=dict
+    )
+    # shard -> the name of data file holding it
+    storage_metadata: Dict[LocalTensorIndex, str] = field(default_factory=dict)
+    # key -> value of the items which are not tensors, e.g. LR_Scheduler
+    non_tensor_values: Dict[str, Any] = field(default_factory=dict)
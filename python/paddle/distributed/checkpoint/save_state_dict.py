@@ -0,0 +1,251 @@
+# Copyright (c) 2023 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import math
+import os
+import pickle
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import paddle
+from paddle.framework import in_dynamic_mode
+
+from ..communication.all_gather import all_gather_object
+from ..communication.group import barrier
+from ..parallel import get_rank, get_world_size
+from .metadata import LocalTensorIndex, Metadata
+from .utils import (
+    METADATA_FILE_NAME,
+    data_file_name,
+    flatten_state_dict,
+    get_local_tensor_metadata,
+    is_tensor,
+    structure_keys,
+    tensor_checksums,
+)
+
+__all__ = []
+
+_executor_lock = threading.Lock()
+_writer = None
+
+
+def _get_writer():
+    global _writer
+    with _executor_lock:
+        if _writer is None:
+            # a single thread, so checkpoints are written in the order of calls
+            _writer = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix='dist_checkpoint_writer'
+            )
+    return _writer
+
+
+def _snapshot(tensor):
+    # copy to host, the tensor can be updated by training after here
+    if tensor.place.is_gpu_place():
+        return tensor.pin_memory()
+    if tensor.place.is_cpu_place():
+        return tensor.numpy()
+    return tensor.cpu()
+
+
+def _write_data(file_path, snapshots):
+    data = {
+        key: value.numpy() if is_tensor(value) else value
+        for key, value in snapshots.items()
+    }
+    # write to a temporary file and rename, so that a data file is never
+    # seen partially written
+    tmp_path = file_path + '.tmp'
+    paddle.save(data, tmp_path, use_chunked_format=True)
+    os.replace(tmp_path, file_path)
+
+
+def _write_metadata(file_path, metadata):
+    tmp_path = file_path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        pickle.dump(metadata, f, protocol=4)
+    os.replace(tmp_path, file_path)
+
+
+def _write_checkpoint(data_path, snapshots, metadata_path, metadata):
+    _write_data(data_path, snapshots)
+    if metadata_path is not None:
+        _write_metadata(metadata_path, metadata)
+
+
+def _remove_metadata(metadata_path):
+    # the metadata of an overwritten checkpoint must not index the data
+    # files being rewritten
+    if os.path.exists(metadata_path):
+        os.remove(metadata_path)
+
+
+def _check_replicas(key, holder, other):
+    # a tensor not split by tensor parallel is saved once, which is only
+    # right if the ranks holding it hold the same data
+    rank, tensor_metadata, checksum = holder
+    other_rank, other_metadata, other_checksum = other
+    if (
+        tensor_metadata.local_shape != other_metadata.local_shape
+        or tensor_metadata.dtype != other_metadata.dtype
+    ):
+        diff = "shapes or dtypes"
+    elif checksum != other_checksum and not (
+        math.isnan(checksum) and math.isnan(other_checksum)
+    ):
+        diff = "data"
+    else:
+        return
+    raise ValueError(
+        f"The tensor {key} has different {diff} on rank {rank} and rank {other_rank}, "
+        "but it is not split by tensor parallel, so it is regarded as replicated. "
+        "Tensors sliced across ranks under the same key, e.g. by sharding stage 2 "
+        "or 3, are not supported by save_state_dict."
+    )
+
+
+def save_state_dict(
+    state_dict,
+    path,
+    process_group=None,
+    coordinator_rank=0,
+    async_save=False,
+):
+    """
+    Saves the state dict of a distributed model as a sharded checkpoint.
+
+    Every rank writes only the shards it owns to its own data file, a shard
+    replicated on several ranks is written once. The coordinator rank also
+    writes the global metadata, which indexes the shards of every tensor
+    by their offsets in the global tensor, so that the checkpoint can be
+    loaded by ``paddle.distributed.load_state_dict`` with a different
+    degree of tensor parallel, pipeline parallel or sharding stage 1.
+
+    The metadata of an existing checkpoint in ``path`` is removed before
+    any data file is rewritten. Without ``async_save``, the metadata is
+    written after the data files of all ranks, so the checkpoint is
+    complete once the metadata exists. With ``async_save``, the
+    coordinator writes the metadata after its own data file only, so the
+    metadata does not mean that the checkpoint is complete, which is only
+    true when the futures of all ranks are done.
+
+    Only the tensors split by tensor parallel are saved as shards, other
+    tensors of the same key must be the same on all ranks, otherwise
+    ValueError is raised, e.g. for the slices of sharding stage 2 or 3.
+    The optimizer states keyed by the names of parameters are saved by
+    the keys of the parameters in the same state dict, which do not change
+    with the degree of pipeline parallel, so the state dicts of model and
+    optimizer should be saved together, e.g.
+    ``{"model": model.state_dict(), "optimizer": opt.state_dict()}``.
+
+    Args:
+        state_dict(dict): the state dict to save, the nested dicts, e.g. the
+            master weights of optimizer, are flattened.
+        path(str): the directory to save the checkpoint in.
+        process_group(Group, optional): the group of ranks saving the
+            checkpoint together. Default: None, all ranks.
+        coordinator_rank(int, optional): the rank in ``process_group``
+            writing the metadata. Default: 0.
+        async_save(bool, optional): If True, the shards are copied to
+            pinned host memory, and written in a background thread after
+            this call returns. Default: False.
+
+    Returns:
+        None, or a ``concurrent.futures.Future`` if ``async_save`` is True,
+        which is done when the files of this rank are written. The
+        checkpoint is complete when the futures of all ranks are done.
+
+    Examples:
+        .. code-block:: python
+
+            >>> # doctest: +SKIP('run in distributed mode')
+            >>> import paddle
+            >>> import paddle.distributed as dist
+
+            >>> dist.init_parallel_env()
+            >>> model = paddle.nn.Linear(8, 8)
+            >>> future = dist.save_state_dict(
+            ...     model.state_dict(), "./checkpoint", async_save=True
+            ... )
+            >>> # continue training, then wait before the next save
+            >>> future.result()
+    """
+    assert (
+        in_dynamic_mode()
+    ), "save_state_dict doesn't support static graph mode."
+
+    flat_state_dict, mapping = flatten_state_dict(state_dict)
+    flat_state_dict, _, params = structure_keys(flat_state_dict, mapping)
+    tensors = {k: v for k, v in flat_state_dict.items() if is_tensor(v)}
+    local_metadata = get_local_tensor_metadata(tensors, params)
+
+    rank = get_rank(process_group)
+    metadata_path = os.path.join(path, METADATA_FILE_NAME)
+    if rank == coordinator_rank:
+        # before the all gather below, so before any rank writes data
+        _remove_metadata(metadata_path)
+    if get_world_size(process_group) > 1:
+        gathered = []
+        all_gather_object(
+            gathered,
+            (local_metadata, tensor_checksums(tensors)),
+            group=process_group,
+        )
+    else:
+        gathered = [(local_metadata, {})]
+
+    # the first rank holding a shard owns it, every rank computes the same
+    metadata = Metadata()
+    owned = []
+    holders = {}
+    for src_rank, (rank_metadata, checksums) in enumerate(gathered):
+        for key, tensor_metadata in rank_metadata.items():
+            index = LocalTensorIndex(key, tensor_metadata.global_offset)
+            holder = (src_rank, tensor_metadata, checksums.get(key))
+            if index in holders:
+                _check_replicas(key, holders[index], holder)
+                continue
+            holders[index] = holder
+            metadata.storage_metadata[index] = data_file_name(src_rank)
+            metadata.state_dict_metadata.setdefault(key, []).append(
+                tensor_metadata
+            )
+            if src_rank == rank:
+                owned.append(index)
+    metadata.non_tensor_values = {
+        k: v for k, v in flat_state_dict.items() if k not in tensors
+    }
+
+    os.makedirs(path, exist_ok=True)
+    snapshots = {
+        index.storage_key: _snapshot(tensors[index.tensor_key])
+        for index in owned
+    }
+    data_path = os.path.join(path, data_file_name(rank))
+    if rank != coordinator_rank:
+        metadata_path = None
+
+    if async_save:
+        return _get_writer().submit(
+            _write_checkpoint, data_path, snapshots, metadata_path, metadata
+        )
+    _write_data(data_path, snapshots)
+    if get_world_size(process_group) > 1:
+        # the metadata is written after the data files of all ranks
+        barrier(group=process_group)
+    if metadata_path is not None:
+        _write_metadata(metadata_path, metadata)
@@ -0,0 +1,244 @@
+# Copyright (c) 2023 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import math
+
+import paddle
+from paddle.base.framework import EagerParamBase
+
+from ..communication.all_gather import all_gather_object
+from .metadata import LocalTensorMetadata
+
+__all__ = []
+
+METADATA_FILE_NAME = '0.metadata'
+
+
+def data_file_name(rank):
+    return f"{rank}_0.distcp"
+
+
+def flatten_state_dict(state_dict):
+    """
+    Flattens the nested dicts of a state dict, e.g. the master weights in
+    the state dict of optimizer, the keys are joined by dot.
+
+    Returns:
+        tuple(dict, dict): the flat state dict, and the mapping from a flat
+        key to the path of keys in the nested dicts.
+    """
+    flat, mapping = {}, {}
+
+    def _flatten(obj, path):
+        for key, value in obj.items():
+            sub_path = (*path, key)
+            if isinstance(value, dict):
+                _flatten(value, sub_path)
+                continue
+            flat_key = '.'.join(str(k) for k in sub_path)
+            if flat_key in flat:
+                raise ValueError(
+                    f"The key {flat_key} is duplicated after flattening the state dict."
+                )
+            flat[flat_key] = value
+            mapping[flat_key] = sub_path
+
+    _flatten(state_dict, ())
+    return flat, mapping
+
+
+def set_nested_value(state_dict, path, value):
+    for key in path[:-1]:
+        state_dict = state_dict[key]
+    state_dict[path[-1]] = value
+
+
+def _param_name_prefix(key, param_keys):
+    # the longest param name which ``key`` is, or starts with followed by
+    # "_", e.g. "linear_0.w_0" of "linear_0.w_0_moment1_0"
+    if key in param_keys:
+        return key
+    pos = key.rfind('_')
+    while pos > 0:
+        if key[:pos] in param_keys:
+            return key[:pos]
+        pos = key.rfind('_', 0, pos)
+    return None
+
+
+def structure_keys(flat_state_dict, mapping):
+    """
+    Renames the items keyed by the auto-generated names of parameters,
+    e.g. the optimizer state ``linear_0.w_0_moment1_0`` and the master
+    weight ``master_weights.linear_0.w_0``, by the keys of the parameters
+    in the same state dict, e.g. ``model.0.weight_moment1_0``. The
+    auto-generated names depend on the order of creating layers, which
+    changes with the degree of pipeline parallel, while the structured
+    keys of parameters do not.
+
+    Args:
+        flat_state_dict(dict): the flat state dict.
+        mapping(dict): the mapping from a flat key to its path of keys.
+
+    Returns:
+        tuple(dict, dict, dict): the renamed flat state dict, the mapping
+        from a renamed key to its path of keys, and the mapping from a
+        renamed key to the parameter the item belongs to.
+    """
+    param_keys = {
+        value.name: key
+        for key, value in flat_state_dict.items()
+        if isinstance(value, EagerParamBase)
+    }
+    renamed, renamed_mapping, params = {}, {}, {}
+    for key, value in flat_state_dict.items():
+        path = mapping[key]
+        name = None
+        if not isinstance(value, EagerParamBase) and isinstance(path[-1], str):
+            name = _param_name_prefix(path[-1], param_keys)
+        if name is not None:
+            param_key = param_keys[name]
+            new_key = '.'.join(
+                [str(k) for k in path[:-1]]
+                + [param_key + path[-1][len(name) :]]
+            )
+            params[new_key] = flat_state_dict[param_key]
+        else:
+            new_key = key
+        if new_key in renamed:
+            raise ValueError(
+                f"The key {new_key} is duplicated after renaming the items by the keys of parameters."
+            )
+        renamed[new_key] = value
+        renamed_mapping[new_key] = path
+    return renamed, renamed_mapping, params
+
+
+def _get_hcg():
+    from paddle.distributed import fleet
+
+    return fleet.fleet._hcg if hasattr(fleet.fleet, "_hcg") else None
+
+
+def _split_axis(tensor, param):
+    for source in (tensor, param):
+        if (
+            source is not None
+            and getattr(source, 'is_distributed', False)
+            and hasattr(source, 'split_axis')
+            and source.shape == tensor.shape
+        ):
+            return source.split_axis
+    return None
+
+
+def get_local_tensor_metadata(tensors, params=None):
+    """
+    Computes the offsets of local shards in the global tensors.
+
+    A tensor split by tensor parallel (``is_distributed`` with a
+    ``split_axis``, see ``paddle.distributed.fleet.meta_parallel``) is
+    offset by the sizes of its shards on lower ranks of the model parallel
+    group, and so is an optimizer state of the same shape as its split
+    parameter. Other tensors are regarded as replicated. This is a
+    collective call in the model parallel group.
+
+    Args:
+        tensors(dict[str, Tensor]): the local tensors.
+        params(dict[str, Tensor], optional): the parameter each optimizer
+            state belongs to, returned by ``structure_keys``.
+
+    Returns:
+        dict[str, LocalTensorMetadata]: the shard of each tensor.
+    """
+    params = params or {}
+    split_axes = {}
+    for key, tensor in tensors.items():
+        axis = _split_axis(tensor, params.get(key))
+        if axis is not None:
+            split_axes[key] = axis
+    split_sizes = {
+        key: tensors[key].shape[axis] for key, axis in split_axes.items()
+    }
+    hcg = _get_hcg()
+    mp_rank = 0
+    gathered = []
+    if (
+        split_sizes
+        and hcg is not None
+        and hcg.get_model_parallel_world_size() > 1
+    ):
+        mp_rank = hcg.get_model_parallel_rank()
+        all_gather_object(
+            gathered, split_sizes, group=hcg.get_model_parallel_group()
+        )
+
+    metadata = {}
+    for key, tensor in tensors.items():
+        offset = [0] * len(tensor.shape)
+        if key in split_sizes and gathered:
+            offset[split_axes[key]] = sum(
+                sizes[key] for sizes in gathered[:mp_rank]
+            )
+        metadata[key] = LocalTensorMetadata(
+            tuple(offset), tuple(tensor.shape), str(tensor.dtype)
+        )
+    return metadata
+
+
+def tensor_checksums(tensors):
+    """
+    Computes a fingerprint of the data of each tensor on its device, to
+    tell whether the tensors of the same key on different ranks are
+    replicas.
+
+    Returns:
+        dict[str, float]: the sum of each tensor in float64.
+    """
+    if not tensors:
+        return {}
+    sums = paddle.stack(
+        [tensor.astype('float64').sum() for tensor in tensors.values()]
+    )
+    return dict(zip(tensors.keys(), sums.numpy().tolist()))
+
+
+def compute_overlap(cur_offset, cur_shape, saved_offset, saved_shape):
+    """
+    Computes the overlap of two shards of a tensor.
+
+    Returns:
+        tuple(tuple[slice], tuple[slice]): the slices of overlap in the
+        current shard and in the saved shard, None if they do not overlap.
+    """
+    cur_slices, saved_slices = [], []
+    for cur_begin, cur_size, saved_begin, saved_size in zip(
+        cur_offset, cur_shape, saved_offset, saved_shape
+    ):
+        begin = max(cur_begin, saved_begin)
+        end = min(cur_begin + cur_size, saved_begin + saved_size)
+        if begin >= end:
+            return None
+        cur_slices.append(slice(begin - cur_begin, end - cur_begin))
+        saved_slices.append(slice(begin - saved_begin, end - saved_begin))
+    return tuple(cur_slices), tuple(saved_slices)
+
+
+def slices_numel(slices):
+    return math.prod(s.stop - s.start for s in slices)
+
+
+def is_tensor(value):
+    return isinstance(value, paddle.Tensor)
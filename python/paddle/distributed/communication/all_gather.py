@@ -15,12 +15,18 @@
 import numpy as np
 
 import paddle
+import paddle.distributed as dist
 from paddle import framework
 from paddle.distributed.communication import stream
 
 from .serialization_utils import (
-    convert_object_to_tensor,
-    convert_tensor_to_object,
+    broadcast_buffers,
+    buffer_sizes,
+    comm_tensor_to_numpy,
+    deserialize_object,
+    empty_comm_tensor,
+    serialize_object,
+    to_comm_tensor,
 )
 
 
@@ -105,23 +111,36 @@ def all_gather_object(object_list, obj, group=None):
         framework.in_dynamic_mode()
     ), "all_gather_object doesn't support static graph mode."
 
-    tensor, len_of_tensor = convert_object_to_tensor(obj)
-
-    # gather len_of_tensor from all ranks
-    list_len_of_tensor = []
-    all_gather(list_len_of_tensor, len_of_tensor, group)
-    # get the max length from list
-    max_len_of_tensor = int(max(list_len_of_tensor).item())
-    # resize the input tensor to max length avoid hang in all gather
-    # Note(liyurui): Maybe we should support various length all_gather?
-    # Now this operation is efficient for we don't support resize in python.
-    numpy_data = tensor.numpy()
-    numpy_data = np.resize(numpy_data, [max_len_of_tensor])
-    input_tensor = paddle.to_tensor(numpy_data)
-
-    tensor_list = []
-    all_gather(tensor_list, input_tensor, group)
-    for i, tensor in enumerate(tensor_list):
-        object_list.append(
-            convert_tensor_to_object(tensor, list_len_of_tensor[i])
+    payload, buffers = serialize_object(obj)
+    group_ranks = (
+        group.ranks if group is not None else range(dist.get_world_size())
+    )
+
+    # negotiate the sizes of payloads once, the sizes of buffers are read
+    # from the payloads
+    payload_sizes = paddle.empty([len(group_ranks)], dtype='int64')
+    stream.all_gather(
+        payload_sizes, paddle.to_tensor([payload.size], dtype='int64'), group
+    )
+    payload_sizes = payload_sizes.numpy().tolist()
+    max_payload_size = max(payload_sizes)
+
+    padded_payload = np.zeros([max_payload_size], dtype=np.uint8)
+    padded_payload[: payload.size] = payload
+    gathered, gathered_array = empty_comm_tensor(
+        max_payload_size * len(payload_sizes)
+    )
+    stream.all_gather(gathered, to_comm_tensor(padded_payload), group)
+    gathered_array = comm_tensor_to_numpy(gathered, gathered_array)
+
+    rank = dist.get_rank()
+    for i, (src, payload_size) in enumerate(zip(group_ranks, payload_sizes)):
+        offset = i * max_payload_size
+        src_payload = gathered_array[offset : offset + payload_size]
+        src_buffers = broadcast_buffers(
+            buffers if src == rank else None,
+            buffer_sizes(src_payload),
+            src,
+            group,
         )
+        object_list.append(deserialize_object(src_payload, src_buffers))
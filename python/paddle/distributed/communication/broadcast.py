@@ -18,8 +18,13 @@ from paddle import framework
 from paddle.distributed.communication import stream
 
 from .serialization_utils import (
-    convert_object_to_tensor,
-    convert_tensor_to_object,
+    broadcast_buffers,
+    buffer_sizes,
+    comm_tensor_to_numpy,
+    deserialize_object,
+    empty_comm_tensor,
+    serialize_object,
+    to_comm_tensor,
 )
 
 
@@ -106,32 +111,24 @@ def broadcast_object_list(object_list, src, group=None):
     ), "broadcast_object_list doesn't support static graph mode."
 
     rank = dist.get_rank()
-    obj_tensors = []
-    obj_nums = len(object_list)
-
+    # the objects are sent in one payload, so the size is negotiated once
     if rank == src:
-        obj_sizes = []
-        for obj in object_list:
-            obj_tensor, obj_size = convert_object_to_tensor(obj)
-            obj_tensors.append(obj_tensor)
-            obj_sizes.append(obj_size)
-        obj_size_tensor = paddle.stack(obj_sizes)
+        payload, buffers = serialize_object(list(object_list))
+        payload_size = paddle.to_tensor([payload.size], dtype="int64")
     else:
-        obj_size_tensor = paddle.empty([obj_nums], dtype="int64")
-    broadcast(obj_size_tensor, src, group)
+        buffers = None
+        payload_size = paddle.empty([1], dtype="int64")
+    broadcast(payload_size, src, group)
 
     if rank == src:
-        # cast to uint8 to keep the same dtype
-        obj_data_tensor = paddle.concat(obj_tensors).cast("uint8")
+        payload_tensor, payload_array = to_comm_tensor(payload), payload
     else:
-        data_len = paddle.sum(obj_size_tensor).item()
-        obj_data_tensor = paddle.empty([data_len], dtype="uint8")
-    broadcast(obj_data_tensor, src, group)
-
-    offset = 0
-    for i in range(obj_nums):
-        data_len = obj_size_tensor[i]
-        object_list[i] = convert_tensor_to_object(
-            obj_data_tensor[offset : offset + data_len], data_len
+        payload_tensor, payload_array = empty_comm_tensor(
+            int(payload_size.item())
         )
-        offset += data_len
+    broadcast(payload_tensor, src, group)
+    payload = comm_tensor_to_numpy(payload_tensor, payload_array)
+
+    buffers = broadcast_buffers(buffers, buffer_sizes(payload), src, group)
+    for i, obj in enumerate(deserialize_object(payload, buffers)):
+        object_list[i] = obj
@@ -20,8 +20,12 @@ from paddle import framework
 from paddle.distributed.communication import stream
 
 from .serialization_utils import (
-    convert_object_to_tensor,
-    convert_tensor_to_object,
+    buffer_sizes,
+    comm_tensor_to_numpy,
+    deserialize_object,
+    empty_comm_tensor,
+    serialize_object,
+    to_comm_tensor,
 )
 
 
@@ -112,34 +116,54 @@ def scatter_object_list(
     ), "scatter_object_list doesn't support static graph mode."
 
     rank = dist.get_rank()
-    in_obj_tensors = []
-    in_obj_sizes = []
+    group_ranks = (
+        group.ranks if group is not None else range(dist.get_world_size())
+    )
+    nranks = len(group_ranks)
 
+    # negotiate the sizes of payloads of all ranks once
     if rank == src:
-        for obj in in_object_list:
-            obj_tensor, obj_size = convert_object_to_tensor(obj)
-            in_obj_tensors.append(obj_tensor)
-            in_obj_sizes.append(obj_size)
-        max_obj_size_tensor = max(in_obj_sizes)
+        serialized = [serialize_object(obj) for obj in in_object_list]
+        payload_sizes = paddle.to_tensor(
+            [payload.size for payload, _ in serialized], dtype="int64"
+        )
     else:
-        max_obj_size_tensor = paddle.empty([], dtype="int64")
-    stream.broadcast(max_obj_size_tensor, src)
-    max_obj_size = int(max_obj_size_tensor.item())
+        payload_sizes = paddle.empty([nranks], dtype="int64")
+    stream.broadcast(payload_sizes, src, group)
+    payload_sizes = payload_sizes.numpy().tolist()
+    max_payload_size = max(payload_sizes)
 
-    # resize to the same size
     in_tensor_list = []
-    for tensor in in_obj_tensors:
-        numpy_data = tensor.numpy()
-        numpy_data = np.resize(numpy_data, [max_obj_size])
-        in_tensor = paddle.to_tensor(numpy_data)
-        in_tensor_list.append(in_tensor)
-    out_tensor = paddle.empty([max_obj_size], dtype="uint8")
+    if rank == src:
+        for payload, _ in serialized:
+            padded_payload = np.zeros([max_payload_size], dtype=np.uint8)
+            padded_payload[: payload.size] = payload
+            in_tensor_list.append(to_comm_tensor(padded_payload))
+    out_tensor, out_array = empty_comm_tensor(max_payload_size)
     scatter(out_tensor, in_tensor_list if rank == src else None, src, group)
+    group_rank = list(group_ranks).index(rank)
+    payload = comm_tensor_to_numpy(out_tensor, out_array)[
+        : payload_sizes[group_rank]
+    ]
 
-    out_tensor_size = paddle.empty([], dtype="int64")
-    scatter(out_tensor_size, in_obj_sizes if rank == src else None, src, group)
+    # the buffers are sent to their destinations only
+    if rank == src:
+        for dst, (_, dst_buffers) in zip(group_ranks, serialized):
+            if dst == src:
+                buffers = [buffer.copy() for buffer in dst_buffers]
+                continue
+            for buffer in dst_buffers:
+                if buffer.size > 0:
+                    stream.send(to_comm_tensor(buffer), dst, group)
+    else:
+        buffers = []
+        for size in buffer_sizes(payload):
+            if size == 0:
+                buffers.append(np.empty([0], dtype=np.uint8))
+                continue
+            tensor, array = empty_comm_tensor(size)
+            stream.recv(tensor, src, group)
+            buffers.append(comm_tensor_to_numpy(tensor, array))
 
     out_object_list.clear()
-    out_object_list.append(
-        convert_tensor_to_object(out_tensor, out_tensor_size.item())
-    )
+    out_object_list.append(deserialize_object(payload, buffers))
@@ -12,12 +12,16 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import copyreg
 import io
 import pickle
+import struct
 
 import numpy as np
 
 import paddle
+from paddle.base import core
+from paddle.base.framework import EagerParamBase, _current_expected_place
 
 
 def convert_object_to_tensor(obj):
@@ -32,3 +36,140 @@ def convert_object_to_tensor(obj):
 def convert_tensor_to_object(tensor, len_of_tensor):
     _unpickler = pickle.Unpickler
     return _unpickler(io.BytesIO(tensor.numpy()[:len_of_tensor])).load()
+
+
+# NOTE: [Out-of-band serialization of object collectives]
+# Objects are pickled with protocol 5, the contiguous numpy arrays and
+# tensors embedded are not copied into the pickle stream but returned as
+# separate buffers, which are sent as tensors sharing memory with them.
+# The payload of an object is the number and sizes of its buffers followed
+# by the pickle stream, so receivers learn the sizes of buffers from the
+# payload, and only the sizes of payloads are negotiated before sending.
+
+_SIZE_FORMAT = '<q'
+_SIZE_BYTES = struct.calcsize(_SIZE_FORMAT)
+
+
+def _rebuild_tensor(data, stop_gradient):
+    return paddle.to_tensor(data, stop_gradient=stop_gradient)
+
+
+def _reduce_tensor(tensor):
+    return _rebuild_tensor, (tensor.numpy(), tensor.stop_gradient)
+
+
+def serialize_object(obj):
+    """
+    Pickles an object with out-of-band buffers.
+
+    Returns:
+        tuple(numpy.ndarray, list[numpy.ndarray]): the payload, and the
+        out-of-band buffers which share memory with the arrays in ``obj``,
+        both are uint8 arrays.
+    """
+    buffers = []
+    f = io.BytesIO()
+    pickler = pickle.Pickler(f, 5, buffer_callback=buffers.append)
+    pickler.dispatch_table = copyreg.dispatch_table.copy()
+    pickler.dispatch_table[core.eager.Tensor] = _reduce_tensor
+    pickler.dispatch_table[EagerParamBase] = _reduce_tensor
+    pickler.dump(obj)
+
+    buffers = [
+        np.frombuffer(buffer.raw(), dtype=np.uint8) for buffer in buffers
+    ]
+    header = struct.pack(
+        f'<{len(buffers) + 1}q', len(buffers), *[b.size for b in buffers]
+    )
+    payload = np.frombuffer(bytearray(header + f.getvalue()), dtype=np.uint8)
+    return payload, buffers
+
+
+def buffer_sizes(payload):
+    """
+    Returns the sizes of out-of-band buffers of a payload.
+    """
+    (num_buffers,) = struct.unpack_from(_SIZE_FORMAT, payload)
+    return list(struct.unpack_from(f'<{num_buffers}q', payload, _SIZE_BYTES))
+
+
+def deserialize_object(payload, buffers):
+    """
+    Unpickles an object from its payload and out-of-band buffers, the
+    arrays in the object share memory with ``buffers``.
+    """
+    num_buffers = len(buffer_sizes(payload))
+    return pickle.loads(
+        payload[(num_buffers + 1) * _SIZE_BYTES :], buffers=buffers
+    )
+
+
+def _use_zero_copy():
+    # gloo communicates tensors on CPU, which can share memory with numpy
+    return isinstance(_current_expected_place(), core.CPUPlace)
+
+
+def to_comm_tensor(array):
+    """
+    Converts a uint8 array to a tensor to send, without copy on CPU.
+    """
+    if _use_zero_copy():
+        return core.eager.Tensor(
+            value=array,
+            place=core.CPUPlace(),
+            persistable=False,
+            zero_copy=True,
+            stop_gradient=True,
+        )
+    return paddle.to_tensor(array)
+
+
+def empty_comm_tensor(size):
+    """
+    Creates a uint8 tensor to receive into.
+
+    Returns:
+        tuple(Tensor, numpy.ndarray): the tensor, and the array sharing
+        memory with it on CPU, which is None on other devices.
+    """
+    if _use_zero_copy():
+        array = np.empty([size], dtype=np.uint8)
+        return to_comm_tensor(array), array
+    return paddle.empty([size], dtype='uint8'), None
+
+
+def comm_tensor_to_numpy(tensor, array):
+    return array if array is not None else tensor.numpy()
+
+
+def broadcast_buffers(buffers, sizes, src, group):
+    """
+    Broadcasts the out-of-band buffers of an object from ``src``, each
+    buffer is sent as a separate tensor.
+
+    Args:
+        buffers(list[numpy.ndarray]|None): the buffers on ``src``, None on
+            other ranks.
+        sizes(list[int]): the sizes of buffers.
+        src(int): the global rank of source.
+        group(Group): the group to broadcast in.
+
+    Returns:
+        list[numpy.ndarray]: the buffers, which are copied on ``src``, so
+        that the received object does not share memory with the sent one.
+    """
+    from .stream import broadcast
+
+    received = []
+    for i, size in enumerate(sizes):
+        if buffers is not None:
+            if size > 0:
+                broadcast(to_comm_tensor(buffers[i]), src, group)
+            received.append(buffers[i].copy())
+        elif size > 0:
+            tensor, array = empty_comm_tensor(size)
+            broadcast(tensor, src, group)
+            received.append(comm_tensor_to_numpy(tensor, array))
+        else:
+            received.append(np.empty([0], dtype=np.uint8))
+    return received
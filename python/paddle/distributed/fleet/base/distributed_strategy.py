@@ -1646,6 +1646,10 @@ class DistributedStrategy:
 
             **micro_batch_size**: the number of small batches in each user defined batch
 
+            **p2p_cache_shape**: if False, the shapes of sent tensors may change between steps, a flag is sent with every tensor and the shapes are sent again only when they change
+
+            **p2p_reuse_recv_buffer**: reuse the buffers of received tensors across micro batches, a buffer is reused only when it is no longer referenced
+
         Examples:
             .. code-block:: python
 
@@ -34,10 +34,14 @@ from ...utils.hybrid_parallel_util import (
 )
 from ...utils.log_util import logger
 from ...utils.mix_precision_utils import MixPrecisionOptimizer
+from ...utils.tensor_fusion_helper import BucketSizeAutotuner
 
 __all__ = []
 
 g_shard_norm_align_dp = int(os.environ.get("FLAGS_shard_norm_align_dp", 0))
+g_dp_autotune_bucket_size = int(
+    os.environ.get("FLAGS_dp_autotune_bucket_size", 0)
+)
 
 
 class HybridParallelClipGrad:
@@ -276,6 +280,9 @@ class HybridParallelOptimizer:
 
         self._sep_enable = self._hcg.get_sep_parallel_world_size() > 1
 
+        # tunes the bucket size of fused allreduce in the first steps
+        self._dp_bucket_tuner = None
+
         if (
             isinstance(self._inner_opt._grad_clip, ClipGradByGlobalNorm)
             and not self._use_dp_mode
@@ -447,7 +454,16 @@ class HybridParallelOptimizer:
                     parameter_list, self._hcg
                 )
         if self._dp_enable or self._sep_enable:
-            fused_allreduce_gradients(dp_parameter_list, self._hcg)
+            if g_dp_autotune_bucket_size:
+                if self._dp_bucket_tuner is None:
+                    self._dp_bucket_tuner = BucketSizeAutotuner()
+                fused_allreduce_gradients(
+                    dp_parameter_list,
+                    self._hcg,
+                    bucket_size=self._dp_bucket_tuner,
+                )
+            else:
+                fused_allreduce_gradients(dp_parameter_list, self._hcg)
 
     @no_grad()
     @framework.dygraph_only
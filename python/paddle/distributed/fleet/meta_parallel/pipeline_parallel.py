@@ -158,6 +158,9 @@ class PipelineParallel(MetaParallelBase):
             'enable_partial_send_recv'
         ]
         self._using_cache = self._strategy.pipeline_configs['p2p_cache_shape']
+        self._reuse_recv_buffer = self._strategy.pipeline_configs[
+            'p2p_reuse_recv_buffer'
+        ]
 
         self.num_stages = self._hcg.get_pipe_parallel_world_size()
         self.stage_id = self._hcg.get_stage_id()
@@ -242,6 +245,7 @@ class PipelineParallel(MetaParallelBase):
             self._using_cache,
             self._enable_partial_send_recv,
             self._enable_timer,
+            self._reuse_recv_buffer,
         )
 
         self.global_rank = self._hcg.get_global_rank()
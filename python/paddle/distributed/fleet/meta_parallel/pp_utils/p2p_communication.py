@@ -12,6 +12,9 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import sys
+from collections import defaultdict
+
 import numpy as np
 
 import paddle
@@ -31,17 +34,84 @@ _hcg = None
 _use_cache = False
 _enable_partial_send_recv = True
 _timers = None
+_recv_buffer_pool = None
 
 
 def initialize_p2p_groups(
-    hcg, use_cache=True, enable_partial_send_recv=True, enable_timer=False
+    hcg,
+    use_cache=True,
+    enable_partial_send_recv=True,
+    enable_timer=False,
+    reuse_recv_buffer=False,
 ):
     global _hcg, _use_cache, _enable_partial_send_recv, _timers
+    global _recv_buffer_pool
     _hcg = hcg
     _use_cache = use_cache
-    _enable_partial_send_recv = enable_partial_send_recv
+    # gloo has no partial send/recv
+    _enable_partial_send_recv = (
+        enable_partial_send_recv
+        and hcg.get_pipe_parallel_group().backend != "GLOO"
+    )
     if enable_timer:
         _timers = timer.get_timers()
+    _recv_buffer_pool = RecvBufferPool() if reuse_recv_buffer else None
+
+
+class RecvBufferPool:
+    """
+    Reuses the tensors received into across micro batches, the buffers are
+    keyed by shape, dtype and the peer rank. A buffer is reused only when it
+    is referenced by the pool only, i.e. the micro batch received into it
+    has finished its backward and dropped it.
+    """
+
+    def __init__(self):
+        self._buffers = defaultdict(list)
+        self.allocated_count = 0
+        self.reused_count = 0
+
+    def get(self, shape, dtype, peer):
+        """
+        Returns a free buffer, or a new one if all buffers are in use.
+
+        Args:
+            shape(list[int]): the shape of buffer.
+            dtype(int): the number of dtype, see `paddle_2_number`.
+            peer(int): the rank received from.
+        """
+        buffers = self._buffers[(tuple(shape), dtype, peer)]
+        for buffer in buffers:
+            # referenced by the list, the loop and the argument only
+            if sys.getrefcount(buffer) == 3:
+                if buffer.grad is not None:
+                    # the grad of last micro batch is accumulated into
+                    buffer.clear_gradient(False)
+                self.reused_count += 1
+                return buffer
+        buffer = paddle.empty(shape=shape, dtype=number_2_dtype(dtype))
+        buffers.append(buffer)
+        self.allocated_count += 1
+        return buffer
+
+    def clear(self):
+        """
+        Stops tracking all buffers, e.g. when the shapes change, the buffers
+        in use are freed by their users.
+        """
+        self._buffers.clear()
+
+
+def _empty_recv_tensor(shape, dtype, peer):
+    if _recv_buffer_pool is None:
+        return paddle.empty(shape=shape, dtype=number_2_dtype(dtype))
+    return _recv_buffer_pool.get(shape, dtype, peer)
+
+
+def _meta_signature(tensor):
+    if isinstance(tensor, tuple):
+        return tuple(_meta_signature(d) for d in tensor)
+    return (tuple(tensor.shape), tensor.dtype, tensor.stop_gradient)
 
 
 class SendRecvMeta:
@@ -58,6 +128,9 @@ class SendRecvMeta:
         self.has_send_meta = False
         self.has_recv_meta = False
 
+        # the meta of the last sent tensor, used when shapes are not cached
+        self.send_signature = None
+
     def _recv_shape_dtype(self, group):
         # recv len(shape)
         dims = paddle.to_tensor([0])
@@ -151,6 +224,38 @@ class SendRecvMeta:
                 )
                 self._send_dims_shape_dtype(d, group=group)
 
+    def send_meta_if_changed(self, tensor, group):
+        """
+        Sends a flag whether the meta of tensor differs from the last sent
+        one, followed by the meta if it does, so that the meta is
+        renegotiated only when the shapes change.
+        """
+        if tensor is None:
+            return
+        signature = _meta_signature(tensor)
+        changed = signature != self.send_signature
+        paddle.distributed.send(
+            paddle.to_tensor([int(changed)]),
+            dst=_hcg._get_p2p_next_rank(),
+            group=group,
+        )
+        if changed:
+            self.set_send_message(tensor)
+            self.send_meta(tensor, group)
+            self.send_signature = signature
+            if _recv_buffer_pool is not None:
+                _recv_buffer_pool.clear()
+
+    def recv_meta_if_changed(self, group):
+        changed = paddle.to_tensor([0])
+        paddle.distributed.recv(
+            changed, src=_hcg._get_p2p_prev_rank(), group=group
+        )
+        if changed.item():
+            self.recv_meta(group)
+            if _recv_buffer_pool is not None:
+                _recv_buffer_pool.clear()
+
     def set_send_message(self, tensor):
         if isinstance(tensor, (paddle.Tensor, framework.core.eager.Tensor)):
             self.send_shape_message = tensor.shape
@@ -171,6 +276,25 @@ class SendRecvMeta:
 _send_recv_meta = SendRecvMeta()
 
 
+def _send_meta(tensor):
+    group = _hcg.get_pipe_parallel_group()
+    if not _use_cache:
+        _send_recv_meta.send_meta_if_changed(tensor, group)
+    elif not _send_recv_meta.has_send_meta:
+        _send_recv_meta.set_send_message(tensor)
+        _send_recv_meta.send_meta(tensor, group)
+        _send_recv_meta.has_send_meta = True
+
+
+def _recv_meta():
+    group = _hcg.get_pipe_parallel_group()
+    if not _use_cache:
+        _send_recv_meta.recv_meta_if_changed(group)
+    elif not _send_recv_meta.has_recv_meta:
+        _send_recv_meta.recv_meta(group)
+        _send_recv_meta.has_recv_meta = True
+
+
 def _is_valid_send_recv_partial(tensor, mp_degree):
     if not _enable_partial_send_recv:
         return False
@@ -184,6 +308,9 @@ def _send_on_calc_stream(tensor, group, dst, nranks=1, rank_id=0):
         group is not None
     ), "Group should be an instance for _send_on_calc_stream."
     dst_rank_in_group = group.get_group_rank(dst)
+    if group.backend == "GLOO":
+        # gloo communicates tensors on CPU, where there is no calc stream
+        return group.process_group.send(tensor, dst_rank_in_group, True)
     if _is_valid_send_recv_partial(tensor, nranks):
         return group.process_group.send_partial_on_calc_stream(
             tensor, dst_rank_in_group, nranks, rank_id
@@ -199,6 +326,8 @@ def _recv_on_calc_stream(tensor, group, src, nranks=1, rank_id=0):
         group is not None
     ), "Group should be an instance for _recv_on_calc_stream."
     src_rank_in_group = group.get_group_rank(src)
+    if group.backend == "GLOO":
+        return group.process_group.recv(tensor, src_rank_in_group, True)
     if _is_valid_send_recv_partial(tensor, nranks):
         return group.process_group.recv_partial_on_calc_stream(
             tensor, src_rank_in_group, nranks, rank_id
@@ -321,34 +450,32 @@ def _p2p_helper(
     mp_rank = _hcg.get_model_parallel_rank()
 
     if recv_prev:
+        prev_rank = _hcg._get_p2p_prev_rank()
         if isinstance(recv_shape_msg, tuple):
             tensor_recv_prev = []
             for idx, shape in enumerate(recv_shape_msg):
-                tmp = paddle.empty(
-                    shape=shape, dtype=number_2_dtype(recv_dtype_msg[idx])
-                )
+                tmp = _empty_recv_tensor(shape, recv_dtype_msg[idx], prev_rank)
                 tmp.stop_gradient = recv_stop_gradient[idx]
                 tensor_recv_prev.append(tmp)
             tensor_recv_prev = tuple(tensor_recv_prev)
         else:
-            tensor_recv_prev = paddle.empty(
-                shape=recv_shape_msg, dtype=number_2_dtype(recv_dtype_msg)
+            tensor_recv_prev = _empty_recv_tensor(
+                recv_shape_msg, recv_dtype_msg, prev_rank
             )
             tensor_recv_prev.stop_gradient = recv_stop_gradient
 
     if recv_next:
+        next_rank = _hcg._get_p2p_next_rank()
         if isinstance(send_shape_msg, tuple):
             tensor_recv_next = []
             for idx, shape in enumerate(send_shape_msg):
                 tensor_recv_next.append(
-                    paddle.empty(
-                        shape=shape, dtype=number_2_dtype(send_dtype_msg[idx])
-                    )
+                    _empty_recv_tensor(shape, send_dtype_msg[idx], next_rank)
                 )
             tensor_recv_next = tuple(tensor_recv_next)
         else:
-            tensor_recv_next = paddle.empty(
-                shape=send_shape_msg, dtype=number_2_dtype(send_dtype_msg)
+            tensor_recv_next = _empty_recv_tensor(
+                send_shape_msg, send_dtype_msg, next_rank
             )
 
     ops = []
@@ -440,9 +567,7 @@ def recv_forward(pp_first_stage, sync_recv=True):
     if pp_first_stage:
         input_tensor = None
     else:
-        if not _send_recv_meta.has_recv_meta:
-            _send_recv_meta.recv_meta(_hcg.get_pipe_parallel_group())
-            _send_recv_meta.has_recv_meta = _use_cache
+        _recv_meta()
 
         input_tensor, _ = _p2p_helper(
             tensor_send_next=None,
@@ -480,12 +605,7 @@ def send_forward(output_tensor, pp_last_stage):
     if _timers is not None:
         _timers("send_forward").start()
     if not pp_last_stage:
-        if not _send_recv_meta.has_send_meta:
-            _send_recv_meta.set_send_message(output_tensor)
-            _send_recv_meta.send_meta(
-                output_tensor, _hcg.get_pipe_parallel_group()
-            )
-            _send_recv_meta.has_send_meta = _use_cache
+        _send_meta(output_tensor)
 
         _p2p_helper(
             tensor_send_next=output_tensor,
@@ -555,13 +675,9 @@ def send_forward_backward_recv_forward_backward(
     global _timers
     if _timers is not None:
         _timers("send_forward_backward_recv_forward_backward").start()
-    if not _send_recv_meta.has_send_meta:
-        _send_recv_meta.set_send_message(output_tensor)
-        _send_recv_meta.send_meta(output_tensor, _hcg.get_pipe_parallel_group())
-        _send_recv_meta.has_send_meta = _use_cache
-    if recv_prev and not _send_recv_meta.has_recv_meta:
-        _send_recv_meta.recv_meta(_hcg.get_pipe_parallel_group())
-        _send_recv_meta.has_recv_meta = _use_cache
+    _send_meta(output_tensor)
+    if recv_prev:
+        _recv_meta()
     input_tensor, output_tensor_grad = _p2p_helper(
         tensor_send_next=output_tensor,
         tensor_send_prev=input_tensor_grad,
@@ -579,13 +695,9 @@ def send_forward_recv_forward(output_tensor, recv_prev):
     global _timers
     if _timers is not None:
         _timers("send_forward_recv_forward").start()
-    if not _send_recv_meta.has_send_meta:
-        _send_recv_meta.set_send_message(output_tensor)
-        _send_recv_meta.send_meta(output_tensor, _hcg.get_pipe_parallel_group())
-        _send_recv_meta.has_send_meta = _use_cache
-    if recv_prev and not _send_recv_meta.has_recv_meta:
-        _send_recv_meta.recv_meta(_hcg.get_pipe_parallel_group())
-        _send_recv_meta.has_recv_meta = _use_cache
+    _send_meta(output_tensor)
+    if recv_prev:
+        _recv_meta()
 
     input_tensor, _ = _p2p_helper(
         tensor_send_next=output_tensor,
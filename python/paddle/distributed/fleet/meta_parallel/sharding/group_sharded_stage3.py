@@ -85,6 +85,8 @@ class GroupShardedStage3(nn.Layer):
         sync_comm=False,
         dp_group=None,
         exclude_layer=None,
+        prefetch_depth=1,
+        prefetch_memory_budget=None,
     ):
         super().__init__()
 
@@ -110,6 +112,11 @@ class GroupShardedStage3(nn.Layer):
         assert segment_size >= 0, "segment_size must be GE than 0."
         self._segment_size = segment_size
 
+        # the number of layers to all-gather params ahead
+        assert prefetch_depth >= 1, "prefetch_depth must be GE than 1."
+        self._prefetch_depth = prefetch_depth
+        self._prefetch_memory_budget = prefetch_memory_budget
+
         global DEV
         DEV = (
             "cpu"
@@ -194,7 +201,10 @@ class GroupShardedStage3(nn.Layer):
         self._order_tracer["layer"] = []
 
         # Register task flow
-        self._task_flow = TaskFlow()
+        self._task_flow = TaskFlow(
+            prefetch_depth=self._prefetch_depth,
+            prefetch_memory_budget=self._prefetch_memory_budget,
+        )
 
         # Register forward hooks
         self._register_forward_hooks(self._layer)
@@ -830,6 +840,15 @@ def ForwardPreHooks(
 
         # Whether to use calc stream
         task_flow.use_calc[layer_id] = use_calc
+        _allgather_buffer(
+            trainable_params[layer_id],
+            group,
+            param2buffer_size=param2buffer_size,
+            use_calc_stream=use_calc,
+            task_flow=task_flow,
+            sync_wait=sync_wait,
+            offload=offload,
+        )
     else:
         # Whether to use calc stream
         task_flow.use_calc[layer_id] = use_calc
@@ -843,22 +862,16 @@ def ForwardPreHooks(
             offload,
         )
 
-        if layer_id == order_tracer["layer"][-1]:
-            return
         order_ = order_tracer[layer_id]
-        layer_id = order_tracer["layer"][order_ + 1]
-
-    _allgather_buffer(
-        trainable_params[layer_id],
-        group,
-        param2buffer_size=param2buffer_size,
-        use_calc_stream=use_calc,
-        task_flow=task_flow,
-        sync_wait=sync_wait,
-        offload=offload,
-    )
-
-    return
+        _prefetch_layers(
+            order_tracer["layer"][order_ + 1 :],
+            trainable_params,
+            group,
+            param2buffer_size,
+            use_calc,
+            task_flow,
+            offload,
+        )
 
 
 class ForwardPostHooks(PyLayer):
@@ -943,16 +956,17 @@ class ForwardPostHooks(PyLayer):
 
         # Whether to use calc stream
         task_flow.use_calc[layer_id] = use_calc
-        if layer_id != order_tracer["layer"][0] and not sync_comm:
-            layer_next_id = order_tracer["layer"][order_tracer[layer_id] - 1]
-            _allgather_buffer(
-                trainable_params[layer_next_id],
+        if not sync_comm:
+            # the layers run backward in reverse order of forward
+            order_ = order_tracer[layer_id]
+            _prefetch_layers(
+                order_tracer["layer"][order_ - 1 :: -1] if order_ > 0 else [],
+                trainable_params,
                 group,
-                param2buffer_size=param2buffer_size,
-                use_calc_stream=use_calc,
-                task_flow=task_flow,
-                sync_wait=sync_wait,
-                offload=offload,
+                param2buffer_size,
+                use_calc,
+                task_flow,
+                offload,
             )
 
         return args
@@ -969,11 +983,15 @@ class TaskFlow:
         full_grad={},
         use_calc={},
         callback=None,
+        prefetch_depth=1,
+        prefetch_memory_budget=None,
     ):
         self.full_param = full_param
         self.full_grad = full_grad
         self.use_calc = use_calc
         self.callback = callback
+        self.prefetch_depth = prefetch_depth
+        self.prefetch_memory_budget = prefetch_memory_budget
 
 
 def _release_param(
@@ -1083,6 +1101,61 @@ def _allgather_buffer(
     return task_flow
 
 
+def _full_params_bytes(task_flow):
+    return sum(
+        full_param._numel() * core.size_of_dtype(full_param.dtype)
+        for full_param, _ in task_flow.full_param.values()
+    )
+
+
+def _prefetch_layers(
+    layer_ids,
+    trainable_params,
+    group,
+    param2buffer_size,
+    use_calc_stream,
+    task_flow,
+    offload=False,
+):
+    """
+    All-gathers the params of the next ``task_flow.prefetch_depth`` layers
+    in execution order asynchronously, ``layer_ids[0]`` is the next layer.
+    The layers after the next one are gathered only if the full params,
+    including the ones in use and in flight, fit in
+    ``task_flow.prefetch_memory_budget`` bytes.
+    """
+    budget = task_flow.prefetch_memory_budget
+    for i, layer_id in enumerate(layer_ids[: task_flow.prefetch_depth]):
+        params = [
+            param
+            for param in trainable_params[layer_id]
+            # the params in use are counted for the next layer only, and
+            # the params in flight are not gathered again
+            if (param.status == "all" and i == 0)
+            or (
+                param.status != "all"
+                and param.name not in task_flow.full_param.keys()
+            )
+        ]
+        if i > 0 and budget is not None:
+            layer_bytes = sum(
+                param2buffer_size[param.name] * core.size_of_dtype(param.dtype)
+                for param in params
+            )
+            if _full_params_bytes(task_flow) + layer_bytes > budget:
+                break
+        _allgather_buffer(
+            params,
+            group,
+            param2buffer_size=param2buffer_size,
+            use_calc_stream=use_calc_stream,
+            task_flow=task_flow,
+            sync_wait=False,
+            offload=offload,
+        )
+    return task_flow
+
+
 @paddle.autograd.no_grad()
 def _create_params_grad(trainable_params, param2buffer_size, task_flow):
     for param in trainable_params:
@@ -25,6 +25,7 @@ from paddle.distributed.parallel import (
 )
 
 from .log_util import logger
+from .tensor_fusion_helper import BucketSizeAutotuner
 
 __all__ = []
 
@@ -229,6 +230,12 @@ def broadcast_dp_parameters(model, hcg):
 def fused_allreduce_gradients_with_group(
     parameter_list, group, bucket_size=128 * 1024 * 1024, scale=None
 ):
+    # bucket_size is either the size in bytes, or a BucketSizeAutotuner
+    # which tunes the size in the first steps
+    if isinstance(bucket_size, BucketSizeAutotuner):
+        bucket_size.step(group)
+        bucket_size = bucket_size.bucket_size
+
     apply_func = (
         _apply_collective_grads_eager
         if in_dynamic_mode()
@@ -238,7 +245,9 @@ def fused_allreduce_gradients_with_group(
         apply_func(parameter_list, group, bucket_size, scale)
 
 
-def fused_allreduce_gradients(parameter_list, hcg):
+def fused_allreduce_gradients(
+    parameter_list, hcg, bucket_size=128 * 1024 * 1024
+):
     group = None
     scale = None
     if hcg is not None:
@@ -259,7 +268,9 @@ def fused_allreduce_gradients(parameter_list, hcg):
             group = sep_group if group is None else dp_sep_group
 
     logger.debug("dp or sep start fuse allreduce gradients")
-    fused_allreduce_gradients_with_group(parameter_list, group, scale=scale)
+    fused_allreduce_gradients_with_group(
+        parameter_list, group, bucket_size=bucket_size, scale=scale
+    )
 
 
 def broadcast_sharding_parameters(model, hcg):
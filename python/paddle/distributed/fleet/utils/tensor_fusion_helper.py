@@ -13,6 +13,7 @@
 # limitations under the License.
 import itertools
 import os
+import time
 from collections import OrderedDict
 
 import numpy as np
@@ -21,6 +22,8 @@ import paddle
 from paddle.framework import base as imperative_base
 from paddle.framework import core
 
+from .log_util import logger
+
 
 class HOOK_ACTION:
     ALL_REDUCE = 0
@@ -270,6 +273,113 @@ class FusedCommBuffer:
         self._reset_params_checked_in()
 
 
+class BucketSizeAutotuner:
+    """
+    Tunes the bucket size of the fused gradient allreduce in the first steps
+    of training. Each candidate is used for ``warmup_steps`` plus
+    ``steps_per_candidate`` steps, and the candidate with the shortest mean
+    step time over all ranks is used for the rest of training.
+
+    Only the bucket size is tuned, the buckets are not reordered by when
+    their gradients become ready, they keep the order of the parameters
+    given to ``assign_group_by_size``.
+
+    ``step`` should be called once per step, before the gradients are
+    allreduced. The step time is measured between two calls of ``step``.
+
+    Args:
+        candidates(list[int], optional): the bucket sizes in bytes to try.
+            Default: 16MB, 32MB, 64MB, 128MB and 256MB.
+        warmup_steps(int, optional): the steps not measured after switching
+            to a candidate. Default: 1.
+        steps_per_candidate(int, optional): the steps measured for each
+            candidate. Default: 3.
+    """
+
+    def __init__(
+        self,
+        candidates=None,
+        warmup_steps=1,
+        steps_per_candidate=3,
+    ):
+        if candidates is None:
+            candidates = [size * 1024 * 1024 for size in [16, 32, 64, 128, 256]]
+        assert len(candidates) > 0, "candidates should not be empty"
+        assert steps_per_candidate > 0, "steps_per_candidate should be > 0"
+        self._candidates = list(candidates)
+        # (index of candidate, whether the step is measured)
+        self._schedule = [
+            (idx, step >= warmup_steps)
+            for idx in range(len(self._candidates))
+            for step in range(warmup_steps + steps_per_candidate)
+        ]
+        self._step = 0
+        self._last_time = None
+        self._step_times = [[] for _ in self._candidates]
+        self._bucket_size = self._candidates[0]
+        self._tuned = False
+
+    @property
+    def bucket_size(self):
+        return self._bucket_size
+
+    @property
+    def tuned(self):
+        return self._tuned
+
+    def step(self, comm_group=None):
+        """
+        Marks the end of a step, and switches the bucket size for the next
+        allreduce.
+
+        Args:
+            comm_group(Group, optional): the group the gradients are
+                allreduced in, the ranks of which agree on the tuned bucket
+                size. Default: None, the global group.
+        """
+        if self._tuned:
+            return
+
+        paddle.device.synchronize()
+        now = time.perf_counter()
+        if self._last_time is not None:
+            idx, measured = self._schedule[self._step - 1]
+            if measured:
+                self._step_times[idx].append(now - self._last_time)
+        self._last_time = now
+
+        if self._step < len(self._schedule):
+            idx, _ = self._schedule[self._step]
+            self._bucket_size = self._candidates[idx]
+            self._step += 1
+        else:
+            self._finish(comm_group)
+
+    def _finish(self, comm_group):
+        mean_times = [sum(times) / len(times) for times in self._step_times]
+        nranks = (
+            paddle.distributed.get_world_size()
+            if comm_group is None
+            else comm_group.nranks
+        )
+        if nranks > 1:
+            # the slowest rank decides the step time, and all ranks must
+            # build the same buckets
+            times = paddle.to_tensor(mean_times, dtype="float64")
+            paddle.distributed.all_reduce(
+                times, op=paddle.distributed.ReduceOp.MAX, group=comm_group
+            )
+            mean_times = times.tolist()
+
+        best = mean_times.index(min(mean_times))
+        self._bucket_size = self._candidates[best]
+        self._tuned = True
+        logger.info(
+            f"The tuned bucket size of fused allreduce is {self._bucket_size} "
+            f"bytes, step times of candidates {self._candidates}: {mean_times}"
+        )
+
+
 def obtain_storage(
     parameters,
     use_main_grad=False,
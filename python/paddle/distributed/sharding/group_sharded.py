@@ -50,6 +50,8 @@ def group_sharded_parallel(
     sync_comm=False,
     dp_group=None,
     exclude_layer=None,
+    prefetch_depth=1,
+    prefetch_memory_budget=None,
 ):
     """
     Use group_sharded_parallel can perform group shared configuration on the model, optimizer and GradScaler. Level has three string options, 'os', 'os_g' and 'p_g_os' corresponds to three different usage scenarios: optimizer state segmentation, optimizer state + gradient segmentation, and parameter + gradient + optimizer state segmentation.
@@ -68,6 +70,8 @@ def group_sharded_parallel(
         sync_comm (bool, optional): Whether to use synchronous communication, only in `p_g_os` used. Defaults to False, indicating that asynchronous communication is used.
         dp_group(Group, optional): dp communication group, support to combine stage2 or stage3 with dp hybrid communication.
         exclude_layer(list, optional): exclude some layers for slicing for sharding stage3, for example, exclude_layer=["GroupNorm", id(model.gpt.linear)], exclude_layer must contain the layers' name or one layer's id.
+        prefetch_depth(int, optional): The number of layers whose parameters are all-gathered ahead in the recorded execution order to overlap with computation, only in `p_g_os` used. Defaults to 1, indicating that only the parameters of the next layer are gathered ahead.
+        prefetch_memory_budget(int, optional): The max bytes of unsharded parameters live at once, including the ones in use and being gathered, the layers after the next one are not gathered ahead if exceeded, only in `p_g_os` used. Defaults to None, indicating no limit.
 
     Returns:
         model: A wrapper for group sharded given model.
@@ -167,6 +171,8 @@ def group_sharded_parallel(
             dp_group=dp_group,
             device=device,
             exclude_layer=exclude_layer,
+            prefetch_depth=prefetch_depth,
+            prefetch_memory_budget=prefetch_memory_budget,
         )
     else:
         raise ValueError("Please enter the correct level.")
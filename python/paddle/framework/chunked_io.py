@@ -0,0 +1,475 @@
+# Copyright (c) 2023 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# Chunked checkpoint format used by `paddle.save(..., use_chunked_format=True)`.
+#
+# The file is composed of a header and raw tensor data blobs:
+#
+#   | MAGIC(8 bytes) | header length(8 bytes) | header | padding | blobs |
+#
+# The header is a pickled dict containing the format version, the tensor
+# index and the pickled object structure, in which each tensor is replaced
+# by a persistent id referring to its entry in the tensor index. Each blob
+# is aligned to CHUNKED_ALIGNMENT bytes, so tensors can be memory-mapped
+# without copying. Blobs are split into chunks and written by a thread pool.
+
+import io
+import os
+import pickle
+import struct
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+import paddle
+from paddle.base import core
+from paddle.base.data_feeder import convert_dtype
+from paddle.base.framework import _current_expected_place, in_dygraph_mode
+
+from .io_utils import _filter_state_dict, _LazyStateDict
+
+CHUNKED_MAGIC = b'PDCKPT\x00\x01'
+CHUNKED_VERSION = 1
+CHUNKED_ALIGNMENT = 64
+_HEADER_LENGTH_FORMAT = '<Q'
+_PREFIX_SIZE = len(CHUNKED_MAGIC) + struct.calcsize(_HEADER_LENGTH_FORMAT)
+
+# kinds of objects saved as blobs
+_KIND_TENSOR = 'tensor'
+_KIND_LOD_TENSOR = 'lod_tensor'
+_KIND_NDARRAY = 'ndarray'
+
+_DEFAULT_NUM_THREADS = 8
+
+
+def _align(nbytes):
+    return (
+        (nbytes + CHUNKED_ALIGNMENT - 1)
+        // CHUNKED_ALIGNMENT
+        * CHUNKED_ALIGNMENT
+    )
+
+
+def _is_chunked_file(path):
+    if not isinstance(path, str) or not os.path.isfile(path):
+        return False
+    with open(path, 'rb') as f:
+        return f.read(len(CHUNKED_MAGIC)) == CHUNKED_MAGIC
+
+
+def _blob_meta(obj):
+    if isinstance(obj, core.eager.Tensor):
+        kind = _KIND_TENSOR
+        name = obj.name
+        dtype = np.dtype(convert_dtype(obj.dtype))
+        shape = list(obj.shape)
+    elif isinstance(obj, core.LoDTensor):
+        kind = _KIND_LOD_TENSOR
+        name = None
+        dtype = np.dtype(convert_dtype(obj._dtype()))
+        shape = list(obj.shape())
+    else:
+        kind = _KIND_NDARRAY
+        name = None
+        dtype = obj.dtype
+        shape = list(obj.shape)
+    nbytes = int(np.prod(shape, dtype=np.int64)) * dtype.itemsize
+    return {
+        'kind': kind,
+        'name': name,
+        'dtype': dtype.str,
+        'shape': shape,
+        'nbytes': nbytes,
+    }
+
+
+def _blob_to_host(obj):
+    if isinstance(obj, core.eager.Tensor):
+        data = obj.numpy()
+    elif isinstance(obj, core.LoDTensor):
+        p = core.Place()
+        p.set_place(paddle.CPUPlace())
+        data = np.array(obj._copy(p))
+    else:
+        data = obj
+    return np.ascontiguousarray(data)
+
+
+class _ChunkedPickler(pickle.Pickler):
+    """
+    Pickle the object structure, tensors and numpy arrays are replaced
+    with persistent ids and collected to be written as blobs.
+    """
+
+    def __init__(self, f, protocol):
+        super().__init__(f, protocol)
+        self.blobs = []
+        self.metas = []
+        self._blob_ids = {}
+
+    def persistent_id(self, obj):
+        if isinstance(obj, paddle.nn.Layer):
+            raise ValueError(
+                "paddle do not support saving `paddle.nn.Layer` object."
+            )
+        if isinstance(obj, core.SelectedRows):
+            raise NotImplementedError(
+                "`paddle.save` do not support saving 'SelectedRows'."
+            )
+        if not isinstance(obj, (core.eager.Tensor, core.LoDTensor, np.ndarray)):
+            return None
+        # the same tensor referred multiple times is saved once
+        blob_id = self._blob_ids.get(id(obj))
+        if blob_id is None:
+            blob_id = len(self.blobs)
+            self._blob_ids[id(obj)] = blob_id
+            self.blobs.append(obj)
+            self.metas.append(_blob_meta(obj))
+        return ('blob', blob_id)
+
+
+def _split_chunks(metas, num_chunks):
+    """
+    Split blobs into contiguous chunks with similar bytes.
+    """
+    total = sum(meta['nbytes'] for meta in metas)
+    chunk_bytes = max(total // max(num_chunks, 1), 1)
+    chunks = []
+    current = []
+    current_bytes = 0
+    for blob_id, meta in enumerate(metas):
+        current.append(blob_id)
+        current_bytes += meta['nbytes']
+        if current_bytes >= chunk_bytes:
+            chunks.append(current)
+            current = []
+            current_bytes = 0
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def _write_chunk(path, data_offset, blobs, metas, chunk):
+    with open(path, 'r+b') as f:
+        for blob_id in chunk:
+            meta = metas[blob_id]
+            if meta['nbytes'] == 0:
+                continue
+            # NOTE: only one chunk of blobs is copied to host memory at the
+            # same time in each thread, which bounds the host memory used
+            data = _blob_to_host(blobs[blob_id])
+            f.seek(data_offset + meta['offset'])
+            f.write(memoryview(data.reshape(-1)).cast('B'))
+            del data
+
+
+def _save_chunked(obj, path, protocol=4, num_threads=None):
+    """
+    Save object to path in chunked format, the file is written to a
+    temporary file first and renamed to path when all blobs are written.
+    """
+    if not isinstance(path, str):
+        raise ValueError(
+            "The chunked format only supports saving objects to file, "
+            f"but got {type(path)}"
+        )
+    if num_threads is None:
+        num_threads = _DEFAULT_NUM_THREADS
+    if not isinstance(num_threads, int) or num_threads <= 0:
+        raise ValueError(
+            f"num_threads should be a positive integer, but got {num_threads}"
+        )
+
+    structure = io.BytesIO()
+    pickler = _ChunkedPickler(structure, protocol)
+    pickler.dump(obj)
+
+    offset = 0
+    for meta in pickler.metas:
+        meta['offset'] = offset
+        offset += _align(meta['nbytes'])
+    data_size = offset
+
+    header = pickle.dumps(
+        {
+            'version': CHUNKED_VERSION,
+            'metas': pickler.metas,
+            'structure': structure.getvalue(),
+        },
+        protocol=protocol,
+    )
+    data_offset = _align(_PREFIX_SIZE + len(header))
+
+    tmp_path = path + '.tmp'
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(CHUNKED_MAGIC)
+            f.write(struct.pack(_HEADER_LENGTH_FORMAT, len(header)))
+            f.write(header)
+            f.truncate(data_offset + data_size)
+
+        chunks = _split_chunks(pickler.metas, num_threads)
+        if len(chunks) <= 1 or num_threads == 1:
+            for chunk in chunks:
+                _write_chunk(
+                    tmp_path, data_offset, pickler.blobs, pickler.metas, chunk
+                )
+        else:
+            with ThreadPoolExecutor(max_workers=num_threads) as executor:
+                futures = [
+                    executor.submit(
+                        _write_chunk,
+                        tmp_path,
+                        data_offset,
+                        pickler.blobs,
+                        pickler.metas,
+                        chunk,
+                    )
+                    for chunk in chunks
+                ]
+                for future in futures:
+                    future.result()
+        os.replace(tmp_path, path)
+    except:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def _read_chunked_header(path):
+    """
+    Read the header of a chunked file.
+
+    Returns:
+        tuple: (metas, structure, data_offset), metas is the tensor index,
+        structure is the pickled object structure.
+    """
+    with open(path, 'rb') as f:
+        prefix = f.read(_PREFIX_SIZE)
+        if prefix[: len(CHUNKED_MAGIC)] != CHUNKED_MAGIC:
+            raise ValueError(f"{path} is not a chunked checkpoint file.")
+        (header_len,) = struct.unpack(
+            _HEADER_LENGTH_FORMAT, prefix[len(CHUNKED_MAGIC) :]
+        )
+        header = pickle.loads(f.read(header_len))
+    if header['version'] > CHUNKED_VERSION:
+        raise ValueError(
+            f"The chunked checkpoint version {header['version']} of {path} "
+            f"is not supported, the latest supported version is {CHUNKED_VERSION}."
+        )
+    return (
+        header['metas'],
+        header['structure'],
+        _align(_PREFIX_SIZE + header_len),
+    )
+
+
+class _ChunkedReader:
+    """
+    Read blobs of a chunked file, by memory map or by file reading.
+    """
+
+    def __init__(self, path, data_offset, mmap=False):
+        self._path = path
+        self._data_offset = data_offset
+        self._mmap = None
+        if mmap and os.path.getsize(path) > data_offset:
+            # NOTE: copy-on-write mapping, tensors sharing memory with the
+            # file can be modified without changing the file
+            self._mmap = np.memmap(path, dtype=np.uint8, mode='c')
+
+    @property
+    def use_mmap(self):
+        return self._mmap is not None
+
+    def read(self, meta):
+        dtype = np.dtype(meta['dtype'])
+        shape = meta['shape']
+        if meta['nbytes'] == 0:
+            return np.empty(shape, dtype=dtype)
+        start = self._data_offset + meta['offset']
+        if self._mmap is not None:
+            data = self._mmap[start : start + meta['nbytes']]
+            return data.view(dtype).reshape(shape)
+        data = np.empty(shape, dtype=dtype)
+        with open(self._path, 'rb') as f:
+            f.seek(start)
+            f.readinto(memoryview(data.reshape(-1)).cast('B'))
+        return data
+
+
+def _blob_to_object(data, meta, return_numpy, zero_copy=False):
+    if meta['kind'] == _KIND_NDARRAY or return_numpy:
+        return data
+    if in_dygraph_mode():
+        place = _current_expected_place()
+        if zero_copy and isinstance(place, core.CPUPlace):
+            # share memory with the memory-mapped file
+            t = core.eager.Tensor(
+                value=data,
+                place=place,
+                persistable=False,
+                zero_copy=True,
+                stop_gradient=True,
+            )
+        else:
+            t = paddle.to_tensor(data)
+        if meta['name']:
+            t.name = meta['name']
+        return t
+    t = core.LoDTensor()
+    t.set(data, _current_expected_place())
+    return t
+
+
+class _ChunkedUnpickler(pickle.Unpickler):
+    def __init__(self, f, load_blob):
+        super().__init__(f)
+        self._load_blob = load_blob
+
+    def persistent_load(self, pid):
+        tag, blob_id = pid
+        if tag != 'blob':
+            raise pickle.UnpicklingError(f"unsupported persistent id {pid}")
+        return self._load_blob(blob_id)
+
+
+class _LazyBlob:
+    """
+    Placeholder of a blob in the object structure, replaced by the loaded
+    object when the value containing it is accessed.
+    """
+
+    __slots__ = ['blob_id']
+
+    def __init__(self, blob_id):
+        self.blob_id = blob_id
+
+
+def _collect_blobs(obj, blob_ids):
+    if isinstance(obj, _LazyBlob):
+        blob_ids.append(obj.blob_id)
+    elif isinstance(obj, dict):
+        for value in obj.values():
+            _collect_blobs(value, blob_ids)
+    elif isinstance(obj, (list, tuple)):
+        for value in obj:
+            _collect_blobs(value, blob_ids)
+
+
+def _resolve_blobs(obj, load_blob):
+    """
+    Replace placeholders in nested dict, list and tuple with loaded blobs.
+    """
+    if isinstance(obj, _LazyBlob):
+        return load_blob(obj.blob_id)
+    if isinstance(obj, dict):
+        for key, value in obj.items():
+            obj[key] = _resolve_blobs(value, load_blob)
+    elif isinstance(obj, list):
+        for i, value in enumerate(obj):
+            obj[i] = _resolve_blobs(value, load_blob)
+    elif type(obj) == tuple:
+        return tuple(_resolve_blobs(value, load_blob) for value in obj)
+    return obj
+
+
+class _BlobLoader:
+    """
+    Load blobs of a chunked file, loaded objects are cached by blob id so
+    that tensors shared in the object structure are loaded once.
+    """
+
+    def __init__(self, path, metas, data_offset, return_numpy, mmap):
+        self._metas = metas
+        self._return_numpy = return_numpy
+        self._reader = _ChunkedReader(path, data_offset, mmap)
+        self._datas = {}
+        self._objs = {}
+
+    def preload(self, blob_ids, num_threads=None):
+        """
+        Read data of blobs in parallel, not needed when memory-mapped.
+        """
+        blob_ids = [i for i in set(blob_ids) if i not in self._objs]
+        if self._reader.use_mmap or len(blob_ids) <= 1:
+            return
+        if num_threads is None:
+            num_threads = _DEFAULT_NUM_THREADS
+        with ThreadPoolExecutor(max_workers=num_threads) as executor:
+            datas = executor.map(
+                self._reader.read, [self._metas[i] for i in blob_ids]
+            )
+            self._datas.update(zip(blob_ids, datas))
+
+    def load(self, blob_id):
+        if blob_id not in self._objs:
+            data = self._datas.pop(blob_id, None)
+            if data is None:
+                data = self._reader.read(self._metas[blob_id])
+            self._objs[blob_id] = _blob_to_object(
+                data,
+                self._metas[blob_id],
+                self._return_numpy,
+                zero_copy=self._reader.use_mmap,
+            )
+        return self._objs[blob_id]
+
+
+def _load_chunked(
+    path,
+    return_numpy=False,
+    mmap=False,
+    num_threads=None,
+    keys=None,
+    prefix=None,
+    lazy=False,
+):
+    """
+    Load object from a chunked file. If mmap is True, tensors are read
+    through a memory map of the file, only pages of tensors used are read
+    from disk, and tensors on CPU share memory with the memory map.
+
+    If the saved object is a state dict, only data of items selected by
+    keys and prefix are read, and if lazy is True, a lazy state dict is
+    returned and only the header is read here.
+    """
+    metas, structure, data_offset = _read_chunked_header(path)
+    loader = _BlobLoader(path, metas, data_offset, return_numpy, mmap)
+
+    if keys is None and prefix is None and not lazy:
+        loader.preload(range(len(metas)), num_threads)
+        return _ChunkedUnpickler(io.BytesIO(structure), loader.load).load()
+
+    obj = _ChunkedUnpickler(io.BytesIO(structure), _LazyBlob).load()
+    if not isinstance(obj, dict):
+        if keys is not None or prefix is not None:
+            raise ValueError(
+                "The `keys` and `prefix` of `paddle.load` only support "
+                f"loading state dict, but the saved object is {type(obj)}."
+            )
+        # NOTE: lazy loading only supports state dict, load all blobs
+        # through unpickling since they may be held by any object
+        loader.preload(range(len(metas)), num_threads)
+        return _ChunkedUnpickler(io.BytesIO(structure), loader.load).load()
+
+    obj = _filter_state_dict(obj, keys, prefix)
+    if lazy:
+        return _LazyStateDict(
+            obj, lambda key, value: _resolve_blobs(value, loader.load)
+        )
+    blob_ids = []
+    _collect_blobs(obj, blob_ids)
+    loader.preload(blob_ids, num_threads)
+    return _resolve_blobs(obj, loader.load)
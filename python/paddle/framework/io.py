@@ -37,9 +37,12 @@ from paddle.base.framework import (
     in_dygraph_mode,
 )
 
+from .chunked_io import _is_chunked_file, _load_chunked, _save_chunked
 from .io_utils import (
+    _filter_state_dict,
     _is_file_path,
     _is_memory_buffer,
+    _LazyStateDict,
     _legacy_static_save,
     _open_file_buffer,
     _pack_loaded_dict,
@@ -230,6 +233,10 @@ def _parse_load_config(configs):
         'params_filename',
         'keep_name_table',
         'return_numpy',
+        'mmap',
+        'keys',
+        'prefix',
+        'lazy',
     ]
 
     # input check
@@ -250,12 +257,21 @@ def _parse_load_config(configs):
     inner_config.params_filename = configs.get('params_filename', None)
     inner_config.keep_name_table = configs.get('keep_name_table', None)
     inner_config.return_numpy = configs.get('return_numpy', False)
+    inner_config.mmap = configs.get('mmap', False)
+    inner_config.keys = configs.get('keys', None)
+    inner_config.prefix = configs.get('prefix', None)
+    inner_config.lazy = configs.get('lazy', False)
 
     return inner_config
 
 
 def _parse_save_config(configs):
-    supported_configs = ['use_binary_format', 'pickle_protocol']
+    supported_configs = [
+        'use_binary_format',
+        'pickle_protocol',
+        'use_chunked_format',
+        'num_threads',
+    ]
 
     # input check
     for key in configs:
@@ -273,6 +289,8 @@ def _parse_save_config(configs):
     inner_config = _SaveLoadConfig()
     inner_config.use_binary_format = configs.get('use_binary_format', False)
     inner_config.pickle_protocol = configs.get('pickle_protocol', None)
+    inner_config.use_chunked_format = configs.get('use_chunked_format', False)
+    inner_config.num_threads = configs.get('num_threads', None)
 
     return inner_config
 
@@ -457,6 +475,47 @@ def _ndarray_to_tensor(obj, return_numpy):
         return _to_LodTensor(obj)
 
 
+def _select_loaded_state_dict(load_result, config):
+    if not isinstance(load_result, dict):
+        if config.keys is not None or config.prefix is not None:
+            raise ValueError(
+                "The `keys` and `prefix` of `paddle.load` only support loading "
+                f"state dict, but the saved object is {type(load_result)}."
+            )
+        return load_result
+    name_table = load_result.get("StructuredToParameterName@@", None)
+    load_result = _filter_state_dict(load_result, config.keys, config.prefix)
+    if name_table is not None:
+        load_result["StructuredToParameterName@@"] = name_table
+    return load_result
+
+
+def _lazy_load_state_dict(load_result, config):
+    # NOTE: values are converted to tensors on first access, the way
+    # to convert them is the same as `paddle.load` without lazy
+    name_table = load_result.get("StructuredToParameterName@@", None)
+    if name_table is not None:
+        if not config.keep_name_table:
+            del load_result["StructuredToParameterName@@"]
+
+        def load_func(key, value):
+            if key in name_table and isinstance(value, np.ndarray):
+                value = _ndarray_to_tensor(value, config.return_numpy)
+                if not config.return_numpy and getattr(value, "name", ""):
+                    value.name = name_table[key]
+            return value
+
+    else:
+        from_varbase = _contain_x(load_result, _transformed_from_varbase)
+
+        def load_func(key, value):
+            return _parse_load_result(
+                value, config.return_numpy, from_varbase=from_varbase
+            )
+
+    return _LazyStateDict(load_result, load_func)
+
+
 def _lod_tensor2varbase(tensor):
     return_var = _create_tensor()
     return_var.value().get_tensor().set(tensor, _current_expected_place())
@@ -498,7 +557,7 @@ def _parse_every_object(obj, condition_func, convert_func):
         return obj
 
 
-def _parse_load_result(obj, return_numpy):
+def _parse_load_result(obj, return_numpy, from_varbase=None):
     def is_layer(obj):
         return isinstance(obj, paddle.nn.Layer)
 
@@ -521,9 +580,12 @@ def _parse_load_result(obj, return_numpy):
     def ndarray_to_tensor(obj):
         return _ndarray_to_tensor(obj, return_numpy=return_numpy)
 
+    if from_varbase is None:
+        from_varbase = _contain_x(obj, _transformed_from_varbase)
+
     # tuple(name, ndarry) was converted from varbase of paddle2.1,
     # and all tuple(name, ndarry) are converted to tensor.
-    if _contain_x(obj, _transformed_from_varbase):
+    if from_varbase:
         return _parse_every_object(
             obj, _transformed_from_varbase, tuple_to_tensor
         )
@@ -669,6 +731,10 @@ def save(obj, path, protocol=4, **configs):
           use_binary_format(bool): When the saved object is static graph variable, you can specify ``use_binary_for_var``.
           If True, save the file in the c++ binary format when saving a single static graph variable; otherwise, save it in pickle format.
           Default: False
+          use_chunked_format(bool): If True, save the file in chunked format, tensors are saved as aligned raw data blobs
+          written by multiple threads instead of being pickled, which is faster for large checkpoints and can be loaded
+          with ``mmap=True`` by ``paddle.load`` . Only supports saving to file path. Default: False
+          num_threads(int): The number of threads to write tensors when ``use_chunked_format`` is True. Default: 8
 
     Returns:
         None
@@ -802,8 +868,19 @@ def save(obj, path, protocol=4, **configs):
             )
         )
 
+    if not isinstance(config.use_chunked_format, bool):
+        raise TypeError(
+            "Type of `use_chunked_format` should be bool, but received {}.".format(
+                type(config.use_chunked_format)
+            )
+        )
+
     if config.use_binary_format:
         _save_binary_var(obj, path)
+    elif config.use_chunked_format:
+        if config.pickle_protocol is not None:
+            protocol = config.pickle_protocol
+        _save_chunked(obj, path, protocol, config.num_threads)
     else:
         # `protocol` need to be used, `pickle_protocol` is a deprecated arg.
         if config.pickle_protocol is not None:
@@ -927,6 +1004,15 @@ def load(path, **configs):
             by default.
             (3) return_numpy(bool): If specified as True, return tensor as numpy.ndarray, otherwise return tensor as paddle.Tensor.
             Default False.
+            (4) mmap(bool): Only used for the file saved with ``use_chunked_format=True`` . If True, the file is memory-mapped,
+            only data of tensors used is read from disk, and tensors on CPU share memory with the file in copy-on-write mode.
+            Default False.
+            (5) keys(list|tuple|set|callable): Only used for loading state dict. Keys of the state dict to load, or a function
+            which takes the key and returns whether to load it. Default None, which means loading all keys.
+            (6) prefix(str|tuple): Only used for loading state dict. Only load the keys start with the prefix. Default None.
+            (7) lazy(bool): Only used for loading state dict. If True, return a read-only mapping whose values are converted
+            to tensors on first access. For the file saved with ``use_chunked_format=True`` , only the header of the file is
+            read here and data of each tensor is read on first access. Default False.
 
     Returns:
         Object(Object): a target object can be used in paddle
@@ -1045,8 +1131,37 @@ def load(path, **configs):
             >>> # load state_dict
             >>> dict_load = paddle.load(byio)
 
+        .. code-block:: python
+            :name: code-example-6
+
+            >>> # example 6: load part of state_dict
+            >>> import paddle
+
+            >>> layer = paddle.nn.Sequential(
+            ...     paddle.nn.Linear(3, 4), paddle.nn.Linear(4, 5))
+            >>> path = 'example/model.pdparams'
+            >>> paddle.save(layer.state_dict(), path, use_chunked_format=True)
+            >>> # only load parameters of the first Linear
+            >>> state_dict = paddle.load(path, prefix='0.')
+            >>> print(list(state_dict.keys()))
+            ['0.weight', '0.bias']
+            >>> # load parameters on first access
+            >>> state_dict = paddle.load(path, lazy=True)
+            >>> weight = state_dict['1.weight']
+
     '''
 
+    if _is_chunked_file(path):
+        config = _parse_load_config(configs)
+        return _load_chunked(
+            path,
+            return_numpy=config.return_numpy,
+            mmap=config.mmap,
+            keys=config.keys,
+            prefix=config.prefix,
+            lazy=config.lazy,
+        )
+
     if _is_memory_buffer(path) or os.path.isfile(path):
         config = _parse_load_config(configs)
         exception_type = pickle.UnpicklingError
@@ -1065,12 +1180,16 @@ def load(path, **configs):
                 # TODO(weixin):If `obj` is any object, the judgment condition should be more precise.
                 if isinstance(load_result, dict):
                     load_result = _pack_loaded_dict(load_result)
+                load_result = _select_loaded_state_dict(load_result, config)
+                if isinstance(load_result, dict):
+                    if config.lazy:
+                        return _lazy_load_state_dict(load_result, config)
                     # paddle2.0: paddle.save/load
                     if "StructuredToParameterName@@" in load_result:
                         for key, name in load_result[
                             "StructuredToParameterName@@"
                         ].items():
-                            if isinstance(load_result[key], np.ndarray):
+                            if isinstance(load_result.get(key), np.ndarray):
                                 load_result[key] = _ndarray_to_tensor(
                                     load_result[key], config.return_numpy
                                 )
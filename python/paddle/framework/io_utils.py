@@ -17,6 +17,7 @@ import math
 import os
 import pickle
 import sys
+from collections.abc import Mapping
 from io import BytesIO
 
 import numpy as np
@@ -271,3 +272,104 @@ def _unpack_saved_dict(saved_obj, protocol):
                     saved_obj[part] = temp_saved_obj[part]
         saved_obj['UnpackBigParamInfor@@'] = unpack_infor
     return saved_obj
+
+
+def _filter_state_dict(state_dict, keys=None, prefix=None):
+    """
+    Select items of state dict whose key is in :attr:`keys` and starts
+    with :attr:`prefix`, the type and order of state dict are kept.
+
+    Args:
+        state_dict(dict): the state dict to filter.
+        keys(list|tuple|set|callable, optional): keys to select, or a
+            function which takes the key and returns whether to select it.
+        prefix(str|tuple, optional): prefix of keys to select.
+
+    Returns:
+        dict: the selected state dict.
+    """
+    if keys is None and prefix is None:
+        return state_dict
+    if keys is not None and not callable(keys):
+        if not isinstance(keys, (list, tuple, set)):
+            raise TypeError(
+                "The `keys` of `paddle.load` should be list, tuple, set or "
+                f"callable, but received {type(keys)}."
+            )
+        keys = set(keys)
+    if prefix is not None and not isinstance(prefix, (str, tuple)):
+        raise TypeError(
+            "The `prefix` of `paddle.load` should be str or tuple, but "
+            f"received {type(prefix)}."
+        )
+
+    def selected(key):
+        if keys is not None:
+            if callable(keys):
+                if not keys(key):
+                    return False
+            elif key not in keys:
+                return False
+        if prefix is not None:
+            return isinstance(key, str) and key.startswith(prefix)
+        return True
+
+    filtered = type(state_dict)()
+    for key, value in state_dict.items():
+        if selected(key):
+            filtered[key] = value
+    return filtered
+
+
+class _LazyStateDict(Mapping):
+    """
+    A read-only state dict whose values are loaded on first access,
+    returned by ``paddle.load(path, lazy=True)`` .
+
+    Args:
+        raw_state_dict(dict): key to the raw value read from file.
+        load_func(callable): a function which takes the key and the raw
+            value, and returns the loaded value.
+    """
+
+    def __init__(self, raw_state_dict, load_func):
+        self._raw_state_dict = raw_state_dict
+        self._load_func = load_func
+        self._loaded = {}
+
+    def __getitem__(self, key):
+        if key not in self._loaded:
+            raw = self._raw_state_dict[key]
+            self._loaded[key] = self._load_func(key, raw)
+            # NOTE: release the raw value to avoid keeping two copies
+            self._raw_state_dict[key] = None
+        return self._loaded[key]
+
+    def __iter__(self):
+        return iter(self._raw_state_dict)
+
+    def __len__(self):
+        return len(self._raw_state_dict)
+
+    def __contains__(self, key):
+        return key in self._raw_state_dict
+
+    def is_loaded(self, key):
+        """
+        Whether the value of key has been loaded.
+        """
+        return key in self._loaded
+
+    def materialize(self):
+        """
+        Load all values and return them as a normal state dict.
+        """
+        state_dict = type(self._raw_state_dict)()
+        for key in self._raw_state_dict:
+            state_dict[key] = self[key]
+        return state_dict
+
+    def __repr__(self):
+        return "{}(keys={}, loaded={})".format(
+            self.__class__.__name__, list(self.keys()), len(self._loaded)
+        )
@@ -40,10 +40,17 @@ def set_config(config=None):
 
     - enable(bool): Whether to enable layout tuning.
 
-    3. dataloader: When it is enabled, the best num_workers will be selected to replace
-    the origin dataloader setting. Tuning parameters are as follows:
+    3. dataloader: When it is enabled, the best num_workers, prefetch_factor, pin memory,
+    batch transport and collate threads will be selected to replace the origin dataloader
+    setting. The selected setting is saved by dataset signature and reused by following
+    runs, and is adapted between epochs if the throughput of dataloader drops during
+    training. Tuning parameters are as follows:
 
     - enable(bool): Whether to enable dataloader tuning.
+    - tuning_steps(int): Number of batches to evaluate each setting. Default: 500.
+    - cache_path(str): Path of the json file to save selected settings. Default: the
+      environment variable PADDLE_DATALOADER_AUTOTUNE_CACHE, or
+      ~/.cache/paddle/dataloader_autotune.json if not set.
 
     Args:
         config (dict|str|None, optional): Configuration for auto-tuning. If it is a
@@ -145,14 +152,29 @@ def set_config(config=None):
                     "The auto-tuning configuration of the dataloader is incorrect."
                     "The `enable` should be bool. Use default parameter instead."
                 )
+        cache_path = None
+        if "cache_path" in dataloader_config:
+            if isinstance(dataloader_config['cache_path'], str):
+                cache_path = dataloader_config['cache_path']
+            else:
+                warnings.warn(
+                    "The auto-tuning configuration of the dataloader is incorrect."
+                    "The `cache_path` should be str. Use default parameter instead."
+                )
+        tuning_steps = None
         if "tuning_steps" in dataloader_config:
             if isinstance(dataloader_config['tuning_steps'], int):
-                paddle.io.reader.set_autotune_config(
-                    use_autoune, dataloader_config['tuning_steps']
-                )
+                tuning_steps = dataloader_config['tuning_steps']
             else:
                 warnings.warn(
                     "The auto-tuning configuration of the dataloader is incorrect."
                     "The `tuning_steps` should be int. Use default parameter instead."
                 )
-                paddle.io.reader.set_autotune_config(use_autoune)
+        if tuning_steps is not None:
+            paddle.io.reader.set_autotune_config(
+                use_autoune, tuning_steps, cache_path=cache_path
+            )
+        else:
+            paddle.io.reader.set_autotune_config(
+                use_autoune, cache_path=cache_path
+            )
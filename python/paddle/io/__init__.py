@@ -19,9 +19,13 @@ from .dataloader import (
     ChainDataset,
     ComposeDataset,
     Dataset,
+    DefaultCollator,
     DistributedBatchSampler,
     IterableDataset,
     RandomSampler,
+    RecordDataset,
+    RecordFileWriter,
+    RecordIterableDataset,
     Sampler,
     SequenceSampler,
     Subset,
@@ -48,4 +52,8 @@ __all__ = [
     'WeightedRandomSampler',
     'random_split',
     'Subset',
+    'DefaultCollator',
+    'RecordFileWriter',
+    'RecordDataset',
+    'RecordIterableDataset',
 ]
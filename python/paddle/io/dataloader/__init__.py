@@ -25,6 +25,12 @@ from .batch_sampler import DistributedBatchSampler
 
 from .worker import get_worker_info
 
+from .collate import DefaultCollator
+
+from .record_dataset import RecordFileWriter
+from .record_dataset import RecordDataset
+from .record_dataset import RecordIterableDataset
+
 from .sampler import Sampler
 from .sampler import SequenceSampler
 from .sampler import RandomSampler
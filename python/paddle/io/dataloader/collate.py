@@ -13,7 +13,9 @@
 # limitations under the License.
 
 import numbers
+import os
 from collections.abc import Mapping, Sequence
+from concurrent.futures import ThreadPoolExecutor
 
 import numpy as np
 
@@ -109,3 +111,350 @@ def default_convert_fn(batch):
         return [default_convert_fn(d) for d in batch]
     else:
         return batch
+
+
+# leaf kinds of sample schema in DefaultCollator
+_LEAF_ARRAY = 0
+_LEAF_TENSOR = 1
+_LEAF_NUMBER = 2
+_LEAF_STRING = 3
+
+
+class _Leaf:
+    __slots__ = ['kind', 'name', 'shape', 'dtype', 'pad_value']
+
+    def __init__(self, kind, name, shape=None, dtype=None, pad_value=None):
+        self.kind = kind
+        self.name = name
+        self.shape = shape
+        self.dtype = dtype
+        self.pad_value = pad_value
+
+
+class _UnsupportedSchema(Exception):
+    pass
+
+
+class DefaultCollator:
+    """
+    Batch collating callable for :code:`paddle.io.DataLoader`, which
+    produces the same outputs as :code:`default_collate_fn` but works out
+    the data structure of samples (the batch schema) only once and reuses
+    it for following batches.
+
+    For each batch, every sample is flattened into its fields by the
+    schema in one pass, and each numpy array field is written into a
+    preallocated contiguous output buffer in place instead of stacking
+    fields recursively. Variable-length numpy array fields can be padded
+    to the maximum shape in the batch by setting :attr:`pad_fields`.
+
+    If a batch does not match the schema (e.g. fields changed, shape or
+    dtype of a field changed), the batch will be collated by
+    :code:`default_collate_fn` and the schema is rebuilt from this batch.
+
+    Args:
+        pad_fields(bool|list|dict, optional): fields to pad if shapes of
+            the field are different among samples in a batch. Fields are
+            named by its dict key, or index in list/tuple samples. If True,
+            all numpy array fields are padded with :attr:`pad_value`. If
+            list, fields named in the list are padded with :attr:`pad_value`.
+            If dict, maps field name to its pad value. Default None, which
+            means no padding.
+        pad_value(int|float, optional): value to pad fields, used when
+            :attr:`pad_fields` is True or a list. Default 0.
+        num_threads(int, optional): number of threads to collate numpy
+            array fields of a batch in parallel, which speeds up batches
+            with several large fields since copying arrays releases GIL.
+            Default 1, which collates fields in calling thread.
+
+    Returns:
+        DefaultCollator: a callable to be set as :attr:`collate_fn` of
+        :code:`paddle.io.DataLoader`.
+
+    Examples:
+
+        .. code-block:: python
+
+            >>> import numpy as np
+            >>> from paddle.io import DataLoader, Dataset, DefaultCollator
+
+            >>> class SentenceDataset(Dataset):
+            ...     def __getitem__(self, idx):
+            ...         ids = np.arange(idx % 5 + 1).astype('int64')
+            ...         return {'input_ids': ids, 'label': idx % 2}
+            ...
+            ...     def __len__(self):
+            ...         return 16
+            ...
+            >>> loader = DataLoader(
+            ...     SentenceDataset(),
+            ...     batch_size=4,
+            ...     collate_fn=DefaultCollator(pad_fields={'input_ids': 0}),
+            ... )
+            >>> for data in loader:
+            ...     print(data['input_ids'].shape)
+            [4, 4]
+            [4, 5]
+            [4, 5]
+            [4, 5]
+    """
+
+    def __init__(self, pad_fields=None, pad_value=0, num_threads=1):
+        if pad_fields is None or pad_fields is False:
+            pad_fields = {}
+        elif isinstance(pad_fields, (list, tuple, set)):
+            pad_fields = {name: pad_value for name in pad_fields}
+        elif not (pad_fields is True or isinstance(pad_fields, Mapping)):
+            raise TypeError(
+                "pad_fields should be bool, list or dict, "
+                f"but got {type(pad_fields)}"
+            )
+        if not isinstance(num_threads, int) or num_threads < 1:
+            raise ValueError(
+                f"num_threads should be a positive int, but got {num_threads}"
+            )
+        self._pad_fields = pad_fields
+        self._pad_value = pad_value
+        self._schema = None
+        self.num_threads = num_threads
+        self._executor = None
+        self._executor_threads = 0
+        self._executor_pid = None
+
+    def _field_pad_value(self, name):
+        if self._pad_fields is True:
+            return self._pad_value
+        return self._pad_fields.get(name, None)
+
+    def _compile(self, sample, name, leaves):
+        """
+        Compile sample structure into a flatten function, which appends
+        fields of a sample into a list, and a restore function, which
+        rebuilds collated outputs into the sample structure.
+        """
+        if isinstance(sample, np.ndarray):
+            leaves.append(
+                _Leaf(
+                    _LEAF_ARRAY,
+                    name,
+                    sample.shape,
+                    sample.dtype,
+                    self._field_pad_value(name),
+                )
+            )
+            return None, None
+        elif isinstance(sample, (paddle.Tensor, core.eager.Tensor)):
+            leaves.append(_Leaf(_LEAF_TENSOR, name))
+            return None, None
+        elif isinstance(sample, numbers.Number):
+            leaves.append(_Leaf(_LEAF_NUMBER, name))
+            return None, None
+        elif isinstance(sample, (str, bytes)):
+            leaves.append(_Leaf(_LEAF_STRING, name))
+            return None, None
+        elif isinstance(sample, Mapping):
+            keys = list(sample.keys())
+            children = [self._compile(sample[k], k, leaves) for k in keys]
+            return (
+                self._compile_mapping_flatten(keys, children),
+                self._compile_mapping_restore(keys, children),
+            )
+        elif isinstance(sample, Sequence):
+            children = [
+                self._compile(field, i, leaves)
+                for i, field in enumerate(sample)
+            ]
+            return (
+                self._compile_sequence_flatten(children),
+                self._compile_sequence_restore(children),
+            )
+        raise _UnsupportedSchema()
+
+    @staticmethod
+    def _compile_mapping_flatten(keys, children):
+        items = [(k, child[0]) for k, child in zip(keys, children)]
+        keys_num = len(keys)
+
+        def flatten(sample, fields):
+            # a sample with missing keys raises KeyError below, one with
+            # extra keys does not match the schema either
+            if not isinstance(sample, Mapping) or len(sample) != keys_num:
+                raise _UnsupportedSchema()
+            for k, child in items:
+                if child is None:
+                    fields.append(sample[k])
+                else:
+                    child(sample[k], fields)
+
+        return flatten
+
+    @staticmethod
+    def _compile_mapping_restore(keys, children):
+        items = [(k, child[1]) for k, child in zip(keys, children)]
+
+        def restore(outputs):
+            return {
+                k: next(outputs) if child is None else child(outputs)
+                for k, child in items
+            }
+
+        return restore
+
+    @staticmethod
+    def _compile_sequence_flatten(children):
+        flattens = [child[0] for child in children]
+        fields_num = len(children)
+
+        def flatten(sample, fields):
+            if not isinstance(sample, Sequence) or len(sample) != fields_num:
+                raise _UnsupportedSchema()
+            for field, child in zip(sample, flattens):
+                if child is None:
+                    fields.append(field)
+                else:
+                    child(field, fields)
+
+        return flatten
+
+    @staticmethod
+    def _compile_sequence_restore(children):
+        restores = [child[1] for child in children]
+
+        def restore(outputs):
+            return [
+                next(outputs) if child is None else child(outputs)
+                for child in restores
+            ]
+
+        return restore
+
+    def _build_schema(self, sample):
+        leaves = []
+        try:
+            flatten, restore = self._compile(sample, None, leaves)
+        except _UnsupportedSchema:
+            return None
+        if flatten is None:
+            # sample only contains single field
+            def flatten(sample, fields):
+                fields.append(sample)
+
+            def restore(outputs):
+                return next(outputs)
+
+        return flatten, restore, leaves
+
+    def _collate_array(self, leaf, fields):
+        shape, dtype = leaf.shape, leaf.dtype
+        out = np.empty((len(fields),) + shape, dtype=dtype)
+        for i, field in enumerate(fields):
+            if (
+                type(field) is not np.ndarray
+                or field.shape != shape
+                or field.dtype != dtype
+            ):
+                return self._collate_mismatch_array(leaf, fields)
+            out[i] = field
+        return out
+
+    def _collate_mismatch_array(self, leaf, fields):
+        if leaf.pad_value is None or not all(
+            isinstance(f, np.ndarray) and f.ndim == len(leaf.shape)
+            for f in fields
+        ):
+            # same result and errors as default_collate_fn
+            return np.stack(fields, axis=0)
+        return _pad_stack(fields, leaf.pad_value)
+
+    def _get_executor(self):
+        if self._executor is not None and self._executor_pid != os.getpid():
+            # inherited by a forked worker process without its threads
+            self._executor = None
+        # num_threads may be changed by DataLoader autotune
+        if self._executor is None or self._executor_threads != self.num_threads:
+            self._shutdown_executor()
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.num_threads,
+                thread_name_prefix="DefaultCollator",
+            )
+            self._executor_threads = self.num_threads
+            self._executor_pid = os.getpid()
+        return self._executor
+
+    def _shutdown_executor(self):
+        # called when the DataLoader iterator or worker is torn down, the
+        # executor is rebuilt on the next parallel collating
+        if self._executor is not None and self._executor_pid == os.getpid():
+            self._executor.shutdown(wait=False)
+        self._executor = None
+
+    def _collate(self, schema, batch):
+        flatten, restore, leaves = schema
+        fields = []
+        for sample in batch:
+            flatten(sample, fields)
+        num_leaves = len(leaves)
+        outputs = [None] * num_leaves
+        futures = {}
+        num_arrays = sum(leaf.kind == _LEAF_ARRAY for leaf in leaves)
+        executor = None
+        if self.num_threads > 1 and num_arrays > 1:
+            executor = self._get_executor()
+        for i, leaf in enumerate(leaves):
+            leaf_fields = fields[i::num_leaves]
+            if leaf.kind == _LEAF_ARRAY:
+                if executor is not None:
+                    futures[i] = executor.submit(
+                        self._collate_array, leaf, leaf_fields
+                    )
+                else:
+                    outputs[i] = self._collate_array(leaf, leaf_fields)
+            elif leaf.kind == _LEAF_TENSOR:
+                outputs[i] = paddle.stack(leaf_fields, axis=0)
+            elif leaf.kind == _LEAF_NUMBER:
+                outputs[i] = np.array(leaf_fields)
+            else:
+                outputs[i] = leaf_fields
+        for i, future in futures.items():
+            outputs[i] = future.result()
+        return restore(iter(outputs))
+
+    def __call__(self, batch):
+        if self._schema is None:
+            self._schema = self._build_schema(batch[0])
+        if self._schema is not None:
+            try:
+                return self._collate(self._schema, batch)
+            except (_UnsupportedSchema, KeyError, TypeError):
+                pass
+        # batch not match schema, rebuild schema with this batch
+        self._schema = None
+        return default_collate_fn(batch)
+
+    def __getstate__(self):
+        # compiled schema contains closures and thread pool cannot be
+        # pickled, both will be rebuilt in subprocess
+        state = self.__dict__.copy()
+        state['_schema'] = None
+        state['_executor'] = None
+        state['_executor_pid'] = None
+        return state
+
+
+def _pad_stack(fields, pad_value):
+    """
+    Stack numpy arrays with the same ndim and dtype but different shapes
+    into one buffer padded to the max shape with pad_value.
+    """
+    shapes = np.array([f.shape for f in fields], dtype=np.int64)
+    max_shape = tuple(shapes.max(axis=0).tolist())
+    dtype = np.result_type(*fields)
+    out = np.full((len(fields),) + max_shape, pad_value, dtype=dtype)
+    if (shapes[:, 1:] == shapes[0, 1:]).all():
+        # fast path: only the first dim is variable, e.g. sequences
+        for i, field in enumerate(fields):
+            out[i, : field.shape[0]] = field
+    else:
+        for i, field in enumerate(fields):
+            out[i][tuple(slice(0, d) for d in field.shape)] = field
+    return out
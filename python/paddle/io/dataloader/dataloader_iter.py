@@ -12,6 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import copy
 import itertools
 import logging
 import os
@@ -35,12 +36,26 @@ from ..multiprocess_utils import (
     CleanupFuncRegistrar,
     _set_SIGCHLD_handler,
 )
-from .batch_sampler import _InfiniteIterableSampler
-from .collate import default_collate_fn, default_convert_fn
+from .batch_sampler import (
+    BatchSampler,
+    DistributedBatchSampler,
+    _InfiniteIterableSampler,
+)
+from .collate import DefaultCollator, default_convert_fn
 from .flat import _flatten_batch, _restore_batch
+from .pipeline_stats import (
+    STAGE_PACK,
+    STAGE_QUEUE,
+    _PipelineStats,
+    _stage_event,
+)
+from .sampler import SequenceSampler
+from .shm_slab import BATCH_TRANSPORT_SHARED_SLAB, _SharedSlabPool, _SlabBatch
 from .worker import (
+    _WORKER_METRICS_SIZE,
     _DatasetKind,
     _IterableDatasetStopIteration,
+    _read_worker_metrics,
     _ResumeIteration,
     _worker_loop,
     _WorkerException,
@@ -104,10 +119,11 @@ class _DataLoaderIterBase:
         self._worker_init_fn = loader.worker_init_fn
         self._dataset_kind = loader.dataset_kind
         self._pin_memory = loader.pin_memory
+        self._batch_transport = loader.batch_transport
 
         self._sampler_iter = iter(self._index_sampler)
         if self._auto_collate_batch:
-            self._collate_fn = loader.collate_fn or default_collate_fn
+            self._collate_fn = loader.collate_fn or loader._default_collator
         else:
             self._collate_fn = loader.collate_fn or default_convert_fn
 
@@ -120,6 +136,11 @@ class _DataLoaderIterBase:
         self._thread = None
         self._thread_done_event = threading.Event()
 
+        # per-stage time of data pipeline, kept in loader to read after
+        # iteration finished
+        self._stats = _PipelineStats(self._num_workers)
+        loader._pipeline_stats = self._stats
+
     @property
     def _index_sampler(self):
         if self._auto_collate_batch:
@@ -241,6 +262,7 @@ class _DataLoaderIterSingleProcess(_DataLoaderIterBase):
 
             if batch is None or self._thread_done_event.is_set():
                 break
+            self._stats.on_fetch(self._dataset_fetcher)
 
             # flat batch and record structure infos
             batch, structure = _flatten_batch(batch)
@@ -251,16 +273,19 @@ class _DataLoaderIterSingleProcess(_DataLoaderIterBase):
 
             try:
                 # pack as LoDTensorArray
-                array = core.LoDTensorArray()
-                for slot in batch:
-                    if isinstance(slot, (paddle.Tensor, core.eager.Tensor)):
-                        slot = slot.value().get_tensor()
-                    elif not isinstance(slot, core.LoDTensor):
-                        tmp = core.LoDTensor()
-                        tmp.set(slot, core.CPUPlace())
-                        slot = tmp
-
-                    array.append(slot)
+                start = time.time()
+                with _stage_event(STAGE_PACK):
+                    array = core.LoDTensorArray()
+                    for slot in batch:
+                        if isinstance(slot, (paddle.Tensor, core.eager.Tensor)):
+                            slot = slot.value().get_tensor()
+                        elif not isinstance(slot, core.LoDTensor):
+                            tmp = core.LoDTensor()
+                            tmp.set(slot, core.CPUPlace())
+                            slot = tmp
+
+                        array.append(slot)
+                self._stats.add(STAGE_PACK, time.time() - start)
 
                 if self._thread_done_event.is_set():
                     break
@@ -286,6 +311,7 @@ class _DataLoaderIterSingleProcess(_DataLoaderIterBase):
         try:
             benchmark().check_if_need_record(self)
             benchmark().before_reader()
+            start = time.time()
             if in_dynamic_mode():
                 data = core.eager.read_next_tensor_list(
                     self._reader.read_next_list()[0]
@@ -309,6 +335,7 @@ class _DataLoaderIterSingleProcess(_DataLoaderIterBase):
                         data = data[0]
                 else:
                     data = self._reader.read_next()
+            self._stats.on_consume(start)
             benchmark().after_reader()
 
             return data
@@ -348,6 +375,8 @@ class _DataLoaderIterSingleProcess(_DataLoaderIterBase):
                 # blocking queue read may hang and _thread_done_event
                 # cannot be checked
                 self._shutdown_thread()
+                if isinstance(self._collate_fn, DefaultCollator):
+                    self._collate_fn._shutdown_executor()
             finally:
                 self._shutdown = True
 
@@ -355,6 +384,18 @@ class _DataLoaderIterSingleProcess(_DataLoaderIterBase):
         self._try_shutdown_all()
 
 
+def _is_deterministic_sampler(sampler):
+    # samplers whose batches only depend on their attributes, unlike
+    # RandomSampler which draws from a random generator. Subclasses may
+    # sample in other ways, so types are matched exactly
+    if type(sampler) in (DistributedBatchSampler, list):
+        return True
+    return (
+        type(sampler) is BatchSampler
+        and type(sampler.sampler) is SequenceSampler
+    )
+
+
 class _DataLoaderIterMultiProcess(_DataLoaderIterBase):
     def __init__(self, loader):
         super().__init__(loader)
@@ -362,6 +403,25 @@ class _DataLoaderIterMultiProcess(_DataLoaderIterBase):
         self._persistent_workers = loader._persistent_workers
         self._resume_worker_cnt = 0
 
+        # NOTE: with persistent workers, batch indices of next epoch are
+        # dispatched to workers once the sampler of current epoch is
+        # exhausted, so that workers prefetch the first batches of next
+        # epoch in the tail of current epoch. Batches from _epoch_end_idx
+        # are held by _thread until the next epoch starts. Only supported
+        # for map-style dataset, since workers of iterable dataset should
+        # be resumed before next epoch, and for samplers which sample the
+        # same batches again if their state is not changed, see
+        # _is_deterministic_sampler.
+        self._prefetch_next_epoch = (
+            self._persistent_workers
+            and self._dataset_kind == _DatasetKind.MAP
+            and _is_deterministic_sampler(self._index_sampler)
+        )
+        self._epoch_end_idx = None
+        self._next_epoch_batches = 0
+        self._next_epoch_indices = []
+        self._next_epoch_event = threading.Event()
+
         assert self._num_workers > 0, (
             "Multi-process DataLoader "
             f"invalid num_workers({self._num_workers})"
@@ -378,6 +438,8 @@ class _DataLoaderIterMultiProcess(_DataLoaderIterBase):
         self._batches_outstanding = 0
         self._task_infos = {}
         self._structure_infos = []
+        # slab id dispatched with batch indices in shared slab transport
+        self._slab_infos = {}
 
         # indices outstand as _outstanding_capacity at first, and
         # blocking_queue capacity is also _outstanding_capacity.
@@ -417,8 +479,17 @@ class _DataLoaderIterMultiProcess(_DataLoaderIterBase):
             (self._worker_shm_buffer_size) * 2 * self._num_workers
         )
 
+        # NOTE: slabs are leased by batches in workers, blocking_queue and
+        # batches held by user, if no free slab, batch will be transported
+        # by queue, so slab number only influences performance
+        self._slab_pool = None
+        if self._batch_transport == BATCH_TRANSPORT_SHARED_SLAB:
+            self._slab_pool = _SharedSlabPool(2 * self._outstanding_capacity)
+
         # init workers and indices queues and put 2 indices in each indices queue
         self._init_workers()
+        # keep worker metrics in loader to read after iteration finished
+        loader._worker_metrics = (self._worker_metrics, self._num_workers)
         for _ in range(self._outstanding_capacity):
             self._try_put_indices()
 
@@ -434,6 +505,12 @@ class _DataLoaderIterMultiProcess(_DataLoaderIterBase):
         self._indices_queues = []
         self._workers_idx_cycle = itertools.cycle(range(self._num_workers))
 
+        # idle time, busy time and batch number of each worker, see
+        # _WorkerMetrics
+        self._worker_metrics = multiprocessing.Array(
+            'd', _WORKER_METRICS_SIZE * self._num_workers, lock=False
+        )
+
         # create data_queue for workers
         self._data_queue = multiprocessing.Queue()
 
@@ -463,6 +540,8 @@ class _DataLoaderIterMultiProcess(_DataLoaderIterBase):
                     self._use_shared_memory,
                     self._base_seed,
                     self._worker_shm_buffer_size,
+                    self._batch_transport,
+                    self._worker_metrics,
                 ),
             )
             worker.daemon = True
@@ -517,18 +596,74 @@ class _DataLoaderIterMultiProcess(_DataLoaderIterBase):
         self._thread.daemon = True
         self._thread.start()
 
+    def _prefetched_sampler_matches(self):
+        # next epoch is prefetched from a copy of sampler, so the sampler
+        # is not changed by prefetching. The prefetched batches are valid
+        # if the sampler samples them again now, e.g. set_epoch of
+        # DistributedBatchSampler may be called after prefetching, which
+        # is checked on another copy of sampler
+        sampler_iter = iter(copy.copy(self._index_sampler))
+        for indices in self._next_epoch_indices:
+            if next(sampler_iter, None) != indices:
+                return False
+        # advance the sampler past the prefetched batches as if they were
+        # sampled from it
+        self._sampler_iter = iter(self._index_sampler)
+        for _ in self._next_epoch_indices:
+            next(self._sampler_iter)
+        return True
+
+    def _start_prefetched_epoch(self):
+        with self._thread_lock:
+            if self._epoch_end_idx is None:
+                return False
+            # batches of current epoch are not all consumed
+            if self._batches_outstanding > self._next_epoch_batches:
+                return False
+            if not self._prefetched_sampler_matches():
+                return False
+            self._epoch_end_idx = None
+            self._next_epoch_batches = 0
+            self._next_epoch_indices = []
+            self._next_epoch_event.set()
+        while self._batches_outstanding < self._outstanding_capacity:
+            send_idx = self._send_idx
+            self._try_put_indices()
+            if send_idx == self._send_idx:
+                break
+        return True
+
+    def _wait_next_epoch(self):
+        while (
+            self._epoch_end_idx is not None
+            and self._rcvd_idx >= self._epoch_end_idx
+            and not self._thread_done_event.is_set()
+        ):
+            self._next_epoch_event.wait(MP_STATUS_CHECK_INTERVAL)
+
     def _reset(self):
+        # start next epoch with batches prefetched directly if current
+        # epoch is finished and sampler is not changed
+        if self._start_prefetched_epoch():
+            return
+
         # resume iteration in following steps
         # 1. Resume workers, clear worker caches
         # put _ResumeIteration to all worker as resume iteration flag
         with self._thread_lock:
+            # prefetched batches of next epoch are discarded, let _thread
+            # receive them
+            self._epoch_end_idx = None
+            self._next_epoch_batches = 0
+            self._next_epoch_indices = []
+            self._next_epoch_event.set()
             self._resume_worker_cnt = self._num_workers
             for worker_id in range(self._num_workers):
                 self._indices_queues[worker_id].put(_ResumeIteration())
                 self._batches_outstanding += 1
         # all flag will be check in _thread_loop, simply wait here
         while self._resume_worker_cnt > 0:
-            time.sleep(0.5)
+            time.sleep(0.01)
 
         # 2. clear blocking_queue caches
         # in order not to restart the thread, we just clear
@@ -550,6 +685,10 @@ class _DataLoaderIterMultiProcess(_DataLoaderIterBase):
         self._batches_outstanding = 0
         self._task_infos = {}
         self._structure_infos = []
+        # slabs of cached batches are not used any more
+        self._slab_infos = {}
+        if self._slab_pool is not None:
+            self._slab_pool.reclaim_dispatched()
 
         # set all worker status available
         self._worker_status = [True] * self._num_workers
@@ -588,6 +727,8 @@ class _DataLoaderIterMultiProcess(_DataLoaderIterBase):
                         q.close()
             finally:
                 core._erase_process_pids(id(self))
+                if self._slab_pool is not None:
+                    self._slab_pool.close()
                 self._shutdown = True
 
     def _thread_loop(self, legacy_expected_place):
@@ -600,7 +741,10 @@ class _DataLoaderIterMultiProcess(_DataLoaderIterBase):
         _set_expected_place(legacy_expected_place)
 
         while not self._thread_done_event.is_set():
-            batch = self._get_data()
+            start = time.time()
+            with _stage_event(STAGE_QUEUE):
+                batch = self._get_data()
+            self._stats.add(STAGE_QUEUE, time.time() - start)
             if not self._thread_done_event.is_set():
                 if batch is None:
                     self._exit_thread_expectedly()
@@ -609,25 +753,12 @@ class _DataLoaderIterMultiProcess(_DataLoaderIterBase):
                         assert self._resume_worker_cnt > 0
                         self._resume_worker_cnt -= 1
                         continue
+                    self._wait_next_epoch()
                     try:
-                        # pack as LoDTensorArray
-                        array = core.LoDTensorArray()
-                        if self._use_shared_memory:
-                            for tensor in batch:
-                                array.append(tensor)
-                        else:
-                            # LoDTensor not in shared memory is not
-                            # serializable, cannot be create in workers
-                            for slot in batch:
-                                if isinstance(
-                                    slot, (paddle.Tensor, core.eager.Tensor)
-                                ):
-                                    slot = slot.value().get_tensor()
-                                elif not isinstance(slot, core.LoDTensor):
-                                    tmp = core.LoDTensor()
-                                    tmp.set(slot, core.CPUPlace())
-                                    slot = tmp
-                                array.append(slot)
+                        start = time.time()
+                        with _stage_event(STAGE_PACK):
+                            array = self._pack_batch(batch)
+                        self._stats.add(STAGE_PACK, time.time() - start)
 
                         if not self._blocking_queue.push(array):
                             self._blocking_queue.close()
@@ -637,6 +768,35 @@ class _DataLoaderIterMultiProcess(_DataLoaderIterBase):
                     finally:
                         self._rcvd_idx += 1
 
+    def _pack_batch(self, batch):
+        if isinstance(batch, _SlabBatch):
+            batch = self._receive_slab_batch(batch)
+        # pack as LoDTensorArray
+        array = core.LoDTensorArray()
+        if self._use_shared_memory:
+            for tensor in batch:
+                array.append(tensor)
+        else:
+            # LoDTensor not in shared memory is not
+            # serializable, cannot be create in workers
+            for slot in batch:
+                if isinstance(slot, (paddle.Tensor, core.eager.Tensor)):
+                    slot = slot.value().get_tensor()
+                elif not isinstance(slot, core.LoDTensor):
+                    tmp = core.LoDTensor()
+                    tmp.set(slot, core.CPUPlace())
+                    slot = tmp
+                array.append(slot)
+        return array
+
+    def _receive_slab_batch(self, slab_batch):
+        self._slab_infos.pop(self._rcvd_idx, None)
+        if slab_batch.fallback is not None:
+            # batch is transported by queue, slab is not used
+            self._slab_pool.release(slab_batch.slab_id, slab_batch.nbytes)
+            return slab_batch.fallback
+        return self._slab_pool.materialize(slab_batch)
+
     def _get_data(self):
         while not self._thread_done_event.is_set():
             # For IterableDataset, batch indices is generated infinitely
@@ -651,6 +811,9 @@ class _DataLoaderIterMultiProcess(_DataLoaderIterBase):
                     if len(info) == 3 or self._worker_status[info[0]]:
                         break
                     del self._task_infos[self._rcvd_idx]
+                    slab_id = self._slab_infos.pop(self._rcvd_idx, None)
+                    if slab_id is not None:
+                        self._slab_pool.release(slab_id)
                     self._rcvd_idx += 1
                     self._batches_outstanding -= 1
                 else:
@@ -776,7 +939,20 @@ class _DataLoaderIterMultiProcess(_DataLoaderIterBase):
             try:
                 indices = next(self._sampler_iter)
             except StopIteration:
-                return
+                if (
+                    not self._prefetch_next_epoch
+                    or self._epoch_end_idx is not None
+                ):
+                    return
+                # start a copy of sampler to prefetch batches of next epoch,
+                # the sampler of user is not changed before next epoch
+                self._epoch_end_idx = self._send_idx
+                self._next_epoch_event.clear()
+                self._sampler_iter = iter(copy.copy(self._index_sampler))
+                try:
+                    indices = next(self._sampler_iter)
+                except StopIteration:
+                    return
 
             for i in range(self._num_workers):
                 worker_idx = next(self._workers_idx_cycle)
@@ -785,10 +961,21 @@ class _DataLoaderIterMultiProcess(_DataLoaderIterBase):
             else:
                 return
 
-            self._indices_queues[worker_idx].put((self._send_idx, indices))
+            slab = None
+            if self._slab_pool is not None:
+                slab = self._slab_pool.acquire()
+                if slab is not None:
+                    self._slab_infos[self._send_idx] = slab[0]
+
+            self._indices_queues[worker_idx].put(
+                (self._send_idx, indices, slab)
+            )
             self._task_infos[self._send_idx] = (worker_idx,)
             self._batches_outstanding += 1
             self._send_idx += 1
+            if self._epoch_end_idx is not None:
+                self._next_epoch_batches += 1
+                self._next_epoch_indices.append(indices)
 
     def __del__(self):
         self._try_shutdown_all()
@@ -813,13 +1000,16 @@ class _DataLoaderIterMultiProcess(_DataLoaderIterBase):
             # no enough data to generate next output, close blocking_queue and
             # set _thread_done_event here, py_reader will raise StopIteration,
             # end workers and indices_queues in StopIteration handling
-            if self._batches_outstanding < len(self._places):
+            if self._batches_outstanding - self._next_epoch_batches < len(
+                self._places
+            ):
                 if self._persistent_workers:
                     raise StopIteration
                 else:
                     self._thread_done_event.set()
                     self._blocking_queue.close()
 
+            start = time.time()
             if in_dynamic_mode():
                 data = core.eager.read_next_tensor_list(
                     self._reader.read_next_list()[0]
@@ -843,6 +1033,7 @@ class _DataLoaderIterMultiProcess(_DataLoaderIterBase):
                 else:
                     data = self._reader.read_next()
             self._on_output_batch()
+            self._stats.on_consume(start)
             benchmark().after_reader()
             return data
         except StopIteration:
@@ -854,6 +1045,9 @@ class _DataLoaderIterMultiProcess(_DataLoaderIterBase):
             if in_profiler_mode():
                 trace_event.end()
 
+    def worker_metrics(self):
+        return _read_worker_metrics(self._worker_metrics, self._num_workers)
+
     def _on_output_batch(self):
         for _ in range(len(self._places)):
             self._batches_outstanding -= 1
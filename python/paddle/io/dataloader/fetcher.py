@@ -12,6 +12,10 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import time
+
+from .pipeline_stats import STAGE_COLLATE, STAGE_GETITEM, _stage_event
+
 
 class _DatasetFetcher:
     def __init__(self, dataset, auto_collate_batch, collate_fn, drop_last):
@@ -19,6 +23,16 @@ class _DatasetFetcher:
         self.auto_collate_batch = auto_collate_batch
         self.collate_fn = collate_fn
         self.drop_last = drop_last
+        # time cost of reading samples and collating of the latest batch
+        self.getitem_time = 0.0
+        self.collate_time = 0.0
+
+    def _collate(self, data):
+        start = time.time()
+        with _stage_event(STAGE_COLLATE):
+            data = self.collate_fn(data)
+        self.collate_time = time.time() - start
+        return data
 
     # NOTE: fetch function here perform the whole pipeline of dataset
     #       reading and data trasforms of a batch in each calling, this
@@ -41,27 +55,31 @@ class _IterableDatasetFetcher(_DatasetFetcher):
         self.dataset_iter = iter(dataset)
 
     def fetch(self, batch_indices, done_event=None):
-        if self.auto_collate_batch:
-            data = []
-            for _ in batch_indices:
-                if done_event is None or not done_event.is_set():
-                    try:
-                        data.append(next(self.dataset_iter))
-                    except StopIteration:
-                        break
-                else:
-                    return None
-
-            if len(data) == 0 or (
-                self.drop_last and len(data) < len(batch_indices)
-            ):
-                raise StopIteration
-
-        else:
-            data = next(self.dataset_iter)
+        start = time.time()
+        with _stage_event(STAGE_GETITEM):
+            if self.auto_collate_batch:
+                data = []
+                for _ in batch_indices:
+                    if done_event is None or not done_event.is_set():
+                        try:
+                            data.append(next(self.dataset_iter))
+                        except StopIteration:
+                            break
+                    else:
+                        return None
 
+                if len(data) == 0 or (
+                    self.drop_last and len(data) < len(batch_indices)
+                ):
+                    raise StopIteration
+
+            else:
+                data = next(self.dataset_iter)
+        self.getitem_time = time.time() - start
+
+        self.collate_time = 0.0
         if self.collate_fn:
-            data = self.collate_fn(data)
+            data = self._collate(data)
         return data
 
 
@@ -70,17 +88,21 @@ class _MapDatasetFetcher(_DatasetFetcher):
         super().__init__(dataset, auto_collate_batch, collate_fn, drop_last)
 
     def fetch(self, batch_indices, done_event=None):
-        if self.auto_collate_batch:
-            data = []
-            for idx in batch_indices:
-                if done_event is None or not done_event.is_set():
-                    data.append(self.dataset[idx])
-                else:
-                    return None
+        start = time.time()
+        with _stage_event(STAGE_GETITEM):
+            if self.auto_collate_batch:
+                data = []
+                for idx in batch_indices:
+                    if done_event is None or not done_event.is_set():
+                        data.append(self.dataset[idx])
+                    else:
+                        return None
 
-        else:
-            data = self.dataset[batch_indices]
+            else:
+                data = self.dataset[batch_indices]
+        self.getitem_time = time.time() - start
 
+        self.collate_time = 0.0
         if self.collate_fn:
-            data = self.collate_fn(data)
+            data = self._collate(data)
         return data
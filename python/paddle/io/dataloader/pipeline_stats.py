@@ -0,0 +1,151 @@
+# Copyright (c) 2023 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import contextlib
+import time
+
+from paddle import profiler
+from paddle.profiler.utils import in_profiler_mode
+
+# stages of DataLoader pipeline:
+#   getitem: read samples from dataset, in workers or main process
+#   collate: batch samples with collate_fn, in workers or main process
+#   transfer: flatten and put batches into inter-process queue or shared
+#             memory slabs in workers, multi-process mode only
+#   queue: wait for and receive batches from workers in loader thread,
+#          multi-process mode only
+#   pack: pack batches as LoDTensorArray in host memory to feed device
+#         reader in loader thread, copying to device is done by the reader
+#         and not included. Pushing into blocking queue is excluded since
+#         it blocks when blocking queue is full, which is not cost of the
+#         stage
+#   wait: training loop waiting for batches in __next__
+STAGE_GETITEM = 'getitem'
+STAGE_COLLATE = 'collate'
+STAGE_TRANSFER = 'transfer'
+STAGE_QUEUE = 'queue'
+STAGE_PACK = 'pack'
+STAGE_WAIT = 'wait'
+
+_WORKER_STAGES = (STAGE_GETITEM, STAGE_COLLATE, STAGE_TRANSFER)
+# stages which cost time to produce a batch, training loop stall is
+# attributed to these stages. queue is excluded since it is mostly
+# waiting for workers
+_PRODUCER_STAGES = (STAGE_GETITEM, STAGE_COLLATE, STAGE_TRANSFER, STAGE_PACK)
+
+
+def _stage_event(stage):
+    # record stage as user defined event if profiler is on
+    if in_profiler_mode():
+        return profiler.RecordEvent(name=f"DataLoader.{stage}")
+    return contextlib.nullcontext()
+
+
+class _PipelineStats:
+    """
+    Accumulate per-stage time of a DataLoader iterator. Stages in main
+    process are recorded here, stages in worker processes are read from
+    worker metrics, see _WorkerMetrics.
+    """
+
+    def __init__(self, num_workers=0):
+        self._num_workers = num_workers
+        self._times = dict.fromkeys(
+            (STAGE_GETITEM, STAGE_COLLATE, STAGE_QUEUE, STAGE_PACK, STAGE_WAIT),
+            0.0,
+        )
+        # batches loaded in main process and consumed by training loop
+        self._num_loaded = 0
+        self._num_consumed = 0
+        self._first_time = None
+        self._last_time = None
+
+    def add(self, stage, cost):
+        self._times[stage] += cost
+
+    def on_fetch(self, fetcher):
+        self._times[STAGE_GETITEM] += fetcher.getitem_time
+        self._times[STAGE_COLLATE] += fetcher.collate_time
+        self._num_loaded += 1
+
+    def on_consume(self, start):
+        end = time.time()
+        self._times[STAGE_WAIT] += end - start
+        self._num_consumed += 1
+        if self._first_time is None:
+            self._first_time = start
+        self._last_time = end
+
+    def summary(self, worker_metrics=None):
+        """
+        Summarize stage time and attribute the time training loop waiting
+        for batches to producer stages by their effective cost per batch.
+        Cost of worker stages is divided by number of workers since
+        workers load batches in parallel.
+        """
+        totals = dict(self._times)
+        if self._num_workers > 0 and worker_metrics:
+            for stage in _WORKER_STAGES:
+                totals[stage] = sum(m[f'{stage}_time'] for m in worker_metrics)
+            num_loaded = sum(m['num_batches'] for m in worker_metrics)
+            parallelism = self._num_workers
+        else:
+            num_loaded = self._num_loaded
+            parallelism = 1
+            if self._num_workers > 0:
+                totals[STAGE_TRANSFER] = 0.0
+            else:
+                # batches are loaded in loader thread directly
+                totals.pop(STAGE_QUEUE)
+
+        stages = {}
+        for stage, total in totals.items():
+            num = self._num_consumed if stage == STAGE_WAIT else num_loaded
+            avg = total / num if num > 0 else 0.0
+            effective = avg
+            if stage in _WORKER_STAGES:
+                effective = avg / parallelism
+            stages[stage] = {
+                'total_time': total,
+                'avg_time': avg,
+                'effective_time': effective,
+            }
+
+        stall_time = totals[STAGE_WAIT]
+        elapsed_time = 0.0
+        if self._first_time is not None:
+            elapsed_time = self._last_time - self._first_time
+        producers = [s for s in _PRODUCER_STAGES if s in stages]
+        effective_sum = sum(stages[s]['effective_time'] for s in producers)
+        attribution = {}
+        bottleneck = None
+        if effective_sum > 0:
+            for stage in producers:
+                share = stages[stage]['effective_time'] / effective_sum
+                attribution[stage] = stall_time * share
+            bottleneck = max(
+                producers, key=lambda s: stages[s]['effective_time']
+            )
+
+        return {
+            'num_batches': self._num_consumed,
+            'elapsed_time': elapsed_time,
+            'stall_time': stall_time,
+            'stall_ratio': (
+                stall_time / elapsed_time if elapsed_time > 0 else 0.0
+            ),
+            'stages': stages,
+            'stall_attribution': attribution,
+            'bottleneck': bottleneck,
+        }
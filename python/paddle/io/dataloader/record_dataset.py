@@ -0,0 +1,426 @@
+#   Copyright (c) 2023 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# Indexed record file format, each file is a shard of dataset:
+#
+#   | MAGIC | record 0 | ... | record N-1 | offsets | N | index offset | MAGIC |
+#
+# offsets are N + 1 little-endian uint64 offsets of records in the file,
+# N and index offset are little-endian uint64. The index is written at the
+# end of file so that records can be written in streaming, and records
+# can be read by random access in O(1) through the index.
+
+import bisect
+import mmap
+import os
+import pickle
+import struct
+
+import numpy as np
+
+from .dataset import Dataset, IterableDataset
+from .worker import get_worker_info
+
+RECORD_FILE_MAGIC = b'PDRECIO1'
+_FOOTER_FORMAT = '<QQ'
+_FOOTER_SIZE = struct.calcsize(_FOOTER_FORMAT) + len(RECORD_FILE_MAGIC)
+
+
+def _default_serializer(sample):
+    return pickle.dumps(sample, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def _default_deserializer(data):
+    return pickle.loads(data)
+
+
+class RecordFileWriter:
+    """
+    Write samples into an indexed record file, which can be read by
+    :ref:`api_paddle_io_RecordDataset` and
+    :ref:`api_paddle_io_RecordIterableDataset` . Samples are written into
+    a temporary file and it is renamed to :attr:`path` when closed.
+
+    Args:
+        path (str): path of the record file.
+        serializer (callable, optional): function to serialize a sample to
+            bytes. Default None, samples are serialized by pickle.
+
+    Examples:
+
+        .. code-block:: python
+
+            >>> import os
+            >>> import numpy as np
+            >>> from paddle.io import RecordFileWriter
+
+            >>> os.makedirs('records', exist_ok=True)
+            >>> for shard in range(2):
+            ...     with RecordFileWriter(f'records/part-{shard}.rec') as writer:
+            ...         for i in range(10):
+            ...             writer.write((np.full([3], i, 'float32'), i))
+    """
+
+    def __init__(self, path, serializer=None):
+        self._path = path
+        self._tmp_path = path + '.tmp'
+        self._serializer = serializer or _default_serializer
+        dirname = os.path.dirname(path)
+        if dirname:
+            os.makedirs(dirname, exist_ok=True)
+        self._file = open(self._tmp_path, 'wb')
+        self._file.write(RECORD_FILE_MAGIC)
+        self._offsets = [len(RECORD_FILE_MAGIC)]
+
+    def __len__(self):
+        return len(self._offsets) - 1
+
+    def write(self, sample):
+        """
+        Serialize and write a sample.
+        """
+        self.write_bytes(self._serializer(sample))
+
+    def write_bytes(self, data):
+        """
+        Write a serialized record.
+        """
+        if self._file is None:
+            raise RuntimeError(f"RecordFileWriter of {self._path} is closed.")
+        self._file.write(data)
+        self._offsets.append(self._offsets[-1] + len(data))
+
+    def close(self):
+        """
+        Write the index and rename the temporary file to path.
+        """
+        if self._file is None:
+            return
+        index_offset = self._offsets[-1]
+        self._file.write(np.asarray(self._offsets, dtype='<u8').tobytes())
+        self._file.write(
+            struct.pack(_FOOTER_FORMAT, len(self._offsets) - 1, index_offset)
+        )
+        self._file.write(RECORD_FILE_MAGIC)
+        self._file.close()
+        self._file = None
+        os.replace(self._tmp_path, self._path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            # discard the incomplete file
+            self._file.close()
+            self._file = None
+            os.remove(self._tmp_path)
+
+
+def _read_num_records(path):
+    with open(path, 'rb') as f:
+        f.seek(-_FOOTER_SIZE, os.SEEK_END)
+        footer = f.read(_FOOTER_SIZE)
+    if footer[-len(RECORD_FILE_MAGIC) :] != RECORD_FILE_MAGIC:
+        raise ValueError(f"{path} is not a valid record file.")
+    num_records, _ = struct.unpack(
+        _FOOTER_FORMAT, footer[: struct.calcsize(_FOOTER_FORMAT)]
+    )
+    return num_records
+
+
+class _RecordFileReader:
+    """
+    Read records of a record file by memory map, the file is mapped on
+    first read, so that it can be pickled into DataLoader workers before.
+    """
+
+    def __init__(self, path, num_records):
+        self.path = path
+        self.num_records = num_records
+        self._mmap = None
+        self._offsets = None
+
+    def _open(self):
+        with open(self.path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        num_records, index_offset = struct.unpack_from(
+            _FOOTER_FORMAT, self._mmap, len(self._mmap) - _FOOTER_SIZE
+        )
+        self._offsets = np.frombuffer(
+            self._mmap, dtype='<u8', count=num_records + 1, offset=index_offset
+        )
+
+    def read(self, idx):
+        if self._mmap is None:
+            self._open()
+        start, end = int(self._offsets[idx]), int(self._offsets[idx + 1])
+        return memoryview(self._mmap)[start:end]
+
+    def __getstate__(self):
+        return {'path': self.path, 'num_records': self.num_records}
+
+    def __setstate__(self, state):
+        self.__init__(state['path'], state['num_records'])
+
+
+class _RecordFiles:
+    """
+    Records of multiple record files indexed by a global index.
+    """
+
+    def __init__(self, files, deserializer=None):
+        if isinstance(files, str):
+            files = [files]
+        if len(files) == 0:
+            raise ValueError("files of record dataset should not be empty.")
+        self.readers = [
+            _RecordFileReader(f, _read_num_records(f)) for f in files
+        ]
+        # cumulative number of records
+        self.cum_sizes = []
+        total = 0
+        for reader in self.readers:
+            total += reader.num_records
+            self.cum_sizes.append(total)
+        self.deserializer = deserializer or _default_deserializer
+
+    def __len__(self):
+        return self.cum_sizes[-1]
+
+    def __getitem__(self, idx):
+        if idx < 0:
+            idx += len(self)
+        if idx < 0 or idx >= len(self):
+            raise IndexError(
+                f"index {idx} is out of range of {len(self)} records."
+            )
+        shard = bisect.bisect_right(self.cum_sizes, idx)
+        if shard > 0:
+            idx -= self.cum_sizes[shard - 1]
+        return self.deserializer(self.readers[shard].read(idx))
+
+
+class RecordDataset(Dataset):
+    """
+    Map-style dataset of record files written by
+    :ref:`api_paddle_io_RecordFileWriter` . Records are indexed across all
+    files and read by memory map in O(1), so it can be globally shuffled by
+    samplers such as :ref:`api_paddle_io_DistributedBatchSampler` without
+    loading whole dataset into memory.
+
+    Args:
+        files (str|list[str]): record file or list of record files.
+        deserializer (callable, optional): function to deserialize a record
+            to sample. Default None, records are deserialized by pickle.
+
+    Examples:
+
+        .. code-block:: python
+
+            >>> import os
+            >>> import numpy as np
+            >>> from paddle.io import RecordDataset, RecordFileWriter, DistributedBatchSampler
+
+            >>> os.makedirs('records', exist_ok=True)
+            >>> files = [f'records/part-{shard}.rec' for shard in range(2)]
+            >>> for shard, path in enumerate(files):
+            ...     with RecordFileWriter(path) as writer:
+            ...         for i in range(10):
+            ...             writer.write((np.full([3], shard * 10 + i, 'float32'), i))
+            >>> dataset = RecordDataset(files)
+            >>> print(len(dataset))
+            20
+            >>> sampler = DistributedBatchSampler(dataset, batch_size=4, shuffle=True)
+    """
+
+    def __init__(self, files, deserializer=None):
+        self._records = _RecordFiles(files, deserializer)
+
+    def __getitem__(self, idx):
+        return self._records[idx]
+
+    def __len__(self):
+        return len(self._records)
+
+
+class RecordIterableDataset(IterableDataset):
+    """
+    Iterable dataset of record files written by
+    :ref:`api_paddle_io_RecordFileWriter` , records are split into ranks
+    and DataLoader workers automatically, and the iteration can be resumed
+    from the middle of an epoch.
+
+    In each epoch, records of all files are ordered (or shuffled by
+    :attr:`seed` and epoch if :attr:`shuffle` is True), padded to be evenly
+    divisible by the number of ranks, and the record at position ``p`` is
+    assigned to rank ``p % num_replicas`` . In each rank, records are
+    split into blocks of :attr:`batch_size` , and the block ``k`` is read by
+    the worker ``k % num_workers`` , which matches the order DataLoader
+    gets batches from workers.
+
+    Args:
+        files (str|list[str]): record file or list of record files.
+        shuffle (bool, optional): whether to shuffle records in each epoch.
+            Default False.
+        seed (int, optional): random seed to shuffle records, should be
+            same in all ranks. Default 0.
+        batch_size (int, optional): number of records read by a worker
+            continuously, should be the batch size of DataLoader to
+            resume exactly with multiple workers. Default 1.
+        num_replicas (int, optional): number of ranks. Default None, the
+            number of ranks in current distributed environment.
+        rank (int, optional): rank of current process. Default None, the
+            rank in current distributed environment.
+        deserializer (callable, optional): function to deserialize a record
+            to sample. Default None, records are deserialized by pickle.
+
+    Examples:
+
+        .. code-block:: python
+
+            >>> import os
+            >>> import numpy as np
+            >>> import paddle
+            >>> from paddle.io import DataLoader, RecordFileWriter, RecordIterableDataset
+
+            >>> os.makedirs('records', exist_ok=True)
+            >>> files = [f'records/part-{shard}.rec' for shard in range(2)]
+            >>> for shard, path in enumerate(files):
+            ...     with RecordFileWriter(path) as writer:
+            ...         for i in range(10):
+            ...             writer.write((np.full([3], shard * 10 + i, 'float32'), i))
+            >>> dataset = RecordIterableDataset(files, shuffle=True, batch_size=4)
+            >>> loader = DataLoader(dataset, batch_size=4)
+            >>> for epoch in range(2):
+            ...     dataset.set_epoch(epoch)
+            ...     for step, (image, label) in enumerate(loader):
+            ...         # save the state with the checkpoint
+            ...         state = {'epoch': epoch, 'consumed': (step + 1) * 4}
+
+            >>> # resume from the state
+            >>> dataset.set_state_dict(state)
+    """
+
+    def __init__(
+        self,
+        files,
+        shuffle=False,
+        seed=0,
+        batch_size=1,
+        num_replicas=None,
+        rank=None,
+        deserializer=None,
+    ):
+        assert (
+            isinstance(batch_size, int) and batch_size > 0
+        ), "batch_size should be a positive integer"
+        self._records = _RecordFiles(files, deserializer)
+        self.shuffle = shuffle
+        self.seed = seed
+        self.batch_size = batch_size
+
+        from paddle.distributed import ParallelEnv
+
+        if num_replicas is not None:
+            assert (
+                isinstance(num_replicas, int) and num_replicas > 0
+            ), "num_replicas should be a positive integer"
+            self.nranks = num_replicas
+        else:
+            self.nranks = ParallelEnv().nranks
+
+        if rank is not None:
+            assert (
+                isinstance(rank, int) and rank >= 0
+            ), "rank should be a non-negative integer"
+            self.local_rank = rank
+        else:
+            self.local_rank = ParallelEnv().local_rank
+
+        self.epoch = 0
+        # number of records consumed in current epoch by current rank
+        self.consumed = 0
+
+    def set_epoch(self, epoch):
+        """
+        Set the epoch to shuffle records, and reset consumed records.
+
+        Args:
+            epoch (int): epoch number.
+        """
+        self.epoch = epoch
+        self.consumed = 0
+
+    def state_dict(self):
+        """
+        Get the iteration state, ``consumed`` is the number of records
+        yielded in current process in current epoch, which is only exact
+        when DataLoader does not use multiple workers. With multiple
+        workers, the state should be built from the training step as
+        ``{'epoch': epoch, 'consumed': num_steps * batch_size}`` .
+
+        Returns:
+            dict: the iteration state.
+        """
+        return {'epoch': self.epoch, 'consumed': self.consumed}
+
+    def set_state_dict(self, state_dict):
+        """
+        Set the iteration state, the next iteration starts from the first
+        record not consumed in the epoch.
+
+        Args:
+            state_dict (dict): state with ``epoch`` and ``consumed`` .
+        """
+        self.epoch = state_dict['epoch']
+        self.consumed = state_dict['consumed']
+
+    def _rank_indices(self):
+        total = len(self._records)
+        if self.shuffle:
+            indices = np.random.RandomState(self.seed + self.epoch).permutation(
+                total
+            )
+        else:
+            indices = np.arange(total)
+        # pad to be evenly divisible like DistributedBatchSampler
+        padded = (total + self.nranks - 1) // self.nranks * self.nranks
+        if padded > total:
+            indices = np.concatenate(
+                [indices, indices[: padded - total]], axis=0
+            )
+        return indices[self.local_rank :: self.nranks]
+
+    def __iter__(self):
+        indices = self._rank_indices()[self.consumed :]
+
+        worker_info = get_worker_info()
+        if worker_info is not None and worker_info.num_workers > 1:
+            num_blocks = (len(indices) + self.batch_size - 1) // self.batch_size
+            blocks = range(worker_info.id, num_blocks, worker_info.num_workers)
+            indices = [
+                indices[k * self.batch_size : (k + 1) * self.batch_size]
+                for k in blocks
+            ]
+            indices = np.concatenate(indices) if indices else []
+
+        for idx in indices:
+            self.consumed += 1
+            yield self._records[int(idx)]
+        if worker_info is None:
+            # epoch is finished, the next iteration starts a new epoch
+            self.consumed = 0
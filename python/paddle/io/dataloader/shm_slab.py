@@ -0,0 +1,321 @@
+#   Copyright (c) 2023 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import threading
+import weakref
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+
+import paddle
+
+from ...framework import core
+
+# batch transport modes of multi-process DataLoader
+# 1. queue: workers put batch tensors into the inter-process queue, each
+#    tensor is shared through a memory map file created per batch
+# 2. shared_slab: workers write batch into a preallocated shared memory
+#    slab which is recycled by main process, only slab id and fields meta
+#    information is put into inter-process queue
+BATCH_TRANSPORT_QUEUE = 'queue'
+BATCH_TRANSPORT_SHARED_SLAB = 'shared_slab'
+_BATCH_TRANSPORTS = (BATCH_TRANSPORT_QUEUE, BATCH_TRANSPORT_SHARED_SLAB)
+
+# fields are written into slab with this alignment, which is large
+# enough for any dtype and matches cache line size
+SLAB_ALIGNMENT = 64
+
+# NOTE: slab size is unknown before the first batch is loaded, slabs
+# are allocated with this size at first, batches which cannot fit in
+# a slab will fallback to queue transport and report the required size,
+# the slab will be reallocated with enough size when it is recycled
+DEFAULT_SLAB_SIZE = 16 * 1024 * 1024
+
+
+def _check_batch_transport(batch_transport):
+    if batch_transport not in _BATCH_TRANSPORTS:
+        raise ValueError(
+            f"batch_transport should be one of {_BATCH_TRANSPORTS}, "
+            f"but got {batch_transport}"
+        )
+
+
+def _align(nbytes):
+    return (nbytes + SLAB_ALIGNMENT - 1) // SLAB_ALIGNMENT * SLAB_ALIGNMENT
+
+
+def _slab_required_size(arrays):
+    return sum(_align(arr.nbytes) for arr in arrays)
+
+
+class _SlabBatch:
+    """
+    Batch information sent from worker to main process in shared slab
+    transport mode.
+
+    Args:
+        slab_id(int): index of the slab in slab pool.
+        metas(list|None): list of (offset, dtype, shape) of each field
+            written in slab, None if batch cannot fit in slab.
+        nbytes(int): slab size required by this batch.
+        fallback(list|None): batch data in queue transport mode, only
+            set when batch cannot fit in slab.
+    """
+
+    __slots__ = ['slab_id', 'metas', 'nbytes', 'fallback']
+
+    def __init__(self, slab_id, metas, nbytes, fallback=None):
+        self.slab_id = slab_id
+        self.metas = metas
+        self.nbytes = nbytes
+        self.fallback = fallback
+
+
+class _SharedSlabPool:
+    """
+    Pool of preallocated shared memory slabs owned by main process.
+
+    Slabs are dispatched to workers together with batch indices, worker
+    writes the whole batch into the slab and main process creates
+    tensors sharing memory with the slab without copying. A slab is
+    recycled automatically when all tensors created from it are released.
+
+    Args:
+        num_slabs(int): number of slabs in pool.
+        slab_size(int): initial size of each slab in bytes.
+    """
+
+    def __init__(self, num_slabs, slab_size=DEFAULT_SLAB_SIZE):
+        assert num_slabs > 0, "num_slabs should be a positive value"
+        # NOTE: start resource tracker before workers are started, so that
+        # workers share the tracker with main process instead of starting
+        # their own trackers, which unlink slabs attached when they exit
+        resource_tracker.ensure_running()
+        self._lock = threading.Lock()
+        self._slab_size = _align(slab_size)
+        self._slabs = [None] * num_slabs
+        self._free_ids = list(range(num_slabs))
+        # slab ids dispatched to workers but not yet received
+        self._dispatched = set()
+        # slab ids leased as tensors in main process
+        self._leased = set()
+        self._closed = False
+
+    @property
+    def slab_size(self):
+        return self._slab_size
+
+    def num_free(self):
+        with self._lock:
+            return len(self._free_ids)
+
+    def _ensure_slab(self, slab_id):
+        # NOTE: only called for free slabs with lock held, free slabs
+        # has no exported buffer and can be closed safely
+        slab = self._slabs[slab_id]
+        if slab is not None and slab.size >= self._slab_size:
+            return slab
+        if slab is not None:
+            slab.unlink()
+            self._close_slab(slab_id)
+        slab = shared_memory.SharedMemory(create=True, size=self._slab_size)
+        self._slabs[slab_id] = slab
+        return slab
+
+    def acquire(self):
+        """
+        Get a free slab to dispatch to worker.
+
+        Returns:
+            tuple|None: (slab_id, slab_name, slab_size) of a free slab, None
+            if no free slab, batch should be sent in queue transport mode.
+        """
+        with self._lock:
+            if self._closed or len(self._free_ids) == 0:
+                return None
+            slab_id = self._free_ids.pop()
+            slab = self._ensure_slab(slab_id)
+            self._dispatched.add(slab_id)
+            return (slab_id, slab.name, slab.size)
+
+    def release(self, slab_id, nbytes=0):
+        """
+        Return a slab to free list, if :attr:`nbytes` is larger than slab
+        size, slabs will be reallocated with larger size before reused.
+        """
+        with self._lock:
+            self._dispatched.discard(slab_id)
+            self._leased.discard(slab_id)
+            if nbytes > self._slab_size:
+                # reserve some space for variable-length batches
+                self._slab_size = _align(int(nbytes * 1.25))
+            if self._closed:
+                self._close_slab(slab_id)
+            else:
+                self._free_ids.append(slab_id)
+
+    def reclaim_dispatched(self):
+        """
+        Return all dispatched slabs to free list, should only be called
+        when no worker is writing slabs, e.g. after workers resumed.
+        """
+        with self._lock:
+            for slab_id in self._dispatched:
+                self._free_ids.append(slab_id)
+            self._dispatched.clear()
+
+    def materialize(self, slab_batch):
+        """
+        Create LoDTensors sharing memory with the slab written by worker.
+        The slab is leased until all created tensors are released.
+
+        Returns:
+            list(LoDTensor): fields of the batch
+        """
+        tensors = []
+        for arr in self.materialize_arrays(slab_batch):
+            tensor = core.LoDTensor()
+            tensor.set(arr, core.CPUPlace(), zero_copy=True)
+            tensors.append(tensor)
+        return tensors
+
+    def materialize_arrays(self, slab_batch):
+        """
+        Create numpy arrays sharing memory with the slab written by worker.
+        The slab is leased until all created arrays are released.
+
+        Returns:
+            list(numpy.ndarray): fields of the batch
+        """
+        slab_id = slab_batch.slab_id
+        with self._lock:
+            self._dispatched.discard(slab_id)
+            self._leased.add(slab_id)
+            slab = self._slabs[slab_id]
+
+        # NOTE: all fields are views of root, tensors hold references of
+        # fields, so root will be collected only after all tensors are
+        # released, and the slab will be recycled then
+        root = np.frombuffer(slab.buf, dtype=np.uint8, count=slab_batch.nbytes)
+        weakref.finalize(root, self.release, slab_id)
+
+        arrays = []
+        for offset, dtype, shape in slab_batch.metas:
+            dtype = np.dtype(dtype)
+            count = int(np.prod(shape, dtype=np.int64))
+            arrays.append(
+                root[offset : offset + count * dtype.itemsize]
+                .view(dtype)
+                .reshape(shape)
+            )
+        return arrays
+
+    def _close_slab(self, slab_id):
+        slab = self._slabs[slab_id]
+        if slab is not None:
+            self._slabs[slab_id] = None
+            try:
+                slab.close()
+            except BufferError:
+                # NOTE: release is called by finalizer before the buffer
+                # export of slab is dropped, drop the reference of memory
+                # map here, it will be unmapped when the export is dropped
+                slab._mmap = None
+                slab.close()
+
+    def close(self):
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            for slab_id, slab in enumerate(self._slabs):
+                if slab is None:
+                    continue
+                slab.unlink()
+                # NOTE: leased slabs still have exported buffers which
+                # cannot be closed now, they will be closed on release
+                if slab_id not in self._leased:
+                    self._close_slab(slab_id)
+            self._free_ids = []
+            self._dispatched.clear()
+
+    def __del__(self):
+        self.close()
+
+
+class _SlabWriter:
+    """
+    Write batches into shared slabs in worker process, shared memory
+    attached is cached by slab id.
+    """
+
+    def __init__(self):
+        self._attached = {}
+
+    def _attach(self, slab_id, name):
+        cached = self._attached.get(slab_id)
+        if cached is not None:
+            if cached.name == name:
+                return cached
+            # slab is reallocated by main process
+            cached.close()
+        # NOTE: shared memory is owned and unlinked by main process, it is
+        # also registered to resource tracker when attaching, which is a
+        # no-op since the tracker is shared with main process
+        slab = shared_memory.SharedMemory(name=name)
+        self._attached[slab_id] = slab
+        return slab
+
+    def write(self, slab, batch):
+        """
+        Write flattened batch into slab.
+
+        Args:
+            slab(tuple): (slab_id, slab_name, slab_size) from main process.
+            batch(list): flattened batch fields.
+
+        Returns:
+            _SlabBatch: batch information to put into inter-process queue.
+        """
+        slab_id, name, size = slab
+        arrays = []
+        for field in batch:
+            if isinstance(field, (paddle.Tensor, core.eager.Tensor)):
+                field = field.numpy()
+            arrays.append(np.ascontiguousarray(field))
+
+        nbytes = _slab_required_size(arrays)
+        if nbytes > size:
+            return _SlabBatch(slab_id, None, nbytes)
+
+        buf = self._attach(slab_id, name).buf
+        metas = []
+        offset = 0
+        for arr in arrays:
+            dst = np.ndarray(
+                arr.shape, dtype=arr.dtype, buffer=buf, offset=offset
+            )
+            dst[...] = arr
+            metas.append((offset, arr.dtype.str, arr.shape))
+            offset += _align(arr.nbytes)
+            del dst
+        return _SlabBatch(slab_id, metas, nbytes)
+
+    def close(self):
+        for slab in self._attached.values():
+            try:
+                slab.close()
+            except BufferError:
+                pass
+        self._attached = {}
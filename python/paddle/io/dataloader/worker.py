@@ -15,6 +15,7 @@
 import os
 import queue
 import sys
+import time
 import traceback
 
 import numpy as np
@@ -27,8 +28,10 @@ from ..multiprocess_utils import (
     CleanupFuncRegistrar,
     _cleanup_mmap,
 )
+from .collate import DefaultCollator
 from .fetcher import _IterableDatasetFetcher, _MapDatasetFetcher
 from .flat import _flatten_batch
+from .shm_slab import BATCH_TRANSPORT_SHARED_SLAB, _SlabWriter
 
 
 class _IterableDatasetStopIteration:
@@ -171,6 +174,71 @@ class WorkerInfo:
         return super().__setattr__(key, val)
 
 
+# number of metrics slots of each worker in shared metrics array
+_WORKER_METRICS_SIZE = 5
+
+
+class _WorkerMetrics:
+    """
+    Accumulate idle time (waiting for indices), busy time (loading
+    batches), number of loaded batches, getitem and collate time of a
+    worker into the slots of the worker in a shared array, which can be
+    read by main process.
+    """
+
+    def __init__(self, array, worker_id):
+        self._array = array
+        self._base = worker_id * _WORKER_METRICS_SIZE
+        self._busy = False
+        self._last = time.time()
+
+    def idle(self):
+        if self._busy:
+            now = time.time()
+            self._array[self._base + 1] += now - self._last
+            self._array[self._base + 2] += 1
+            self._last = now
+            self._busy = False
+
+    def busy(self):
+        now = time.time()
+        self._array[self._base] += now - self._last
+        self._last = now
+        self._busy = True
+
+    def on_fetch(self, fetcher):
+        self._array[self._base + 3] += fetcher.getitem_time
+        self._array[self._base + 4] += fetcher.collate_time
+
+
+def _read_worker_metrics(array, num_workers):
+    metrics = []
+    for worker_id in range(num_workers):
+        base = worker_id * _WORKER_METRICS_SIZE
+        idle_time = array[base]
+        busy_time = array[base + 1]
+        getitem_time = array[base + 3]
+        collate_time = array[base + 4]
+        total = idle_time + busy_time
+        metrics.append(
+            {
+                'worker_id': worker_id,
+                'idle_time': idle_time,
+                'busy_time': busy_time,
+                'num_batches': int(array[base + 2]),
+                'idle_ratio': idle_time / total if total > 0 else 0.0,
+                'getitem_time': getitem_time,
+                'collate_time': collate_time,
+                # the rest of busy time is spent on flattening batches
+                # and putting them into queue or shared memory slabs
+                'transfer_time': max(
+                    busy_time - getitem_time - collate_time, 0.0
+                ),
+            }
+        )
+    return metrics
+
+
 class _WorkerException:
     def __init__(self, worker_id, exc_info=None):
         self.worker_id = worker_id
@@ -285,7 +353,10 @@ def _worker_loop(
     use_shared_memory,
     base_seed,
     shm_cahce_size=0,
+    batch_transport=None,
+    metrics_array=None,
 ):
+    slab_writer = None
     try:
         # NOTE: [ mmap files clear ] When the child process exits unexpectedly,
         # some shared memory objects may have been applied for but have not yet
@@ -319,6 +390,9 @@ def _worker_loop(
             seed=base_seed,
         )
 
+        if batch_transport == BATCH_TRANSPORT_SHARED_SLAB:
+            slab_writer = _SlabWriter()
+
         init_exception = None
         try:
             if init_fn is not None:
@@ -329,10 +403,16 @@ def _worker_loop(
         except:
             init_exception = _WorkerException(worker_id)
 
+        metrics = None
+        if metrics_array is not None:
+            metrics = _WorkerMetrics(metrics_array, worker_id)
+
         iterator_drained = False
         parent_watch_dog = ParentWatchDog()
 
         while parent_watch_dog.is_alive():
+            if metrics is not None:
+                metrics.idle()
             try:
                 data = indices_queue.get(MP_STATUS_CHECK_INTERVAL)
             except queue.Empty:
@@ -342,7 +422,11 @@ def _worker_loop(
                 out_queue.put((data, None, None))
                 iterator_drained = False
                 fetcher = _DatasetKind.create_fetcher(
-                    dataset_kind, dataset, auto_collate_batch, collate_fn, True
+                    dataset_kind,
+                    dataset,
+                    auto_collate_batch,
+                    collate_fn,
+                    drop_last,
                 )
                 continue
 
@@ -357,7 +441,13 @@ def _worker_loop(
             if done_event.is_set() or iterator_drained:
                 continue
 
-            idx, indices = data
+            if metrics is not None:
+                metrics.busy()
+
+            # slab is None if no free slab in main process or shared slab
+            # transport is not used, batch will be put into out_queue
+            idx, indices = data[0], data[1]
+            slab = data[2] if len(data) > 2 else None
             try:
                 if init_exception is not None:
                     batch = init_exception
@@ -370,6 +460,8 @@ def _worker_loop(
                     #       to make sure tensor will be operated only on CPU
                     with paddle.base.dygraph.guard(place=paddle.CPUPlace()):
                         batch = fetcher.fetch(indices)
+                    if metrics is not None:
+                        metrics.on_fetch(fetcher)
             except Exception as e:
                 if (
                     isinstance(e, StopIteration)
@@ -383,6 +475,12 @@ def _worker_loop(
                 if isinstance(batch, _WorkerException):
                     out_queue.put((idx, batch, None))
                 batch, structure = _flatten_batch(batch)
+                slab_batch = None
+                if slab is not None:
+                    slab_batch = slab_writer.write(slab, batch)
+                    if slab_batch.metas is not None:
+                        out_queue.put((idx, slab_batch, structure))
+                        continue
                 if use_shared_memory:
 
                     def numpy2lodtensor(arr):
@@ -390,15 +488,18 @@ def _worker_loop(
                         lodtensor.set(arr, core.CPUPlace())
                         return lodtensor
 
-                    tensor_list = [
+                    batch = [
                         numpy2lodtensor(b)
                         if isinstance(b, np.ndarray)
                         else b.get_tensor()
                         for b in batch
                     ]
-                    out_queue.put((idx, tensor_list, structure))
-                else:
-                    out_queue.put((idx, batch, structure))
+                if slab_batch is not None:
+                    # batch cannot fit in slab, fallback to queue transport
+                    # and report slab size needed to main process
+                    slab_batch.fallback = batch
+                    batch = slab_batch
+                out_queue.put((idx, batch, structure))
     except KeyboardInterrupt:
         # NOTE: Main process will raise KeyboardInterrupt anyways, ignore it in child process
         pass
@@ -407,6 +508,10 @@ def _worker_loop(
     finally:
         if use_shared_memory:
             _cleanup_mmap()
+        if slab_writer is not None:
+            slab_writer.close()
+        if isinstance(collate_fn, DefaultCollator):
+            collate_fn._shutdown_executor()
     if done_event.is_set():
         out_queue.cancel_join_thread()
         out_queue.close()
@@ -13,8 +13,11 @@
 # limitations under the License.
 
 import copy
+import hashlib
+import json
 import logging
 import multiprocessing
+import os
 import sys
 import time
 import warnings
@@ -27,13 +30,20 @@ from ..base.framework import (
     _get_paddle_place_list,
 )
 from ..framework import core, in_dynamic_mode
-from .dataloader import BatchSampler, IterableDataset, Subset
+from .dataloader import BatchSampler, DefaultCollator, IterableDataset, Subset
 from .dataloader.batch_sampler import _InfiniteIterableSampler
 from .dataloader.dataloader_iter import (
     _DataLoaderIterMultiProcess,
     _DataLoaderIterSingleProcess,
     _DatasetKind,
 )
+from .dataloader.pipeline_stats import STAGE_COLLATE, STAGE_PACK, STAGE_TRANSFER
+from .dataloader.shm_slab import (
+    BATCH_TRANSPORT_QUEUE,
+    BATCH_TRANSPORT_SHARED_SLAB,
+    _check_batch_transport,
+)
+from .dataloader.worker import _read_worker_metrics
 
 # NOTE: [ avoid hanging & failed quickly ]
 # These value is used in getting data from another process
@@ -43,13 +53,57 @@ USE_PINNED_MEMORY = None
 # AutoTune Flags
 USE_AUTOTUNE = False
 TUNING_STEPS = 500
+# json file to save tuned configs by dataset signature, default path is
+# set by PADDLE_DATALOADER_AUTOTUNE_CACHE or under ~/.cache/paddle
+AUTOTUNE_CACHE_PATH = None
 
 
-def set_autotune_config(use_autotune, tuning_steps=500):
+def set_autotune_config(use_autotune, tuning_steps=500, cache_path=None):
     global USE_AUTOTUNE
     USE_AUTOTUNE = use_autotune
     global TUNING_STEPS
     TUNING_STEPS = tuning_steps
+    global AUTOTUNE_CACHE_PATH
+    AUTOTUNE_CACHE_PATH = cache_path
+
+
+def _autotune_cache_path():
+    if AUTOTUNE_CACHE_PATH is not None:
+        return AUTOTUNE_CACHE_PATH
+    return os.environ.get(
+        'PADDLE_DATALOADER_AUTOTUNE_CACHE',
+        os.path.join(
+            os.path.expanduser('~'),
+            '.cache',
+            'paddle',
+            'dataloader_autotune.json',
+        ),
+    )
+
+
+def _load_autotune_cache():
+    try:
+        with open(_autotune_cache_path(), 'r') as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return cache if isinstance(cache, dict) else {}
+
+
+def _save_autotune_cache(signature, config):
+    path = _autotune_cache_path()
+    cache = _load_autotune_cache()
+    cache[signature] = config
+    # write to a temporary file and rename, so that concurrent runs never
+    # read a partially written file
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    try:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(tmp_path, 'w') as f:
+            json.dump(cache, f)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logging.warning(f"Failed to save DataLoader autotune config: {e}")
 
 
 def use_pinned_memory(*args):
@@ -77,67 +131,72 @@ def _convert_places(places):
 
 
 class AuToTune:
+    """
+    Tune num_workers, prefetch_factor, pin memory, batch transport and
+    collate threads of a DataLoader by timing loaders over a sub-dataset.
+
+    num_workers is searched exponentially and then bisected, other options
+    are tried one by one and only kept if faster, options which cannot
+    speed up the measured bottleneck stage are skipped. The tuned config
+    is saved in a json file by dataset signature and reused by following
+    runs, and is adapted at the start of each epoch if waiting time for
+    batches increases during training.
+    """
+
+    # candidates of options besides num_workers
+    PREFETCH_FACTORS = [2, 4, 8]
+    COLLATE_THREADS = [1, 2, 4]
+    BATCH_TRANSPORTS = [BATCH_TRANSPORT_QUEUE, BATCH_TRANSPORT_SHARED_SLAB]
+    # a config is only taken if it is faster than this ratio of best cost
+    IMPROVE_RATIO = 0.9
+    # adapt config if stall ratio of an epoch is larger than
+    # ADAPT_STALL_RATIO and waiting time per batch increases by
+    # ADAPT_DROP_RATIO compared with the best epoch
+    ADAPT_MIN_BATCHES = 20
+    ADAPT_STALL_RATIO = 0.1
+    ADAPT_DROP_RATIO = 0.25
+
     def __init__(self, loader):
         self.loader = loader
-        self.max_num_worker = multiprocessing.cpu_count() / 2
+        self.max_num_worker = multiprocessing.cpu_count() // 2
+        self._best_wait = None
+        self._last_stats = (None, 0, 0.0, 0.0)
 
     def __call__(self):
         # use default loader
         if (not USE_AUTOTUNE) or (not self.need_autotune()):
             return self.loader.num_workers
 
+        signature = self.dataset_signature()
+        config = _load_autotune_cache().get(signature)
+        if config is not None:
+            logging.info(
+                "auto_tune dataLoader use cached config: " + str(config)
+            )
+            self.apply_config(self.loader, config)
+            return self.loader.num_workers
+
         # get autotune loader
         auto_tune_loader = self.get_autotune_loader()
         if auto_tune_loader is None:
             return self.loader.num_workers
 
-        # pick the best num_workers
         auto_tune_start = time.time()
         logging.debug("========= DataLoader Auto Tune =========")
-        logging.debug(
-            "User config for DataLoader: " + str(self.loader.num_workers)
-        )
-        best_num_workers = 0
-        min_cost = float("inf")
-        logging.debug(
-            "Tuning Range for num_workers: 0 ~ " + str(self.max_num_worker)
-        )
-        num_workers = 0
-        while num_workers < self.max_num_worker:
-            auto_tune_loader.num_workers = num_workers
-            avg_cost = self.evaluate_reader_cost(auto_tune_loader)
-            if min_cost * 0.75 > avg_cost:
-                min_cost = avg_cost
-                best_num_workers = num_workers
-            else:
-                update_num = self.is_best(
-                    auto_tune_loader,
-                    best_num_workers,
-                    min_cost,
-                    self.max_num_worker,
-                )
-                if update_num == best_num_workers:
-                    break
-                else:
-                    best_num_workers = update_num
-            logging.debug(
-                "num_workers: "
-                + str(num_workers)
-                + " avg_cost: "
-                + str(avg_cost)
-            )
-            num_workers += 2
-        logging.info(
-            "auto_tune dataLoader best_num_workers: " + str(best_num_workers)
-        )
+        config = self.get_config(self.loader)
+        logging.debug("User config for DataLoader: " + str(config))
+        config = self.tune(auto_tune_loader, config)
+        logging.info("auto_tune dataLoader best config: " + str(config))
         logging.debug(
             "AutoTuning Cost for DataLoader: "
             + str(time.time() - auto_tune_start)
             + ' seconds'
         )
 
-        # tune the default loader's num_workers
-        return best_num_workers
+        # tune the default loader
+        self.apply_config(self.loader, config)
+        _save_autotune_cache(signature, config)
+        return self.loader.num_workers
 
     def need_autotune(self):
         if sys.platform == 'darwin' or sys.platform == 'win32':
@@ -145,6 +204,58 @@ class AuToTune:
         else:
             return True
 
+    def dataset_signature(self):
+        loader = self.loader
+        dataset = loader.dataset
+        collate_fn = loader.collate_fn
+        dataset_cls = type(dataset)
+        info = {
+            'dataset': f'{dataset_cls.__module__}.{dataset_cls.__qualname__}',
+            'num_samples': (
+                len(dataset) if loader.dataset_kind == _DatasetKind.MAP else -1
+            ),
+            'batch_size': getattr(loader.batch_sampler, 'batch_size', None),
+            'collate_fn': (
+                None
+                if collate_fn is None
+                else getattr(collate_fn, '__qualname__', str(type(collate_fn)))
+            ),
+            'places': [str(place) for place in loader.places],
+            'cpu_count': multiprocessing.cpu_count(),
+        }
+        return hashlib.md5(
+            json.dumps(info, sort_keys=True).encode()
+        ).hexdigest()
+
+    def get_collator(self, loader):
+        # collate threads can only be tuned for DefaultCollator
+        if loader.collate_fn is None:
+            return loader._default_collator
+        if isinstance(loader.collate_fn, DefaultCollator):
+            return loader.collate_fn
+        return None
+
+    def get_config(self, loader):
+        collator = self.get_collator(loader)
+        return {
+            'num_workers': loader.num_workers,
+            'prefetch_factor': loader.prefetch_factor,
+            'pin_memory': loader.pin_memory,
+            'batch_transport': loader.batch_transport,
+            'collate_threads': (
+                None if collator is None else collator.num_threads
+            ),
+        }
+
+    def apply_config(self, loader, config):
+        loader.num_workers = config['num_workers']
+        loader.prefetch_factor = config['prefetch_factor']
+        loader.pin_memory = config['pin_memory']
+        loader.batch_transport = config['batch_transport']
+        collator = self.get_collator(loader)
+        if collator is not None and config['collate_threads'] is not None:
+            collator.num_threads = config['collate_threads']
+
     def get_sub_dataset(self, dataset, batch_size):
         num_samples = min(batch_size * TUNING_STEPS, len(dataset))
         sub_dataset = Subset(dataset, indices=list(range(num_samples)))
@@ -152,6 +263,13 @@ class AuToTune:
 
     def get_autotune_loader(self):
         loader = copy.copy(self.loader)
+        # autotune loader should not adapt config while tuning
+        loader._autotune = None
+        # nor change collate threads of the collator of the loader
+        if loader.collate_fn is None:
+            loader._default_collator = copy.copy(loader._default_collator)
+        elif isinstance(loader.collate_fn, DefaultCollator):
+            loader.collate_fn = copy.copy(loader.collate_fn)
         batch_size = self.loader.batch_sampler.batch_size
         if isinstance(
             self.loader.batch_sampler, paddle.io.DistributedBatchSampler
@@ -191,26 +309,158 @@ class AuToTune:
             avg_cost = sum(costs[0:]) / len(costs[0:])
         return avg_cost
 
-    def is_best(self, reader, best_workers, best_time, num_work_boundary):
-        step = 0
-        num_workers = best_workers + 1
-        boundary = 1
-        while num_workers < num_work_boundary and step < 5:
-            self.loader.num_workers = num_workers
-            time = self.evaluate_reader_cost(reader)
-            logging.debug(
-                "for back num_workers: "
-                + str(num_workers)
-                + " avg_cost: "
-                + str(time)
-            )
-            step += 1
-            if time < best_time * 0.70 * boundary:
-                return num_workers
+    def evaluate_config(self, reader, config):
+        self.apply_config(reader, config)
+        avg_cost = self.evaluate_reader_cost(reader)
+        logging.debug("config: " + str(config) + " avg_cost: " + str(avg_cost))
+        return avg_cost
+
+    def is_main_process_bound(self, reader):
+        # more workers cannot speed up the loader if the measured bottleneck
+        # stage is in main process
+        stats = reader.pipeline_stats()
+        return stats is not None and stats['bottleneck'] == STAGE_PACK
+
+    def tune_num_workers(self, reader, config):
+        costs = {}
+
+        def evaluate(num_workers):
+            if num_workers not in costs:
+                costs[num_workers] = self.evaluate_config(
+                    reader, dict(config, num_workers=num_workers)
+                )
+            return costs[num_workers]
+
+        logging.debug(
+            "Tuning Range for num_workers: 0 ~ " + str(self.max_num_worker)
+        )
+        # exponential search: 0, 1, 2, 4, ... until cost stops decreasing
+        best = 0
+        evaluate(best)
+        num_workers = 1
+        while num_workers <= self.max_num_worker:
+            if evaluate(num_workers) >= costs[best] * self.IMPROVE_RATIO:
+                break
+            best = num_workers
+            if self.is_main_process_bound(reader):
+                logging.debug("DataLoader bounded by main process")
+                break
+            num_workers *= 2
+
+        # bisect between best and the next probed num_workers
+        low, high = best, min(num_workers, self.max_num_worker)
+        while high - low > 1:
+            mid = (low + high) // 2
+            if evaluate(mid) < costs[low] * self.IMPROVE_RATIO:
+                low = mid
             else:
-                num_workers += 1
-            boundary *= 0.80
-        return best_workers
+                high = mid
+        return low, costs[low]
+
+    def option_candidates(self, reader, config):
+        stats = reader.pipeline_stats()
+        bottleneck = None if stats is None else stats['bottleneck']
+        options = [('prefetch_factor', self.PREFETCH_FACTORS)]
+        if in_dynamic_mode() and core.is_compiled_with_cuda():
+            options.append(('pin_memory', [True, False]))
+        if config['num_workers'] > 0 and bottleneck in (
+            STAGE_TRANSFER,
+            STAGE_PACK,
+        ):
+            options.append(('batch_transport', self.BATCH_TRANSPORTS))
+        if (
+            config['collate_threads'] is not None
+            and bottleneck == STAGE_COLLATE
+        ):
+            options.append(('collate_threads', self.COLLATE_THREADS))
+        return options
+
+    def tune(self, reader, config):
+        num_workers, min_cost = self.tune_num_workers(reader, config)
+        config = dict(config, num_workers=num_workers)
+        # evaluate again to get pipeline stats of best num_workers
+        min_cost = self.evaluate_config(reader, config)
+        for name, candidates in self.option_candidates(reader, config):
+            for value in candidates:
+                if value == config[name]:
+                    continue
+                trial = dict(config, **{name: value})
+                avg_cost = self.evaluate_config(reader, trial)
+                if avg_cost < min_cost * self.IMPROVE_RATIO:
+                    config, min_cost = trial, avg_cost
+        return config
+
+    def adapt(self):
+        """
+        Adapt config of loader by pipeline stats of the latest epoch, return
+        whether config is changed.
+        """
+        loader = self.loader
+        stats = loader._pipeline_stats
+        if not USE_AUTOTUNE or stats is None or not self.need_autotune():
+            return False
+        summary = loader.pipeline_stats()
+        # stats of persistent workers are accumulated over epochs
+        last, num_batches, stall_time, elapsed_time = self._last_stats
+        if last is not stats:
+            num_batches, stall_time, elapsed_time = 0, 0.0, 0.0
+        self._last_stats = (
+            stats,
+            summary['num_batches'],
+            summary['stall_time'],
+            summary['elapsed_time'],
+        )
+        num_batches = summary['num_batches'] - num_batches
+        stall_time = summary['stall_time'] - stall_time
+        elapsed_time = summary['elapsed_time'] - elapsed_time
+        if num_batches < self.ADAPT_MIN_BATCHES or elapsed_time <= 0:
+            return False
+
+        wait = stall_time / num_batches
+        if self._best_wait is None or wait < self._best_wait:
+            self._best_wait = wait
+            return False
+        if (
+            stall_time / elapsed_time < self.ADAPT_STALL_RATIO
+            or wait < self._best_wait * (1 + self.ADAPT_DROP_RATIO)
+        ):
+            return False
+
+        config = self.get_config(loader)
+        bottleneck = summary['bottleneck']
+        if bottleneck == STAGE_PACK:
+            # packing runs in loader thread of main process, neither more
+            # workers nor deeper prefetching speeds it up
+            logging.debug("DataLoader bounded by main process")
+            return False
+        if config['num_workers'] < self.max_num_worker:
+            config['num_workers'] = min(
+                config['num_workers'] + max(config['num_workers'] // 2, 1),
+                self.max_num_worker,
+            )
+        elif (
+            bottleneck == STAGE_TRANSFER
+            and config['batch_transport'] == BATCH_TRANSPORT_QUEUE
+        ):
+            config['batch_transport'] = BATCH_TRANSPORT_SHARED_SLAB
+        elif (
+            bottleneck == STAGE_COLLATE
+            and config['collate_threads'] is not None
+            and config['collate_threads'] < self.COLLATE_THREADS[-1]
+        ):
+            config['collate_threads'] *= 2
+        if config == self.get_config(loader):
+            return False
+
+        logging.info(
+            "auto_tune dataLoader throughput dropped, adapt config: "
+            + str(config)
+        )
+        self.apply_config(loader, config)
+        _save_autotune_cache(self.dataset_signature(), config)
+        # start a new baseline with new config
+        self._best_wait = None
+        return True
 
 
 class DataLoader:
@@ -290,7 +540,8 @@ class DataLoader:
             for :attr:`batch_sampler`, see :attr:`batch_size`. Default False
         collate_fn(callable, optional): function to generate mini-batch data by merging
             the sample list, None for only stack each fields of sample in axis
-            0(same as :attr::`np.stack(..., axis=0)`). Default None
+            0(same as :attr::`np.stack(..., axis=0)`) by :code:`paddle.io.DefaultCollator`.
+            Default None
         num_workers(int, optional): the number of subprocess to load data, 0 for no
             subprocess used and loading data in main process. Default 0
         use_buffer_reader (bool, optional): whether to use bufferred reader.
@@ -311,6 +562,22 @@ class DataLoader:
         worker_init_fn(callable, optional): init function which will be called with
             worker id on each subproces starting if not set as None. Default
             None.
+        persistent_workers(bool, optional): whether to keep worker processes
+            alive after an epoch finished, only works in multi-process mode.
+            For map-style dataset with a sequential :code:`BatchSampler` or
+            a :code:`DistributedBatchSampler`, workers start loading batches
+            of next epoch from a copy of the sampler when the sampler of
+            current epoch is exhausted. They are used only if next epoch
+            starts after current epoch finished and the sampler samples the
+            same batches again, e.g. after :code:`set_epoch` with the
+            expected epoch, otherwise they are discarded. Default False.
+        batch_transport(str, optional): the way batches are transported from
+            subprocesses to main process, can be ``queue`` or ``shared_slab``.
+            ``queue`` puts batch data into inter-process queue. ``shared_slab``
+            lets subprocesses write batches into a pool of preallocated
+            shared memory slabs recycled by main process, and creates tensors
+            from slabs without copying, which is faster for large batches.
+            Only works in multi-process mode. Default ``queue``.
 
     Returns:
         DataLoader: an iterable object for data iterating, each elemnet of the generated data is a Tensor.
@@ -399,9 +666,13 @@ class DataLoader:
         timeout=0,
         worker_init_fn=None,
         persistent_workers=False,
+        batch_transport=BATCH_TRANSPORT_QUEUE,
     ):
         self.return_list = return_list
         self.collate_fn = collate_fn
+        # NOTE: batch schema is worked out by the default collator once
+        # per DataLoader, see DefaultCollator
+        self._default_collator = DefaultCollator()
         self.use_buffer_reader = use_buffer_reader
         self.prefetch_factor = prefetch_factor
         self.worker_init_fn = worker_init_fn
@@ -442,6 +713,9 @@ class DataLoader:
         assert timeout >= 0, "timeout should be a non-negative value"
         self.timeout = timeout
 
+        _check_batch_transport(batch_transport)
+        self.batch_transport = batch_transport
+
         if isinstance(dataset, IterableDataset):
             self.dataset_kind = _DatasetKind.ITER
             if shuffle:
@@ -494,7 +768,10 @@ class DataLoader:
 
         self._persistent_workers = persistent_workers
         self._iterator = None
-        self.num_workers = AuToTune(self).__call__()
+        self._worker_metrics = None
+        self._pipeline_stats = None
+        self._autotune = AuToTune(self)
+        self.num_workers = self._autotune()
 
     def __len__(self):
         if self.dataset_kind == _DatasetKind.ITER:
@@ -506,6 +783,12 @@ class DataLoader:
                 return len(self.dataset)
 
     def __iter__(self):
+        # adapt config by pipeline stats of the latest epoch, workers
+        # should be restarted if config changed
+        if self._autotune is not None and self._autotune.adapt():
+            if self._iterator is not None:
+                self._iterator._try_shutdown_all()
+                self._iterator = None
         if self.num_workers == 0:
             return _DataLoaderIterSingleProcess(self)
         elif self._persistent_workers:
@@ -519,3 +802,100 @@ class DataLoader:
 
     def __call__(self):
         return self.__iter__()
+
+    def worker_metrics(self):
+        """
+        Get the time each worker process spent waiting for batch indices
+        (idle) and loading batches (busy) in the latest multi-process
+        iteration, accumulated over epochs with persistent workers. A high
+        idle ratio means workers are starved by the training loop, and
+        :attr:`num_workers` can be reduced.
+
+        Returns:
+            list: a list of dict for each worker with keys ``worker_id``,
+            ``idle_time``, ``busy_time`` (in seconds), ``num_batches`` and
+            ``idle_ratio``. Empty list if no multi-process iteration started.
+
+        Examples:
+
+            .. code-block:: python
+
+                >>> import numpy as np
+                >>> from paddle.io import Dataset, DataLoader
+
+                >>> class RandomDataset(Dataset):
+                ...     def __getitem__(self, idx):
+                ...         return np.random.random([4]).astype('float32')
+                ...
+                ...     def __len__(self):
+                ...         return 16
+
+                >>> loader = DataLoader(RandomDataset(), batch_size=4, num_workers=2)
+                >>> for data in loader:
+                ...     pass
+                >>> metrics = loader.worker_metrics()
+                >>> print(len(metrics))
+                2
+                >>> print(sum(m['num_batches'] for m in metrics))
+                4
+        """
+        if self._worker_metrics is None:
+            return []
+        return _read_worker_metrics(*self._worker_metrics)
+
+    def pipeline_stats(self):
+        """
+        Get per-stage time of the data pipeline in the latest iteration and
+        attribute the time training loop stalled on waiting for batches to
+        the stages. Stages are:
+
+        - ``getitem``: reading samples from dataset.
+        - ``collate``: batching samples with :attr:`collate_fn`.
+        - ``transfer``: putting batches into inter-process queue or shared
+          memory slabs in worker processes, multi-process mode only.
+        - ``queue``: waiting for and receiving batches from worker processes,
+          multi-process mode only.
+        - ``pack``: packing batches in host memory to feed the device
+          reader, copying batches to device is not included.
+        - ``wait``: training loop waiting for batches.
+
+        Stages are also recorded as user defined events named
+        ``DataLoader.<stage>`` when :ref:`Profiler <api_paddle_profiler_Profiler>`
+        is on, stages in worker processes are recorded only when profiler is
+        on in worker processes.
+
+        Returns:
+            dict: a dict with keys ``num_batches``, ``elapsed_time``,
+            ``stall_time``, ``stall_ratio``, ``stages`` (total, average and
+            effective time of each stage, effective time is average time
+            divided by number of workers for stages in worker processes),
+            ``stall_attribution`` (stall time attributed to each stage by its
+            effective time) and ``bottleneck`` (the stage with largest
+            effective time). None if no iteration started.
+
+        Examples:
+
+            .. code-block:: python
+
+                >>> import numpy as np
+                >>> from paddle.io import Dataset, DataLoader
+
+                >>> class RandomDataset(Dataset):
+                ...     def __getitem__(self, idx):
+                ...         return np.random.random([4]).astype('float32')
+                ...
+                ...     def __len__(self):
+                ...         return 16
+
+                >>> loader = DataLoader(RandomDataset(), batch_size=4)
+                >>> for data in loader:
+                ...     pass
+                >>> stats = loader.pipeline_stats()
+                >>> print(stats['num_batches'])
+                4
+                >>> print(sorted(stats['stages'].keys()))
+                ['collate', 'getitem', 'pack', 'wait']
+        """
+        if self._pipeline_stats is None:
+            return None
+        return self._pipeline_stats.summary(self.worker_metrics())
@@ -21,6 +21,7 @@ from .api import ignore_module
 from .dy2static.program_translator import enable_to_static
 
 from .dy2static.logging_utils import set_code_level, set_verbosity
+from .dy2static.persistent_cache import set_cache_dir
 from .translated_layer import TranslatedLayer
 
 __all__ = [
@@ -31,6 +32,7 @@ __all__ = [
     'TranslatedLayer',
     'set_code_level',
     'set_verbosity',
+    'set_cache_dir',
     'not_to_static',
     'enable_to_static',
 ]
@@ -39,6 +39,7 @@ from paddle.base.dygraph.base import (
     program_desc_tracing_guard,
     switch_to_static_graph,
 )
+from . import async_save
 from .dy2static import logging_utils
 from .dy2static.convert_call_func import (
     ConversionOptions,
@@ -74,7 +75,12 @@ from paddle.base.framework import (
 )
 from paddle.base.framework import dygraph_only
 from paddle.base.wrapped_decorator import wrap_decorator
-from paddle.static.io import save_inference_model
+from paddle.static.io import (
+    _serialize_program,
+    normalize_program,
+    save_inference_model,
+)
+from paddle.framework.io_utils import is_persistable
 from paddle.framework import in_dynamic_mode
 
 
@@ -257,6 +263,11 @@ def to_static(
             please refer to :code:`paddle.static.BuildStrategy`. The default is None.
         backend(str, Optional): Specifies compilation backend, which can be `CINN` or None. When backend is `CINN`, CINN compiler will be used to speed up training and inference.
         kwargs: Support keys including `property`, set `property` to True if the fucntion is python property.
+            Besides, `shape_buckets` (dict) maps an argument name to ``{dim: boundaries}``, the tensor argument is
+            padded with 0 along the dim to the nearest boundary, or the next power of two if boundaries is None,
+            so that inputs of variable lengths share the programs of buckets. The function should be aware of the
+            padding. `program_cache_size` (int) and `program_cache_memory` (int, in bytes) cap the cached programs,
+            the least recently used one is evicted if exceeded. They are 0 (unlimited) by default.
 
 
     Returns:
@@ -285,6 +296,15 @@ def to_static(
 
     """
     property = kwargs.get("property", False)
+    program_cache_kwargs = {
+        key: kwargs[key]
+        for key in (
+            "shape_buckets",
+            "program_cache_size",
+            "program_cache_memory",
+        )
+        if key in kwargs
+    }
 
     def decorated(python_func):
         """
@@ -316,6 +336,7 @@ def to_static(
                 build_strategy=build_strategy,
                 property=property,
                 backend=backend,
+                **program_cache_kwargs,
             ),
         )
 
@@ -400,6 +421,8 @@ class _SaveLoadConfig:
         self._separate_params = False
         # used for `paddle.load`
         self._keep_name_table = False
+        # used for `paddle.jit.load`, if True, params are memory-mapped
+        self.mmap = False
 
         # NOTE: Users rarely use following configs, so these configs are not open to users,
         # reducing user learning costs, but we retain the configuration capabilities
@@ -422,6 +445,9 @@ class _SaveLoadConfig:
         # in the scene of llm-inference, prunning program can cause unexpectable result, an option to skip prune is necessary
         self.skip_prune_program = False
 
+        # if True, files are written in background and `paddle.jit.save` returns a future
+        self.async_save = False
+
     @property
     def output_spec(self):
         return self._output_spec
@@ -502,6 +528,7 @@ def _parse_save_configs(configs):
         "skip_forward",
         "input_names_after_prune",
         "skip_prune_program",
+        "async_save",
     ]
 
     # input check
@@ -523,12 +550,13 @@ def _parse_save_configs(configs):
         "input_names_after_prune", None
     )
     inner_config.skip_prune_program = configs.get("skip_prune_program", False)
+    inner_config.async_save = configs.get("async_save", False)
 
     return inner_config
 
 
 def _parse_load_config(configs):
-    supported_configs = ['model_filename', 'params_filename']
+    supported_configs = ['model_filename', 'params_filename', 'mmap']
 
     # input check
     for key in configs:
@@ -542,6 +570,7 @@ def _parse_load_config(configs):
     inner_config = _SaveLoadConfig()
     inner_config.model_filename = configs.get('model_filename', None)
     inner_config.params_filename = configs.get('params_filename', None)
+    inner_config.mmap = configs.get('mmap', False)
 
     return inner_config
 
@@ -793,17 +822,19 @@ def _run_save_pre_hooks(func):
         global _save_pre_hooks
         for hook in _save_pre_hooks:
             hook(layer, input_spec, configs)
-        func(layer, path, input_spec, **configs)
+        return func(layer, path, input_spec, **configs)
 
     return wrapper
 
 
-def _save_property(filename: str, property_vals: list[tuple[Any, str]]):
+def _serialize_property(property_vals: list[tuple[Any, str]]) -> bytes:
     """class property serialization.
 
     Args:
-        filename (str): *.meta
         property_vals (list[tuple[Any, str]]): class property.
+
+    Returns:
+        bytes: the serialized properties.
     """
 
     def set_property(meta, key, val):
@@ -823,12 +854,64 @@ def _save_property(filename: str, property_vals: list[tuple[Any, str]]):
         else:
             raise ValueError(f"Note support val type: {type(val)}")
 
+    meta = paddle.framework.core.Property()
+    for item in property_vals:
+        val, key = item[0], item[1]
+        set_property(meta, key, val)
+    return meta.serialize_to_string()
+
+
+def _save_property(filename: str, property_vals: list[tuple[Any, str]]):
+    """class property serialization.
+
+    Args:
+        filename (str): *.meta
+        property_vals (list[tuple[Any, str]]): class property.
+    """
     with open(filename, 'wb') as f:
-        meta = paddle.framework.core.Property()
-        for item in property_vals:
-            val, key = item[0], item[1]
-            set_property(meta, key, val)
-        f.write(meta.serialize_to_string())
+        f.write(_serialize_property(property_vals))
+
+
+def _saved_var_names(vars):
+    # the order of vars saved by `save_combine`, see `paddle.static.save_vars`
+    return sorted(
+        var.name for var in vars if var.type != core.VarDesc.VarType.RAW
+    )
+
+
+def _prepare_async_inference_model(
+    path_prefix,
+    feed_vars,
+    fetch_vars,
+    program,
+    scope,
+    configs,
+    async_files,
+    async_params,
+):
+    """
+    Serializes the program and copies its persistable vars to host like
+    `save_inference_model`, the files are recorded in `async_files` and
+    `async_params` to be written by `async_save.submit`.
+    """
+    program = normalize_program(
+        program,
+        feed_vars,
+        fetch_vars,
+        skip_prune_program=configs.skip_prune_program,
+    )
+    async_files[path_prefix + INFER_MODEL_SUFFIX] = _serialize_program(
+        program._remove_training_info(clip_extra=configs.clip_extra)
+    )
+    var_names = _saved_var_names(filter(is_persistable, program.list_vars()))
+    if len(var_names) == 0:
+        warnings.warn(
+            "no variable in your model, please ensure there are any variables in your model to save"
+        )
+    else:
+        async_params[
+            path_prefix + INFER_PARAMS_SUFFIX
+        ] = async_save.snapshot_vars(scope, var_names)
 
 
 @_run_save_pre_hooks
@@ -870,9 +953,17 @@ def save(layer, path, input_spec=None, **configs):
             By default, all return variables of original Layer's forward method are kept as the
             output of the saved model. If the provided ``output_spec`` list is not all output variables,
             the saved model will be pruned according to the given ``output_spec`` list.
+            (2) async_save (bool): If True, the programs are built and the persistable variables are
+            copied to host before returning, and the files are written by background threads, so
+            the layer can be trained while saving. Files are written to temporary paths unique to
+            each call and renamed when all of them are written, so a saved file is never partially
+            written, even if calls saving to the same path overlap. Nothing is renamed if writing
+            fails, but the renames are not atomic as a whole: if one of them fails, the files
+            renamed before it are kept. Default False.
 
     Returns:
-        None
+        None, or a ``concurrent.futures.Future`` if ``async_save`` is True, which is done when
+        all files are saved, call its ``result()`` to wait for it and raise the error of saving.
 
     Examples:
         .. code-block:: python
@@ -1053,6 +1144,10 @@ def save(layer, path, input_spec=None, **configs):
     combine_params = configs.combine_params
     if combine_params:
         configs._program_only = True
+    # path -> content, and path of params file -> snapshots of vars,
+    # which are written in background if async_save
+    async_files = {}
+    async_params = {}
 
     scope = core.Scope()
     extra_var_info = {}
@@ -1257,15 +1352,27 @@ def save(layer, path, input_spec=None, **configs):
                 concrete_program.main_program.global_block().var(name)
                 for name in input_var_names
             ]
-            save_inference_model(
-                path_prefix=file_prefix,
-                feed_vars=input_vars,
-                fetch_vars=output_vars,
-                executor=Executor(_current_expected_place()),
-                program=concrete_program.main_program.clone(),
-                clip_extra=configs.clip_extra,
-                skip_prune_program=configs.skip_prune_program,
-            )
+            if configs.async_save:
+                _prepare_async_inference_model(
+                    file_prefix,
+                    input_vars,
+                    output_vars,
+                    concrete_program.main_program.clone(),
+                    scope,
+                    configs,
+                    async_files,
+                    async_params,
+                )
+            else:
+                save_inference_model(
+                    path_prefix=file_prefix,
+                    feed_vars=input_vars,
+                    fetch_vars=output_vars,
+                    executor=Executor(_current_expected_place()),
+                    program=concrete_program.main_program.clone(),
+                    clip_extra=configs.clip_extra,
+                    skip_prune_program=configs.skip_prune_program,
+                )
 
         if combine_params:
             clone_main_program = concrete_program.main_program.clone()
@@ -1284,22 +1391,28 @@ def save(layer, path, input_spec=None, **configs):
             ordered_vars.append(var)
 
         params_filename = file_prefix + INFER_PARAMS_SUFFIX
-        with scope_guard(scope):
-            paddle.static.save_vars(
-                Executor(_current_expected_place()),
-                dirname=model_path,
-                vars=list(
-                    filter(
-                        paddle.framework.io_utils.is_persistable, ordered_vars
-                    )
-                ),
-                filename=params_filename,
+        if configs.async_save:
+            async_params[
+                os.path.join(os.path.normpath(model_path), params_filename)
+            ] = async_save.snapshot_vars(
+                scope, _saved_var_names(filter(is_persistable, ordered_vars))
             )
+        else:
+            with scope_guard(scope):
+                paddle.static.save_vars(
+                    Executor(_current_expected_place()),
+                    dirname=model_path,
+                    vars=list(filter(is_persistable, ordered_vars)),
+                    filename=params_filename,
+                )
         # save property
         property_save_path = os.path.join(
             os.path.normpath(model_path), file_prefix + INFER_PROPERTY_SUFFIX
         )
-        _save_property(property_save_path, property_vals)
+        if configs.async_save:
+            async_files[property_save_path] = _serialize_property(property_vals)
+        else:
+            _save_property(property_save_path, property_vals)
 
     # NOTE(chenweihang): [ Save extra variable info ]
     # save_inference_model will lose some important variable information, including:
@@ -1324,10 +1437,18 @@ def save(layer, path, input_spec=None, **configs):
             contain_parameter |= isinstance(var, Parameter)
 
     if (isinstance(layer, Layer) or contain_parameter) and extra_var_info:
-        with scope_guard(scope):
-            extra_var_info_path = path + INFER_PARAMS_INFO_SUFFIX
-            with open(extra_var_info_path, 'wb') as f:
-                pickle.dump(extra_var_info, f, protocol=2)
+        extra_var_info_path = path + INFER_PARAMS_INFO_SUFFIX
+        if configs.async_save:
+            async_files[extra_var_info_path] = pickle.dumps(
+                extra_var_info, protocol=2
+            )
+        else:
+            with scope_guard(scope):
+                with open(extra_var_info_path, 'wb') as f:
+                    pickle.dump(extra_var_info, f, protocol=2)
+
+    if configs.async_save:
+        return async_save.submit(async_files, async_params)
 
 
 @dygraph_only
@@ -1358,6 +1479,11 @@ def load(path, **configs):
             (2) params_filename (str): The persistable variables file name of the paddle 1.x
             ``save_inference_model`` save format. No default file name, save variables separately
             by default.
+            (3) mmap (bool): If True, the params file is memory-mapped in copy-on-write mode and the
+            parameters on CPU share memory with it instead of being read into their own buffers, so the
+            models loaded from the same file share the physical memory of the weights, in one process or
+            across processes. A modified parameter only copies the pages it is in, and the file is never
+            written. Parameters on other devices are copied from the memory map. Default False.
 
 
     Returns:
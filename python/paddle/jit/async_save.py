@@ -0,0 +1,150 @@
+# Copyright (c) 2023 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# Asynchronous export of `paddle.jit.save(..., async_save=True)`.
+#
+# The programs are built and serialized and the persistable variables are
+# copied to host in the calling thread, which is the only part blocking the
+# training loop. Files are then written to temporary paths unique to the
+# export by a pool of worker threads, and renamed to their final paths by a
+# single committer thread once all files of the export are written, so
+# exports are committed in the order of calls and a file is never seen
+# partially written, even if exports to the same path overlap. Nothing is
+# renamed if writing any file fails. The renames of an export are not atomic
+# as a whole though: if one of them fails, the files renamed before it are
+# kept beside the files of the previous export.
+
+import itertools
+import os
+import struct
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+
+import numpy as np
+
+from paddle.base import core
+from paddle.base.proto import framework_pb2
+
+__all__ = []
+
+_DEFAULT_NUM_THREADS = 8
+
+_executor_lock = threading.Lock()
+_writer_pool = None
+_committer = None
+_export_ids = itertools.count()
+
+
+def _get_executors():
+    global _writer_pool, _committer
+    with _executor_lock:
+        if _writer_pool is None:
+            _writer_pool = ThreadPoolExecutor(
+                max_workers=_DEFAULT_NUM_THREADS,
+                thread_name_prefix='jit_save_writer',
+            )
+            _committer = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix='jit_save_committer'
+            )
+    return _writer_pool, _committer
+
+
+def snapshot_vars(scope, var_names):
+    """
+    Copies the variables in scope to host, in the order of ``var_names``.
+
+    Returns:
+        list[tuple[int, numpy.ndarray]]: the dtype and data of each variable.
+    """
+    snapshots = []
+    for name in var_names:
+        var = scope.find_var(name)
+        if var is None or not var.is_type(core.VarDesc.VarType.LOD_TENSOR):
+            raise ValueError(
+                f"The variable {name} is not a DenseTensor, which is not "
+                "supported by `paddle.jit.save` with `async_save=True`."
+            )
+        tensor = var.get_tensor()
+        # NOTE: np.array copies, the variable can be updated after here
+        snapshots.append((int(tensor._dtype()), np.array(tensor)))
+    return snapshots
+
+
+def _tensor_header(dtype, shape):
+    # the format of DenseTensor written by `save_combine`:
+    # version, lod level, tensor version, desc size, TensorDesc
+    desc = framework_pb2.VarType.TensorDesc()
+    desc.data_type = dtype
+    desc.dims.extend(shape)
+    desc_bytes = desc.SerializeToString()
+    return struct.pack('<IQIi', 0, 0, 0, len(desc_bytes)) + desc_bytes
+
+
+def _tmp_path(path, export_id):
+    # NOTE: unique to the export, so that overlapping exports to the same
+    # path never write the same file
+    return f'{path}.{os.getpid()}.{export_id}.tmp'
+
+
+def _write_file(tmp_path, content):
+    with open(tmp_path, 'wb') as f:
+        f.write(content)
+
+
+def _write_params(tmp_path, snapshots):
+    with open(tmp_path, 'wb') as f:
+        for dtype, data in snapshots:
+            f.write(_tensor_header(dtype, data.shape))
+            f.write(memoryview(np.ascontiguousarray(data)).cast('B'))
+
+
+def _commit(futures, tmp_paths):
+    wait(futures)
+    try:
+        for future in futures:
+            future.result()
+        for path, tmp_path in tmp_paths.items():
+            os.replace(tmp_path, path)
+    except BaseException:
+        for tmp_path in tmp_paths.values():
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        raise
+
+
+def submit(files, params):
+    """
+    Writes the files of an export in background.
+
+    Args:
+        files(dict[str, bytes]): maps a path to its content.
+        params(dict[str, list]): maps a path of params file to the snapshots
+            of variables returned by `snapshot_vars`.
+
+    Returns:
+        concurrent.futures.Future: done when all files are written and
+        renamed, the result is None.
+    """
+    writer_pool, committer = _get_executors()
+    export_id = next(_export_ids)
+    tmp_paths = {path: _tmp_path(path, export_id) for path in [*files, *params]}
+    futures = [
+        writer_pool.submit(_write_file, tmp_paths[path], content)
+        for path, content in files.items()
+    ]
+    futures += [
+        writer_pool.submit(_write_params, tmp_paths[path], snapshots)
+        for path, snapshots in params.items()
+    ]
+    return committer.submit(_commit, futures, tmp_paths)
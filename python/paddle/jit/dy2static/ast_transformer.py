@@ -17,7 +17,11 @@
 # as produced by ast.parse from the standard ast module.
 # See details in https://github.com/serge-sans-paille/gast/
 
+import collections
 import os
+import time
+
+from paddle.utils import gast
 
 from . import logging_utils
 from .assert_transformer import AssertTransformer
@@ -59,11 +63,174 @@ def apply_optimization(transformers):
         transformers.insert(3, BreakTransformOptimizer)
 
 
+def scan_features(root):
+    """
+    Returns the features of AST which decide the transformers to apply, including
+    the names of node types, ``.attr`` for attribute names and ``@`` for decorators.
+    """
+    features = set()
+    for node in gast.walk(root):
+        features.add(type(node).__name__)
+        if isinstance(node, gast.Attribute):
+            features.add('.' + node.attr)
+        elif (
+            isinstance(node, (gast.FunctionDef, gast.ClassDef))
+            and node.decorator_list
+        ):
+            features.add('@')
+    return features
+
+
+def _has_any(*names):
+    return lambda features: not features.isdisjoint(names)
+
+
+_CONTROL_FLOW_NODES = ('If', 'IfExp', 'For', 'While')
+
+# Transformers are skipped if the AST has none of the features they deal with,
+# transformers not listed here are always applied.
+_TRANSFORMER_CONDITIONS = {
+    RegisterHookTransformer: _has_any('.register_hook'),
+    EarlyReturnTransformer: lambda f: 'If' in f and 'Return' in f,
+    BasicApiTransformer: _has_any('Call', '.size'),
+    TensorShapeTransformer: _has_any('.shape'),
+    BreakContinueTransformer: _has_any('Break', 'Continue'),
+    BreakTransformOptimizer: _has_any('Break'),
+    ReturnTransformer: _has_any('Return'),
+    LogicalTransformer: _has_any('BoolOp', 'UnaryOp'),
+    CreateVariableTransformer: _has_any(*_CONTROL_FLOW_NODES),
+    LoopTransformer: _has_any('For', 'While'),
+    IfElseTransformer: _has_any('If', 'IfExp', '.numpy'),
+    AssertTransformer: _has_any('Assert'),
+    CallTransformer: _has_any('Call'),
+    CastTransformer: _has_any('Call'),
+    DecoratorTransformer: _has_any('@'),
+}
+
+# Node types of trivial functions, which only compute on their arguments and
+# local variables, so they run the same without transformation.
+_TRIVIAL_NODES = {
+    'Module',
+    'FunctionDef',
+    'arguments',
+    'Name',
+    'Load',
+    'Store',
+    'Param',
+    'Assign',
+    'AugAssign',
+    'Return',
+    'Pass',
+    'Constant',
+    'Tuple',
+    'List',
+    'BinOp',
+    'UnaryOp',
+    'UAdd',
+    'USub',
+    'Compare',
+    'Subscript',
+    'Slice',
+    'Add',
+    'Sub',
+    'Mult',
+    'MatMult',
+    'Div',
+    'FloorDiv',
+    'Mod',
+    'Pow',
+    'Eq',
+    'NotEq',
+    'Lt',
+    'LtE',
+    'Gt',
+    'GtE',
+}
+
+
+def is_trivial_function(root):
+    """
+    Whether the function in AST only computes on its arguments and local
+    variables with arithmetic and comparison, without calls, attributes,
+    control flow and decorators, so it doesn't need to be transformed.
+    """
+    func_defs = []
+    local_names = set()
+    for node in gast.walk(root):
+        if type(node).__name__ not in _TRIVIAL_NODES:
+            return False
+        if isinstance(node, gast.FunctionDef):
+            func_defs.append(node)
+        elif isinstance(node, gast.Name) and not isinstance(
+            node.ctx, gast.Load
+        ):
+            local_names.add(node.id)
+        elif isinstance(node, gast.Subscript) and not isinstance(
+            node.ctx, gast.Load
+        ):
+            return False
+    if len(func_defs) != 1 or func_defs[0].decorator_list:
+        return False
+    # arguments and assigned names are stored names, other names are globals
+    return all(
+        node.id in local_names
+        for node in gast.walk(root)
+        if isinstance(node, gast.Name) and isinstance(node.ctx, gast.Load)
+    )
+
+
+class TransformStats:
+    """
+    Accumulated count of applied and skipped times and cost of each transformer.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        # name -> [applied count, skipped count, total seconds]
+        self._stats = collections.defaultdict(lambda: [0, 0, 0.0])
+
+    def record(self, name, seconds=None):
+        """
+        Records an application of transformer, or a skip if seconds is None.
+        """
+        stat = self._stats[name]
+        if seconds is None:
+            stat[1] += 1
+        else:
+            stat[0] += 1
+            stat[2] += seconds
+
+    def get(self, name):
+        """
+        Returns (applied count, skipped count, total seconds) of the transformer.
+        """
+        return tuple(self._stats.get(name, (0, 0, 0.0)))
+
+    def summary(self):
+        lines = [
+            "{:>28} {:>8} {:>8} {:>10}".format(
+                'transformer', 'applied', 'skipped', 'time(ms)'
+            )
+        ]
+        for name, (applied, skipped, seconds) in sorted(
+            self._stats.items(), key=lambda item: -item[1][2]
+        ):
+            lines.append(
+                f"{name:>28} {applied:>8} {skipped:>8} {seconds * 1e3:>10.2f}"
+            )
+        return "\n".join(lines)
+
+
 class DygraphToStaticAst(BaseTransformer):
     """
     Main class to transform Dygraph to Static Graph
     """
 
+    # shared by all instances, see `TransformStats`
+    stats = TransformStats()
+
     def __init__(self):
         self.translator_logger = logging_utils.TranslatorLogger()
 
@@ -76,7 +243,9 @@ class DygraphToStaticAst(BaseTransformer):
         return self.root
 
     def _apply(self, transformer, node, log_level):
+        start = time.perf_counter()
         transformer(node).transform()
+        self.stats.record(transformer.__name__, time.perf_counter() - start)
         self.translator_logger.log_transformed_code(
             log_level, self.root, transformer.__name__
         )
@@ -109,8 +278,15 @@ class DygraphToStaticAst(BaseTransformer):
 
         apply_optimization(transformers)
 
+        features = scan_features(node)
         for index, transformer in enumerate(transformers):
+            condition = _TRANSFORMER_CONDITIONS.get(transformer)
+            if condition is not None and not condition(features):
+                self.stats.record(transformer.__name__)
+                continue
             self._apply(transformer, node, log_level=index + 1)
+            # transformers may introduce new nodes, e.g. calls of `_jst`
+            features = scan_features(node)
 
         self.translator_logger.log_transformed_code(
             logging_utils.LOG_AllTransformer, self.root, "All Transformers"
@@ -0,0 +1,504 @@
+# Copyright (c) 2023 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import hashlib
+import inspect
+import os
+import pickle
+import sys
+import tempfile
+import threading
+
+from paddle.base import core, framework
+from paddle.base.dygraph.base import switch_to_static_graph
+from paddle.base.unique_name import UniqueNameGenerator
+from paddle.nn.layer import layers
+from paddle.utils import map_structure
+
+from . import logging_utils
+from .utils import unwrap
+
+__all__ = []
+
+CACHE_DIR_ENV_NAME = 'PADDLE_JIT_CACHE_DIR'
+
+# NOTE: [Persistent cache of to_static]
+# The cache directory holds two kinds of entries:
+# 1. code: the transformed source code and origin info of a converted
+#    function, keyed by its source code and location, so a warm start
+#    skips parsing and all AST transformers.
+# 2. program: the serialized main/startup program and the structure of
+#    inputs, outputs and parameters of a ConcreteProgram, keyed by the
+#    function, input specs, the signature of the Layer (type, simple
+#    attributes, parameters and buffers) and flags affecting the program.
+#    Source files of all functions converted while building the program
+#    are hashed and checked before a program entry is reused.
+# Entries are placed in a sub directory named by Paddle version and
+# Python version, broken or stale entries are treated as missed, and
+# files are written to a temporary file and renamed atomically, so the
+# directory can be shared between processes.
+
+_UNSET = object()
+_cache_dir = _UNSET
+_cache = None
+_cache_lock = threading.Lock()
+_dependency_recorder = threading.local()
+
+_SIMPLE_TYPES = (bool, int, float, str, type(None))
+
+
+def set_cache_dir(cache_dir=None):
+    """
+    Sets the directory of the persistent cache of `@to_static`. Transformed
+    code and programs are saved into the directory, and reused by later
+    processes to skip code transformation and program building.
+
+    There are two means to set the cache directory:
+
+    1. Call function `set_cache_dir`
+
+    2. Set environment variable `PADDLE_JIT_CACHE_DIR`
+
+    **Note**:
+    `set_cache_dir` has a higher priority than the environment variable.
+    Only the source code of functions converted by `@to_static` is tracked
+    for invalidation, please clear the directory if the behavior of other
+    code used by the converted functions is changed.
+
+    Args:
+        cache_dir(str|None): The cache directory. The default value is None,
+            which means the persistent cache is disabled.
+
+    Examples:
+        .. code-block:: python
+
+            >>> import paddle
+
+            >>> paddle.jit.set_cache_dir('./to_static_cache')
+            >>> # Transformed code and programs are cached in ./to_static_cache
+
+            >>> paddle.jit.set_cache_dir(None)
+            >>> # The persistent cache is disabled
+    """
+    global _cache_dir, _cache
+    with _cache_lock:
+        _cache_dir = cache_dir
+        _cache = None
+
+
+def get_cache_dir():
+    if _cache_dir is not _UNSET:
+        return _cache_dir
+    return os.environ.get(CACHE_DIR_ENV_NAME) or None
+
+
+def get_persistent_cache():
+    """
+    Returns the PersistentCache of current cache directory, or None if the
+    persistent cache is disabled.
+    """
+    global _cache
+    cache_dir = get_cache_dir()
+    if cache_dir is None:
+        return None
+    with _cache_lock:
+        if _cache is None or _cache.cache_dir != cache_dir:
+            _cache = PersistentCache(cache_dir)
+        return _cache
+
+
+def _hash(*items):
+    sha = hashlib.sha256()
+    for item in items:
+        sha.update(repr(item).encode('utf-8'))
+        sha.update(b'\0')
+    return sha.hexdigest()
+
+
+def _file_digest(path):
+    try:
+        with open(path, 'rb') as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except OSError:
+        return None
+
+
+def _environment_tag():
+    from paddle import version
+
+    return _hash(
+        version.full_version,
+        version.commit,
+        sys.version_info[:2],
+        core.is_compiled_with_cuda(),
+    )[:16]
+
+
+class PersistentCache:
+    """
+    Pickled entries under a cache directory, see [Persistent cache of
+    to_static].
+    """
+
+    def __init__(self, cache_dir):
+        self.cache_dir = cache_dir
+        self.root = os.path.join(
+            os.path.abspath(os.path.expanduser(cache_dir)), _environment_tag()
+        )
+
+    def _path(self, kind, key):
+        return os.path.join(self.root, kind, key + '.pkl')
+
+    def load(self, kind, key):
+        path = self._path(kind, key)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, 'rb') as f:
+                return pickle.load(f)
+        except Exception as e:
+            logging_utils.warn(
+                f"Failed to load to_static cache {path}, it will be rebuilt: {e}"
+            )
+            self.remove(kind, key)
+            return None
+
+    def save(self, kind, key, value):
+        path = self._path(kind, key)
+        try:
+            data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(
+                dir=os.path.dirname(path), suffix='.tmp'
+            )
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(data)
+                os.replace(tmp_path, path)
+            except BaseException:
+                os.remove(tmp_path)
+                raise
+        except Exception as e:
+            logging_utils.log(
+                2, f"Skip saving to_static cache of {key} because: {e}"
+            )
+            return False
+        return True
+
+    def remove(self, kind, key):
+        try:
+            os.remove(self._path(kind, key))
+        except OSError:
+            pass
+
+
+def record_dependency(function):
+    """
+    Records the source file of a converted function as a dependency of the
+    program being built.
+    """
+    dependencies = getattr(_dependency_recorder, 'files', None)
+    if dependencies is None:
+        return
+    try:
+        path = inspect.getsourcefile(unwrap(function))
+    except TypeError:
+        path = None
+    if path is not None:
+        dependencies.add(path)
+
+
+class DependencyRecorder:
+    """
+    Context to record source files of functions converted inside it.
+    """
+
+    def __enter__(self):
+        self._old = getattr(_dependency_recorder, 'files', None)
+        self.files = set()
+        _dependency_recorder.files = self.files
+        return self
+
+    def __exit__(self, *args):
+        _dependency_recorder.files = self._old
+        if self._old is not None:
+            # dependencies of nested program are also dependencies of outer
+            self._old.update(self.files)
+
+
+def code_cache_key(function, source_code):
+    function = unwrap(function)
+    try:
+        filepath = inspect.getsourcefile(function)
+        lineno = function.__code__.co_firstlineno
+    except (TypeError, AttributeError):
+        return None
+    return _hash(source_code, filepath, lineno)
+
+
+def load_transformed_code(function, source_code):
+    """
+    Returns (transformed_source, origin_info_map) of function from the
+    persistent cache, origin_info_map maps lineno of transformed source to
+    OriginInfo of dygraph code.
+    """
+    cache = get_persistent_cache()
+    if cache is None:
+        return None
+    key = code_cache_key(function, source_code)
+    if key is None:
+        return None
+    entry = cache.load('code', key)
+    if entry is None or entry.get('source_code') != source_code:
+        return None
+    logging_utils.log(
+        2, f"Hit to_static code cache of function {function.__name__}"
+    )
+    return entry['transformed_source'], entry['origin_info_map']
+
+
+def save_transformed_code(
+    function, source_code, transformed_source, origin_info_map
+):
+    cache = get_persistent_cache()
+    if cache is None:
+        return
+    key = code_cache_key(function, source_code)
+    if key is None:
+        return
+    cache.save(
+        'code',
+        key,
+        {
+            'source_code': source_code,
+            'transformed_source': transformed_source,
+            'origin_info_map': origin_info_map,
+        },
+    )
+
+
+class _VarRef:
+    """
+    Placeholder of a Variable of main program in cached inputs and outputs.
+    """
+
+    __slots__ = ('name',)
+
+    def __init__(self, name):
+        self.name = name
+
+
+class _LayerRef:
+    """
+    Placeholder of the class instance in cached inputs.
+    """
+
+
+def _simple_value(value):
+    if isinstance(value, _SIMPLE_TYPES):
+        return True
+    if isinstance(value, (list, tuple)):
+        return all(_simple_value(v) for v in value)
+    return False
+
+
+def layer_signature(layer):
+    """
+    Describes things of a Layer that may affect the program built from it:
+    the types, simple attributes, parameters and buffers of the layer and
+    its sublayers.
+    """
+    if layer is None:
+        return None
+    signature = []
+    for name, sublayer in layer.named_sublayers(include_self=True):
+        attrs = sorted(
+            (k, v)
+            for k, v in vars(sublayer).items()
+            if not k.startswith('_') and _simple_value(v)
+        )
+        tensors = [
+            (k, t.name, tuple(t.shape), str(t.dtype), t.stop_gradient)
+            for k, t in list(sublayer._parameters.items())
+            + list(sublayer._buffers.items())
+            if t is not None
+        ]
+        signature.append(
+            (
+                name,
+                type(sublayer).__module__,
+                type(sublayer).__qualname__,
+                sublayer.training,
+                attrs,
+                tensors,
+            )
+        )
+    return signature
+
+
+def _program_flags():
+    from paddle.framework import use_pir_api
+
+    return (
+        use_pir_api(),
+        os.environ.get('FLAGS_enable_new_ir_in_executor', None),
+        core._is_fwd_prim_enabled(),
+        core._is_bwd_prim_enabled(),
+        framework.default_main_program().random_seed,
+    )
+
+
+def program_cache_key(cache_key):
+    """
+    Returns a persistent key of a CacheKey, or None if the persistent cache
+    is disabled or the inputs cannot be described persistently, such as
+    python objects without stable repr.
+    """
+    if get_persistent_cache() is None:
+        return None
+    function = unwrap(cache_key.function_spec.dygraph_function)
+    try:
+        source_file = inspect.getsourcefile(function)
+        source_code = inspect.getsource(function)
+    except (TypeError, OSError):
+        return None
+    input_specs = repr(
+        (cache_key.input_args_with_spec, cache_key.input_kwargs_with_spec)
+    )
+    # repr of objects without __repr__ contains address, which changes
+    # between processes
+    if ' at 0x' in input_specs:
+        return None
+    kwargs = cache_key.kwargs
+    build_strategy = kwargs.get('build_strategy', None)
+    return _hash(
+        getattr(function, '__module__', None),
+        getattr(function, '__qualname__', None),
+        source_file,
+        source_code,
+        input_specs,
+        layer_signature(cache_key.class_instance),
+        kwargs.get('with_hook', False),
+        kwargs.get('is_train', False),
+        kwargs.get('backend', None),
+        getattr(build_strategy, 'build_cinn_pass', None),
+        _program_flags(),
+    )
+
+
+def _dependency_digests(files):
+    return {path: _file_digest(path) for path in sorted(files)}
+
+
+def save_concrete_program(key, concrete_program, dependencies):
+    """
+    Saves a ConcreteProgram built by legacy IR into the persistent cache.
+    """
+    cache = get_persistent_cache()
+    if cache is None or key is None:
+        return
+
+    def to_ref(value):
+        if isinstance(value, framework.Variable):
+            return _VarRef(value.name)
+        if isinstance(value, layers.Layer):
+            return _LayerRef()
+        return value
+
+    try:
+        entry = {
+            'main_program': concrete_program.main_program.desc.serialize_to_string(),
+            'startup_program': concrete_program.startup_program.desc.serialize_to_string(),
+            'inputs': map_structure(to_ref, concrete_program.inputs),
+            'outputs': map_structure(to_ref, concrete_program.outputs),
+            'parameters': [p.name for p in concrete_program.parameters],
+            'name_generator': (
+                concrete_program.name_generator.prefix,
+                dict(concrete_program.name_generator.ids),
+            ),
+            'dependencies': _dependency_digests(dependencies),
+        }
+    except Exception as e:
+        logging_utils.log(
+            2, f"Skip saving to_static program cache because: {e}"
+        )
+        return
+    cache.save('program', key, entry)
+
+
+@switch_to_static_graph
+def load_concrete_program(key, cache_key):
+    """
+    Returns the ConcreteProgram of cache_key from the persistent cache, or
+    None if it is missed or stale.
+    """
+    from .program_translator import ConcreteProgram
+
+    cache = get_persistent_cache()
+    if cache is None or key is None:
+        return None
+    entry = cache.load('program', key)
+    if entry is None:
+        return None
+    dependencies = entry['dependencies']
+    if _dependency_digests(dependencies) != dependencies:
+        logging_utils.log(
+            2, "to_static program cache is stale since source code changed"
+        )
+        cache.remove('program', key)
+        return None
+
+    class_instance = cache_key.class_instance
+    tensors = {}
+    if class_instance is not None:
+        for tensor in class_instance.parameters() + class_instance.buffers():
+            tensors[tensor.name] = tensor
+    if any(name not in tensors for name in entry['parameters']):
+        return None
+    parameters = [tensors[name] for name in entry['parameters']]
+
+    main_program = framework.Program.parse_from_string(entry['main_program'])
+    startup_program = framework.Program.parse_from_string(
+        entry['startup_program']
+    )
+    main_program.random_seed = framework.default_main_program().random_seed
+    startup_program.random_seed = (
+        framework.default_startup_program().random_seed
+    )
+    block = main_program.global_block()
+
+    def from_ref(value):
+        if isinstance(value, _VarRef):
+            return block.var(value.name)
+        if isinstance(value, _LayerRef):
+            return class_instance
+        return value
+
+    prefix, ids = entry['name_generator']
+    name_generator = UniqueNameGenerator(prefix)
+    name_generator.ids.update(ids)
+    logging_utils.log(
+        2,
+        f"Hit to_static program cache of function {cache_key.function_spec.dygraph_function.__name__}",
+    )
+    return ConcreteProgram(
+        inputs=map_structure(from_ref, entry['inputs']),
+        outputs=map_structure(from_ref, entry['outputs']),
+        parameters=parameters,
+        function=cache_key.function_spec.dygraph_function,
+        name_generator=name_generator,
+        main_program=main_program,
+        startup_program=startup_program,
+        **cache_key.kwargs,
+    )
@@ -13,10 +13,12 @@
 # limitations under the License.
 
 import collections
+import hashlib
 import inspect
 import os
 import textwrap
 import threading
+import types
 import warnings
 import weakref
 
@@ -36,7 +38,7 @@ from paddle.nn.layer import layers
 from paddle.utils import flatten, gast
 
 from . import error, logging_utils
-from .ast_transformer import DygraphToStaticAst
+from .ast_transformer import DygraphToStaticAst, is_trivial_function
 from .function_spec import (
     FunctionSpec,
     _hash_spec_names,
@@ -49,13 +51,23 @@ from .newir_partial_program import (
 from .origin_info import (
     attach_origin_info,
     create_and_update_origin_info_map,
+    global_origin_info_map,
     update_op_callstack_with_origin_info,
 )
 from .partial_program import PartialProgramLayerHook
+from .persistent_cache import (
+    DependencyRecorder,
+    load_concrete_program,
+    load_transformed_code,
+    program_cache_key,
+    record_dependency,
+    save_concrete_program,
+    save_transformed_code,
+)
+from .shape_buckets import ShapeBuckets
 from .utils import (
     ALREADY_D2S,
     NO_SHAPE_VAR_TYPE,
-    ast_to_func,
     ast_to_source_code,
     backend_guard,
     func_to_source_code,
@@ -63,6 +75,7 @@ from .utils import (
     is_paddle_func,
     make_hashable,
     prim_or_cinn_is_enabled,
+    source_to_func,
     type_name,
     unwrap,
 )
@@ -94,7 +107,8 @@ class FunctionCache:
     def __init__(self):
         # Caches the converted static functions. {dygraph_func: static_func}
         self._converted_static_func_caches = weakref.WeakKeyDictionary()
-        # Caches the converted ast node for same source code. {source_code: ast_root}
+        # Caches the converted ast node for same function. {(qualname, source_hash): ast_root},
+        # ast_root is None if the function is trivial and not transformed.
         self._code_to_ast_caches = {}
         self._dygraph_to_static = DygraphToStaticAst()
 
@@ -128,29 +142,91 @@ class FunctionCache:
                 return z
 
         If the conversion of A.foo happens after B.foo, it will reuse the transformed ast node of B.foo
-        to speed up the conversion.
+        to speed up the conversion. The ast nodes are keyed by the qualified name and the hash of
+        source code, so methods with same source code in different classes are converted separately.
+
+        Trivial functions, which only compute on arguments and local variables without calls and
+        control flow, are returned as is without transformation, see `is_trivial_function`.
+
+        If the persistent cache is enabled by `paddle.jit.set_cache_dir`, the transformed code is loaded
+        from the cache directory instead of being transformed again.
         """
         # Note: In Python2, it will raise OSError when inspect function
         # with decorator directly and function.__wrapped__ holds the actual function.
         func = unwrap(func)
         source_code = func_to_source_code(func)
+        cache_key = (
+            getattr(func, '__qualname__', None),
+            hashlib.sha256(source_code.encode('utf-8')).hexdigest(),
+        )
 
-        # TODO(liym27):
-        #  Consider this case: source_code in self._code_to_ast_caches,
-        #  but actually they are methods in different classes.
-        #  Maybe use (__class__, source_code) as key
-        if source_code in self._code_to_ast_caches:
-            root = self._code_to_ast_caches[source_code]
+        # only cache code transformed from the source of func, since origin
+        # info of reused ast node belongs to another function
+        is_transformed = False
+        if cache_key in self._code_to_ast_caches:
+            root = self._code_to_ast_caches[cache_key]
+            if root is None:
+                return self._trivial_func(func)
         else:
+            cached_code = load_transformed_code(func, source_code)
+            if cached_code is not None:
+                return self._convert_from_cache(func, *cached_code)
             root = gast.parse(source_code)
+            if is_trivial_function(root):
+                self._code_to_ast_caches[cache_key] = None
+                return self._trivial_func(func)
             root = attach_origin_info(root, func)
             root = self._dygraph_to_static.get_static_ast(root)
-            self._code_to_ast_caches[source_code] = root
+            self._code_to_ast_caches[cache_key] = root
+            is_transformed = True
 
         # Get static function from AST
-        static_func, file_name = ast_to_func(root, func)
+        transformed_source = ast_to_source_code(root)
+        static_func, file_name = source_to_func(transformed_source, func)
+
+        origin_info_map = create_and_update_origin_info_map(
+            root, static_func, is_global=False
+        )
+        if is_transformed:
+            save_transformed_code(
+                func,
+                source_code,
+                transformed_source,
+                {
+                    lineno: info
+                    for (filepath, lineno), info in origin_info_map.items()
+                    if filepath == file_name
+                },
+            )
+        return static_func
+
+    def _trivial_func(self, func):
+        # NOTE: return a new function sharing the code of func, since the
+        # converted function is marked by ALREADY_D2S, and bound methods are
+        # converted into plain functions like the transformed ones.
+        if inspect.ismethod(func):
+            func = func.__func__
+        static_func = types.FunctionType(
+            func.__code__,
+            func.__globals__,
+            func.__name__,
+            func.__defaults__,
+            func.__closure__,
+        )
+        static_func.__kwdefaults__ = func.__kwdefaults__
+        static_func.__qualname__ = func.__qualname__
+        static_func.__module__ = func.__module__
+        static_func.__doc__ = func.__doc__
+        return static_func
 
-        create_and_update_origin_info_map(root, static_func)
+    def _convert_from_cache(self, func, transformed_source, origin_info_map):
+        static_func, file_name = source_to_func(transformed_source, func)
+        global_origin_info_map.update(
+            {
+                (file_name, lineno): info
+                for lineno, info in origin_info_map.items()
+            }
+        )
         return static_func
 
     def exist(self, func):
@@ -182,6 +258,7 @@ def convert_to_static(function):
     if need_skip:
         return function.__func__ if inspect.ismethod(function) else function
 
+    record_dependency(function)
     with _CACHE_LOCK:
         static_func = _FUNCTION_CACHE.convert_with_cache(function)
         setattr(static_func, ALREADY_D2S, True)
@@ -358,7 +435,16 @@ class StaticFunction:
 
         self._input_spec = input_spec
         self._function_spec = FunctionSpec(function, input_spec)
-        self._program_cache = ProgramCache()
+        self._program_cache = ProgramCache(
+            max_size=kwargs.get("program_cache_size", 0),
+            max_memory=kwargs.get("program_cache_memory", 0),
+        )
+        shape_buckets = kwargs.get("shape_buckets", None)
+        if shape_buckets is not None and not isinstance(
+            shape_buckets, ShapeBuckets
+        ):
+            shape_buckets = ShapeBuckets(shape_buckets)
+        self._shape_buckets = shape_buckets
         self._descriptor_cache = weakref.WeakKeyDictionary()
         # Note: Hold a reference to ProgramTranslator for switching `enable_to_static`.
         self._program_trans = ProgramTranslator()
@@ -702,6 +788,10 @@ class SymbolicStaticFunction(StaticFunction):
         from ..sot import symbolic_translate
 
         args, kwargs = self._function_spec.unified_args_and_kwargs(args, kwargs)
+        if self._shape_buckets is not None:
+            args, kwargs = self._shape_buckets.pad_args(
+                self._function_spec.args_name, args, kwargs
+            )
         (
             input_args_with_spec,
             input_kwargs_with_spec,
@@ -769,6 +859,10 @@ class ASTStaticFunction(StaticFunction):
     def _perform_call(self, *args, **kwargs):
         # 1. trace ops from dygraph layers and cache the generated program.
         args, kwargs = self._function_spec.unified_args_and_kwargs(args, kwargs)
+        if self._shape_buckets is not None:
+            args, kwargs = self._shape_buckets.pad_args(
+                self._function_spec.args_name, args, kwargs
+            )
 
         try:
             concrete_program, partial_program_layer = self.get_concrete_program(
@@ -1517,16 +1611,27 @@ class PirPrimHooker(PirPartialProgramLayerHook):
 class ProgramCache:
     """
     Wrapper class for the program functions defined by dygraph function.
+
+    Args:
+        max_size(int): Max number of cached programs, the least recently used
+            one is evicted if exceeded. 0 means unlimited.
+        max_memory(int): Max bytes of cached programs, which are approximated
+            by the sizes of their serialized main programs. 0 means unlimited.
     """
 
     dy2static_error_file = "to_static.error"
 
-    def __init__(self):
-        # {hash_id : (concrete_program, partial_layer)}
+    def __init__(self, max_size=0, max_memory=0):
+        # {hash_id : (concrete_program, partial_layer)}, in LRU order
         self._caches = collections.OrderedDict()
         # trace mostly recent used program
         self._recent_key = None
         self._recent_cache_key = None
+        self.max_size = max_size
+        self.max_memory = max_memory
+        # {hash_id : approximate bytes of program}
+        self._memory = {}
+        self.evicted_count = 0
 
     def _build_once(self, cache_key):
         # TODO(Aurelius84): Need a gloabl FLAGS to enable/disable to_prim
@@ -1544,13 +1649,7 @@ class ProgramCache:
                     **cache_key.kwargs,
                 )
             else:
-                concrete_program = ConcreteProgram.from_func_spec(
-                    func_spec=cache_key.function_spec,
-                    input_spec=cache_key.input_args_with_spec,
-                    input_kwargs_spec=cache_key.input_kwargs_with_spec,
-                    class_instance=cache_key.class_instance,
-                    **cache_key.kwargs,
-                )
+                concrete_program = self._build_concrete_program(cache_key)
         except Exception as e:
             if enable_fallback:
                 warnings.warn(
@@ -1607,6 +1706,29 @@ class ProgramCache:
                     )
         return concrete_program, partial_program
 
+    def _build_concrete_program(self, cache_key):
+        # NOTE: programs of new IR can not be serialized yet, only programs
+        # of legacy IR are saved into the persistent cache.
+        persistent_key = program_cache_key(cache_key)
+        if persistent_key is not None:
+            concrete_program = load_concrete_program(persistent_key, cache_key)
+            if concrete_program is not None:
+                return concrete_program
+
+        with DependencyRecorder() as recorder:
+            concrete_program = ConcreteProgram.from_func_spec(
+                func_spec=cache_key.function_spec,
+                input_spec=cache_key.input_args_with_spec,
+                input_kwargs_spec=cache_key.input_kwargs_with_spec,
+                class_instance=cache_key.class_instance,
+                **cache_key.kwargs,
+            )
+        if persistent_key is not None:
+            save_concrete_program(
+                persistent_key, concrete_program, recorder.files
+            )
+        return concrete_program
+
     def __getitem__(self, item):
         if not isinstance(item, CacheKey):
             raise ValueError(
@@ -1616,8 +1738,16 @@ class ProgramCache:
         item_id = hash(item)
         self._recent_cache_key = item
         self._recent_key = item_id
-        if item_id not in self._caches:
+        if item_id in self._caches:
+            self._caches.move_to_end(item_id)
+        else:
             self._caches[item_id] = self._build_once(item)
+            # NOTE: serializing a program costs, only measure it if limited
+            if self.max_memory > 0:
+                self._memory[item_id] = _program_memory(
+                    self._caches[item_id][0]
+                )
+            self._evict()
             # Note: raise warnings if number of traced program is more than `max_tracing_count`
             current_tracing_count = len(self._caches)
             if current_tracing_count > MAX_TRACED_PROGRAM_COUNT:
@@ -1630,6 +1760,29 @@ class ProgramCache:
 
         return self._caches[item_id]
 
+    def _evict(self):
+        # the most recently built program is always kept
+        while len(self._caches) > 1 and (
+            0 < self.max_size < len(self._caches)
+            or 0 < self.max_memory < self.memory_usage
+        ):
+            item_id, _ = self._caches.popitem(last=False)
+            self._memory.pop(item_id, None)
+            self.evicted_count += 1
+            logging_utils.log(
+                2,
+                "Evict the least recently used program from ProgramCache, "
+                f"{len(self._caches)} programs with {self.memory_usage} bytes remain.",
+            )
+
+    @property
+    def memory_usage(self):
+        """
+        Approximate bytes of all cached programs, which are only measured
+        if ``max_memory`` is set, otherwise 0.
+        """
+        return sum(self._memory.values())
+
     def get_program_without_cache(self, cache_key):
         return self._build_once(cache_key=cache_key)
 
@@ -1661,6 +1814,19 @@ class ProgramCache:
 
     def clear(self):
         self._caches = collections.OrderedDict()
+        self._memory = {}
+
+
+def _program_memory(concrete_program):
+    # parameters are held by layers rather than the cache, so only the
+    # program itself is counted
+    main_program = getattr(concrete_program, "main_program", None)
+    if main_program is None:
+        return 0
+    desc = getattr(main_program, "desc", None)
+    if desc is not None and hasattr(desc, "serialize_to_string"):
+        return len(desc.serialize_to_string())
+    return len(str(main_program))
 
 
 class PrimHooker(PartialProgramLayerHook):
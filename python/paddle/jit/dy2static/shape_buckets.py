@@ -0,0 +1,106 @@
+# Copyright (c) 2023 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import bisect
+
+import paddle
+from paddle.base import core
+
+__all__ = []
+
+
+def _next_power_of_two(size):
+    return 1 << max(size - 1, 0).bit_length()
+
+
+class ShapeBuckets:
+    """
+    Pads the tensor arguments of a function along the bucketed dims to the
+    upper bound of the bucket their sizes fall in, so that the inputs of
+    different sizes share the program of a bucket.
+
+    Args:
+        buckets(dict): maps the name of an argument to a dict of
+            ``{dim: boundaries}``. ``boundaries`` is a sorted list of the
+            sizes to pad to, a size greater than the last boundary is not
+            padded. If ``boundaries`` is None, sizes are padded to the next
+            power of two.
+        pad_value(int|float): the value to pad with. Default: 0.
+
+    Note:
+        The padded inputs are passed to the function as is, so the function
+        should be aware of the padding, e.g. by masking. The outputs are not
+        sliced back.
+    """
+
+    def __init__(self, buckets, pad_value=0):
+        if not isinstance(buckets, dict):
+            raise TypeError(
+                f"The type of `shape_buckets` should be dict, but received {type(buckets).__name__}."
+            )
+        self.buckets = {}
+        for name, dims in buckets.items():
+            self.buckets[name] = {
+                dim: None if boundaries is None else sorted(boundaries)
+                for dim, boundaries in dims.items()
+            }
+        self.pad_value = pad_value
+
+    def bucket_size(self, boundaries, size):
+        """
+        Returns the size padded to, which is the size itself if it is out of
+        the buckets.
+        """
+        if boundaries is None:
+            return _next_power_of_two(size)
+        index = bisect.bisect_left(boundaries, size)
+        if index == len(boundaries):
+            return size
+        return boundaries[index]
+
+    def pad(self, tensor, dims):
+        for dim, boundaries in dims.items():
+            if not -tensor.ndim <= dim < tensor.ndim:
+                continue
+            size = tensor.shape[dim]
+            target = self.bucket_size(boundaries, size)
+            if target == size:
+                continue
+            pad_shape = list(tensor.shape)
+            pad_shape[dim] = target - size
+            padding = paddle.full(pad_shape, self.pad_value, tensor.dtype)
+            padding.stop_gradient = True
+            tensor = paddle.concat([tensor, padding], axis=dim)
+        return tensor
+
+    def pad_args(self, arg_names, args, kwargs):
+        """
+        Pads the tensor arguments with buckets.
+
+        Args:
+            arg_names(list[str]): the names of positional arguments.
+            args(tuple): the positional arguments.
+            kwargs(dict): the keyword arguments.
+
+        Returns:
+            The padded args and kwargs.
+        """
+        args = list(args)
+        for i, name in enumerate(arg_names[: len(args)]):
+            if name in self.buckets and isinstance(args[i], core.eager.Tensor):
+                args[i] = self.pad(args[i], self.buckets[name])
+        for name, value in kwargs.items():
+            if name in self.buckets and isinstance(value, core.eager.Tensor):
+                kwargs[name] = self.pad(value, self.buckets[name])
+        return tuple(args), kwargs
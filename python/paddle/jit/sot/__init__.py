@@ -18,5 +18,8 @@ from .opcode_translator.breakpoint import (  # noqa: F401
     add_breakpoint,
     add_event,
 )
+from .opcode_translator.executor.dynamic_shape import (  # noqa: F401
+    mark_dynamic,
+)
 from .opcode_translator.skip_files import skip_function  # noqa: F401
 from .translate import symbolic_translate  # noqa: F401
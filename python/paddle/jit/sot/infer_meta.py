@@ -12,6 +12,8 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from contextlib import contextmanager
+
 import paddle
 from paddle.amp.auto_cast import amp_state
 from paddle.base.unique_name import UniqueNameGenerator
@@ -19,7 +21,13 @@ from paddle.base.unique_name import guard as UniqueNameGuard
 from paddle.static import Program
 from paddle.utils import flatten, is_sequence
 
-from .utils import Cache, Singleton, map_if_extend, meta_str
+from .utils import (
+    Cache,
+    Singleton,
+    in_background_translate,
+    map_if_extend,
+    meta_str,
+)
 
 
 class MetaInfo:
@@ -35,7 +43,7 @@ class MetaInfo:
         self.stop_gradient = stop_gradient
 
     @staticmethod
-    def from_tensor(tensor):
+    def from_tensor(tensor, dynamic_dims=()):
         # We always use float32 in simulation if AMP is enabled.
         dtype = tensor.dtype
         current_amp_state = amp_state()
@@ -45,8 +53,13 @@ class MetaInfo:
             and current_amp_state["dtype"] == "float16"
         ):
             dtype = paddle.float32
+        shape = list(tensor.shape)
+        # dynamic dims are -1, see NOTE [How does dynamic shape work in SOT?]
+        for dim in dynamic_dims:
+            if dim < len(shape):
+                shape[dim] = -1
         return MetaInfo(
-            list(tensor.shape),
+            shape,
             dtype,
             tensor.stop_gradient,
             tensor.name,
@@ -121,9 +134,7 @@ class VariableCreator:
         return self.var_cache[var_feature_name]
 
     def infer_meta(self, func, *args, **kwargs):
-        with paddle.base.framework._dygraph_guard(None), UniqueNameGuard(
-            self.var_name_generator
-        ):
+        with static_mode_guard(), UniqueNameGuard(self.var_name_generator):
             args, kwargs = convert_meta_to_variable(
                 args
             ), convert_meta_to_variable(kwargs)
@@ -141,6 +152,24 @@ class VariableCreator:
         return convert_variable_to_meta_info(out)
 
 
+@contextmanager
+def static_mode_guard():
+    if not in_background_translate():
+        with paddle.base.framework._dygraph_guard(None):
+            yield
+        return
+    # NOTE: _dygraph_guard also switches the tracer of C++ side, which is
+    # shared by all threads and breaks the eager execution of main thread,
+    # so only the thread local tracer is switched in background translation.
+    global_var = paddle.base.framework.global_var
+    tracer = global_var._dygraph_tracer_
+    global_var.__dict__["_dygraph_tracer_"] = None
+    try:
+        yield
+    finally:
+        global_var.__dict__["_dygraph_tracer_"] = tracer
+
+
 def convert_meta_to_variable(args):
     return map_if_extend(
         args,
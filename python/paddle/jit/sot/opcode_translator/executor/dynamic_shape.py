@@ -0,0 +1,145 @@
+# Copyright (c) 2023 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+
+import types
+from typing import TYPE_CHECKING, Callable, Dict, Optional, Sequence, Tuple
+
+from ...utils import Singleton, is_auto_dynamic_shape, log
+from .tracker import LocalTracker
+
+if TYPE_CHECKING:
+    from .tracker import Tracker
+
+# dim -> bucket boundaries of the dim, None if the dim is not bucketed
+DynamicDims = Dict[int, Optional[Tuple[int, ...]]]
+
+# NOTE: [How does dynamic shape work in SOT?]
+# A dim of an input tensor is dynamic if it is hinted by `mark_dynamic`, or
+# it has been seen with different sizes in translations of the same code
+# when SOT_AUTO_DYNAMIC_SHAPE is enabled. A dynamic dim is -1 in MetaInfo,
+# so the simulation and the compiled program serve any size of it, and the
+# tensor meta guard masks the dim, e.g. when input `x` is dynamic in dim 0:
+#     MetaInfo.from_tensor(x, dynamic_dims=(0,)).guard_str() == "([-1, 8], ...)"
+# A bucketed dim is also guarded by the index of bucket its size falls in,
+# so that each bucket is translated and compiled separately.
+
+
+@Singleton
+class DynamicShapeRecorder:
+    """
+    Records the shapes of input tensors of each code object, and decides the dynamic dims of them.
+    """
+
+    def __init__(self):
+        # (code, expr of tensor in frame) -> dim -> seen sizes
+        self.history: dict[tuple[types.CodeType, str], list[set[int]]] = {}
+        self.hints: dict[tuple[types.CodeType, str], DynamicDims] = {}
+
+    def clear(self):
+        """
+        Clears the recorded shapes, the hints are kept.
+        """
+        self.history.clear()
+
+    def add_hint(
+        self,
+        code: types.CodeType,
+        name: str,
+        dims: Sequence[int],
+        buckets: Sequence[int] | None = None,
+    ):
+        expr = LocalTracker(name).trace_value_from_frame().debug_expr
+        hint = self.hints.setdefault((code, expr), {})
+        for dim in dims:
+            hint[dim] = None if buckets is None else tuple(sorted(buckets))
+
+    def get_dynamic_dims(
+        self, code: types.CodeType, tracker: Tracker, shape: list[int]
+    ) -> DynamicDims:
+        """
+        Records the shape of an input tensor and returns its dynamic dims.
+
+        Args:
+            code (types.CodeType): The code object being translated.
+            tracker (Tracker): The tracker of the tensor.
+            shape (list[int]): The shape of the tensor.
+
+        Returns:
+            DynamicDims: The dynamic dims of the tensor, which are sorted.
+        """
+        if not shape or not tracker.is_traceable():
+            return {}
+        key = (code, tracker.trace_value_from_frame().debug_expr)
+        rank = len(shape)
+        dynamic_dims = {}
+        for dim, buckets in self.hints.get(key, {}).items():
+            if -rank <= dim < rank:
+                dynamic_dims[dim % rank] = buckets
+
+        if is_auto_dynamic_shape():
+            seen = self.history.get(key)
+            if seen is None or len(seen) != rank:
+                seen = [set() for _ in range(rank)]
+                self.history[key] = seen
+            for dim, size in enumerate(shape):
+                seen[dim].add(size)
+                if len(seen[dim]) > 1 and dim not in dynamic_dims:
+                    log(
+                        3,
+                        f"[DynamicShape] {key[1]} of {code.co_name} is dynamic in dim {dim}, seen sizes: {sorted(seen[dim])}\n",
+                    )
+                    dynamic_dims[dim] = None
+        return dict(sorted(dynamic_dims.items()))
+
+
+def mark_dynamic(
+    fn: Callable | types.CodeType,
+    name: str,
+    dims: int | Sequence[int],
+    buckets: Sequence[int] | None = None,
+):
+    """
+    Hints that the dims of a tensor argument of `fn` vary between calls, so that SOT translates `fn` with these dims as dynamic (-1) from the first call, rather than translating it for every size.
+
+    Args:
+        fn (Callable|types.CodeType): The function or its code object.
+        name (str): The name of the tensor argument.
+        dims (int|Sequence[int]): The dynamic dims of the argument.
+        buckets (Sequence[int]|None, optional): The boundaries to split the sizes of the dims into buckets, the sizes in the same bucket share a translated code, e.g. buckets=[128, 512] makes three buckets: sizes <= 128, 128 < sizes <= 512 and sizes > 512. Default: None, which means all sizes share a translated code.
+
+    Examples:
+        .. code-block:: python
+
+            >>> import paddle
+            >>> from paddle.jit.sot import mark_dynamic, symbolic_translate
+
+            >>> def foo(x):
+            ...     return paddle.nn.functional.relu(x) + 1
+
+            >>> mark_dynamic(foo, "x", dims=[1], buckets=[128, 512])
+            >>> out = symbolic_translate(foo)(paddle.rand([4, 100]))
+            >>> # translated once for all sequence lengths in (0, 128]
+            >>> out = symbolic_translate(foo)(paddle.rand([4, 120]))
+    """
+    code = fn if isinstance(fn, types.CodeType) else fn.__code__
+    if (
+        name
+        not in code.co_varnames[: code.co_argcount + code.co_kwonlyargcount]
+    ):
+        raise ValueError(f"{name} is not an argument of {code.co_name}")
+    if isinstance(dims, int):
+        dims = [dims]
+    DynamicShapeRecorder().add_hint(code, name, dims, buckets)
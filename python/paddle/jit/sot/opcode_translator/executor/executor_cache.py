@@ -14,23 +14,32 @@
 
 from __future__ import annotations
 
+import queue
+import threading
+import time
 import traceback
 import types
 from typing import List, Tuple
 
-from ...profiler import EventGuard, event_register
+from ...profiler import EventGuard, SotReport, event_register
 from ...psdb import NO_FALLBACK_CODES
 from ...utils import (
+    TRANSLATE_LOCK,
     BreakGraphError,
     FallbackError,
     InnerError,
     Singleton,
+    background_translate_guard,
+    is_async_translate,
     is_strict_mode,
     log,
     log_do,
+    sot_max_cache_size,
 )
 from ..custom_code import CustomCode
+from .dynamic_shape import DynamicShapeRecorder
 from .guard import Guard
+from .guard_tree import GuardTree
 from .opcode_executor import OpcodeExecutor, OpcodeExecutorBase
 from .pycode_generator import PyCodeGen
 
@@ -40,6 +49,7 @@ GuardedFunctions = List[GuardedFunction]
 dummy_guard: Guard = lambda frame: True
 dummy_guard.expr = "lambda frame: True"
 dummy_guard.lambda_expr = "lambda frame: True"
+dummy_guard.stringify_guards = []
 
 
 @Singleton
@@ -49,86 +59,151 @@ class OpcodeExecutorCache:
     This cache is used to store previously translated instructions along with their corresponding guard functions.
 
     Attributes:
-        cache (dict): A dictionary that maps code objects to tuples of a cache getter function and a list of guarded functions.
+        cache (dict): A dictionary that maps code objects to GuardTrees of guarded custom codes, each tree holds at most `sot_max_cache_size()` entries and evicts the least recently used one.
         translate_count (int): The count of how many instructions have been translated. It is used to test whether the cache hits.
+        async_translator (AsyncTranslator | None): The background translator used if `SOT_ASYNC_TRANSLATE` is enabled, it is created at the first cache miss.
     """
 
-    MAX_CACHE_SIZE = 20
-    cache: dict[types.CodeType, GuardedFunctions]
+    cache: dict[types.CodeType, GuardTree]
     translate_count: int
+    async_translator: AsyncTranslator | None
 
     def __init__(self):
         self.cache = {}
         self.translate_count = 0
+        self.async_translator = None
+        # guard trees are looked up in the calling thread and updated by
+        # the background translator
+        self._lock = threading.Lock()
 
     def clear(self):
         """
-        Clears the cache and resets the translate count.
+        Waits for the background translations, then clears the cache, the recorded shapes of inputs and resets the translate count.
         """
-        self.cache.clear()
+        self.wait()
+        with self._lock:
+            self.cache.clear()
+        DynamicShapeRecorder().clear()
         self.translate_count = 0
 
+    def wait(self):
+        """
+        Blocks until all background translations are added to the cache.
+        """
+        if self.async_translator is not None:
+            self.async_translator.wait()
+
     def __call__(self, frame: types.FrameType, **kwargs) -> CustomCode:
         code: types.CodeType = frame.f_code
-        if code not in self.cache:
+        guard_tree = self.cache.get(code)
+        if guard_tree is None:
             log(2, f"[Cache]: Firstly call {code}\n")
+            if SotReport().enabled:
+                SotReport().on_lookup(code, hit=False)
+            if is_async_translate():
+                return self.translate_in_background(frame, **kwargs)
             new_custom_code, guard_fn = self.translate(frame, **kwargs)
-            self.cache[code] = [(new_custom_code, guard_fn)]
+            self.add(code, new_custom_code, guard_fn)
             return new_custom_code
-        guarded_fns = self.cache[code]
-        return self.lookup(frame, guarded_fns, **kwargs)
+        return self.lookup(frame, guard_tree, **kwargs)
+
+    def add(
+        self, code: types.CodeType, custom_code: CustomCode, guard_fn: Guard
+    ):
+        """
+        Adds a translated custom code with its guard function to the cache of the code object.
+        """
+        with self._lock:
+            guard_tree = self.cache.get(code)
+            if guard_tree is None:
+                guard_tree = GuardTree(max_size=sot_max_cache_size())
+                self.cache[code] = guard_tree
+            if 0 < guard_tree.max_size <= len(guard_tree):
+                log(
+                    2,
+                    f"[Cache]: Exceed max cache size {guard_tree.max_size}, evict the least recently used one\n",
+                )
+            guard_tree.add(custom_code, guard_fn)
 
     @event_register("lookup")
     def lookup(
-        self, frame: types.FrameType, guarded_fns: GuardedFunctions, **kwargs
+        self, frame: types.FrameType, guard_tree: GuardTree, **kwargs
     ) -> CustomCode:
         """
-        Looks up the cache for a matching code object and returns a custom code object if a matching guard function is found, otherwise None.
+        Looks up the cache for a matching custom code, translates the frame and adds the result to the cache if all guards missed.
 
         Args:
             frame (types.FrameType): The frame whose code object needs to be looked up in the cache.
-            guarded_fns (GuardedFunctions): The list of guarded functions associated with the code object.
+            guard_tree (GuardTree): The guarded custom codes associated with the code object.
 
         Returns:
-            CustomCode | None: The custom code object if a matching guard function is found, otherwise None.
+            CustomCode: The custom code object of the matched or newly translated entry.
         """
 
-        if len(guarded_fns) >= self.MAX_CACHE_SIZE:
-            log(2, "[Cache]: Exceed max cache size, skip it\n")
-            return CustomCode(None, False)
+        start = time.perf_counter()
+        with EventGuard("try guard"), self._lock:
+            entry = guard_tree.lookup(frame)
+        if SotReport().enabled:
+            SotReport().on_lookup(
+                frame.f_code,
+                hit=entry is not None,
+                guard_time=time.perf_counter() - start,
+            )
+        if entry is not None:
+            log(
+                2,
+                f"[Cache]: Cache hit, Guard is \n{getattr(entry.guard_fn, 'expr', 'None')}\n",
+            )
+            return entry.custom_code
 
-        for custom_code, guard_fn in guarded_fns:
+        with self._lock:
+            entries = guard_tree.entries()
+        for entry in entries:
+            guard_fn = entry.guard_fn
             try:
-                with EventGuard("try guard"):
-                    guard_result = guard_fn(frame)
-                if guard_result:
-                    log(
-                        2,
-                        f"[Cache]: Cache hit, Guard is \n{getattr(guard_fn, 'expr', 'None')}\n",
-                    )
-                    return custom_code
-                else:
-                    log_do(
-                        4,
-                        self.analyse_guard_global_object(guard_fn),
-                    )
-                    log(
-                        2,
-                        f"[Cache]: Cache miss, Guard is \n{getattr(guard_fn, 'expr', 'None')}\n",
-                    )
-                    log_do(
-                        2,
-                        self.analyse_guard_error(guard_fn, frame),
-                    )
+                log_do(
+                    4,
+                    self.analyse_guard_global_object(guard_fn),
+                )
+                log(
+                    2,
+                    f"[Cache]: Cache miss, Guard is \n{getattr(guard_fn, 'expr', 'None')}\n",
+                )
+                log_do(
+                    2,
+                    self.analyse_guard_error(guard_fn, frame),
+                )
             except Exception as e:
                 log(2, f"[Cache]: Guard function error: {e}\n")
-                continue
 
         log(2, "[Cache]: all guards missed\n")
+        if is_async_translate():
+            return self.translate_in_background(frame, **kwargs)
         new_custom_code, guard_fn = self.translate(frame, **kwargs)
-        guarded_fns.append((new_custom_code, guard_fn))
+        self.add(frame.f_code, new_custom_code, guard_fn)
         return new_custom_code
 
+    def translate_in_background(
+        self, frame: types.FrameType, **kwargs
+    ) -> CustomCode:
+        """
+        Submits the frame to the background translator and runs it eagerly, the translated code is used by the following calls once it is added to the cache.
+
+        Args:
+            frame (types.FrameType): The frame whose code object needs to be translated.
+
+        Returns:
+            CustomCode: The custom code to run the frame eagerly.
+        """
+        if self.async_translator is None:
+            self.async_translator = AsyncTranslator(self)
+        if self.async_translator.submit(frame, **kwargs):
+            log(
+                2,
+                f"[Cache]: Translate {frame.f_code} in background, run it eagerly\n",
+            )
+        return CustomCode(None, True)
+
     def translate(
         self, frame: types.FrameType, **kwargs
     ) -> tuple[CustomCode, Guard]:
@@ -143,7 +218,8 @@ class OpcodeExecutorCache:
         """
         code: types.CodeType = frame.f_code
         self.translate_count += 1
-        custom_new_code, guard_fn = start_translate(frame, **kwargs)
+        with SotReport().translate_guard(code):
+            custom_new_code, guard_fn = start_translate(frame, **kwargs)
         return custom_new_code, guard_fn
 
     def analyse_guard_global_object(self, guard_fn):
@@ -179,6 +255,87 @@ class OpcodeExecutorCache:
         return inner
 
 
+class FrameSnapshot:
+    """
+    The states of a frame used in translation, which are copied when the frame is called, so that it can be translated after the frame has been executed.
+    """
+
+    __slots__ = ("f_code", "f_locals", "f_globals", "f_builtins")
+
+    def __init__(self, frame: types.FrameType):
+        self.f_code = frame.f_code
+        self.f_locals = dict(frame.f_locals)
+        self.f_globals = frame.f_globals
+        self.f_builtins = frame.f_builtins
+
+
+class AsyncTranslator:
+    """
+    Translates frames in a daemon thread one by one, and adds the results to the OpcodeExecutorCache. A code object has at most one pending translation, frames of it missed the cache meanwhile are not submitted.
+
+    Args:
+        executor_cache (OpcodeExecutorCache): The cache to add the translated codes to.
+    """
+
+    def __init__(self, executor_cache: OpcodeExecutorCache):
+        self.executor_cache = executor_cache
+        self._queue: queue.Queue[tuple[FrameSnapshot, dict]] = queue.Queue()
+        self._pending: set[types.CodeType] = set()
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+
+    def submit(self, frame: types.FrameType, **kwargs) -> bool:
+        """
+        Submits a frame to translate, returns False if the code object is being translated.
+        """
+        with self._lock:
+            if frame.f_code in self._pending:
+                return False
+            self._pending.add(frame.f_code)
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="SotAsyncTranslator", daemon=True
+                )
+                self._thread.start()
+        self._queue.put((FrameSnapshot(frame), kwargs))
+        return True
+
+    def wait(self):
+        """
+        Blocks until all submitted frames are translated.
+        """
+        self._queue.join()
+
+    def _run(self):
+        with background_translate_guard():
+            while True:
+                snapshot, kwargs = self._queue.get()
+                try:
+                    self._translate(snapshot, **kwargs)
+                finally:
+                    with self._lock:
+                        self._pending.discard(snapshot.f_code)
+                    self._queue.task_done()
+
+    def _translate(self, snapshot: FrameSnapshot, **kwargs):
+        try:
+            with TRANSLATE_LOCK:
+                new_custom_code, guard_fn = self.executor_cache.translate(
+                    snapshot, **kwargs
+                )
+        except Exception as e:
+            # nobody is waiting for the error, run the code eagerly from now on
+            log(
+                1,
+                f"[Cache]: Background translation of {snapshot.f_code} failed, run it eagerly, error message is: \n"
+                + "".join(
+                    traceback.format_exception(type(e), e, e.__traceback__)
+                ),
+            )
+            new_custom_code, guard_fn = CustomCode(None, True), dummy_guard
+        self.executor_cache.add(snapshot.f_code, new_custom_code, guard_fn)
+
+
 def start_translate(frame: types.FrameType, **kwargs) -> GuardedFunction:
     """
     Starts the translation process for the given frame and returns the translated code object and its guard function, or None if translation fails.
@@ -212,6 +369,8 @@ def start_translate(frame: types.FrameType, **kwargs) -> GuardedFunction:
             f"Unsupport Frame is {frame.f_code}, error message is: \n"
             + "".join(traceback.format_exception(type(e), e, e.__traceback__)),
         )
+        if SotReport().enabled:
+            SotReport().on_fallback(frame.f_code, e)
 
         # NOTE: If resume fn need fallback, we should replace NullVariable using NULL otherwise will fail to run
         py_codegen = PyCodeGen(frame)
@@ -25,7 +25,7 @@ from functools import cached_property
 from typing import Any, Callable
 
 from ...infer_meta import InferMetaCache, LayerInferMetaCache, MetaInfo
-from ...profiler import EventGuard, event_register
+from ...profiler import EventGuard, SotReport, event_register
 from ...symbolic.statement_ir import Symbol
 from ...symbolic.symbolic_context import SymbolicTraceContext
 from ...utils import (
@@ -299,10 +299,20 @@ class FunctionGraph:
         ]
 
         tensor_items = self._find_tensor_outputs(ret_items)
+        input_metas = {
+            variable.var_name: variable.origin_meta
+            for variable in self.input_variables
+            if isinstance(variable, TensorVariable)
+        }
+        if not any(meta.is_dynamic_shape() for meta in input_metas.values()):
+            input_metas = None
         compiled_fn, statment_ir = self.sir_ctx.compile_fn(
             [Symbol(tensor_var.var_name) for tensor_var in tensor_items],
+            input_metas=input_metas,
             **self._kwargs,
         )
+        if SotReport().enabled and len(statment_ir) > 0:
+            SotReport().on_subgraph(len(statment_ir))
         input_names = statment_ir.inputs
         compiled_fn_name = f"__compiled_fn_{statment_ir.name}"
         # prepare function and inputs
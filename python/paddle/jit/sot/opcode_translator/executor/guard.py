@@ -71,6 +71,23 @@ def union_free_vars(*free_vars: dict[str, Any]):
     return {k: v for d in free_vars for k, v in d.items()}
 
 
+def equal_stringify_guard(
+    lhs: StringifyExpression, value: Any
+) -> StringifyExpression:
+    """
+    Make a guard `lhs == value`, the lhs and value are recorded so that
+    guards on the same lhs can be dispatched by value in GuardTree.
+
+    Args:
+        lhs: the StringifyExpression to compare.
+        value: a literal value which can be rebuilt by its repr.
+    """
+    guard = StringifyExpression(f"{{}} == {value!r}", [lhs], lhs.free_vars)
+    guard.lhs = lhs
+    guard.value = value
+    return guard
+
+
 def make_guard(stringify_guards: list[StringifyExpression]) -> Guard:
     """
     Make a guard from a list of StringifyExpression.
@@ -85,6 +102,7 @@ def make_guard(stringify_guards: list[StringifyExpression]) -> Guard:
         if not num_guards:
             guard = lambda frame: True
             guard.expr = "lambda frame: True"
+            guard.stringify_guards = []
             return guard
 
         def analyse_expresions(stringify_exprs, tmp_names):
@@ -122,6 +140,8 @@ def make_guard(stringify_guards: list[StringifyExpression]) -> Guard:
         log(3, f"[Guard]: {lambda_string}\n")
         guard.lambda_expr = lambda_string
         guard.expr = func_string
+        # sub guards are merged into GuardTree of the code
+        guard.stringify_guards = list(stringify_guards)
         assert callable(guard), "guard must be callable."
 
         return guard
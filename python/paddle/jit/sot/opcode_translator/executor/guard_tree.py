@@ -0,0 +1,298 @@
+# Copyright (c) 2023 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+
+import types
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Callable
+
+if TYPE_CHECKING:
+    from ..custom_code import CustomCode
+    from .guard import Guard, StringifyExpression
+
+# NOTE: [How does GuardTree work?]
+# A guard built by make_guard is the conjunction of its StringifyExpressions
+# (sub guards). Instead of checking the guards of a code one by one, all
+# guards are merged into a trie whose edges are sub guards, and each cache
+# entry is stored at the node where all its sub guards have passed:
+# 1. sub guards of an entry are sorted by the order they are first seen in
+#    the tree, so entries with common sub guards share the prefix path.
+# 2. equality sub guards `lhs == value` (e.g. tensor meta, type id, constant
+#    value) with the same lhs are grouped on a node, lhs is evaluated once
+#    and the child is dispatched by value with a dict lookup, so that the
+#    shape or dtype variants of a function cost nearly constant to look up.
+# 3. each sub guard or lhs is evaluated at most once in a lookup.
+# 4. entries deeper in the tree are checked before the entries on their
+#    ancestors, so an entry with fewer sub guards, e.g. the dummy guard of a
+#    fallback code on root, does not shadow more specific entries.
+
+_FAILED = object()
+
+
+def _guard_key(expr: StringifyExpression):
+    # free vars are compared by identity, they are kept alive by the
+    # compiled functions in tree, so that ids will not be reused
+    return (
+        expr.debug_expr,
+        tuple(sorted((name, id(var)) for name, var in expr.free_vars.items())),
+    )
+
+
+def _compile(expr: StringifyExpression) -> Callable[[types.FrameType], Any]:
+    return eval(f"lambda frame: {expr.debug_expr}", dict(expr.free_vars))
+
+
+def _is_dispatchable(value) -> bool:
+    try:
+        hash(value)
+    except TypeError:
+        return False
+    # nan is not equal to itself, but can be found in dict by identity
+    return value == value
+
+
+class SubGuard:
+    """
+    A sub guard of a Guard, which is checked on an edge of GuardTree.
+    """
+
+    __slots__ = ("expr", "key", "lhs_key", "value")
+
+    def __init__(self, expr: StringifyExpression):
+        self.expr = expr
+        self.key = _guard_key(expr)
+        self.lhs_key = None
+        self.value = None
+        lhs = getattr(expr, "lhs", None)
+        if lhs is not None and _is_dispatchable(expr.value):
+            self.lhs_key = _guard_key(lhs)
+            self.value = expr.value
+
+    @property
+    def rank_key(self):
+        # equality guards on the same lhs share a rank to be put on the
+        # same level of tree
+        return self.key if self.lhs_key is None else self.lhs_key
+
+
+class GuardNode:
+    __slots__ = ("fn", "children", "dispatch", "entries")
+
+    def __init__(self, fn=None):
+        # the compiled sub guard on the edge to this node
+        self.fn = fn
+        # sub guard key -> child node, for guards cannot dispatch by value
+        self.children: dict[Any, GuardNode] = {}
+        # lhs key -> (compiled lhs, value -> child node)
+        self.dispatch: dict[Any, tuple[Callable, dict[Any, GuardNode]]] = {}
+        self.entries: list[GuardEntry] = []
+
+    def is_empty(self):
+        return not (self.children or self.dispatch or self.entries)
+
+
+class GuardEntry:
+    __slots__ = ("custom_code", "guard_fn", "sub_guards")
+
+    def __init__(self, custom_code, guard_fn, sub_guards):
+        self.custom_code = custom_code
+        self.guard_fn = guard_fn
+        # None if guard is not built by make_guard, which is checked as a
+        # whole after the tree
+        self.sub_guards = sub_guards
+
+
+class GuardTree:
+    """
+    Guarded CustomCodes of a code object, organized as a decision tree of
+    sub guards, and evicted in LRU order if number of entries exceeds
+    max_size.
+
+    Args:
+        max_size (int): Max number of entries, 0 means unlimited.
+    """
+
+    def __init__(self, max_size: int = 0):
+        self.max_size = max_size
+        self._root = GuardNode()
+        # rank key -> (rank, number of entries using it)
+        self._ranks: dict[Any, list[int]] = {}
+        self._next_rank = 0
+        self._opaque_entries: list[GuardEntry] = []
+        # entries in LRU order, the most recently used one is the last
+        self._entries: OrderedDict[GuardEntry, None] = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def entries(self) -> list[GuardEntry]:
+        return list(self._entries)
+
+    def add(self, custom_code: CustomCode, guard_fn: Guard) -> GuardEntry:
+        """
+        Add a guarded CustomCode, and evict the least recently used one if
+        tree is full.
+        """
+        stringify_guards = getattr(guard_fn, "stringify_guards", None)
+        if stringify_guards is None:
+            entry = GuardEntry(custom_code, guard_fn, None)
+            self._opaque_entries.append(entry)
+        else:
+            sub_guards = {}
+            for expr in stringify_guards:
+                sub_guard = SubGuard(expr)
+                sub_guards.setdefault(sub_guard.key, sub_guard)
+            for sub_guard in sub_guards.values():
+                self._acquire_rank(sub_guard.rank_key)
+            entry = GuardEntry(
+                custom_code,
+                guard_fn,
+                sorted(
+                    sub_guards.values(),
+                    key=lambda sub_guard: self._ranks[sub_guard.rank_key][0],
+                ),
+            )
+            node = self._root
+            for sub_guard in entry.sub_guards:
+                node = self._get_or_create_child(node, sub_guard)
+            node.entries.append(entry)
+        self._entries[entry] = None
+
+        while 0 < self.max_size < len(self._entries):
+            evicted, _ = self._entries.popitem(last=False)
+            self._remove(evicted)
+        return entry
+
+    def lookup(self, frame: types.FrameType) -> GuardEntry | None:
+        """
+        Find an entry whose guard passes with the frame, and mark it as the
+        most recently used one.
+        """
+        entry = self._search(self._root, frame, {}, {})
+        if entry is None:
+            for opaque_entry in self._opaque_entries:
+                try:
+                    if opaque_entry.guard_fn(frame):
+                        entry = opaque_entry
+                        break
+                except Exception:
+                    continue
+        if entry is not None:
+            self._entries.move_to_end(entry)
+        return entry
+
+    def _acquire_rank(self, rank_key):
+        rank = self._ranks.get(rank_key)
+        if rank is None:
+            rank = self._ranks[rank_key] = [self._next_rank, 0]
+            self._next_rank += 1
+        rank[1] += 1
+
+    def _release_rank(self, rank_key):
+        rank = self._ranks[rank_key]
+        rank[1] -= 1
+        if rank[1] == 0:
+            del self._ranks[rank_key]
+
+    def _get_or_create_child(self, node: GuardNode, sub_guard: SubGuard):
+        if sub_guard.lhs_key is None:
+            child = node.children.get(sub_guard.key)
+            if child is None:
+                child = GuardNode(_compile(sub_guard.expr))
+                node.children[sub_guard.key] = child
+            return child
+        if sub_guard.lhs_key not in node.dispatch:
+            node.dispatch[sub_guard.lhs_key] = (
+                _compile(sub_guard.expr.lhs),
+                {},
+            )
+        branches = node.dispatch[sub_guard.lhs_key][1]
+        child = branches.get(sub_guard.value)
+        if child is None:
+            child = GuardNode()
+            branches[sub_guard.value] = child
+        return child
+
+    def _search(self, node: GuardNode, frame, guard_results, lhs_values):
+        for lhs_key, (lhs_fn, branches) in node.dispatch.items():
+            if lhs_key not in lhs_values:
+                try:
+                    lhs_values[lhs_key] = lhs_fn(frame)
+                except Exception:
+                    lhs_values[lhs_key] = _FAILED
+            value = lhs_values[lhs_key]
+            if value is _FAILED:
+                continue
+            try:
+                child = branches.get(value)
+            except TypeError:
+                # unhashable value in frame, compare with each branch
+                child = self._find_branch(branches, value)
+            if child is not None:
+                entry = self._search(child, frame, guard_results, lhs_values)
+                if entry is not None:
+                    return entry
+
+        for key, child in node.children.items():
+            if key not in guard_results:
+                try:
+                    guard_results[key] = bool(child.fn(frame))
+                except Exception:
+                    guard_results[key] = False
+            if guard_results[key]:
+                entry = self._search(child, frame, guard_results, lhs_values)
+                if entry is not None:
+                    return entry
+
+        if node.entries:
+            return node.entries[0]
+        return None
+
+    @staticmethod
+    def _find_branch(branches, value):
+        for branch_value, child in branches.items():
+            try:
+                if value == branch_value:
+                    return child
+            except Exception:
+                continue
+        return None
+
+    def _remove(self, entry: GuardEntry):
+        if entry.sub_guards is None:
+            self._opaque_entries.remove(entry)
+            return
+        path = []
+        node = self._root
+        for sub_guard in entry.sub_guards:
+            self._release_rank(sub_guard.rank_key)
+            path.append((node, sub_guard))
+            if sub_guard.lhs_key is None:
+                node = node.children[sub_guard.key]
+            else:
+                node = node.dispatch[sub_guard.lhs_key][1][sub_guard.value]
+        node.entries.remove(entry)
+        # prune empty nodes from leaf to root
+        for parent, sub_guard in reversed(path):
+            if not node.is_empty():
+                break
+            if sub_guard.lhs_key is None:
+                del parent.children[sub_guard.key]
+            else:
+                branches = parent.dispatch[sub_guard.lhs_key][1]
+                del branches[sub_guard.value]
+                if not branches:
+                    del parent.dispatch[sub_guard.lhs_key]
+            node = parent
@@ -27,7 +27,7 @@ from typing import Any, Callable
 
 import opcode
 
-from ...profiler import EventGuard, event_register
+from ...profiler import EventGuard, SotReport, event_register
 from ...psdb import NO_BREAKGRAPH_CODES
 from ...utils import (
     BreakGraphError,
@@ -231,6 +231,14 @@ def jump_break_graph_decorator(normal_jump: Callable):
             # fallback when in OpcodeExecutor
             # raise error in OpcodeInlineExecutor
             log(3, "[BreakGraph] jump break graph, because if tensor\n")
+            # break graph in inline call is reported by the outermost call
+            if SotReport().enabled and isinstance(self, OpcodeExecutor):
+                SotReport().on_graph_break(
+                    self._code,
+                    self._current_line,
+                    "jump",
+                    f"{instr.opname} on {result.__class__.__name__}",
+                )
             self._break_graph_in_jump(result, instr)
             return Stop(state="BreakGraph")
         else:
@@ -264,6 +272,10 @@ def call_break_graph_decorator(push_n: int | Callable[[int | None], int]):
                     )
                 if isinstance(self, OpcodeExecutor):
                     log(3, f"[BreakGraph] call function Break graph: {e}\n")
+                    if SotReport().enabled:
+                        SotReport().on_graph_break(
+                            self._code, self._current_line, "call", e
+                        )
                     self._break_graph_in_call(origin_stack, instr, push_n)
                     return Stop(state="BreakGraph")
                 else:
@@ -2058,6 +2070,13 @@ class OpcodeExecutor(OpcodeExecutorBase):
             if backup_iter_idx:
                 iterator.idx = backup_iter_idx
             self._graph.remove_global_guarded_variable(iterator)
+            if SotReport().enabled:
+                SotReport().on_graph_break(
+                    self._code,
+                    self._current_line,
+                    "for_loop",
+                    e if str(e) else f"iterate {iterator.__class__.__name__}",
+                )
             self._break_graph_in_for_loop(iterator, instr)
             return Stop(state="BreakGraph")
 
@@ -26,7 +26,12 @@ from ....profiler import event_register
 from ....utils import NameGenerator, get_unbound_method, log
 from ....utils.exceptions import FallbackError, HasNoAttributeError
 from ..dispatcher import Dispatcher
-from ..guard import StringifyExpression, check_guard, union_free_vars
+from ..guard import (
+    StringifyExpression,
+    check_guard,
+    equal_stringify_guard,
+    union_free_vars,
+)
 from ..mutable_data import MutableDictLikeData
 from ..pycode_generator import PyCodeGen
 from ..tracker import (
@@ -343,16 +348,15 @@ class VariableBase:
         frame_value_tracer = self.tracker.trace_value_from_frame()
 
         return [
-            StringifyExpression(
-                f"id(type({{}})) == {id(self.get_py_type())}",
-                [frame_value_tracer],
-                union_free_vars(frame_value_tracer.free_vars),
-            ),
-            StringifyExpression(
-                f"{{}} == {self.get_py_value()!r}",
-                [frame_value_tracer],
-                union_free_vars(frame_value_tracer.free_vars),
+            equal_stringify_guard(
+                StringifyExpression(
+                    "id(type({}))",
+                    [frame_value_tracer],
+                    union_free_vars(frame_value_tracer.free_vars),
+                ),
+                id(self.get_py_type()),
             ),
+            equal_stringify_guard(frame_value_tracer, self.get_py_value()),
         ]
 
     def get_py_value(self, allow_tensor=False) -> Any:
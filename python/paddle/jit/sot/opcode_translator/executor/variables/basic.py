@@ -14,6 +14,7 @@
 
 from __future__ import annotations
 
+import bisect
 import operator
 import types
 from functools import cached_property, reduce
@@ -33,9 +34,11 @@ from ....utils import (
 )
 from ....utils.exceptions import HasNoAttributeError, InnerError
 from ..dispatch_functions import tensor_numel
+from ..dynamic_shape import DynamicShapeRecorder
 from ..guard import (
     StringifyExpression,
     check_guard,
+    equal_stringify_guard,
     object_equal_stringify_guard,
     union_free_vars,
 )
@@ -258,10 +261,16 @@ class TensorDtypeVariable(DataVariable):
                 self.tracker.obj.tracker.trace_value_from_frame()
             )
             return [
-                StringifyExpression(
-                    f"str(MetaInfo.from_tensor({{}}).dtype) == '{str(self.value)}'",
-                    [tensor_value_tracer],
-                    {"MetaInfo": MetaInfo},
+                equal_stringify_guard(
+                    StringifyExpression(
+                        "str(MetaInfo.from_tensor({}).dtype)",
+                        [tensor_value_tracer],
+                        union_free_vars(
+                            {"MetaInfo": MetaInfo},
+                            tensor_value_tracer.free_vars,
+                        ),
+                    ),
+                    str(self.value),
                 )
             ]
         else:
@@ -301,9 +310,22 @@ class TensorVariable(VariableBase):
         super().__init__(graph, tracker)
         if isinstance(tensor, paddle.Tensor):
             self.value = None
-            self.meta = MetaInfo.from_tensor(tensor)
+            self.dynamic_dims = DynamicShapeRecorder().get_dynamic_dims(
+                graph.pycode_gen._origin_code, tracker, tensor.shape
+            )
+            self.meta = MetaInfo.from_tensor(
+                tensor, dynamic_dims=self.dynamic_dims
+            )
+            # the size of a bucketed dynamic dim is guarded by its bucket
+            self.bucket_indices = {
+                dim: bisect.bisect_left(buckets, tensor.shape[dim])
+                for dim, buckets in self.dynamic_dims.items()
+                if buckets is not None
+            }
         elif isinstance(tensor, MetaInfo):
             self.value = None
+            self.dynamic_dims = {}
+            self.bucket_indices = {}
             self.meta = tensor
         else:
             raise InnerError(
@@ -357,17 +379,39 @@ class TensorVariable(VariableBase):
     @check_guard
     def make_stringify_guard(self) -> list[StringifyExpression]:
         frame_value_tracer = self.tracker.trace_value_from_frame()
+        if self.dynamic_dims:
+            meta_expr = f"MetaInfo.from_tensor({{}}, dynamic_dims={tuple(self.dynamic_dims)}).guard_str()"
+        else:
+            meta_expr = "MetaInfo.from_tensor({}).guard_str()"
 
-        return [
-            StringifyExpression(
-                f"MetaInfo.from_tensor({{}}).guard_str() == '{self.origin_meta.guard_str()}'",
-                [frame_value_tracer],
-                union_free_vars(
-                    {"MetaInfo": MetaInfo},
-                    frame_value_tracer.free_vars,
+        guards = [
+            equal_stringify_guard(
+                StringifyExpression(
+                    meta_expr,
+                    [frame_value_tracer],
+                    union_free_vars(
+                        {"MetaInfo": MetaInfo},
+                        frame_value_tracer.free_vars,
+                    ),
                 ),
+                self.origin_meta.guard_str(),
             )
         ]
+        for dim, bucket_index in self.bucket_indices.items():
+            guards.append(
+                equal_stringify_guard(
+                    StringifyExpression(
+                        f"bisect.bisect_left({self.dynamic_dims[dim]}, {{}}.shape[{dim}])",
+                        [frame_value_tracer],
+                        union_free_vars(
+                            {"bisect": bisect},
+                            frame_value_tracer.free_vars,
+                        ),
+                    ),
+                    bucket_index,
+                )
+            )
+        return guards
 
     def get_iter(self):
         from .iter import SequenceIterVariable
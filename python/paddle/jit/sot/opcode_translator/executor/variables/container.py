@@ -21,7 +21,7 @@ from typing import TYPE_CHECKING, Any
 
 from ....utils.exceptions import FallbackError, InnerError
 from ..dispatcher import Dispatcher
-from ..guard import StringifyExpression, check_guard
+from ..guard import StringifyExpression, check_guard, equal_stringify_guard
 from ..mutable_data import MutableDictLikeData, MutableListLikeData
 from ..pycode_generator import PyCodeGen
 from ..tracker import (
@@ -78,10 +78,11 @@ class ContainerVariable(VariableBase):
             [frame_value_tracer],
             frame_value_tracer.free_vars,
         )
-        len_guard = StringifyExpression(
-            f"len({{}}) == {len(self.init_value)}",
-            [frame_value_tracer],
-            frame_value_tracer.free_vars,
+        len_guard = equal_stringify_guard(
+            StringifyExpression(
+                "len({})", [frame_value_tracer], frame_value_tracer.free_vars
+            ),
+            len(self.init_value),
         )
         if isinstance(self, (ListVariable, TupleVariable)):
             guard_variables = self.proxy.reproduce(0)
@@ -12,12 +12,21 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from __future__ import annotations
+
+import atexit
+import json
 import os
+import sys
+import time
+import types
 from contextlib import contextmanager
 from functools import wraps
 
 from paddle.framework import core
 
+from .utils import Singleton
+
 _event_level = int(os.environ.get("EVENT_LEVEL", "-1"))
 
 
@@ -76,3 +85,260 @@ def event_register(event_name, event_level=0):
         return event_wrapper
     else:
         return do_nothing
+
+
+# NOTE: [SOT report]
+# SotReport aggregates the cost of SOT by code object: translation time,
+# guard evaluation time, cache hits and misses, the number of subgraphs and
+# every graph break with its location and reason. It is enabled by
+# `with SotReport():` or environment variable `SOT_REPORT=table|json`, in
+# which case the report is written to `SOT_REPORT_FILE` (stdout by default)
+# when the process exits.
+
+
+class FunctionReport:
+    """
+    Translation cost of a code object.
+    """
+
+    def __init__(self, code: types.CodeType):
+        self.name = code.co_name
+        self.filename = code.co_filename
+        self.lineno = code.co_firstlineno
+        self.translate_count = 0
+        self.translate_time = 0.0
+        self.guard_time = 0.0
+        self.cache_hit = 0
+        self.cache_miss = 0
+        self.subgraph_count = 0
+        self.statement_count = 0
+        self.fallback_count = 0
+        # (lineno, kind, reason) -> count
+        self.graph_breaks: dict[tuple[int, str, str], int] = {}
+
+    @property
+    def location(self):
+        return f"{self.filename}:{self.lineno}"
+
+    @property
+    def total_time(self):
+        return self.translate_time + self.guard_time
+
+    def to_dict(self):
+        return {
+            "name": self.name,
+            "location": self.location,
+            "translate_count": self.translate_count,
+            "translate_time": self.translate_time,
+            "guard_time": self.guard_time,
+            "cache_hit": self.cache_hit,
+            "cache_miss": self.cache_miss,
+            "subgraph_count": self.subgraph_count,
+            "statement_count": self.statement_count,
+            "fallback_count": self.fallback_count,
+            "graph_breaks": [
+                {
+                    "location": f"{self.filename}:{lineno}",
+                    "kind": kind,
+                    "reason": reason,
+                    "count": count,
+                }
+                for (lineno, kind, reason), count in self.graph_breaks.items()
+            ],
+        }
+
+
+@Singleton
+class SotReport:
+    """
+    Collect translation cost and graph breaks of SOT, see [SOT report].
+
+    Examples:
+        >>> # doctest: +SKIP("Need to run in SOT mode.")
+        >>> from paddle.jit.sot.profiler import SotReport
+        >>> with SotReport() as report:
+        ...     symbolic_translate(foo)(x)
+        >>> print(report.to_table())
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.clear()
+
+    def clear(self):
+        self.functions: dict[types.CodeType, FunctionReport] = {}
+        self._translating: list[FunctionReport] = []
+
+    def enable(self):
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def __enter__(self):
+        self.clear()
+        self.enable()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.disable()
+
+    def function(self, code: types.CodeType) -> FunctionReport:
+        if code not in self.functions:
+            self.functions[code] = FunctionReport(code)
+        return self.functions[code]
+
+    @contextmanager
+    def translate_guard(self, code: types.CodeType):
+        if not self.enabled:
+            yield
+            return
+        report = self.function(code)
+        self._translating.append(report)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            report.translate_time += time.perf_counter() - start
+            report.translate_count += 1
+            self._translating.pop()
+
+    def on_lookup(self, code: types.CodeType, hit: bool, guard_time=0.0):
+        report = self.function(code)
+        report.guard_time += guard_time
+        if hit:
+            report.cache_hit += 1
+        else:
+            report.cache_miss += 1
+
+    def on_subgraph(self, num_statements: int):
+        if self._translating:
+            self._translating[-1].subgraph_count += 1
+            self._translating[-1].statement_count += num_statements
+
+    def on_graph_break(
+        self, code: types.CodeType, lineno: int, kind: str, reason
+    ):
+        if isinstance(reason, BaseException):
+            reason = str(reason) or type(reason).__name__
+        # keep the first line of reason, which is enough to group breaks
+        reason = str(reason).strip().split("\n")[0]
+        graph_breaks = self.function(code).graph_breaks
+        key = (lineno, kind, reason)
+        graph_breaks[key] = graph_breaks.get(key, 0) + 1
+
+    def on_fallback(self, code: types.CodeType, reason):
+        self.function(code).fallback_count += 1
+        self.on_graph_break(code, code.co_firstlineno, "fallback", reason)
+
+    def to_dict(self):
+        functions = sorted(
+            self.functions.values(), key=lambda f: f.total_time, reverse=True
+        )
+        return {
+            "translate_time": sum(f.translate_time for f in functions),
+            "guard_time": sum(f.guard_time for f in functions),
+            "cache_hit": sum(f.cache_hit for f in functions),
+            "cache_miss": sum(f.cache_miss for f in functions),
+            "subgraph_count": sum(f.subgraph_count for f in functions),
+            "graph_break_count": sum(
+                sum(f.graph_breaks.values()) for f in functions
+            ),
+            "functions": [f.to_dict() for f in functions],
+        }
+
+    def to_json(self, indent=2):
+        return json.dumps(self.to_dict(), indent=indent)
+
+    def to_table(self):
+        summary = self.to_dict()
+        headers = [
+            "Function",
+            "Location",
+            "Translate",
+            "Translate(ms)",
+            "Guard(ms)",
+            "Hit",
+            "Miss",
+            "Subgraph",
+            "Break",
+        ]
+        rows = [
+            [
+                f["name"],
+                f["location"],
+                f["translate_count"],
+                f"{f['translate_time'] * 1000:.2f}",
+                f"{f['guard_time'] * 1000:.2f}",
+                f["cache_hit"],
+                f["cache_miss"],
+                f["subgraph_count"],
+                sum(b["count"] for b in f["graph_breaks"]),
+            ]
+            for f in summary["functions"]
+        ]
+        lines = ["---------------- PaddleSOT report ----------------"]
+        lines.append(
+            f"TranslateTime: {summary['translate_time'] * 1000:.2f}ms, "
+            f"GuardTime: {summary['guard_time'] * 1000:.2f}ms, "
+            f"CacheHit: {summary['cache_hit']}, "
+            f"CacheMiss: {summary['cache_miss']}, "
+            f"SubgraphNum: {summary['subgraph_count']}, "
+            f"GraphBreakNum: {summary['graph_break_count']}"
+        )
+        lines.extend(_format_table(headers, rows))
+
+        breaks = [
+            [b["location"], f["name"], b["kind"], b["count"], b["reason"]]
+            for f in summary["functions"]
+            for b in f["graph_breaks"]
+        ]
+        if breaks:
+            breaks.sort(key=lambda b: b[3], reverse=True)
+            lines.append("Graph breaks:")
+            lines.extend(
+                _format_table(
+                    ["Location", "Function", "Kind", "Count", "Reason"], breaks
+                )
+            )
+        lines.append("---------------- PaddleSOT report ----------------")
+        return "\n".join(lines)
+
+    def dump(self, fmt="table", file=None):
+        content = self.to_json() if fmt == "json" else self.to_table()
+        if file is None:
+            print(content)
+        else:
+            with open(file, "w") as f:
+                f.write(content)
+
+
+def _format_table(headers, rows):
+    widths = [len(h) for h in headers]
+    for row in rows:
+        for i, cell in enumerate(row):
+            widths[i] = max(widths[i], len(str(cell)))
+    lines = ["  ".join(h.ljust(w) for h, w in zip(headers, widths)).rstrip()]
+    lines.append("  ".join("-" * w for w in widths))
+    for row in rows:
+        lines.append(
+            "  ".join(
+                str(cell).ljust(w) for cell, w in zip(row, widths)
+            ).rstrip()
+        )
+    return lines
+
+
+_report_format = os.environ.get("SOT_REPORT", "").lower()
+if _report_format in ("table", "json"):
+    SotReport().enable()
+    atexit.register(
+        SotReport().dump,
+        fmt=_report_format,
+        file=os.environ.get("SOT_REPORT_FILE", None),
+    )
+elif _report_format:
+    print(
+        f"Unknown SOT_REPORT format {_report_format}, expected table or json.",
+        file=sys.stderr,
+    )
@@ -20,6 +20,7 @@ import paddle
 
 from ..profiler import EventGuard
 from ..utils import (
+    TRANSLATE_LOCK,
     Cache,
     CodeStatus,
     GraphLogger,
@@ -67,7 +68,11 @@ class FallbackWrapper:
                 ),
             )
             if self.partial_program is None:
-                with EventGuard("FallbackWrapper: call compiled_fn"):
+                # program building switches the default programs, which
+                # must not interleave with the background translation
+                with EventGuard(
+                    "FallbackWrapper: call compiled_fn"
+                ), TRANSLATE_LOCK:
                     outputs = self.compiled_fn(*args, **kwargs)
                     (
                         self.concrete_program,
@@ -109,14 +114,19 @@ class CompileSIRCache(Cache):
             context: The context to compile
             sir_name: The name of the sir to compile
             build_strategy: The build strategy to compile
+            input_metas: The metas of the SIR inputs if some of them have dynamic dims
 
         Returns:
             The hash key of the SIR
         """
         sir = context.get_sir(sir_name)
         # NOTE(dev): Is str(sir) a heavy opearation ?
-        hash_key = hash(str(sir))
-        return hash_key
+        input_metas = kwargs.get("input_metas", None)
+        if input_metas is None:
+            return hash(str(sir))
+        return hash(
+            (str(sir), tuple(input_metas[symbol.name] for symbol in sir.inputs))
+        )
 
     def value_fn(self, context: SymbolicTraceContext, sir_name: str, **kwargs):
         """
@@ -126,15 +136,28 @@ class CompileSIRCache(Cache):
             context: The context to compile
             sir_name: The name of the sir to compile
             build_strategy: The build strategy to compile
+            input_metas: The metas of the SIR inputs if some of them have dynamic dims
 
         Returns:
             The static graph function
         """
         build_strategy = kwargs.get("build_strategy", None)
         backend = kwargs.get("backend", None)
+        input_metas = kwargs.get("input_metas", None)
+        input_spec = None
+        if input_metas is not None:
+            # the inputs are packed into a tuple, build a program with -1 in
+            # the dynamic dims rather than a program for each size
+            input_spec = [
+                tuple(
+                    input_metas[symbol.name].to_input_spec()
+                    for symbol in context.get_sir(sir_name).inputs
+                )
+            ]
         return FallbackWrapper(
             paddle.jit.to_static(
                 compile_sir(context, sir_name),
+                input_spec=input_spec,
                 build_strategy=build_strategy,
                 backend=backend,
                 enable_fallback=False,
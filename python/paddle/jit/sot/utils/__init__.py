@@ -26,6 +26,7 @@ from .paddle_api_config import (  # noqa: F401
     paddle_tensor_methods,
 )
 from .utils import (  # noqa: F401
+    TRANSLATE_LOCK,
     Cache,
     GraphLogger,
     NameGenerator,
@@ -35,6 +36,7 @@ from .utils import (  # noqa: F401
     SotUndefinedVar,
     StepInfoManager,
     StepState,
+    background_translate_guard,
     cost_model,
     count_if,
     current_tmp_name_records,
@@ -42,7 +44,10 @@ from .utils import (  # noqa: F401
     flatten_extend,
     get_unbound_method,
     hashable,
+    in_background_translate,
     in_paddle_module,
+    is_async_translate,
+    is_auto_dynamic_shape,
     is_break_graph_api,
     is_builtin_fn,
     is_clean_code,
@@ -58,5 +63,6 @@ from .utils import (  # noqa: F401
     min_graph_size,
     no_eval_frame,
     show_trackers,
+    sot_max_cache_size,
     tmp_name_guard,
 )
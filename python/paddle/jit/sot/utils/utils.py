@@ -17,6 +17,7 @@ from __future__ import annotations
 import builtins
 import inspect
 import os
+import threading
 import time
 import types
 import weakref
@@ -49,6 +50,46 @@ def min_graph_size():
     return int(os.environ.get("MIN_GRAPH_SIZE", 10))
 
 
+def sot_max_cache_size():
+    # max number of translated codes cached for a code object, the least
+    # recently used one is evicted if exceeded, 0 means unlimited
+    return int(os.environ.get("SOT_MAX_CACHE_SIZE", 20))
+
+
+def is_auto_dynamic_shape():
+    # mark the dims of input tensors seen with different sizes as dynamic,
+    # rather than translating the code for each size
+    return os.environ.get("SOT_AUTO_DYNAMIC_SHAPE", "False") == "True"
+
+
+def is_async_translate():
+    # translate frames in a background thread and run them eagerly until
+    # the translated code is ready
+    return os.environ.get("SOT_ASYNC_TRANSLATE", "False") == "True"
+
+
+# Guards the process-wide states switched by translation and program
+# building (default programs, unique name generator, ...), which are shared
+# by the background translation thread and the main thread.
+TRANSLATE_LOCK = threading.RLock()
+
+_background_translate_state = threading.local()
+
+
+def in_background_translate() -> bool:
+    return getattr(_background_translate_state, "enabled", False)
+
+
+@contextmanager
+def background_translate_guard():
+    old = in_background_translate()
+    _background_translate_state.enabled = True
+    try:
+        yield
+    finally:
+        _background_translate_state.enabled = old
+
+
 class Singleton(Generic[T]):
     def __init__(self, cls: type[T]):
         self._cls = cls
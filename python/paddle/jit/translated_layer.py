@@ -14,15 +14,17 @@
 
 import os
 import pickle
+import struct
 
 import numpy as np
 
 import paddle
 from paddle import _legacy_C_ops
 from paddle.base import backward, core, framework, unique_name
-from paddle.base.data_feeder import check_type
+from paddle.base.data_feeder import check_type, convert_dtype
 from paddle.base.dygraph.base import switch_to_static_graph
 from paddle.base.framework import OpProtoHolder
+from paddle.base.proto import framework_pb2
 from paddle.framework import in_dynamic_mode
 from paddle.jit.dy2static.partial_program import (
     LazyInitialized,
@@ -654,10 +656,85 @@ class _ProgramHolder:
 #   make some control flow execution logic wrong.
 
 
+# NOTE: [load persistable vars with mmap]
+# A params file written by `save` / `save_combine` is a sequence of
+# serialized DenseTensors:
+#   | version(uint32) | lod level(uint64) | (lod size(uint64), lod data)... |
+#   | version(uint32) | desc size(int32) | TensorDesc | data |
+# With mmap, the file is memory-mapped in copy-on-write mode and the vars on
+# CPU share memory with the map instead of reading the file into their own
+# buffers. The pages of the file are shared through the page cache by all
+# TranslatedLayers loaded from it, in this process and in other processes,
+# and a page is only copied when a var in it is modified, the file is never
+# written. The data of a tensor follows a variable-length TensorDesc, so it
+# is not always aligned to its dtype in the map, such tensor is copied
+# since the CPU kernels sharing its memory expect aligned data.
+def _mmap_tensors(file_path):
+    """
+    Returns the numpy arrays of tensors in the params file, which are views of
+    a copy-on-write memory map of the file, or copies of the data if it is not
+    aligned in the file.
+    """
+    if os.path.getsize(file_path) == 0:
+        return []
+    buffer = np.memmap(file_path, dtype=np.uint8, mode='c')
+    arrays = []
+    offset = 0
+    while offset < len(buffer):
+        # skip the version and the lod
+        offset += 4
+        (lod_level,) = struct.unpack_from('<Q', buffer, offset)
+        offset += 8
+        for _ in range(lod_level):
+            (lod_size,) = struct.unpack_from('<Q', buffer, offset)
+            offset += 8 + lod_size
+        # skip the version of tensor
+        offset += 4
+        (desc_size,) = struct.unpack_from('<i', buffer, offset)
+        offset += 4
+        desc = framework_pb2.VarType.TensorDesc.FromString(
+            bytes(buffer[offset : offset + desc_size])
+        )
+        offset += desc_size
+        dtype = np.dtype(convert_dtype(core.VarDesc.VarType(desc.data_type)))
+        shape = list(desc.dims)
+        nbytes = int(np.prod(shape, dtype=np.int64)) * dtype.itemsize
+        array = buffer[offset : offset + nbytes].view(dtype).reshape(shape)
+        # the map starts at a page boundary, so offset in the file decides
+        # the alignment
+        if offset % dtype.alignment != 0:
+            array = np.array(array)
+        arrays.append(array)
+        offset += nbytes
+    return arrays
+
+
+def _load_vars_by_mmap(load_var_list, file_path):
+    arrays = _mmap_tensors(file_path)
+    if len(arrays) != len(load_var_list):
+        raise RuntimeError(
+            f"The number of tensors in {file_path} is {len(arrays)}, "
+            f"but {len(load_var_list)} variables are expected to be loaded."
+        )
+    place = framework._current_expected_place()
+    # NOTE: vars on devices are copied from the memory map, which still
+    # avoids the host copy of the file
+    zero_copy = isinstance(place, core.CPUPlace)
+    for var, array in zip(load_var_list, arrays):
+        tensor = core.eager.Tensor(
+            value=array,
+            place=place,
+            persistable=False,
+            zero_copy=zero_copy,
+            stop_gradient=True,
+        )
+        tensor._share_underline_tensor_to(var)
+
+
 # NOTE: [compatible] deal with model saved by save_inference_model,
 # which need get var info from program desc
 def _load_persistable_vars_by_program(
-    model_path, program_holder, params_filename=None
+    model_path, program_holder, params_filename=None, mmap=False
 ):
     # make sure the path has been checked
     persistable_vars = _get_persistable_vars(program_holder.infer_program)
@@ -682,12 +759,16 @@ def _load_persistable_vars_by_program(
                 persistable=True,
             )
         if params_filename is None:
-            framework._dygraph_tracer().trace_op(
-                type='load',
-                inputs={},
-                outputs={'Out': new_var},
-                attrs={'file_path': os.path.join(model_path, orig_each_name)},
-            )
+            var_file_path = os.path.join(model_path, orig_each_name)
+            if mmap:
+                _load_vars_by_mmap([new_var], var_file_path)
+            else:
+                framework._dygraph_tracer().trace_op(
+                    type='load',
+                    inputs={},
+                    outputs={'Out': new_var},
+                    attrs={'file_path': var_file_path},
+                )
         new_var.stop_gradient = False
         load_var_dict[each_var.name()] = new_var
 
@@ -699,12 +780,16 @@ def _load_persistable_vars_by_program(
         for name in sorted(dict_name_old_new.keys()):
             load_var_list.append(load_var_dict[dict_name_old_new[name]])
 
-        framework._dygraph_tracer().trace_op(
-            type='load_combine',
-            inputs={},
-            outputs={'Out': load_var_list},
-            attrs={'file_path': os.path.join(model_path, params_filename)},
-        )
+        var_file_path = os.path.join(model_path, params_filename)
+        if mmap:
+            _load_vars_by_mmap(load_var_list, var_file_path)
+        else:
+            framework._dygraph_tracer().trace_op(
+                type='load_combine',
+                inputs={},
+                outputs={'Out': load_var_list},
+                attrs={'file_path': var_file_path},
+            )
 
         for each_var in persistable_vars:
             if not _is_parameter(each_var, program_holder.infer_program):
@@ -727,7 +812,7 @@ def _load_persistable_vars_by_program(
 
 
 def _load_persistable_vars(
-    model_path, var_info_path, program_holder, params_filename
+    model_path, var_info_path, program_holder, params_filename, mmap=False
 ):
     # 1. load extra var info
     with open(var_info_path, 'rb') as f:
@@ -774,6 +859,8 @@ def _load_persistable_vars(
     if not os.path.exists(var_file_path):
         if len(extra_var_info) != 0:
             raise ValueError("The model to be loaded is incomplete.")
+    elif mmap:
+        _load_vars_by_mmap(load_var_list, var_file_path)
     else:
         framework._dygraph_tracer().trace_op(
             type='load_combine',
@@ -842,7 +929,7 @@ def _construct_program_holders(model_path, model_filename=None):
 
 
 def _construct_params_and_buffers(
-    model_path, programs, params_filename=None, append_suffix=True
+    model_path, programs, params_filename=None, append_suffix=True, mmap=False
 ):
     var_info_filename = str(params_filename) + ".info"
     var_info_path = os.path.join(model_path, var_info_filename)
@@ -850,7 +937,11 @@ def _construct_params_and_buffers(
 
     if os.path.exists(var_info_path):
         var_dict = _load_persistable_vars(
-            model_path, var_info_path, programs['forward'], params_filename
+            model_path,
+            var_info_path,
+            programs['forward'],
+            params_filename,
+            mmap,
         )
         model_name = params_filename[: -len(INFER_PARAMS_SUFFIX)]
         # Load every file that meets the requirements in the directory model_path.
@@ -870,7 +961,11 @@ def _construct_params_and_buffers(
             var_info_path = os.path.join(model_path, var_info_filename)
             var_dict.update(
                 _load_persistable_vars(
-                    model_path, var_info_path, programs[func_name], file_name
+                    model_path,
+                    var_info_path,
+                    programs[func_name],
+                    file_name,
+                    mmap,
                 )
             )
     elif params_filename is not None and not os.path.exists(params_path):
@@ -878,7 +973,7 @@ def _construct_params_and_buffers(
         return {}
     else:
         var_dict = _load_persistable_vars_by_program(
-            model_path, programs['forward'], params_filename
+            model_path, programs['forward'], params_filename, mmap
         )
 
     if not append_suffix:
@@ -1449,16 +1544,18 @@ class TranslatedLayer(layers.Layer):
             raise ValueError("There is no directory named '%s'" % model_path)
         model_filename = None
         params_filename = None
+        mmap = False
         if configs is not None:
             model_filename = configs.model_filename
             params_filename = configs.params_filename
+            mmap = configs.mmap
 
         # 1. load program desc & construct _ProgramHolder
         programs = _construct_program_holders(model_path, model_filename)
 
         # 2. load layer parameters & buffers
         persistable_vars = _construct_params_and_buffers(
-            model_path, programs, params_filename
+            model_path, programs, params_filename, mmap=mmap
         )
 
         # 3. construct TranslatedLayer object
@@ -594,7 +594,6 @@ class Auc(Metric):
     """
     The auc metric is for binary classification.
     Refer to https://en.wikipedia.org/wiki/Receiver_operating_characteristic#Area_under_the_curve.
-    Please notice that the auc metric is implemented with python, which may be a little bit slow.
 
     The `auc` function creates four local variables, `true_positives`,
     `true_negatives`, `false_positives` and `false_negatives` that are used to
@@ -604,6 +603,12 @@ class Auc(Metric):
     values by the false positive rate, while the area under the PR-curve is the
     computed using the height of the precision values by the recall.
 
+    Predictions are bucketed into histograms of positive and negative samples
+    by threshold in bulk, and the histograms can be kept on the device of the
+    predictions by setting :attr:`on_device` to avoid copying predictions to
+    host in each update. Histograms of all data-parallel ranks can be merged
+    by :code:`all_reduce` before :code:`accumulate`.
+
     Args:
         curve (str): Specifies the mode of the curve to be computed,
             'ROC' or 'PR' for the Precision-Recall-curve. Default is 'ROC'.
@@ -612,6 +617,9 @@ class Auc(Metric):
             'ROC' or 'PR' for the Precision-Recall-curve. Default is 'ROC'.
         name (str, optional): String name of the metric instance. Default
             is `auc`.
+        on_device (bool, optional): Whether to accumulate histograms with
+            Tensors on the device of predictions instead of numpy arrays on
+            host. Default is False.
 
     "NOTE: only implement the ROC curve type via Python now."
 
@@ -669,19 +677,38 @@ class Auc(Metric):
             ...     metrics=paddle.metric.Auc())
             >>> data = Data()
             >>> model.fit(data, batch_size=16)
+
+        .. code-block:: python
+            :name: code-distributed-example
+
+            >>> # doctest: +SKIP('Need to be launched by paddle.distributed.launch')
+            >>> import paddle
+            >>> import paddle.distributed as dist
+
+            >>> dist.init_parallel_env()
+            >>> m = paddle.metric.Auc(on_device=True)
+            >>> preds = paddle.rand([1024, 2])
+            >>> labels = paddle.randint(0, 2, [1024, 1])
+            >>> m.update(preds, labels)
+            >>> m.all_reduce()
+            >>> res = m.accumulate()
     """
 
     def __init__(
-        self, curve='ROC', num_thresholds=4095, name='auc', *args, **kwargs
+        self,
+        curve='ROC',
+        num_thresholds=4095,
+        name='auc',
+        *args,
+        on_device=False,
+        **kwargs,
     ):
         super().__init__(*args, **kwargs)
         self._curve = curve
         self._num_thresholds = num_thresholds
-
-        _num_pred_buckets = num_thresholds + 1
-        self._stat_pos = np.zeros(_num_pred_buckets)
-        self._stat_neg = np.zeros(_num_pred_buckets)
+        self._on_device = on_device
         self._name = name
+        self.reset()
 
     def update(self, preds, labels):
         """
@@ -695,6 +722,10 @@ class Auc(Metric):
                 (batch_size, 1), labels[i] is either o or 1,
                 representing the label of the instance i.
         """
+        if self._on_device:
+            self._update_on_device(preds, labels)
+            return
+
         if isinstance(labels, (paddle.Tensor, paddle.base.core.eager.Tensor)):
             labels = np.array(labels)
         elif not _is_numpy_(labels):
@@ -705,14 +736,112 @@ class Auc(Metric):
         elif not _is_numpy_(preds):
             raise ValueError("The 'preds' must be a numpy ndarray or Tensor.")
 
-        for i, lbl in enumerate(labels):
-            value = preds[i, 1]
-            bin_idx = int(value * self._num_thresholds)
-            assert bin_idx <= self._num_thresholds
-            if lbl:
-                self._stat_pos[bin_idx] += 1.0
-            else:
-                self._stat_neg[bin_idx] += 1.0
+        num_samples = len(labels)
+        bin_idx = (preds[:num_samples, 1] * self._num_thresholds).astype(
+            np.int64
+        )
+        assert bin_idx.size == 0 or bin_idx.max() <= self._num_thresholds
+        is_pos = labels.reshape([num_samples, -1])[:, 0] != 0
+
+        num_pred_buckets = self._num_thresholds + 1
+        self._stat_pos += np.bincount(
+            bin_idx[is_pos], minlength=num_pred_buckets
+        )
+        self._stat_neg += np.bincount(
+            bin_idx[~is_pos], minlength=num_pred_buckets
+        )
+
+    def _update_on_device(self, preds, labels):
+        if _is_numpy_(preds):
+            preds = paddle.to_tensor(preds)
+        elif not isinstance(
+            preds, (paddle.Tensor, paddle.base.core.eager.Tensor)
+        ):
+            raise ValueError("The 'preds' must be a numpy ndarray or Tensor.")
+        if _is_numpy_(labels):
+            labels = paddle.to_tensor(labels)
+        elif not isinstance(
+            labels, (paddle.Tensor, paddle.base.core.eager.Tensor)
+        ):
+            raise ValueError("The 'labels' must be a numpy ndarray or Tensor.")
+
+        num_samples = labels.shape[0]
+        bin_idx = paddle.cast(
+            preds[:num_samples, 1] * self._num_thresholds, 'int64'
+        )
+        is_pos = paddle.cast(
+            labels.reshape([num_samples, -1])[:, 0] != 0, 'float64'
+        )
+
+        num_pred_buckets = self._num_thresholds + 1
+        stat_pos = paddle.bincount(
+            bin_idx, weights=is_pos, minlength=num_pred_buckets
+        )
+        stat_neg = paddle.bincount(
+            bin_idx, weights=1.0 - is_pos, minlength=num_pred_buckets
+        )
+        if self._stat_pos is None:
+            self._stat_pos, self._stat_neg = stat_pos, stat_neg
+        else:
+            self._stat_pos = self._stat_pos + stat_pos
+            self._stat_neg = self._stat_neg + stat_neg
+
+    def _host_stats(self):
+        if self._on_device:
+            if self._stat_pos is None:
+                num_pred_buckets = self._num_thresholds + 1
+                return np.zeros(num_pred_buckets), np.zeros(num_pred_buckets)
+            return self._stat_pos.numpy(), self._stat_neg.numpy()
+        return self._stat_pos, self._stat_neg
+
+    def merge(self, other):
+        """
+        Merge the histograms of another Auc metric into this one, e.g. Auc
+        metrics updated in different data readers.
+
+        Args:
+            other (Auc): An Auc metric with the same :attr:`num_thresholds`.
+        """
+        if not isinstance(other, Auc):
+            raise TypeError(
+                f"Auc can only merge with Auc, but got {type(other)}"
+            )
+        if other._num_thresholds != self._num_thresholds:
+            raise ValueError(
+                "num_thresholds should be the same to merge Auc, but got "
+                f"{self._num_thresholds} and {other._num_thresholds}"
+            )
+        stat_pos, stat_neg = other._host_stats()
+        if self._on_device:
+            stat_pos = paddle.to_tensor(stat_pos)
+            stat_neg = paddle.to_tensor(stat_neg)
+            if self._stat_pos is None:
+                self._stat_pos, self._stat_neg = stat_pos, stat_neg
+                return
+        self._stat_pos = self._stat_pos + stat_pos
+        self._stat_neg = self._stat_neg + stat_neg
+
+    def all_reduce(self, group=None):
+        """
+        Sum the histograms of all ranks in the communication group, so that
+        :code:`accumulate` returns the auc of all data-parallel ranks.
+
+        Args:
+            group (Group, optional): The communication group, default is
+                the global group.
+        """
+        if paddle.distributed.get_world_size(group) <= 1:
+            return
+        if self._on_device and self._stat_pos is not None:
+            stats = paddle.stack([self._stat_pos, self._stat_neg])
+        else:
+            stats = paddle.to_tensor(np.stack(self._host_stats()))
+        paddle.distributed.all_reduce(stats, group=group)
+        if self._on_device:
+            self._stat_pos, self._stat_neg = stats[0], stats[1]
+        else:
+            stats = stats.numpy()
+            self._stat_pos, self._stat_neg = stats[0], stats[1]
 
     @staticmethod
     def trapezoid_area(x1, x2, y1, y2):
@@ -725,21 +854,18 @@ class Auc(Metric):
         Return:
             float: the area under auc curve
         """
-        tot_pos = 0.0
-        tot_neg = 0.0
-        auc = 0.0
-
-        idx = self._num_thresholds
-        while idx >= 0:
-            tot_pos_prev = tot_pos
-            tot_neg_prev = tot_neg
-            tot_pos += self._stat_pos[idx]
-            tot_neg += self._stat_neg[idx]
-            auc += self.trapezoid_area(
-                tot_neg, tot_neg_prev, tot_pos, tot_pos_prev
-            )
-            idx -= 1
-
+        stat_pos, stat_neg = self._host_stats()
+        # accumulate from the highest threshold to the lowest
+        tot_pos = np.cumsum(stat_pos[::-1])
+        tot_neg = np.cumsum(stat_neg[::-1])
+        tot_pos_prev = np.concatenate([[0.0], tot_pos[:-1]])
+        tot_neg_prev = np.concatenate([[0.0], tot_neg[:-1]])
+        auc = self.trapezoid_area(
+            tot_neg, tot_neg_prev, tot_pos, tot_pos_prev
+        ).sum()
+
+        tot_pos = tot_pos[-1]
+        tot_neg = tot_neg[-1]
         return (
             auc / tot_pos / tot_neg if tot_pos > 0.0 and tot_neg > 0.0 else 0.0
         )
@@ -748,9 +874,14 @@ class Auc(Metric):
         """
         Reset states and result
         """
-        _num_pred_buckets = self._num_thresholds + 1
-        self._stat_pos = np.zeros(_num_pred_buckets)
-        self._stat_neg = np.zeros(_num_pred_buckets)
+        if self._on_device:
+            # histograms are created on the device of the first predictions
+            self._stat_pos = None
+            self._stat_neg = None
+        else:
+            _num_pred_buckets = self._num_thresholds + 1
+            self._stat_pos = np.zeros(_num_pred_buckets)
+            self._stat_neg = np.zeros(_num_pred_buckets)
 
     def name(self):
         """
@@ -15,13 +15,18 @@
 import itertools
 import logging
 import multiprocessing
+import pickle
+import queue
 import random
 import sys
+import traceback
 import warnings
 from itertools import zip_longest
 from queue import Queue
 from threading import Thread
 
+import numpy as np
+
 from paddle.base.reader import QUEUE_GET_TIMEOUT
 
 __all__ = []
@@ -404,21 +409,70 @@ class XmapEndSignal:
     pass
 
 
-def xmap_readers(mapper, reader, process_num, buffer_size, order=False):
+def xmap_readers(
+    mapper,
+    reader,
+    process_num,
+    buffer_size,
+    order=False,
+    use_process=False,
+    use_shared_memory=True,
+):
     """
     Use multi-threads to map samples from reader by a mapper defined by user.
 
     Args:
         mapper (callable): a function to map the data from reader.
         reader (callable): a data reader which yields the data.
-        process_num (int): thread number to handle original sample.
-        buffer_size (int): size of the queue to read data in.
+        process_num (int): thread number to handle original sample, or
+            process number if :attr:`use_process` is True.
+        buffer_size (int): size of the queue to read data in. If
+            :attr:`use_process` is True, it is the max number of samples
+            dispatched to processes but not yet yielded, which bounds the
+            reorder window when :attr:`order` is True.
         order (bool): whether to keep the data order from original reader.
             Default False.
+        use_process (bool): whether to map samples in a pool of processes
+            instead of threads, which is not limited by GIL and is faster
+            for CPU-bound mappers. The mapper runs in forked processes, so
+            it should not rely on states modified in main process after
+            the decorated reader starts. Not supported on Windows.
+            Default False.
+        use_shared_memory (bool): only used when :attr:`use_process` is
+            True, whether to send numpy arrays in mapped samples back to
+            main process through shared memory instead of pickling them
+            into the queue. Default True.
 
     Returns:
         callable: a decorated reader with data mapping.
+
+    Examples:
+        .. code-block:: python
+
+            >>> import numpy as np
+            >>> import paddle
+
+            >>> def reader():
+            ...     for i in range(4):
+            ...         yield i
+            ...
+            >>> def mapper(i):
+            ...     return np.full([2], i, dtype='int64')
+            ...
+            >>> xreader = paddle.reader.xmap_readers(
+            ...     mapper, reader, 2, 4, order=True, use_process=True)
+            >>> for sample in xreader():
+            ...     print(sample)
+            [0 0]
+            [1 1]
+            [2 2]
+            [3 3]
     """
+    if use_process:
+        return _xmap_readers_process(
+            mapper, reader, process_num, buffer_size, order, use_shared_memory
+        )
+
     end = XmapEndSignal()
 
     # define a worker to read samples from reader to in_queue
@@ -500,6 +554,162 @@ def xmap_readers(mapper, reader, process_num, buffer_size, order=False):
     return xreader
 
 
+# interval in seconds to check whether xmap processes are alive
+_XMAP_STATUS_CHECK_INTERVAL = 5
+
+# initial size of shared memory slabs to send mapped samples, slabs are
+# reallocated with larger size if mapped samples cannot fit in
+_XMAP_SLAB_SIZE = 1024 * 1024
+
+
+def _xmap_process_worker(mapper, in_queue, out_queue):
+    from paddle.io.dataloader.shm_slab import _SlabWriter
+
+    writer = _SlabWriter()
+    try:
+        while True:
+            task = in_queue.get()
+            if task is None:
+                break
+            idx, sample, slab = task
+            try:
+                result = mapper(sample)
+            except Exception:
+                out_queue.put((idx, None, None, traceback.format_exc()))
+                continue
+
+            slab_batch = None
+            if slab is not None:
+                # NOTE: numpy arrays are pickled out-of-band with protocol
+                # 5, their data is written into the slab and only the
+                # remaining pickle stream is sent through the queue
+                buffers = []
+                payload = pickle.dumps(
+                    result, protocol=5, buffer_callback=buffers.append
+                )
+                arrays = [
+                    np.frombuffer(buf.raw(), dtype=np.uint8) for buf in buffers
+                ]
+                slab_batch = writer.write(slab, arrays)
+                del buffers, arrays
+                if slab_batch.metas is not None:
+                    out_queue.put((idx, payload, slab_batch, None))
+                    continue
+            # slab is not dispatched or the result cannot fit in slab
+            payload = pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL)
+            out_queue.put((idx, payload, slab_batch, None))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        writer.close()
+
+
+def _xmap_readers_process(
+    mapper, reader, process_num, buffer_size, order, use_shared_memory
+):
+    if sys.platform == 'win32':
+        raise NotImplementedError(
+            "xmap_readers with use_process=True is not supported on windows."
+        )
+    assert process_num > 0, "process_num should be a positive value"
+    assert buffer_size > 0, "buffer_size should be a positive value"
+
+    def xreader():
+        from paddle.io.dataloader.shm_slab import _SharedSlabPool
+
+        # NOTE: slab pool should be created before processes are started
+        pool = (
+            _SharedSlabPool(buffer_size, _XMAP_SLAB_SIZE)
+            if use_shared_memory
+            else None
+        )
+        in_queue = fork_context.Queue()
+        out_queue = fork_context.Queue()
+        workers = []
+        for _ in range(process_num):
+            worker = fork_context.Process(
+                target=_xmap_process_worker,
+                args=(mapper, in_queue, out_queue),
+            )
+            worker.daemon = True
+            worker.start()
+            workers.append(worker)
+
+        def receive():
+            while True:
+                try:
+                    idx, payload, slab_batch, error = out_queue.get(
+                        timeout=_XMAP_STATUS_CHECK_INTERVAL
+                    )
+                    break
+                except queue.Empty:
+                    for worker in workers:
+                        if not worker.is_alive():
+                            raise RuntimeError(
+                                f"xmap_readers process (pid {worker.pid}) exited "
+                                f"unexpectedly with code {worker.exitcode}"
+                            )
+            if error is not None:
+                raise RuntimeError(
+                    f"xmap_readers mapper failed on sample {idx}:\n{error}"
+                )
+            if slab_batch is not None and slab_batch.metas is not None:
+                buffers = pool.materialize_arrays(slab_batch)
+                return idx, pickle.loads(payload, buffers=buffers)
+            if slab_batch is not None:
+                pool.release(slab_batch.slab_id, slab_batch.nbytes)
+            return idx, pickle.loads(payload)
+
+        samples = reader()
+        next_idx = 0
+        num_yielded = 0
+        exhausted = False
+        # mapped samples received but not yet yielded in order mode
+        reorder_buffer = {}
+        try:
+            while True:
+                # NOTE: samples dispatched but not yet yielded are bounded
+                # by buffer_size, including samples waiting to be reordered
+                while not exhausted and next_idx - num_yielded < buffer_size:
+                    try:
+                        sample = next(samples)
+                    except StopIteration:
+                        exhausted = True
+                        break
+                    slab = pool.acquire() if pool is not None else None
+                    in_queue.put((next_idx, sample, slab))
+                    next_idx += 1
+
+                if num_yielded == next_idx:
+                    break
+
+                if order and num_yielded in reorder_buffer:
+                    result = reorder_buffer.pop(num_yielded)
+                else:
+                    idx, result = receive()
+                    if order and idx != num_yielded:
+                        reorder_buffer[idx] = result
+                        continue
+                num_yielded += 1
+                yield result
+                del result
+        finally:
+            for _ in workers:
+                in_queue.put(None)
+            for worker in workers:
+                worker.join(timeout=_XMAP_STATUS_CHECK_INTERVAL)
+                if worker.is_alive():
+                    worker.terminate()
+            in_queue.cancel_join_thread()
+            in_queue.close()
+            out_queue.cancel_join_thread()
+            out_queue.close()
+            if pool is not None:
+                pool.close()
+
+    return xreader
+
+
 def multiprocess_reader(readers, use_pipe=True, queue_size=1000):
     """
     This API use python ``multiprocessing`` to read data from ``readers`` parallelly,
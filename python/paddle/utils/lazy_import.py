@@ -39,3 +39,52 @@ def try_import(module_name, err_msg=None):
                 "manually installed (usually with `pip install {}`). "
             ).format(module_name, install_name)
         raise ImportError(err_msg)
+
+
+def lazy_module_attrs(module_name, module_globals, submodules, attributes):
+    """
+    Makes submodules and attributes of a module be imported on first access,
+    with module level ``__getattr__`` and ``__dir__`` (PEP 562).
+
+    Args:
+        module_name(str): The name of the module, e.g. ``paddle``.
+        module_globals(dict): The ``globals()`` of the module, accessed
+            values are cached in it.
+        submodules(Iterable[str]): The names of submodules to load lazily.
+        attributes(dict[str, str]): Maps the name of an attribute to the
+            relative name of the submodule it is defined in.
+
+    Returns:
+        The ``__getattr__`` and ``__dir__`` functions of the module.
+
+    Examples:
+        .. code-block:: python
+
+            >>> # in mypackage/__init__.py
+            >>> from paddle.utils.lazy_import import lazy_module_attrs
+            >>> __getattr__, __dir__ = lazy_module_attrs(
+            ...     __name__, globals(), ['vision'], {'Model': 'hapi'}
+            ... )
+    """
+    submodules = frozenset(submodules)
+    attributes = dict(attributes)
+
+    def __getattr__(name):
+        if name in submodules:
+            value = importlib.import_module(f'{module_name}.{name}')
+        elif name in attributes:
+            module = importlib.import_module(
+                f'{module_name}.{attributes[name]}'
+            )
+            value = getattr(module, name)
+        else:
+            raise AttributeError(
+                f'module {module_name!r} has no attribute {name!r}'
+            )
+        module_globals[name] = value
+        return value
+
+    def __dir__():
+        return sorted(set(module_globals) | submodules | set(attributes))
+
+    return __getattr__, __dir__
@@ -1383,6 +1383,7 @@ def get_setup_parameters():
         'paddle.distribution',
         'paddle.distributed.utils',
         'paddle.distributed.sharding',
+        'paddle.distributed.checkpoint',
         'paddle.distributed.fleet',
         'paddle.distributed.auto_tuner',
         'paddle.distributed.launch',
@@ -145,6 +145,8 @@ def train_mlp(
     test_minimize=False,
     save_model=False,
     exclude_test=[],
+    prefetch_depth=1,
+    prefetch_memory_budget=None,
 ):
     group = paddle.distributed.new_group([0, 1])
     if opt_group:
@@ -178,6 +180,8 @@ def train_mlp(
             sync_comm=sync_comm,
             segment_size=2**15,
             exclude_layer=exclude_test,
+            prefetch_depth=prefetch_depth,
+            prefetch_memory_budget=prefetch_memory_budget,
         )
 
     # check optimizer.minimize() error
@@ -263,6 +267,8 @@ def test_stage2_stage3():
         mlp10,
         mlp11,
         mlp12,
+        mlp13,
+        mlp14,
     ) = (
         MLP(),
         MLP(),
@@ -277,6 +283,8 @@ def test_stage2_stage3():
         MLP(),
         MLP(),
         MLP(),
+        MLP(),
+        MLP(),
     )
     state_dict = mlp.state_dict()
     mlp1.set_state_dict(state_dict)
@@ -291,6 +299,8 @@ def test_stage2_stage3():
     mlp10.set_state_dict(state_dict)
     mlp11.set_state_dict(state_dict)
     mlp12.set_state_dict(state_dict)
+    mlp13.set_state_dict(state_dict)
+    mlp14.set_state_dict(state_dict)
 
     # fp32
     stage2_params = train_mlp(
@@ -308,6 +318,24 @@ def test_stage2_stage3():
             atol=1e-6,
         )
 
+    # fp32 prefetch
+    for prefetch_memory_budget, mlp_prefetch in [(None, mlp13), (1, mlp14)]:
+        stage3_params = train_mlp(
+            mlp_prefetch,
+            sharding_stage=3,
+            use_pure_fp16=False,
+            opt_group=False,
+            prefetch_depth=3,
+            prefetch_memory_budget=prefetch_memory_budget,
+        )
+        for i in range(len(stage2_params)):
+            np.testing.assert_allclose(
+                stage2_params[i].numpy(),
+                stage3_params[i].numpy(),
+                rtol=1e-6,
+                atol=1e-6,
+            )
+
     # fp32 accumulate grad
     stage3_params = train_mlp(
         mlp3,
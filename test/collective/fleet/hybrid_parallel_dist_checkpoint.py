@@ -0,0 +1,165 @@
+# Copyright (c) 2023 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import random
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+import paddle
+import paddle.distributed as dist
+from paddle.distributed import fleet
+
+
+def set_random_seed(seed):
+    random.seed(seed)
+    np.random.seed(seed)
+    paddle.seed(seed)
+    fleet.meta_parallel.model_parallel_random_seed(seed)
+
+
+class MPNet(paddle.nn.Layer):
+    def __init__(self):
+        super().__init__()
+        self.column = fleet.meta_parallel.ColumnParallelLinear(
+            8, 16, has_bias=True, gather_output=False
+        )
+        self.row = fleet.meta_parallel.RowParallelLinear(
+            16, 8, has_bias=True, input_is_parallel=True
+        )
+
+    def forward(self, x):
+        return self.row(self.column(x))
+
+
+class Net(paddle.nn.Layer):
+    def __init__(self):
+        super().__init__()
+        self.column = paddle.nn.Linear(8, 16)
+        self.row = paddle.nn.Linear(16, 8)
+
+    def forward(self, x):
+        return self.row(self.column(x))
+
+
+def train_step(model, opt):
+    loss = model(paddle.rand([4, 8])).mean()
+    loss.backward()
+    opt.step()
+    opt.clear_grad()
+
+
+def gather_full(tensor, group):
+    # the global tensor of a tensor split by tensor parallel
+    if not getattr(tensor, 'is_distributed', False):
+        return tensor.numpy()
+    shards = []
+    dist.all_gather(shards, tensor, group=group)
+    return np.concatenate(
+        [shard.numpy() for shard in shards], axis=tensor.split_axis
+    )
+
+
+class TestDistCheckpoint(unittest.TestCase):
+    def setUp(self):
+        strategy = fleet.DistributedStrategy()
+        strategy.hybrid_configs = {
+            "dp_degree": 1,
+            "mp_degree": 2,
+            "pp_degree": 1,
+        }
+        fleet.init(is_collective=True, strategy=strategy)
+        self.hcg = fleet.get_hybrid_communicate_group()
+        self.rank = dist.get_rank()
+        # all ranks save to the same directory
+        self.path = os.path.join(tempfile.gettempdir(), 'dist_checkpoint_mp')
+        if self.rank == 0 and os.path.exists(self.path):
+            shutil.rmtree(self.path)
+        dist.barrier()
+
+    def tearDown(self):
+        dist.barrier()
+        if self.rank == 0:
+            shutil.rmtree(self.path, ignore_errors=True)
+
+    def test_reshard_mp_to_single(self):
+        set_random_seed(2023)
+        mp_group = self.hcg.get_model_parallel_group()
+        model = MPNet()
+        opt = paddle.optimizer.Adam(parameters=model.parameters())
+        train_step(model, opt)
+        dist.save_state_dict(
+            {'model': model.state_dict(), 'opt': opt.state_dict()}, self.path
+        )
+        dist.barrier()
+
+        moment1 = opt._accumulators['moment1']
+        expected_params = {
+            key: gather_full(param, mp_group)
+            for key, param in model.state_dict().items()
+        }
+        # moments are split as their params
+        expected_moments = {}
+        for key, param in model.state_dict().items():
+            moment = moment1[param.name]
+            if getattr(param, 'is_distributed', False):
+                moment.is_distributed = True
+                moment.split_axis = param.split_axis
+            expected_moments[key] = gather_full(moment, mp_group)
+
+        # loaded without tensor parallel, and with other param names
+        new_model = Net()
+        new_opt = paddle.optimizer.Adam(
+            learning_rate=0.0, parameters=new_model.parameters()
+        )
+        train_step(new_model, new_opt)
+        dist.load_state_dict(
+            {'model': new_model.state_dict(), 'opt': new_opt.state_dict()},
+            self.path,
+        )
+        new_moment1 = new_opt._accumulators['moment1']
+        for key, param in new_model.state_dict().items():
+            np.testing.assert_array_equal(param.numpy(), expected_params[key])
+            np.testing.assert_array_equal(
+                new_moment1[param.name].numpy(), expected_moments[key]
+            )
+
+    def test_different_replicas(self):
+        # not split by tensor parallel but different on ranks, e.g. the
+        # slices of sharding stage 2
+        with self.assertRaises(ValueError):
+            dist.save_state_dict(
+                {'w': paddle.full([4], float(self.rank))}, self.path
+            )
+        with self.assertRaises(ValueError):
+            dist.save_state_dict(
+                {'w': paddle.zeros([self.rank + 1])}, self.path
+            )
+        # replicas of the same data are saved once
+        dist.save_state_dict({'w': paddle.ones([4])}, self.path)
+        dist.barrier()
+        # data files are renamed from their temporary files
+        self.assertFalse(
+            [name for name in os.listdir(self.path) if name.endswith('.tmp')]
+        )
+        state_dict = {'w': paddle.zeros([4])}
+        dist.load_state_dict(state_dict, self.path)
+        np.testing.assert_array_equal(state_dict['w'].numpy(), np.ones([4]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,162 @@
+# Copyright (c) 2023 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import importlib.util
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+
+import paddle
+from paddle.jit.dy2static import program_translator
+from paddle.jit.dy2static.ast_transformer import DygraphToStaticAst
+from paddle.jit.dy2static.program_translator import (
+    ConcreteProgram,
+    FunctionCache,
+)
+
+MODULE_SOURCE = '''
+import paddle
+
+
+class Net(paddle.nn.Layer):
+    def __init__(self):
+        super().__init__()
+        self.linear = paddle.nn.Linear(4, 2)
+
+    def forward(self, x):
+        if x.shape[0] > 1:
+            x = x * 2
+        return self.linear(x) + 1, x.shape[0]
+'''
+
+
+def load_module(path, source):
+    with open(path, 'w') as f:
+        f.write(source)
+    spec = importlib.util.spec_from_file_location('persistent_net', path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class TestPersistentCache(unittest.TestCase):
+    def setUp(self):
+        paddle.disable_static()
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cache_dir = os.path.join(self.temp_dir.name, 'cache')
+        self.module_path = os.path.join(self.temp_dir.name, 'persistent_net.py')
+        self.module = load_module(self.module_path, MODULE_SOURCE)
+        paddle.jit.set_cache_dir(self.cache_dir)
+        self.x = paddle.rand([3, 4])
+
+    def tearDown(self):
+        paddle.jit.set_cache_dir(None)
+        self.temp_dir.cleanup()
+
+    def reset_function_cache(self):
+        # simulate a new process, which has nothing cached in memory
+        program_translator._FUNCTION_CACHE = FunctionCache()
+
+    def create_net(self):
+        net = self.module.Net()
+        dygraph_out = net(self.x)[0].numpy()
+        return paddle.jit.to_static(net, enable_fallback=False), dygraph_out
+
+    def run_net(self, net):
+        out, batch = net(self.x)
+        self.assertEqual(batch, 3)
+        return out.numpy()
+
+    def count_build(self, net):
+        with mock.patch.object(
+            ConcreteProgram,
+            'from_func_spec',
+            wraps=ConcreteProgram.from_func_spec,
+        ) as from_func_spec, mock.patch.object(
+            DygraphToStaticAst,
+            'get_static_ast',
+            autospec=True,
+            side_effect=DygraphToStaticAst.get_static_ast,
+        ) as get_static_ast:
+            out = self.run_net(net)
+        return out, from_func_spec.call_count, get_static_ast.call_count
+
+    def test_warm_start(self):
+        net, dygraph_out = self.create_net()
+
+        self.reset_function_cache()
+        out, num_builds, num_transforms = self.count_build(net)
+        np.testing.assert_allclose(out, dygraph_out, rtol=1e-05)
+        self.assertEqual(num_builds, 1)
+        self.assertEqual(num_transforms, 1)
+        self.assertTrue(os.listdir(self.cache_dir))
+
+        self.reset_function_cache()
+        net.forward.program_cache.clear()
+        out, num_builds, num_transforms = self.count_build(net)
+        np.testing.assert_allclose(out, dygraph_out, rtol=1e-05)
+        self.assertEqual(num_builds, 0)
+
+        # program of another input spec is built from cached code
+        self.x = paddle.rand([3, 4], dtype='float64')
+        net.to(dtype='float64')
+        _, num_builds, num_transforms = self.count_build(net)
+        self.assertEqual(num_builds, 1)
+        self.assertEqual(num_transforms, 0)
+
+    def test_invalidate_on_source_change(self):
+        net, _ = self.create_net()
+        self.run_net(net)
+
+        # source file is changed although the function is the same
+        load_module(self.module_path, MODULE_SOURCE + '\nVALUE = 1\n')
+        net.forward.program_cache.clear()
+        _, num_builds, _ = self.count_build(net)
+        self.assertEqual(num_builds, 1)
+
+    def test_invalidate_on_layer_change(self):
+        net, _ = self.create_net()
+        self.run_net(net)
+
+        net.forward.program_cache.clear()
+        net.linear.weight.stop_gradient = True
+        _, num_builds, _ = self.count_build(net)
+        self.assertEqual(num_builds, 1)
+
+    def test_broken_entry(self):
+        net, _ = self.create_net()
+        self.run_net(net)
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                with open(os.path.join(root, name), 'wb') as f:
+                    f.write(b'broken')
+
+        self.reset_function_cache()
+        net.forward.program_cache.clear()
+        _, num_builds, num_transforms = self.count_build(net)
+        self.assertEqual(num_builds, 1)
+        self.assertEqual(num_transforms, 1)
+
+    def test_disabled(self):
+        paddle.jit.set_cache_dir(None)
+        net, _ = self.create_net()
+        self.run_net(net)
+        self.assertFalse(os.path.exists(self.cache_dir))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+# Copyright (c) 2023 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+import numpy as np
+
+import paddle
+from paddle.jit.dy2static.shape_buckets import ShapeBuckets
+
+
+def seq_sum(x, scale):
+    # padded zeros do not change the sum
+    return (x * scale).sum(axis=1)
+
+
+class TestShapeBuckets(unittest.TestCase):
+    def setUp(self):
+        paddle.disable_static()
+
+    def run_seq_lens(self, static_fn, seq_lens):
+        for seq_len in seq_lens:
+            x = paddle.rand([2, seq_len, 3])
+            out = static_fn(x, 2.0)
+            np.testing.assert_allclose(
+                out.numpy(), seq_sum(x, 2.0).numpy(), rtol=1e-05
+            )
+
+    def test_bucket_size(self):
+        buckets = ShapeBuckets({'x': {1: [8, 4]}})
+        self.assertEqual(buckets.bucket_size([4, 8], 3), 4)
+        self.assertEqual(buckets.bucket_size([4, 8], 4), 4)
+        self.assertEqual(buckets.bucket_size([4, 8], 5), 8)
+        self.assertEqual(buckets.bucket_size([4, 8], 9), 9)
+        self.assertEqual(buckets.bucket_size(None, 5), 8)
+        self.assertEqual(buckets.bucket_size(None, 1), 1)
+
+    def test_declared_buckets(self):
+        static_fn = paddle.jit.to_static(
+            seq_sum, shape_buckets={'x': {1: [4, 8]}}
+        )
+        self.run_seq_lens(static_fn, [3, 4, 5, 7])
+        self.assertEqual(static_fn.get_traced_count(), 2)
+        # out of buckets
+        self.run_seq_lens(static_fn, [9])
+        self.assertEqual(static_fn.get_traced_count(), 3)
+
+    def test_power_of_two_buckets(self):
+        static_fn = paddle.jit.to_static(
+            seq_sum, shape_buckets={'x': {1: None}}
+        )
+        self.run_seq_lens(static_fn, [5, 6, 7, 8])
+        self.assertEqual(static_fn.get_traced_count(), 1)
+
+    def test_lru_eviction(self):
+        static_fn = paddle.jit.to_static(seq_sum, program_cache_size=2)
+        self.run_seq_lens(static_fn, [3, 4, 3, 5])
+        program_cache = static_fn.program_cache
+        self.assertEqual(len(program_cache), 2)
+        self.assertEqual(program_cache.evicted_count, 1)
+        # programs of 3 and 5 are kept
+        self.run_seq_lens(static_fn, [3, 5])
+        self.assertEqual(program_cache.evicted_count, 1)
+        self.run_seq_lens(static_fn, [4])
+        self.assertEqual(program_cache.evicted_count, 2)
+
+    def test_memory_limit(self):
+        # programs are not measured without the limit
+        static_fn = paddle.jit.to_static(seq_sum)
+        self.run_seq_lens(static_fn, [3, 4])
+        self.assertEqual(static_fn.program_cache.memory_usage, 0)
+
+        static_fn = paddle.jit.to_static(seq_sum, program_cache_memory=1)
+        self.run_seq_lens(static_fn, [3, 4, 5])
+        self.assertGreater(static_fn.program_cache.memory_usage, 0)
+        self.assertEqual(len(static_fn.program_cache), 1)
+        self.assertEqual(static_fn.program_cache.evicted_count, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,146 @@
+# Copyright (c) 2023 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import textwrap
+import unittest
+from unittest import mock
+
+import numpy as np
+
+import paddle
+from paddle.jit.dy2static import convert_to_static
+from paddle.jit.dy2static.ast_transformer import (
+    DygraphToStaticAst,
+    is_trivial_function,
+)
+from paddle.jit.dy2static.convert_call_func import convert_call
+from paddle.jit.dy2static.program_translator import FunctionCache
+from paddle.utils import gast
+
+
+def trivial_helper(x, y, scale=2):
+    z = x * scale
+    z += -y
+    return z, x > y
+
+
+def straight_func(x):
+    return paddle.nn.functional.relu(x) + 1
+
+
+def loop_func(x, n):
+    for i in range(n):
+        if i > 1:
+            break
+        x = x + i
+    return x
+
+
+class A:
+    def foo(self, x):
+        return paddle.abs(x)
+
+
+class B:
+    def foo(self, x):
+        return paddle.abs(x)
+
+
+def is_trivial(source):
+    return is_trivial_function(gast.parse(textwrap.dedent(source)))
+
+
+class TestTrivialFunction(unittest.TestCase):
+    def test_is_trivial(self):
+        self.assertTrue(is_trivial("def f(x, y):\n    return x * y + 1\n"))
+        # global names, calls, control flow, item assignment and decorators
+        self.assertFalse(is_trivial("def f(x):\n    return x + w\n"))
+        self.assertFalse(is_trivial("def f(x):\n    return paddle.abs(x)\n"))
+        self.assertFalse(
+            is_trivial("def f(x):\n    if x:\n        x = 1\n    return x\n")
+        )
+        self.assertFalse(is_trivial("def f(x, y):\n    x[0] = y\n"))
+        self.assertFalse(is_trivial("@deco\ndef f(x):\n    return x\n"))
+
+    def test_convert_call_trivial_helper(self):
+        with mock.patch.object(
+            DygraphToStaticAst,
+            'get_static_ast',
+            autospec=True,
+            side_effect=DygraphToStaticAst.get_static_ast,
+        ) as get_static_ast:
+            converted = convert_call(trivial_helper)
+        self.assertEqual(get_static_ast.call_count, 0)
+        self.assertIsNot(converted, trivial_helper)
+        self.assertIs(converted.__code__, trivial_helper.__code__)
+        x, y = paddle.rand([3]), paddle.rand([3])
+        for out, expected in zip(converted(x, y), trivial_helper(x, y)):
+            np.testing.assert_array_equal(out.numpy(), expected.numpy())
+
+
+class TestTransformCache(unittest.TestCase):
+    def setUp(self):
+        paddle.disable_static()
+        self.cache = FunctionCache()
+        DygraphToStaticAst.stats.reset()
+
+    def count_transform(self, func):
+        with mock.patch.object(
+            DygraphToStaticAst,
+            'get_static_ast',
+            autospec=True,
+            side_effect=DygraphToStaticAst.get_static_ast,
+        ) as get_static_ast:
+            self.cache.convert_with_cache(func)
+        return get_static_ast.call_count
+
+    def test_same_source_in_different_classes(self):
+        self.assertEqual(self.count_transform(A.foo), 1)
+        self.assertEqual(self.count_transform(B.foo), 1)
+        self.assertEqual(len(self.cache._code_to_ast_caches), 2)
+
+    def test_skip_transformers(self):
+        stats = DygraphToStaticAst.stats
+        self.cache.convert_with_cache(straight_func)
+        for name in [
+            'LoopTransformer',
+            'IfElseTransformer',
+            'BreakContinueTransformer',
+            'AssertTransformer',
+            'CreateVariableTransformer',
+        ]:
+            self.assertEqual(stats.get(name)[:2], (0, 1), name)
+        self.assertEqual(stats.get('CallTransformer')[:2], (1, 0))
+
+        self.cache.convert_with_cache(loop_func)
+        for name in [
+            'LoopTransformer',
+            'IfElseTransformer',
+            'BreakContinueTransformer',
+        ]:
+            self.assertEqual(stats.get(name)[:2], (1, 1), name)
+        self.assertIn('LoopTransformer', stats.summary())
+
+    def test_transformed_result(self):
+        static_loop_func = paddle.jit.to_static(loop_func)
+        x = paddle.ones([2])
+        np.testing.assert_allclose(
+            static_loop_func(x, 5).numpy(), loop_func(x, 5).numpy()
+        )
+        static_func = convert_to_static(straight_func)
+        self.assertIsNot(static_func, straight_func)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+#   Copyright (c) 2023 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# Measure throughput of paddle.metric.Auc in rows per second, usage:
+#   python benchmark_auc_metric.py --batch_size 65536 --steps 100
+
+import argparse
+import time
+
+import numpy as np
+
+import paddle
+
+
+def run(metric, batches, to_tensor):
+    if to_tensor:
+        batches = [
+            (paddle.to_tensor(preds), paddle.to_tensor(labels))
+            for preds, labels in batches
+        ]
+    start = time.time()
+    for preds, labels in batches:
+        metric.update(preds, labels)
+    update_cost = time.time() - start
+
+    start = time.time()
+    metric.accumulate()
+    accumulate_cost = time.time() - start
+    return update_cost, accumulate_cost
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--batch_size', type=int, default=65536)
+    parser.add_argument('--steps', type=int, default=100)
+    parser.add_argument('--num_thresholds', type=int, default=4095)
+    args = parser.parse_args()
+
+    paddle.disable_static()
+    batches = []
+    for _ in range(args.steps):
+        pos = np.random.random([args.batch_size, 1]).astype('float32')
+        preds = np.concatenate([1 - pos, pos], axis=1)
+        labels = np.random.randint(2, size=[args.batch_size, 1])
+        batches.append((preds, labels))
+    rows = args.batch_size * args.steps
+
+    print(
+        "{:>24} {:>16} {:>16}".format(
+            'mode', 'update(rows/s)', 'accumulate(ms)'
+        )
+    )
+    for mode, on_device, to_tensor in [
+        ('numpy', False, False),
+        ('tensor', False, True),
+        ('tensor on_device', True, True),
+    ]:
+        metric = paddle.metric.Auc(
+            num_thresholds=args.num_thresholds, on_device=on_device
+        )
+        update_cost, accumulate_cost = run(metric, batches, to_tensor)
+        print(
+            f"{mode:>24} {rows / update_cost:>16.0f} {accumulate_cost * 1000:>16.3f}"
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+#   Copyright (c) 2023 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# Compare batch transport modes of multi-process DataLoader, usage:
+#   python benchmark_dataloader_transport.py --batch_size 256 \
+#       --num_workers 1 2 4 8 --steps 50
+
+import argparse
+import time
+
+import numpy as np
+
+import paddle
+from paddle.io import DataLoader, Dataset
+
+
+class ImageDataset(Dataset):
+    def __init__(self, sample_num, image_shape):
+        self.sample_num = sample_num
+        self.image = np.random.random(image_shape).astype('float32')
+
+    def __len__(self):
+        return self.sample_num
+
+    def __getitem__(self, idx):
+        return self.image, np.array([idx % 1000], dtype='int64')
+
+
+def run(dataset, batch_size, num_workers, batch_transport, steps):
+    loader = DataLoader(
+        dataset,
+        places=paddle.CPUPlace(),
+        batch_size=batch_size,
+        num_workers=num_workers,
+        drop_last=True,
+        batch_transport=batch_transport,
+    )
+    warmup = 5
+    start = None
+    for i, (image, label) in enumerate(loader()):
+        if i == warmup:
+            start = time.time()
+        if i == warmup + steps:
+            break
+    cost = time.time() - start
+    return steps / cost
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--batch_size', type=int, default=256)
+    parser.add_argument(
+        '--image_shape', type=int, nargs='+', default=[3, 224, 224]
+    )
+    parser.add_argument(
+        '--num_workers', type=int, nargs='+', default=[1, 2, 4, 8]
+    )
+    parser.add_argument('--steps', type=int, default=50)
+    args = parser.parse_args()
+
+    paddle.disable_static()
+    dataset = ImageDataset(
+        args.batch_size * (args.steps + 10), args.image_shape
+    )
+    print(
+        "{:>12} {:>16} {:>16} {:>10}".format(
+            'num_workers', 'queue(batch/s)', 'slab(batch/s)', 'speedup'
+        )
+    )
+    for num_workers in args.num_workers:
+        queue_ips = run(
+            dataset, args.batch_size, num_workers, 'queue', args.steps
+        )
+        slab_ips = run(
+            dataset, args.batch_size, num_workers, 'shared_slab', args.steps
+        )
+        print(
+            "{:>12} {:>16.2f} {:>16.2f} {:>10.2f}".format(
+                num_workers, queue_ips, slab_ips, slab_ips / queue_ips
+            )
+        )
+
+
+if __name__ == '__main__':
+    main()
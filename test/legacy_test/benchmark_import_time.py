@@ -0,0 +1,104 @@
+#   Copyright (c) 2023 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# Measure the time of `import paddle` and the cost of each top level
+# submodule of paddle, usage:
+#   python benchmark_import_time.py --repeat 5 --top 20
+#   python benchmark_import_time.py --stmt "import paddle; paddle.vision"
+
+import argparse
+import re
+import subprocess
+import sys
+
+_IMPORT_TIME_LINE = re.compile(
+    r'^import time:\s*(\d+)\s*\|\s*(\d+)\s*\|(\s*)(\S+)\s*$'
+)
+
+
+def import_time(stmt='import paddle'):
+    """
+    Runs ``stmt`` in a fresh interpreter with ``-X importtime``, returns the
+    list of ``(module, self_us, cumulative_us, depth)`` in import order.
+    """
+    proc = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', stmt],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+        check=True,
+    )
+    records = []
+    for line in proc.stderr.splitlines():
+        match = _IMPORT_TIME_LINE.match(line)
+        if match is None:
+            continue
+        self_us, cumulative_us, indent, module = match.groups()
+        records.append(
+            (module, int(self_us), int(cumulative_us), (len(indent) - 1) // 2)
+        )
+    return records
+
+
+def submodule_costs(records, package='paddle'):
+    """
+    Returns the cumulative import time in us of each top level submodule of
+    ``package``, e.g. ``paddle.nn``, and the total time of ``package``.
+    """
+    costs = {}
+    total = 0
+    prefix = package + '.'
+    for module, _, cumulative_us, _ in records:
+        if module == package:
+            total = cumulative_us
+        elif module.startswith(prefix):
+            name = prefix + module[len(prefix) :].split('.')[0]
+            # a submodule is recorded once, where it is imported first, and
+            # its own submodules are nested in its cumulative time
+            if name == module:
+                costs[name] = cumulative_us
+    return costs, total
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--stmt', type=str, default='import paddle')
+    parser.add_argument('--package', type=str, default='paddle')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--top', type=int, default=20)
+    args = parser.parse_args()
+
+    # the first run warms up the file system cache
+    import_time(args.stmt)
+    totals = []
+    costs = {}
+    for _ in range(args.repeat):
+        run_costs, total = submodule_costs(import_time(args.stmt), args.package)
+        totals.append(total)
+        for name, cost in run_costs.items():
+            costs.setdefault(name, []).append(cost)
+
+    print(f"{args.stmt!r}: {min(totals) / 1e3:.1f} ms (min of {args.repeat})")
+    print("{:>32} {:>12} {:>8}".format('submodule', 'time(ms)', 'ratio'))
+    ranked = sorted(costs.items(), key=lambda item: -min(item[1]))
+    for name, cost in ranked[: args.top]:
+        print(
+            "{:>32} {:>12.1f} {:>7.1f}%".format(
+                name, min(cost) / 1e3, 100.0 * min(cost) / min(totals)
+            )
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+#   Copyright (c) 2023 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# Measure the per-step overhead of pipeline parallel p2p communication
+# between two stages on CPU with gloo, usage:
+#   python benchmark_pp_p2p.py --shape 4 128 256 --micro_batches 8 \
+#       --steps 50
+
+import argparse
+import time
+
+import paddle
+import paddle.distributed as dist
+from paddle.distributed.fleet.base.topology import (
+    CommunicateTopology,
+    HybridCommunicateGroup,
+)
+from paddle.distributed.fleet.meta_parallel.pp_utils import (
+    p2p_communication as p2p,
+)
+
+MODES = {
+    # name: (p2p_cache_shape, p2p_reuse_recv_buffer)
+    'cache_shape': (True, False),
+    'cache_shape+reuse_buffer': (True, True),
+    'dynamic_shape': (False, False),
+    'dynamic_shape+reuse_buffer': (False, True),
+}
+
+
+def run_step(stage_id, shape, micro_batches):
+    if stage_id == 0:
+        for _ in range(micro_batches):
+            p2p.send_forward(paddle.ones(shape), pp_last_stage=False)
+        for _ in range(micro_batches):
+            p2p.recv_backward(pp_last_stage=False)
+    else:
+        # hold the inputs until backward, as the schedule does
+        inputs = [
+            p2p.recv_forward(pp_first_stage=False) for _ in range(micro_batches)
+        ]
+        for x in inputs:
+            p2p.send_backward(x.detach(), pp_first_stage=False)
+
+
+def run(hcg, mode, args):
+    use_cache, reuse_recv_buffer = MODES[mode]
+    p2p._send_recv_meta = p2p.SendRecvMeta()
+    p2p.initialize_p2p_groups(
+        hcg, use_cache=use_cache, reuse_recv_buffer=reuse_recv_buffer
+    )
+    stage_id = hcg.get_stage_id()
+    for _ in range(args.warmup):
+        run_step(stage_id, args.shape, args.micro_batches)
+    dist.barrier()
+    start = time.time()
+    for _ in range(args.steps):
+        run_step(stage_id, args.shape, args.micro_batches)
+    cost = (time.time() - start) / args.steps
+    pool = p2p._recv_buffer_pool
+    if stage_id == 1:
+        pool_info = (
+            f", allocated: {pool.allocated_count}, reused: {pool.reused_count}"
+            if pool is not None
+            else ""
+        )
+        print(f"{mode:<28} {cost * 1000:.3f} ms/step{pool_info}")
+
+
+def main(args):
+    paddle.set_device('cpu')
+    dist.init_parallel_env()
+    topo = CommunicateTopology(
+        ["data", "pipe", "sharding", "sep", "model"], [1, 2, 1, 1, 1]
+    )
+    hcg = HybridCommunicateGroup(topo)
+    for mode in args.modes:
+        run(hcg, mode, args)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--shape', type=int, nargs='+', default=[4, 128, 256])
+    parser.add_argument('--micro_batches', type=int, default=8)
+    parser.add_argument('--steps', type=int, default=50)
+    parser.add_argument('--warmup', type=int, default=5)
+    parser.add_argument(
+        '--modes', nargs='+', choices=list(MODES), default=list(MODES)
+    )
+    args = parser.parse_args()
+    dist.spawn(main, args=(args,), backend='gloo', nprocs=2)
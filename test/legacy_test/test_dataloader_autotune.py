@@ -98,7 +98,162 @@ class TestAutoTune(unittest.TestCase):
         )
 
 
+class FakeStats:
+    def __init__(self, summary):
+        self._summary = summary
+
+    def summary(self, worker_metrics=None):
+        return self._summary
+
+
+class TestAutoTuneConfig(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cache_path = os.path.join(self.temp_dir.name, 'autotune.json')
+        paddle.io.reader.set_autotune_config(
+            True, tuning_steps=2, cache_path=self.cache_path
+        )
+        self.dataset = RandomDataset(20)
+
+    def tearDown(self):
+        paddle.io.reader.set_autotune_config(False)
+        self.temp_dir.cleanup()
+
+    def test_cache_config(self):
+        loader = DataLoader(self.dataset, batch_size=2)
+        with open(self.cache_path) as f:
+            cache = json.load(f)
+        self.assertEqual(len(cache), 1)
+        config = list(cache.values())[0]
+        self.assertEqual(
+            sorted(config.keys()),
+            [
+                'batch_transport',
+                'collate_threads',
+                'num_workers',
+                'pin_memory',
+                'prefetch_factor',
+            ],
+        )
+        self.assertEqual(loader.num_workers, config['num_workers'])
+        self.assertEqual(loader.prefetch_factor, config['prefetch_factor'])
+
+        # cached config is used without tuning
+        config['prefetch_factor'] = 7
+        with open(self.cache_path, 'w') as f:
+            json.dump(cache, f)
+        loader = DataLoader(self.dataset, batch_size=2)
+        self.assertEqual(loader.prefetch_factor, 7)
+        # different dataset signature
+        loader = DataLoader(self.dataset, batch_size=4)
+        self.assertNotEqual(loader.prefetch_factor, 7)
+
+    def test_config_search(self):
+        loader = DataLoader(self.dataset, batch_size=2)
+        tuner = paddle.io.reader.AuToTune(loader)
+        tuner.max_num_worker = 4
+        evaluated = []
+
+        def evaluate_config(reader, config):
+            evaluated.append(config['num_workers'])
+            # best num_workers is 3
+            return abs(config['num_workers'] - 3) + 1.0
+
+        tuner.evaluate_config = evaluate_config
+        tuner.is_main_process_bound = lambda reader: False
+        num_workers, cost = tuner.tune_num_workers(
+            loader, tuner.get_config(loader)
+        )
+        self.assertEqual(num_workers, 3)
+        self.assertEqual(cost, 1.0)
+        # no linear scan
+        self.assertEqual(sorted(set(evaluated)), [0, 1, 2, 3, 4])
+        self.assertEqual(len(evaluated), len(set(evaluated)))
+
+    def test_autotune_loader_collator(self):
+        collator = paddle.io.DefaultCollator()
+        for collate_fn in [None, collator]:
+            loader = DataLoader(
+                self.dataset, batch_size=2, collate_fn=collate_fn
+            )
+            tuner = paddle.io.reader.AuToTune(loader)
+            num_threads = tuner.get_collator(loader).num_threads
+            autotune_loader = tuner.get_autotune_loader()
+            config = tuner.get_config(autotune_loader)
+            config['collate_threads'] = num_threads + 1
+            tuner.apply_config(autotune_loader, config)
+            # trials do not change the collator of the loader
+            self.assertEqual(
+                tuner.get_collator(loader).num_threads, num_threads
+            )
+
+    def test_adapt(self):
+        loader = DataLoader(self.dataset, batch_size=2, num_workers=0)
+        tuner = loader._autotune
+        tuner.max_num_worker = 4
+        loader.num_workers = 1
+        loader.prefetch_factor = 2
+
+        def set_stats(stall_time, bottleneck):
+            loader._pipeline_stats = FakeStats(
+                {
+                    'num_batches': 100,
+                    'stall_time': stall_time,
+                    'elapsed_time': 10.0,
+                    'bottleneck': bottleneck,
+                }
+            )
+
+        # the first epoch is taken as baseline
+        set_stats(1.0, 'getitem')
+        self.assertFalse(tuner.adapt())
+        # waiting time increased
+        set_stats(3.0, 'getitem')
+        self.assertTrue(tuner.adapt())
+        self.assertEqual(loader.num_workers, 2)
+        set_stats(1.0, 'pack')
+        self.assertFalse(tuner.adapt())
+        # packing in main process is not sped up by workers or prefetching
+        set_stats(3.0, 'pack')
+        config = tuner.get_config(loader)
+        self.assertFalse(tuner.adapt())
+        self.assertEqual(tuner.get_config(loader), config)
+
+    def test_adapt_not_needed(self):
+        loader = DataLoader(self.dataset, batch_size=2, num_workers=0)
+        tuner = loader._autotune
+        tuner.need_autotune = lambda: False
+        num_workers = loader.num_workers
+        for stall_time in [1.0, 3.0]:
+            loader._pipeline_stats = FakeStats(
+                {
+                    'num_batches': 100,
+                    'stall_time': stall_time,
+                    'elapsed_time': 10.0,
+                    'bottleneck': 'getitem',
+                }
+            )
+            self.assertFalse(tuner.adapt())
+        self.assertEqual(loader.num_workers, num_workers)
+
+
 class TestAutoTuneAPI(unittest.TestCase):
+    def tearDown(self):
+        paddle.io.reader.set_autotune_config(False)
+
+    def test_set_config_dataloader_without_tuning_steps(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cache_path = os.path.join(temp_dir, 'autotune.json')
+            paddle.incubate.autotune.set_config(
+                {"dataloader": {"enable": True, "cache_path": cache_path}}
+            )
+            self.assertTrue(paddle.io.reader.USE_AUTOTUNE)
+            self.assertEqual(paddle.io.reader.AUTOTUNE_CACHE_PATH, cache_path)
+            paddle.incubate.autotune.set_config(
+                {"dataloader": {"enable": False}}
+            )
+            self.assertFalse(paddle.io.reader.USE_AUTOTUNE)
+
     def test_set_config_warnings(self):
         with warnings.catch_warnings(record=True) as w:
             config = {"kernel": {"enable": 1, "tuning_range": True}}
@@ -0,0 +1,212 @@
+#   Copyright (c) 2023 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pickle
+import unittest
+
+import numpy as np
+
+import paddle
+from paddle.io import DataLoader, Dataset, DefaultCollator
+from paddle.io.dataloader.collate import default_collate_fn
+
+
+def assert_same(test, x, y):
+    test.assertEqual(type(x), type(y))
+    if isinstance(x, dict):
+        test.assertEqual(list(x.keys()), list(y.keys()))
+        for k in x:
+            assert_same(test, x[k], y[k])
+    elif isinstance(x, list):
+        test.assertEqual(len(x), len(y))
+        for a, b in zip(x, y):
+            assert_same(test, a, b)
+    elif isinstance(x, np.ndarray):
+        test.assertEqual(x.dtype, y.dtype)
+        np.testing.assert_array_equal(x, y)
+    elif isinstance(x, paddle.Tensor):
+        np.testing.assert_array_equal(x.numpy(), y.numpy())
+    else:
+        test.assertEqual(x, y)
+
+
+def make_sample(idx):
+    return {
+        'image': np.random.random([3, 4, 4]).astype('float32'),
+        'label': idx % 10,
+        'name': f'sample_{idx}',
+        'meta': [np.array([idx], dtype='int64'), 0.5 * idx],
+    }
+
+
+class TestDefaultCollator(unittest.TestCase):
+    def test_same_as_default_collate_fn(self):
+        collator = DefaultCollator()
+        for _ in range(3):
+            batch = [make_sample(i) for i in range(8)]
+            assert_same(self, collator(batch), default_collate_fn(batch))
+
+    def test_single_field(self):
+        collator = DefaultCollator()
+        batch = [np.ones([2, 3], dtype='float64') * i for i in range(4)]
+        assert_same(self, collator(batch), default_collate_fn(batch))
+        batch = list(range(4))
+        collator = DefaultCollator()
+        assert_same(self, collator(batch), default_collate_fn(batch))
+
+    def test_tensor_field(self):
+        collator = DefaultCollator()
+        batch = [(paddle.ones([2]) * i, i) for i in range(4)]
+        assert_same(self, collator(batch), default_collate_fn(batch))
+
+    def test_schema_mismatch(self):
+        collator = DefaultCollator()
+        batch = [make_sample(i) for i in range(4)]
+        collator(batch)
+        # dtype changed
+        batch = [make_sample(i) for i in range(4)]
+        for sample in batch:
+            sample['image'] = sample['image'].astype('float64')
+        assert_same(self, collator(batch), default_collate_fn(batch))
+        # structure changed
+        batch = [(np.ones([2]), 1) for i in range(4)]
+        assert_same(self, collator(batch), default_collate_fn(batch))
+
+    def test_keys_changed(self):
+        collator = DefaultCollator()
+        batch = [make_sample(i) for i in range(4)]
+        collator(batch)
+        # key added
+        batch = [make_sample(i) for i in range(4)]
+        for sample in batch:
+            sample['weight'] = 1.0
+        assert_same(self, collator(batch), default_collate_fn(batch))
+        assert_same(self, collator(batch), default_collate_fn(batch))
+        # key replaced, the number of keys is not changed
+        for sample in batch:
+            sample['score'] = sample.pop('weight')
+        assert_same(self, collator(batch), default_collate_fn(batch))
+        # key removed
+        for sample in batch:
+            sample.pop('score')
+            sample.pop('name')
+        assert_same(self, collator(batch), default_collate_fn(batch))
+
+    def test_shape_mismatch_without_padding(self):
+        collator = DefaultCollator()
+        batch = [np.ones([i + 1]) for i in range(4)]
+        with self.assertRaises(ValueError):
+            collator(batch)
+
+    def test_fields_number_mismatch(self):
+        collator = DefaultCollator()
+        batch = [[np.ones([2]), 1], [np.ones([2])]]
+        with self.assertRaises(RuntimeError):
+            collator(batch)
+
+    def test_padding(self):
+        collator = DefaultCollator(pad_fields={'ids': -1})
+        batch = [
+            {'ids': np.arange(i + 1, dtype='int64'), 'label': i}
+            for i in range(4)
+        ]
+        out = collator(batch)
+        self.assertEqual(out['ids'].shape, (4, 4))
+        self.assertEqual(out['ids'].dtype, np.int64)
+        for i in range(4):
+            np.testing.assert_array_equal(
+                out['ids'][i, : i + 1], np.arange(i + 1)
+            )
+            self.assertTrue((out['ids'][i, i + 1 :] == -1).all())
+        np.testing.assert_array_equal(out['label'], np.arange(4))
+
+    def test_padding_multi_dims(self):
+        collator = DefaultCollator(pad_fields=True, pad_value=0.0)
+        batch = [np.ones([i + 1, 4 - i], dtype='float32') for i in range(4)]
+        out = collator(batch)
+        self.assertEqual(out.shape, (4, 4, 4))
+        for i in range(4):
+            self.assertEqual(out[i].sum(), (i + 1) * (4 - i))
+
+    def test_padding_list_fields(self):
+        collator = DefaultCollator(pad_fields=[0], pad_value=7)
+        batch = [(np.zeros([i + 1]), np.zeros([2])) for i in range(3)]
+        out = collator(batch)
+        self.assertEqual(out[0].shape, (3, 3))
+        self.assertEqual(out[0][0, 1], 7)
+
+    def test_invalid_pad_fields(self):
+        with self.assertRaises(TypeError):
+            DefaultCollator(pad_fields='ids')
+
+    def test_num_threads(self):
+        collator = DefaultCollator(num_threads=2)
+        for _ in range(3):
+            batch = [make_sample(i) for i in range(8)]
+            assert_same(self, collator(batch), default_collate_fn(batch))
+        collator.num_threads = 4
+        batch = [make_sample(i) for i in range(8)]
+        assert_same(self, collator(batch), default_collate_fn(batch))
+        collator = pickle.loads(pickle.dumps(collator))
+        self.assertEqual(collator.num_threads, 4)
+        assert_same(self, collator(batch), default_collate_fn(batch))
+        with self.assertRaises(ValueError):
+            DefaultCollator(num_threads=0)
+
+    def test_executor_rebuilt_in_forked_process(self):
+        collator = DefaultCollator(num_threads=2)
+        batch = [make_sample(i) for i in range(8)]
+        collator(batch)
+        executor = collator._executor
+        # as inherited by a forked worker, whose executor has no threads
+        collator._executor_pid = -1
+        assert_same(self, collator(batch), default_collate_fn(batch))
+        self.assertIsNot(collator._executor, executor)
+        executor.shutdown()
+        collator._shutdown_executor()
+        self.assertIsNone(collator._executor)
+        assert_same(self, collator(batch), default_collate_fn(batch))
+        collator._shutdown_executor()
+
+    def test_pickle(self):
+        collator = DefaultCollator(pad_fields={'ids': 0})
+        collator([{'ids': np.ones([2])}])
+        collator = pickle.loads(pickle.dumps(collator))
+        out = collator([{'ids': np.ones([2])}, {'ids': np.ones([3])}])
+        self.assertEqual(out['ids'].shape, (2, 3))
+
+
+class VarLenDataset(Dataset):
+    def __getitem__(self, idx):
+        return np.arange(idx % 5 + 1).astype('int64'), idx % 2
+
+    def __len__(self):
+        return 20
+
+
+class TestDefaultCollatorDataLoader(unittest.TestCase):
+    def test_dataloader(self):
+        paddle.disable_static()
+        loader = DataLoader(
+            VarLenDataset(),
+            batch_size=5,
+            collate_fn=DefaultCollator(pad_fields=[0]),
+        )
+        for ids, label in loader:
+            self.assertEqual(ids.shape, [5, 5])
+            self.assertEqual(label.shape, [5])
+
+
+if __name__ == '__main__':
+    unittest.main()
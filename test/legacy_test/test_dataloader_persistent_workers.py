@@ -0,0 +1,187 @@
+#   Copyright (c) 2023 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import sys
+import unittest
+from unittest import mock
+
+import numpy as np
+
+import paddle
+from paddle.io import DataLoader, Dataset, DistributedBatchSampler
+from paddle.io.dataloader.dataloader_iter import _DataLoaderIterMultiProcess
+
+SAMPLE_NUM = 40
+BATCH_SIZE = 4
+
+
+class IndexDataset(Dataset):
+    def __getitem__(self, idx):
+        return np.array([idx], dtype='int64')
+
+    def __len__(self):
+        return SAMPLE_NUM
+
+
+def read_epoch(loader, max_steps=None):
+    indices = []
+    for step, data in enumerate(loader):
+        if max_steps is not None and step >= max_steps:
+            break
+        indices.extend(data.numpy().flatten().tolist())
+    return indices
+
+
+@unittest.skipIf(
+    sys.platform == 'darwin' or sys.platform == 'win32',
+    "multi-process DataLoader is not supported",
+)
+class TestPersistentWorkers(unittest.TestCase):
+    def setUp(self):
+        paddle.disable_static()
+
+    def create_loader(self, batch_sampler=None, **kwargs):
+        if batch_sampler is not None:
+            kwargs['batch_sampler'] = batch_sampler
+        else:
+            kwargs['batch_size'] = BATCH_SIZE
+        return DataLoader(
+            IndexDataset(), num_workers=2, persistent_workers=True, **kwargs
+        )
+
+    def test_multi_epochs(self):
+        for drop_last in [False, True]:
+            loader = self.create_loader(drop_last=drop_last)
+            for _ in range(3):
+                self.assertEqual(read_epoch(loader), list(range(SAMPLE_NUM)))
+
+    def test_shuffle(self):
+        loader = self.create_loader(shuffle=True)
+        for _ in range(3):
+            indices = read_epoch(loader)
+            self.assertEqual(sorted(indices), list(range(SAMPLE_NUM)))
+
+    def test_break_epoch(self):
+        loader = self.create_loader()
+        self.assertEqual(read_epoch(loader, max_steps=2), list(range(8)))
+        self.assertEqual(read_epoch(loader), list(range(SAMPLE_NUM)))
+        # break in the tail of epoch, batches of next epoch are prefetched
+        self.assertEqual(
+            read_epoch(loader, max_steps=SAMPLE_NUM // BATCH_SIZE - 1),
+            list(range(SAMPLE_NUM - BATCH_SIZE)),
+        )
+        self.assertEqual(read_epoch(loader), list(range(SAMPLE_NUM)))
+
+    def record_reuse(self, reused):
+        # records whether the prefetched batches are used in each reset
+        start_prefetched_epoch = (
+            _DataLoaderIterMultiProcess._start_prefetched_epoch
+        )
+
+        def record_start(iterator):
+            started = start_prefetched_epoch(iterator)
+            reused.append(started)
+            return started
+
+        return mock.patch.object(
+            _DataLoaderIterMultiProcess,
+            '_start_prefetched_epoch',
+            record_start,
+        )
+
+    def read_epochs_with_sampler(self, epochs):
+        dataset = IndexDataset()
+        sampler = DistributedBatchSampler(
+            dataset, batch_size=BATCH_SIZE, shuffle=True
+        )
+        loader = self.create_loader(batch_sampler=sampler)
+
+        reused = []
+        with self.record_reuse(reused):
+            for epoch in epochs:
+                sampler.set_epoch(epoch)
+                expected_sampler = DistributedBatchSampler(
+                    dataset, batch_size=BATCH_SIZE, shuffle=True
+                )
+                expected_sampler.set_epoch(epoch)
+                expected = [idx for batch in expected_sampler for idx in batch]
+                self.assertEqual(read_epoch(loader), expected)
+                # sampler is advanced only by the epoch read from it
+                self.assertEqual(sampler.epoch, epoch + 1)
+        return reused
+
+    def test_sampler_set_epoch(self):
+        reused = self.read_epochs_with_sampler([0, 1, 2])
+        self.assertEqual(reused, [True, True])
+
+    def test_sampler_set_other_epoch(self):
+        # the prefetched batches are sampled with epoch 1, not 5
+        reused = self.read_epochs_with_sampler([0, 5])
+        self.assertEqual(reused, [False])
+
+    def test_random_sampler_not_prefetched(self):
+        # batches of RandomSampler cannot be sampled again
+        loader = self.create_loader(shuffle=True)
+        reused = []
+        with self.record_reuse(reused):
+            for _ in range(3):
+                indices = read_epoch(loader)
+                self.assertEqual(sorted(indices), list(range(SAMPLE_NUM)))
+        self.assertEqual(reused, [False, False])
+
+
+@unittest.skipIf(
+    sys.platform == 'darwin' or sys.platform == 'win32',
+    "multi-process DataLoader is not supported",
+)
+class TestWorkerMetrics(unittest.TestCase):
+    def setUp(self):
+        paddle.disable_static()
+
+    def check_metrics(self, loader, num_batches):
+        metrics = loader.worker_metrics()
+        self.assertEqual([m['worker_id'] for m in metrics], [0, 1])
+        self.assertEqual(sum(m['num_batches'] for m in metrics), num_batches)
+        for m in metrics:
+            self.assertGreaterEqual(m['idle_time'], 0.0)
+            self.assertGreaterEqual(m['busy_time'], 0.0)
+            self.assertTrue(0.0 <= m['idle_ratio'] <= 1.0)
+
+    def test_metrics(self):
+        loader = DataLoader(IndexDataset(), batch_size=BATCH_SIZE)
+        self.assertEqual(loader.worker_metrics(), [])
+
+        loader = DataLoader(
+            IndexDataset(), batch_size=BATCH_SIZE, num_workers=2
+        )
+        read_epoch(loader)
+        self.check_metrics(loader, SAMPLE_NUM // BATCH_SIZE)
+
+    def test_persistent_metrics(self):
+        loader = DataLoader(
+            IndexDataset(),
+            batch_size=BATCH_SIZE,
+            num_workers=2,
+            persistent_workers=True,
+        )
+        read_epoch(loader)
+        read_epoch(loader)
+        # metrics are accumulated over epochs, prefetched batches of
+        # the third epoch may be counted
+        num_batches = sum(m['num_batches'] for m in loader.worker_metrics())
+        self.assertGreaterEqual(num_batches, 2 * SAMPLE_NUM // BATCH_SIZE)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,146 @@
+#   Copyright (c) 2023 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import sys
+import time
+import unittest
+
+import numpy as np
+
+import paddle
+from paddle import profiler
+from paddle.io import DataLoader, Dataset
+from paddle.io.dataloader.pipeline_stats import _PipelineStats
+
+SAMPLE_NUM = 16
+BATCH_SIZE = 4
+
+
+class SlowDataset(Dataset):
+    def __init__(self, sleep_time=0.0):
+        self.sleep_time = sleep_time
+
+    def __getitem__(self, idx):
+        time.sleep(self.sleep_time)
+        return np.full([4], idx, dtype='float32')
+
+    def __len__(self):
+        return SAMPLE_NUM
+
+
+def slow_collate_fn(batch):
+    time.sleep(0.02)
+    return np.stack(batch)
+
+
+class TestPipelineStatsSummary(unittest.TestCase):
+    def test_attribution(self):
+        stats = _PipelineStats(num_workers=2)
+        stats.add('pack', 0.1)
+        stats.on_consume(time.time() - 0.5)
+        worker_metrics = [
+            {
+                'num_batches': 1,
+                'getitem_time': 0.8,
+                'collate_time': 0.1,
+                'transfer_time': 0.1,
+            },
+            {
+                'num_batches': 1,
+                'getitem_time': 0.8,
+                'collate_time': 0.1,
+                'transfer_time': 0.1,
+            },
+        ]
+        summary = stats.summary(worker_metrics)
+        self.assertEqual(summary['num_batches'], 1)
+        self.assertEqual(summary['bottleneck'], 'getitem')
+        stages = summary['stages']
+        self.assertAlmostEqual(stages['getitem']['total_time'], 1.6)
+        self.assertAlmostEqual(stages['getitem']['avg_time'], 0.8)
+        # workers load batches in parallel
+        self.assertAlmostEqual(stages['getitem']['effective_time'], 0.4)
+        self.assertAlmostEqual(stages['pack']['effective_time'], 0.05)
+        attribution = summary['stall_attribution']
+        self.assertAlmostEqual(sum(attribution.values()), summary['stall_time'])
+        self.assertAlmostEqual(
+            attribution['getitem'] / attribution['pack'], 8.0
+        )
+
+    def test_empty(self):
+        summary = _PipelineStats().summary()
+        self.assertEqual(summary['num_batches'], 0)
+        self.assertIsNone(summary['bottleneck'])
+        self.assertEqual(summary['stall_attribution'], {})
+        self.assertNotIn('queue', summary['stages'])
+
+
+class TestDataLoaderPipelineStats(unittest.TestCase):
+    def setUp(self):
+        paddle.disable_static()
+
+    def check_stats(self, loader, stages):
+        self.assertIsNone(loader.pipeline_stats())
+        for _ in loader:
+            pass
+        stats = loader.pipeline_stats()
+        self.assertEqual(stats['num_batches'], SAMPLE_NUM // BATCH_SIZE)
+        self.assertEqual(sorted(stats['stages'].keys()), sorted(stages))
+        for stage in stats['stages'].values():
+            self.assertGreaterEqual(stage['total_time'], 0.0)
+        self.assertTrue(0.0 <= stats['stall_ratio'] <= 1.0)
+        return stats
+
+    def test_single_process(self):
+        loader = DataLoader(
+            SlowDataset(0.01), batch_size=BATCH_SIZE, collate_fn=slow_collate_fn
+        )
+        stats = self.check_stats(loader, ['getitem', 'collate', 'pack', 'wait'])
+        self.assertGreaterEqual(
+            stats['stages']['getitem']['total_time'], SAMPLE_NUM * 0.01
+        )
+        self.assertGreaterEqual(stats['stages']['collate']['avg_time'], 0.02)
+        self.assertIn(stats['bottleneck'], ['getitem', 'collate'])
+
+    def test_multi_process(self):
+        if sys.platform == 'darwin' or sys.platform == 'win32':
+            return
+        loader = DataLoader(
+            SlowDataset(0.02), batch_size=BATCH_SIZE, num_workers=2
+        )
+        stats = self.check_stats(
+            loader, ['getitem', 'collate', 'transfer', 'queue', 'pack', 'wait']
+        )
+        self.assertGreaterEqual(
+            stats['stages']['getitem']['total_time'], SAMPLE_NUM * 0.02
+        )
+        self.assertEqual(stats['bottleneck'], 'getitem')
+        for metrics in loader.worker_metrics():
+            self.assertGreaterEqual(metrics['getitem_time'], 0.0)
+            self.assertGreaterEqual(metrics['transfer_time'], 0.0)
+
+    def test_profiler_events(self):
+        loader = DataLoader(SlowDataset(), batch_size=BATCH_SIZE)
+        prof = profiler.Profiler(targets=[profiler.ProfilerTarget.CPU])
+        prof.start()
+        for _ in loader:
+            prof.step()
+        prof.stop()
+        self.assertEqual(
+            loader.pipeline_stats()['num_batches'], SAMPLE_NUM // BATCH_SIZE
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,170 @@
+#   Copyright (c) 2023 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import gc
+import sys
+import unittest
+
+import numpy as np
+
+import paddle
+from paddle import base
+from paddle.io import DataLoader, Dataset, IterableDataset
+from paddle.io.dataloader.shm_slab import _SharedSlabPool, _SlabWriter
+
+IMAGE_SIZE = 32
+
+
+class RandomDataset(Dataset):
+    def __init__(self, sample_num, image_size=IMAGE_SIZE):
+        self.sample_num = sample_num
+        self.image_size = image_size
+
+    def __len__(self):
+        return self.sample_num
+
+    def __getitem__(self, idx):
+        np.random.seed(idx)
+        image = np.random.random([self.image_size]).astype('float32')
+        label = np.random.randint(0, 9, (1,)).astype('int64')
+        return {'image': image, 'label': label, 'idx': idx}
+
+
+class RandomIterableDataset(IterableDataset):
+    def __init__(self, sample_num):
+        self.sample_num = sample_num
+
+    def __iter__(self):
+        for i in range(self.sample_num):
+            np.random.seed(i)
+            image = np.random.random([IMAGE_SIZE]).astype('float32')
+            label = np.random.randint(0, 9, (1,)).astype('int64')
+            yield image, label
+
+
+class TestSharedSlabPool(unittest.TestCase):
+    def test_write_and_materialize(self):
+        pool = _SharedSlabPool(2, slab_size=1024)
+        writer = _SlabWriter()
+        try:
+            slab = pool.acquire()
+            self.assertEqual(pool.num_free(), 1)
+            batch = [
+                np.arange(12, dtype='float32').reshape([3, 4]),
+                np.array([1, 2, 3], dtype='int64'),
+            ]
+            slab_batch = writer.write(slab, batch)
+            self.assertIsNotNone(slab_batch.metas)
+            self.assertIsNone(slab_batch.fallback)
+
+            tensors = pool.materialize(slab_batch)
+            for tensor, expected in zip(tensors, batch):
+                np.testing.assert_array_equal(np.array(tensor), expected)
+
+            # slab is recycled only after all tensors released
+            self.assertEqual(pool.num_free(), 1)
+            del tensors
+            gc.collect()
+            self.assertEqual(pool.num_free(), 2)
+        finally:
+            writer.close()
+            pool.close()
+
+    def test_batch_exceed_slab_size(self):
+        pool = _SharedSlabPool(1, slab_size=64)
+        writer = _SlabWriter()
+        try:
+            slab = pool.acquire()
+            batch = [np.ones([64], dtype='float32')]
+            slab_batch = writer.write(slab, batch)
+            self.assertIsNone(slab_batch.metas)
+            self.assertEqual(slab_batch.nbytes, 256)
+
+            pool.release(slab_batch.slab_id, slab_batch.nbytes)
+            self.assertGreaterEqual(pool.slab_size, 256)
+
+            # slab is reallocated with enough size
+            slab = pool.acquire()
+            self.assertGreaterEqual(slab[2], 256)
+            slab_batch = writer.write(slab, batch)
+            self.assertIsNotNone(slab_batch.metas)
+            pool.release(slab_batch.slab_id)
+        finally:
+            writer.close()
+            pool.close()
+
+    def test_acquire_exhausted(self):
+        pool = _SharedSlabPool(1, slab_size=64)
+        try:
+            self.assertIsNotNone(pool.acquire())
+            self.assertIsNone(pool.acquire())
+            pool.reclaim_dispatched()
+            self.assertIsNotNone(pool.acquire())
+        finally:
+            pool.close()
+        self.assertIsNone(pool.acquire())
+
+
+class TestSharedSlabDataLoader(unittest.TestCase):
+    def run_main(self, dataset, batch_transport, num_workers=2, epoch=2):
+        place = base.CPUPlace()
+        with base.dygraph.guard(place):
+            loader = DataLoader(
+                dataset,
+                places=place,
+                num_workers=num_workers,
+                batch_size=4,
+                drop_last=True,
+                batch_transport=batch_transport,
+            )
+            results = []
+            for _ in range(epoch):
+                for data in loader():
+                    if isinstance(data, dict):
+                        data = [data['image'], data['label'], data['idx']]
+                    results.append([np.array(d) for d in data])
+            return results
+
+    def check_same(self, dataset):
+        expected = self.run_main(dataset, 'queue')
+        results = self.run_main(dataset, 'shared_slab')
+        self.assertEqual(len(expected), len(results))
+        for exp, res in zip(expected, results):
+            for e, r in zip(exp, res):
+                np.testing.assert_array_equal(e, r)
+
+    def test_map_dataset(self):
+        if sys.platform == 'darwin' or sys.platform == 'win32':
+            return
+        self.check_same(RandomDataset(40))
+
+    def test_iterable_dataset(self):
+        if sys.platform == 'darwin' or sys.platform == 'win32':
+            return
+        self.check_same(RandomIterableDataset(40))
+
+    def test_slab_reallocated(self):
+        if sys.platform == 'darwin' or sys.platform == 'win32':
+            return
+        # batch larger than default slab size fallback to queue at first
+        self.check_same(RandomDataset(16, image_size=2 * 1024 * 1024))
+
+    def test_invalid_batch_transport(self):
+        with self.assertRaises(ValueError):
+            DataLoader(RandomDataset(10), batch_transport='pipe')
+
+
+if __name__ == '__main__':
+    paddle.disable_static()
+    unittest.main()
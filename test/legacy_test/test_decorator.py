@@ -17,6 +17,8 @@ import sys
 import time
 import unittest
 
+import numpy as np
+
 import paddle.reader
 
 __all__ = []
@@ -153,6 +155,66 @@ class TestXmap(unittest.TestCase):
                             self.assertEqual(e, mapper(idx))
 
 
+def array_mapper(x):
+    return np.full([x % 3 + 1, 2], x, dtype='float32'), x
+
+
+class TestXmapProcess(unittest.TestCase):
+    def test_xmap_process(self):
+        if sys.platform == 'win32':
+            return
+        for order in (True, False):
+            for use_shared_memory in (True, False):
+                for process_num, size in ((1, 1), (2, 4), (4, 2)):
+                    reader = paddle.reader.xmap_readers(
+                        array_mapper,
+                        reader_creator_10(0),
+                        process_num,
+                        size,
+                        order,
+                        use_process=True,
+                        use_shared_memory=use_shared_memory,
+                    )
+                    for n in range(2):
+                        result = list(reader())
+                        idxs = [x for _, x in result]
+                        if order:
+                            self.assertEqual(idxs, list(range(10)))
+                        else:
+                            self.assertEqual(sorted(idxs), list(range(10)))
+                        for arr, x in result:
+                            np.testing.assert_array_equal(
+                                arr, array_mapper(x)[0]
+                            )
+
+    def test_xmap_process_break(self):
+        if sys.platform == 'win32':
+            return
+        reader = paddle.reader.xmap_readers(
+            array_mapper, reader_creator_10(0), 2, 2, True, use_process=True
+        )
+        for i, (_, x) in enumerate(reader()):
+            self.assertEqual(i, x)
+            if i == 3:
+                break
+
+    def test_xmap_process_exception(self):
+        if sys.platform == 'win32':
+            return
+
+        def mapper(x):
+            if x == 5:
+                raise ValueError("mapper error")
+            return x
+
+        reader = paddle.reader.xmap_readers(
+            mapper, reader_creator_10(0), 2, 4, use_process=True
+        )
+        with self.assertRaises(RuntimeError):
+            for _ in reader():
+                pass
+
+
 class TestMultiProcessReader(unittest.TestCase):
     def setup(self):
         self.samples = []
@@ -0,0 +1,179 @@
+# Copyright (c) 2023 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import pickle
+import tempfile
+import unittest
+
+import numpy as np
+
+import paddle
+import paddle.distributed as dist
+from paddle.distributed.checkpoint.metadata import (
+    LocalTensorIndex,
+    LocalTensorMetadata,
+    Metadata,
+)
+from paddle.distributed.checkpoint.utils import (
+    METADATA_FILE_NAME,
+    compute_overlap,
+    data_file_name,
+    flatten_state_dict,
+    structure_keys,
+)
+
+
+class TestDistCheckpoint(unittest.TestCase):
+    def setUp(self):
+        paddle.disable_static()
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, 'checkpoint')
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_compute_overlap(self):
+        # columns [2, 6) of the local shard and [4, 8) of the saved shard
+        self.assertEqual(
+            compute_overlap((0, 2), (4, 4), (0, 4), (4, 4)),
+            ((slice(0, 4), slice(2, 4)), (slice(0, 4), slice(0, 2))),
+        )
+        self.assertIsNone(compute_overlap((0, 0), (4, 4), (0, 4), (4, 4)))
+
+    def test_flatten_state_dict(self):
+        flat, mapping = flatten_state_dict({'w': 1, 'master_weights': {'w': 2}})
+        self.assertEqual(flat, {'w': 1, 'master_weights.w': 2})
+        self.assertEqual(mapping['master_weights.w'], ('master_weights', 'w'))
+        with self.assertRaises(ValueError):
+            flatten_state_dict({'a.b': 1, 'a': {'b': 2}})
+
+    def check_save_load(self, async_save):
+        model = paddle.nn.Linear(4, 8)
+        state_dict = model.state_dict()
+        state_dict['LR_Scheduler'] = {'last_epoch': 3}
+        future = dist.save_state_dict(
+            state_dict, self.path, async_save=async_save
+        )
+        if async_save:
+            # the snapshot is not affected by the update after saving
+            expected = model.weight.numpy()
+            model.weight.set_value(np.zeros([4, 8], 'float32'))
+            future.result()
+        else:
+            self.assertIsNone(future)
+            expected = model.weight.numpy()
+
+        new_model = paddle.nn.Linear(4, 8)
+        new_state_dict = new_model.state_dict()
+        new_state_dict['LR_Scheduler'] = {'last_epoch': 0}
+        dist.load_state_dict(new_state_dict, self.path)
+        np.testing.assert_array_equal(new_model.weight.numpy(), expected)
+        self.assertEqual(new_state_dict['LR_Scheduler']['last_epoch'], 3)
+
+    def test_save_load(self):
+        self.check_save_load(async_save=False)
+
+    def test_async_save_load(self):
+        self.check_save_load(async_save=True)
+
+    def test_reshard(self):
+        # a weight split into two column shards, as saved with 2 mp ranks
+        weight = np.random.rand(4, 8).astype('float32')
+        metadata = Metadata()
+        os.makedirs(self.path)
+        for rank in range(2):
+            offset = (0, rank * 4)
+            index = LocalTensorIndex('weight', offset)
+            metadata.state_dict_metadata.setdefault('weight', []).append(
+                LocalTensorMetadata(offset, (4, 4), 'paddle.float32')
+            )
+            metadata.storage_metadata[index] = data_file_name(rank)
+            paddle.save(
+                {index.storage_key: weight[:, rank * 4 : rank * 4 + 4]},
+                os.path.join(self.path, data_file_name(rank)),
+                use_chunked_format=True,
+            )
+        with open(os.path.join(self.path, METADATA_FILE_NAME), 'wb') as f:
+            pickle.dump(metadata, f)
+
+        # loaded without tensor parallel
+        state_dict = {'weight': paddle.zeros([4, 8])}
+        dist.load_state_dict(state_dict, self.path)
+        np.testing.assert_array_equal(state_dict['weight'].numpy(), weight)
+
+        state_dict = {'weight': paddle.zeros([4, 16])}
+        with self.assertRaises(ValueError):
+            dist.load_state_dict(state_dict, self.path)
+
+    def train_step(self, model, opt):
+        loss = model(paddle.rand([2, 4])).mean()
+        loss.backward()
+        opt.step()
+        opt.clear_grad()
+
+    def test_structure_keys(self):
+        model = paddle.nn.Linear(4, 8)
+        opt = paddle.optimizer.Adam(parameters=model.parameters())
+        self.train_step(model, opt)
+        state_dict = {'model': model.state_dict(), 'opt': opt.state_dict()}
+        flat, mapping = flatten_state_dict(state_dict)
+        renamed, renamed_mapping, params = structure_keys(flat, mapping)
+        moment_key = f'opt.{model.weight.name}_moment1_0'
+        self.assertIn(moment_key, flat)
+        self.assertIn('opt.model.weight_moment1_0', renamed)
+        self.assertIs(params['opt.model.weight_moment1_0'], model.weight)
+        self.assertEqual(
+            renamed_mapping['opt.model.weight_moment1_0'], mapping[moment_key]
+        )
+        self.assertIn('model.weight', renamed)
+
+    def test_optimizer_state_with_other_param_names(self):
+        model = paddle.nn.Linear(4, 8)
+        opt = paddle.optimizer.Adam(parameters=model.parameters())
+        self.train_step(model, opt)
+        dist.save_state_dict(
+            {'model': model.state_dict(), 'opt': opt.state_dict()}, self.path
+        )
+
+        # the auto-generated names of params are changed, e.g. by the
+        # layers of other pipeline stages created before
+        paddle.nn.Linear(2, 2)
+        new_model = paddle.nn.Linear(4, 8)
+        self.assertNotEqual(new_model.weight.name, model.weight.name)
+        new_opt = paddle.optimizer.Adam(
+            learning_rate=0.0, parameters=new_model.parameters()
+        )
+        self.train_step(new_model, new_opt)
+        dist.load_state_dict(
+            {'model': new_model.state_dict(), 'opt': new_opt.state_dict()},
+            self.path,
+        )
+        np.testing.assert_array_equal(
+            new_model.weight.numpy(), model.weight.numpy()
+        )
+        moment1 = opt._accumulators['moment1']
+        new_moment1 = new_opt._accumulators['moment1']
+        np.testing.assert_array_equal(
+            new_moment1[new_model.weight.name].numpy(),
+            moment1[model.weight.name].numpy(),
+        )
+
+    def test_missing_metadata(self):
+        with self.assertRaises(ValueError):
+            dist.load_state_dict({}, self.temp_dir.name)
+
+
+if __name__ == '__main__':
+    unittest.main()
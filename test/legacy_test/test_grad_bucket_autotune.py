@@ -0,0 +1,48 @@
+# Copyright (c) 2023 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+from unittest import mock
+
+from paddle.distributed.fleet.utils import tensor_fusion_helper
+from paddle.distributed.fleet.utils.tensor_fusion_helper import (
+    BucketSizeAutotuner,
+)
+
+
+class TestGradBucketAutotune(unittest.TestCase):
+    def test_autotuner(self):
+        tuner = BucketSizeAutotuner(
+            candidates=[1, 2],
+            warmup_steps=1,
+            steps_per_candidate=2,
+        )
+        # steps of candidate 2 take half of the time of candidate 1
+        timestamps = [0, 1, 3, 5, 7, 8, 9]
+        bucket_sizes = []
+        with mock.patch.object(tensor_fusion_helper, "time") as mock_time:
+            mock_time.perf_counter.side_effect = timestamps
+            for _ in timestamps:
+                tuner.step()
+                bucket_sizes.append(tuner.bucket_size)
+        self.assertEqual(bucket_sizes, [1, 1, 1, 2, 2, 2, 2])
+        self.assertTrue(tuner.tuned)
+        self.assertEqual(tuner.bucket_size, 2)
+        # tuned size is kept
+        tuner.step()
+        self.assertEqual(tuner.bucket_size, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,154 @@
+# Copyright (c) 2023 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import struct
+import tempfile
+import unittest
+
+import numpy as np
+
+import paddle
+from paddle import nn
+from paddle.base import core
+from paddle.base.proto import framework_pb2
+from paddle.jit.translated_layer import _mmap_tensors
+from paddle.static import InputSpec
+
+
+class LinearNet(nn.Layer):
+    def __init__(self):
+        super().__init__()
+        self._linear = nn.Linear(8, 4)
+        self._bn = nn.BatchNorm1D(4)
+
+    def forward(self, x):
+        return self._bn(self._linear(x))
+
+
+def write_tensors(path, values, data_types):
+    # write numpy arrays in the format of save_combine, return the offsets
+    # of their data in the file
+    offsets = []
+    with open(path, 'wb') as f:
+        for value, data_type in zip(values, data_types):
+            desc = framework_pb2.VarType.TensorDesc()
+            desc.data_type = data_type
+            desc.dims.extend(value.shape)
+            desc_bytes = desc.SerializeToString()
+            f.write(struct.pack('<IQI', 0, 0, 0))
+            f.write(struct.pack('<i', len(desc_bytes)))
+            f.write(desc_bytes)
+            offsets.append(f.tell())
+            f.write(value.tobytes())
+    return offsets
+
+
+class TestJitLoadMmap(unittest.TestCase):
+    def setUp(self):
+        paddle.disable_static()
+        paddle.set_device('cpu')
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, 'linear/model')
+        self.layer = LinearNet()
+        self.layer.eval()
+        paddle.jit.save(
+            self.layer,
+            self.path,
+            input_spec=[InputSpec([None, 8], 'float32', name='x')],
+        )
+        self.x = paddle.rand([2, 8])
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_mmap_tensors(self):
+        arrays = _mmap_tensors(self.path + '.pdiparams')
+        expected = sorted(
+            (p.numpy() for p in self.layer.state_dict().values()),
+            key=lambda x: x.shape,
+        )
+        self.assertEqual(len(arrays), len(expected))
+        for array, value in zip(
+            sorted(arrays, key=lambda x: x.shape), expected
+        ):
+            self.assertTrue(array.flags.aligned)
+            self.assertEqual(array.shape, value.shape)
+
+    def test_mmap_tensors_misaligned(self):
+        path = os.path.join(self.temp_dir.name, 'misaligned.pdiparams')
+        # with 3 bytes of the first tensor and a 6 bytes TensorDesc, the data
+        # of the second tensor is at an odd offset
+        values = [
+            np.arange(3, dtype='uint8'),
+            np.arange(6, dtype='float64').reshape([2, 3]),
+        ]
+        offsets = write_tensors(
+            path,
+            values,
+            [core.VarDesc.VarType.UINT8, core.VarDesc.VarType.FP64],
+        )
+        self.assertEqual(offsets[1] % 2, 1)
+        arrays = _mmap_tensors(path)
+        self.assertIsInstance(arrays[0], np.memmap)
+        self.assertNotIsInstance(arrays[1], np.memmap)
+        for array, value in zip(arrays, values):
+            self.assertTrue(array.flags.aligned)
+            np.testing.assert_array_equal(array, value)
+
+    def test_load(self):
+        expected = self.layer(self.x).numpy()
+        loaded = paddle.jit.load(self.path)
+        mmap_loaded = paddle.jit.load(self.path, mmap=True)
+        np.testing.assert_allclose(loaded(self.x).numpy(), expected, rtol=1e-5)
+        np.testing.assert_allclose(
+            mmap_loaded(self.x).numpy(), expected, rtol=1e-5
+        )
+        for p, mmap_p in zip(loaded.parameters(), mmap_loaded.parameters()):
+            self.assertEqual(p.dtype, mmap_p.dtype)
+            self.assertEqual(p.stop_gradient, mmap_p.stop_gradient)
+            np.testing.assert_array_equal(p.numpy(), mmap_p.numpy())
+
+    def test_copy_on_write(self):
+        with open(self.path + '.pdiparams', 'rb') as f:
+            params_bytes = f.read()
+        replica1 = paddle.jit.load(self.path, mmap=True)
+        replica2 = paddle.jit.load(self.path, mmap=True)
+        expected = replica2(self.x).numpy()
+        for p in replica1.parameters():
+            paddle.assign(paddle.zeros_like(p), p)
+        # modifying one replica does not change others and the file
+        np.testing.assert_allclose(replica2(self.x).numpy(), expected)
+        with open(self.path + '.pdiparams', 'rb') as f:
+            self.assertEqual(f.read(), params_bytes)
+
+    def test_fine_tuning(self):
+        layer = paddle.jit.load(self.path, mmap=True)
+        layer.train()
+        sgd = paddle.optimizer.SGD(
+            learning_rate=0.1, parameters=layer.parameters()
+        )
+        before = [p.numpy() for p in layer.parameters()]
+        loss = layer(self.x).mean()
+        loss.backward()
+        sgd.step()
+        changed = [
+            not np.array_equal(b, p.numpy())
+            for b, p in zip(before, layer.parameters())
+        ]
+        self.assertTrue(any(changed))
+
+
+if __name__ == '__main__':
+    unittest.main()
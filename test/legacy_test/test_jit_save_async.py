@@ -0,0 +1,135 @@
+# Copyright (c) 2023 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import tempfile
+import unittest
+from concurrent.futures import Future
+from unittest import mock
+
+import numpy as np
+
+import paddle
+from paddle import nn
+from paddle.jit import async_save
+from paddle.static import InputSpec
+
+
+class LinearNet(nn.Layer):
+    def __init__(self):
+        super().__init__()
+        self._linear = nn.Linear(8, 4)
+        self._bn = nn.BatchNorm1D(4)
+
+    def forward(self, x):
+        return self._bn(self._linear(x))
+
+
+class TestJitSaveAsync(unittest.TestCase):
+    def setUp(self):
+        paddle.disable_static()
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, 'linear/model')
+        self.layer = LinearNet()
+        self.layer.eval()
+        self.input_spec = [InputSpec([None, 8], 'float32', name='x')]
+        self.x = paddle.rand([2, 8])
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def check_load(self, path, expected):
+        loaded = paddle.jit.load(path)
+        np.testing.assert_allclose(loaded(self.x).numpy(), expected, rtol=1e-5)
+
+    def test_same_as_sync_save(self):
+        sync_path = os.path.join(self.temp_dir.name, 'sync/model')
+        self.assertIsNone(
+            paddle.jit.save(self.layer, sync_path, input_spec=self.input_spec)
+        )
+        future = paddle.jit.save(
+            self.layer, self.path, input_spec=self.input_spec, async_save=True
+        )
+        self.assertIsInstance(future, Future)
+        self.assertIsNone(future.result())
+        for suffix in ['.pdmodel', '.pdiparams', '.pdiparams.info']:
+            with open(sync_path + suffix, 'rb') as f:
+                expected = f.read()
+            with open(self.path + suffix, 'rb') as f:
+                self.assertEqual(f.read(), expected, suffix)
+        self.assertEqual(
+            sorted(os.listdir(os.path.dirname(self.path))),
+            ['model.pdiparams', 'model.pdiparams.info', 'model.pdmodel'],
+        )
+        self.check_load(self.path, self.layer(self.x).numpy())
+
+    def test_snapshot(self):
+        expected = self.layer(self.x).numpy()
+        future = paddle.jit.save(
+            self.layer, self.path, input_spec=self.input_spec, async_save=True
+        )
+        # updating params after returning does not change the saved model
+        for param in self.layer.parameters():
+            paddle.assign(paddle.zeros_like(param), param)
+        future.result()
+        self.check_load(self.path, expected)
+
+    def test_overlapping_saves(self):
+        futures = []
+        for _ in range(3):
+            futures.append(
+                paddle.jit.save(
+                    self.layer,
+                    self.path,
+                    input_spec=self.input_spec,
+                    async_save=True,
+                )
+            )
+            for param in self.layer.parameters():
+                paddle.assign(param + 1.0, param)
+        expected = self.layer(self.x).numpy()
+        futures.append(
+            paddle.jit.save(
+                self.layer,
+                self.path,
+                input_spec=self.input_spec,
+                async_save=True,
+            )
+        )
+        for future in futures:
+            future.result()
+        # exports are committed in order, the last one wins
+        self.check_load(self.path, expected)
+        self.assertEqual(
+            sorted(os.listdir(os.path.dirname(self.path))),
+            ['model.pdiparams', 'model.pdiparams.info', 'model.pdmodel'],
+        )
+
+    def test_atomic_on_error(self):
+        with mock.patch.object(
+            async_save, '_write_params', side_effect=OSError('disk full')
+        ):
+            future = paddle.jit.save(
+                self.layer,
+                self.path,
+                input_spec=self.input_spec,
+                async_save=True,
+            )
+            with self.assertRaises(OSError):
+                future.result()
+        self.assertEqual(os.listdir(os.path.dirname(self.path)), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+# Copyright (c) 2023 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import subprocess
+import sys
+import unittest
+
+from benchmark_import_time import import_time, submodule_costs
+
+LAZY_SUBMODULES = [
+    'paddle.distributed',
+    'paddle.incubate',
+    'paddle.inference',
+    'paddle.onnx',
+    'paddle.vision',
+    'paddle.text',
+    'paddle.audio',
+    'paddle.geometric',
+    'paddle.quantization',
+    'paddle.callbacks',
+    'paddle.hub',
+    'paddle.hapi',
+]
+
+
+def run_python(code):
+    proc = subprocess.run(
+        [sys.executable, '-c', code],
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr)
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+class TestLazyImport(unittest.TestCase):
+    def test_not_imported(self):
+        loaded = run_python(
+            "import json, sys; import paddle; "
+            f"print(json.dumps([m for m in {LAZY_SUBMODULES!r} if m in sys.modules]))"
+        )
+        self.assertEqual(loaded, [])
+
+    def test_load_on_access(self):
+        loaded = run_python(
+            "import json, sys; import paddle; "
+            "vision = paddle.vision; model = paddle.Model; "
+            "dp = paddle.DataParallel; "
+            "print(json.dumps(["
+            "vision is sys.modules['paddle.vision'], "
+            "model is sys.modules['paddle.hapi'].Model, "
+            "dp is sys.modules['paddle.distributed'].DataParallel, "
+            "'paddle.incubate' in sys.modules]))"
+        )
+        self.assertEqual(loaded, [True, True, True, False])
+
+    def test_dir(self):
+        names = run_python(
+            "import json; import paddle; print(json.dumps(dir(paddle)))"
+        )
+        for name in ['vision', 'hub', 'Model', 'DataParallel']:
+            self.assertIn(name, names)
+
+    def test_unknown_attribute(self):
+        message = run_python(
+            "import json; import paddle\n"
+            "try:\n"
+            "    paddle.not_a_module\n"
+            "except AttributeError as e:\n"
+            "    print(json.dumps(str(e)))\n"
+        )
+        self.assertIn('not_a_module', message)
+
+    def test_import_time(self):
+        costs, total = submodule_costs(import_time('import paddle'))
+        self.assertGreater(total, 0)
+        for name in LAZY_SUBMODULES:
+            self.assertNotIn(name, costs)
+        # report the cost of each submodule to catch regressions in logs
+        for name, cost in sorted(costs.items(), key=lambda item: -item[1]):
+            print(f"{name}: {cost / 1e3:.1f} ms ({100.0 * cost / total:.1f}%)")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -355,6 +355,81 @@ class TestAuc(unittest.TestCase):
         m.reset()
         self.assertEqual(m.accumulate(), 0.0)
 
+    def reference_auc(self, preds, labels, num_thresholds=4095):
+        stat_pos = np.zeros(num_thresholds + 1)
+        stat_neg = np.zeros(num_thresholds + 1)
+        for i, lbl in enumerate(labels):
+            bin_idx = int(preds[i, 1] * num_thresholds)
+            if lbl:
+                stat_pos[bin_idx] += 1.0
+            else:
+                stat_neg[bin_idx] += 1.0
+        tot_pos, tot_neg, auc = 0.0, 0.0, 0.0
+        for idx in range(num_thresholds, -1, -1):
+            tot_pos_prev, tot_neg_prev = tot_pos, tot_neg
+            tot_pos += stat_pos[idx]
+            tot_neg += stat_neg[idx]
+            auc += abs(tot_neg - tot_neg_prev) * (tot_pos + tot_pos_prev) / 2.0
+        return auc / tot_pos / tot_neg
+
+    def random_batches(self, num_batches=4, batch_size=1000):
+        np.random.seed(2023)
+        batches = []
+        for _ in range(num_batches):
+            pos = np.random.random([batch_size, 1])
+            preds = np.concatenate([1 - pos, pos], axis=1)
+            labels = np.random.randint(2, size=[batch_size, 1])
+            batches.append((preds, labels))
+        return batches
+
+    def test_auc_random(self):
+        batches = self.random_batches()
+        m = paddle.metric.Auc()
+        for preds, labels in batches:
+            m.update(preds, labels)
+        preds = np.concatenate([b[0] for b in batches])
+        labels = np.concatenate([b[1] for b in batches])
+        self.assertAlmostEqual(
+            m.accumulate(), self.reference_auc(preds, labels)
+        )
+
+    def test_auc_on_device(self):
+        batches = self.random_batches()
+        m = paddle.metric.Auc()
+        m_device = paddle.metric.Auc(on_device=True)
+        self.assertEqual(m_device.accumulate(), 0.0)
+        for preds, labels in batches:
+            m.update(preds, labels)
+            m_device.update(paddle.to_tensor(preds), paddle.to_tensor(labels))
+        self.assertAlmostEqual(m_device.accumulate(), m.accumulate())
+
+        m_device.reset()
+        self.assertEqual(m_device.accumulate(), 0.0)
+
+    def test_auc_merge(self):
+        batches = self.random_batches()
+        m = paddle.metric.Auc()
+        m0 = paddle.metric.Auc()
+        m1 = paddle.metric.Auc(on_device=True)
+        for i, (preds, labels) in enumerate(batches):
+            m.update(preds, labels)
+            (m0 if i % 2 == 0 else m1).update(preds, labels)
+        m0.merge(m1)
+        self.assertAlmostEqual(m0.accumulate(), m.accumulate())
+
+        with self.assertRaises(ValueError):
+            m0.merge(paddle.metric.Auc(num_thresholds=100))
+        with self.assertRaises(TypeError):
+            m0.merge(paddle.metric.Accuracy())
+
+    def test_auc_all_reduce_single_rank(self):
+        preds, labels = self.random_batches(num_batches=1)[0]
+        m = paddle.metric.Auc()
+        m.update(preds, labels)
+        res = m.accumulate()
+        m.all_reduce()
+        self.assertAlmostEqual(m.accumulate(), res)
+
 
 if __name__ == '__main__':
     unittest.main()
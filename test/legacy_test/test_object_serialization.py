@@ -0,0 +1,76 @@
+# Copyright (c) 2023 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+import numpy as np
+
+import paddle
+from paddle.distributed.communication.serialization_utils import (
+    buffer_sizes,
+    comm_tensor_to_numpy,
+    deserialize_object,
+    empty_comm_tensor,
+    serialize_object,
+    to_comm_tensor,
+)
+
+
+class TestObjectSerialization(unittest.TestCase):
+    def setUp(self):
+        paddle.disable_static()
+
+    def test_out_of_band_buffers(self):
+        array = np.random.rand(16, 8).astype('float32')
+        obj = {'meta': [1, 'a'], 'array': array, 'empty': np.zeros([0])}
+        payload, buffers = serialize_object(obj)
+        self.assertEqual(payload.dtype, np.uint8)
+        self.assertEqual(buffer_sizes(payload), [array.nbytes, 0])
+        # the array is not copied into the payload
+        self.assertLess(payload.size, array.nbytes)
+        self.assertTrue(np.shares_memory(buffers[0], array))
+
+        loaded = deserialize_object(payload, [b.copy() for b in buffers])
+        self.assertEqual(loaded['meta'], [1, 'a'])
+        np.testing.assert_array_equal(loaded['array'], array)
+        self.assertEqual(loaded['empty'].shape, (0,))
+
+    def test_tensor(self):
+        tensor = paddle.rand([4, 4])
+        tensor.stop_gradient = False
+        param = paddle.nn.Linear(2, 2).weight
+        payload, buffers = serialize_object([tensor, param])
+        self.assertEqual(len(buffers), 2)
+        loaded = deserialize_object(payload, buffers)
+        np.testing.assert_array_equal(loaded[0].numpy(), tensor.numpy())
+        self.assertFalse(loaded[0].stop_gradient)
+        np.testing.assert_array_equal(loaded[1].numpy(), param.numpy())
+
+    def test_no_buffers(self):
+        payload, buffers = serialize_object({'foo': [1, 2, 3]})
+        self.assertEqual(buffers, [])
+        self.assertEqual(buffer_sizes(payload), [])
+        self.assertEqual(deserialize_object(payload, []), {'foo': [1, 2, 3]})
+
+    def test_comm_tensor(self):
+        paddle.set_device('cpu')
+        array = np.arange(8, dtype=np.uint8)
+        np.testing.assert_array_equal(to_comm_tensor(array).numpy(), array)
+        tensor, buffer = empty_comm_tensor(8)
+        self.assertEqual(tensor.shape, [8])
+        self.assertIs(comm_tensor_to_numpy(tensor, buffer), buffer)
+
+
+if __name__ == '__main__':
+    unittest.main()
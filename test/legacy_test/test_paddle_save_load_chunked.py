@@ -0,0 +1,279 @@
+# Copyright (c) 2023 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import tempfile
+import unittest
+from io import BytesIO
+
+import numpy as np
+
+import paddle
+from paddle.framework.chunked_io import (
+    CHUNKED_ALIGNMENT,
+    _is_chunked_file,
+    _read_chunked_header,
+    _split_chunks,
+)
+
+
+class LinearNet(paddle.nn.Layer):
+    def __init__(self):
+        super().__init__()
+        self.fc1 = paddle.nn.Linear(13, 64)
+        self.fc2 = paddle.nn.Linear(64, 7)
+        self.bn = paddle.nn.BatchNorm1D(7)
+
+    def forward(self, x):
+        return self.bn(self.fc2(self.fc1(x)))
+
+
+class TestSaveLoadChunked(unittest.TestCase):
+    def setUp(self):
+        paddle.disable_static()
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, 'model.pdparams')
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def check_state_dict(self, state_dict, loaded, return_numpy=False):
+        self.assertEqual(list(state_dict.keys()), list(loaded.keys()))
+        for key, value in state_dict.items():
+            if return_numpy:
+                self.assertIsInstance(loaded[key], np.ndarray)
+                np.testing.assert_array_equal(value.numpy(), loaded[key])
+            else:
+                self.assertIsInstance(loaded[key], paddle.Tensor)
+                self.assertEqual(value.name, loaded[key].name)
+                self.assertEqual(value.dtype, loaded[key].dtype)
+                np.testing.assert_array_equal(
+                    value.numpy(), loaded[key].numpy()
+                )
+
+    def test_state_dict(self):
+        state_dict = LinearNet().state_dict()
+        for num_threads in [1, 3]:
+            paddle.save(
+                state_dict,
+                self.path,
+                use_chunked_format=True,
+                num_threads=num_threads,
+            )
+            self.assertTrue(_is_chunked_file(self.path))
+            self.assertFalse(os.path.exists(self.path + '.tmp'))
+            for mmap in [False, True]:
+                self.check_state_dict(
+                    state_dict, paddle.load(self.path, mmap=mmap)
+                )
+                self.check_state_dict(
+                    state_dict,
+                    paddle.load(self.path, mmap=mmap, return_numpy=True),
+                    return_numpy=True,
+                )
+
+    def test_blob_alignment(self):
+        state_dict = LinearNet().state_dict()
+        paddle.save(state_dict, self.path, use_chunked_format=True)
+        metas, _, data_offset = _read_chunked_header(self.path)
+        self.assertEqual(len(metas), len(state_dict))
+        self.assertEqual(data_offset % CHUNKED_ALIGNMENT, 0)
+        for meta in metas:
+            self.assertEqual(meta['offset'] % CHUNKED_ALIGNMENT, 0)
+
+    def test_nested_object(self):
+        weight = paddle.rand([4, 5])
+        obj = {
+            'model': {'w': weight, 'w_shared': weight},
+            'array': np.arange(10, dtype='int64'),
+            'list': [paddle.to_tensor([1, 2, 3], dtype='int32'), 'str'],
+            'empty': paddle.zeros([0, 3]),
+            'epoch': 10,
+        }
+        paddle.save(obj, self.path, use_chunked_format=True)
+        metas, _, _ = _read_chunked_header(self.path)
+        # shared tensor is saved once
+        self.assertEqual(len(metas), 4)
+
+        for mmap in [False, True]:
+            loaded = paddle.load(self.path, mmap=mmap)
+            np.testing.assert_array_equal(
+                loaded['model']['w'].numpy(), weight.numpy()
+            )
+            self.assertIs(loaded['model']['w'], loaded['model']['w_shared'])
+            self.assertIsInstance(loaded['array'], np.ndarray)
+            np.testing.assert_array_equal(loaded['array'], obj['array'])
+            np.testing.assert_array_equal(
+                loaded['list'][0].numpy(), np.array([1, 2, 3], dtype='int32')
+            )
+            self.assertEqual(loaded['list'][1], 'str')
+            self.assertEqual(loaded['empty'].shape, [0, 3])
+            self.assertEqual(loaded['epoch'], 10)
+
+    def test_single_tensor(self):
+        tensor = paddle.rand([3, 4]).astype('float16')
+        paddle.save(tensor, self.path, use_chunked_format=True)
+        loaded = paddle.load(self.path, mmap=True)
+        self.assertEqual(loaded.dtype, paddle.float16)
+        np.testing.assert_array_equal(loaded.numpy(), tensor.numpy())
+
+    def test_mmap_copy_on_write(self):
+        tensor = paddle.ones([8])
+        paddle.save({'t': tensor}, self.path, use_chunked_format=True)
+        loaded = paddle.load(self.path, mmap=True, return_numpy=True)
+        loaded['t'][:] = 0
+        reloaded = paddle.load(self.path, return_numpy=True)
+        np.testing.assert_array_equal(reloaded['t'], np.ones([8], 'float32'))
+
+    def test_split_chunks(self):
+        metas = [{'nbytes': n} for n in [10, 10, 10, 10, 40]]
+        chunks = _split_chunks(metas, 2)
+        self.assertEqual(sum(chunks, []), list(range(5)))
+        self.assertEqual(chunks, [[0, 1, 2, 3], [4]])
+
+    def test_layer_error(self):
+        with self.assertRaises(ValueError):
+            paddle.save(LinearNet(), self.path, use_chunked_format=True)
+        self.assertFalse(os.path.exists(self.path))
+        self.assertFalse(os.path.exists(self.path + '.tmp'))
+
+    def test_config_error(self):
+        state_dict = LinearNet().state_dict()
+        with self.assertRaises(ValueError):
+            paddle.save(state_dict, BytesIO(), use_chunked_format=True)
+        with self.assertRaises(TypeError):
+            paddle.save(state_dict, self.path, use_chunked_format=1)
+        with self.assertRaises(ValueError):
+            paddle.save(
+                state_dict, self.path, use_chunked_format=True, num_threads=0
+            )
+
+
+class TestLoadSelectedKeys(unittest.TestCase):
+    def setUp(self):
+        paddle.disable_static()
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.state_dict = LinearNet().state_dict()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def save(self, use_chunked_format):
+        path = os.path.join(
+            self.temp_dir.name, f'model_{use_chunked_format}.pdparams'
+        )
+        paddle.save(
+            self.state_dict, path, use_chunked_format=use_chunked_format
+        )
+        return path
+
+    def check_value(self, key, value):
+        self.assertIsInstance(value, paddle.Tensor)
+        self.assertEqual(value.name, self.state_dict[key].name)
+        np.testing.assert_array_equal(
+            value.numpy(), self.state_dict[key].numpy()
+        )
+
+    def test_prefix(self):
+        for use_chunked_format in [False, True]:
+            path = self.save(use_chunked_format)
+            loaded = paddle.load(path, prefix='fc1.')
+            self.assertEqual(list(loaded.keys()), ['fc1.weight', 'fc1.bias'])
+            for key, value in loaded.items():
+                self.check_value(key, value)
+            loaded = paddle.load(path, prefix=('fc2.', 'bn.'))
+            self.assertEqual(len(loaded), len(self.state_dict) - 2)
+
+    def test_keys(self):
+        for use_chunked_format in [False, True]:
+            path = self.save(use_chunked_format)
+            loaded = paddle.load(path, keys=['fc2.bias', 'not_exist'])
+            self.assertEqual(list(loaded.keys()), ['fc2.bias'])
+            self.check_value('fc2.bias', loaded['fc2.bias'])
+            loaded = paddle.load(
+                path, keys=lambda key: key.endswith('weight'), prefix='fc'
+            )
+            self.assertEqual(list(loaded.keys()), ['fc1.weight', 'fc2.weight'])
+
+    def test_lazy(self):
+        for use_chunked_format in [False, True]:
+            path = self.save(use_chunked_format)
+            loaded = paddle.load(path, lazy=True)
+            self.assertEqual(list(loaded.keys()), list(self.state_dict.keys()))
+            self.assertFalse(loaded.is_loaded('fc1.weight'))
+            self.check_value('fc1.weight', loaded['fc1.weight'])
+            self.assertTrue(loaded.is_loaded('fc1.weight'))
+            self.assertFalse(loaded.is_loaded('fc2.weight'))
+            # loaded value is cached
+            self.assertIs(loaded['fc1.weight'], loaded['fc1.weight'])
+
+            layer = LinearNet()
+            layer.set_state_dict(loaded)
+            for key, value in layer.state_dict().items():
+                np.testing.assert_array_equal(
+                    value.numpy(), self.state_dict[key].numpy()
+                )
+
+            state_dict = paddle.load(
+                path, lazy=True, prefix='bn.'
+            ).materialize()
+            self.assertIsInstance(state_dict, dict)
+            for key, value in state_dict.items():
+                self.check_value(key, value)
+
+    def test_lazy_return_numpy(self):
+        for use_chunked_format in [False, True]:
+            path = self.save(use_chunked_format)
+            loaded = paddle.load(path, lazy=True, return_numpy=True)
+            self.assertIsInstance(loaded['fc1.bias'], np.ndarray)
+
+    def test_not_state_dict(self):
+        for use_chunked_format in [False, True]:
+            path = os.path.join(self.temp_dir.name, 'tensor.pdtensor')
+            paddle.save(
+                paddle.ones([2]), path, use_chunked_format=use_chunked_format
+            )
+            with self.assertRaises(ValueError):
+                paddle.load(path, prefix='fc1.')
+            loaded = paddle.load(path, lazy=True)
+            np.testing.assert_array_equal(loaded.numpy(), np.ones([2]))
+
+    def test_invalid_keys(self):
+        path = self.save(True)
+        with self.assertRaises(TypeError):
+            paddle.load(path, keys='fc1.weight')
+        with self.assertRaises(TypeError):
+            paddle.load(path, prefix=['fc1.'])
+
+
+class TestLoadChunkedStatic(unittest.TestCase):
+    def test_static(self):
+        paddle.disable_static()
+        temp_dir = tempfile.TemporaryDirectory()
+        path = os.path.join(temp_dir.name, 'tensor.pdtensor')
+        value = np.random.random([2, 3]).astype('float32')
+        paddle.save(
+            {'t': paddle.to_tensor(value)}, path, use_chunked_format=True
+        )
+        paddle.enable_static()
+        try:
+            loaded = paddle.load(path)
+            np.testing.assert_array_equal(np.array(loaded['t']), value)
+        finally:
+            paddle.disable_static()
+            temp_dir.cleanup()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+# Copyright (c) 2023 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+import paddle
+from paddle.distributed.fleet.meta_parallel.pp_utils.p2p_communication import (
+    RecvBufferPool,
+)
+from paddle.distributed.fleet.meta_parallel.pp_utils.utils import (
+    paddle_2_number,
+)
+
+
+class TestRecvBufferPool(unittest.TestCase):
+    def setUp(self):
+        paddle.disable_static()
+        self.dtype = paddle_2_number(paddle.float32)
+
+    def test_reuse(self):
+        pool = RecvBufferPool()
+        first = pool.get([2, 3], self.dtype, 1)
+        self.assertEqual(first.shape, [2, 3])
+        # in use
+        second = pool.get([2, 3], self.dtype, 1)
+        self.assertIsNot(first, second)
+        self.assertEqual(pool.allocated_count, 2)
+
+        first_id = id(first)
+        del first
+        self.assertEqual(id(pool.get([2, 3], self.dtype, 1)), first_id)
+        self.assertEqual(pool.reused_count, 1)
+
+        # keyed by shape, dtype and peer
+        pool.get([2, 4], self.dtype, 1)
+        pool.get([2, 3], self.dtype, 0)
+        self.assertEqual(pool.allocated_count, 4)
+
+    def test_clear_gradient(self):
+        pool = RecvBufferPool()
+        buffer = pool.get([2], self.dtype, 1)
+        buffer.stop_gradient = False
+        (buffer * 2).sum().backward()
+        self.assertIsNotNone(buffer.grad)
+        del buffer
+        self.assertIsNone(pool.get([2], self.dtype, 1).grad)
+
+    def test_clear(self):
+        pool = RecvBufferPool()
+        pool.get([2], self.dtype, 1)
+        pool.clear()
+        pool.get([2], self.dtype, 1)
+        self.assertEqual(pool.allocated_count, 2)
+        self.assertEqual(pool.reused_count, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,208 @@
+#   Copyright (c) 2023 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import pickle
+import sys
+import tempfile
+import unittest
+
+import numpy as np
+
+import paddle
+from paddle.io import (
+    DataLoader,
+    DistributedBatchSampler,
+    RecordDataset,
+    RecordFileWriter,
+    RecordIterableDataset,
+)
+
+NUM_SHARDS = 3
+RECORDS_PER_SHARD = 10
+
+
+class TestRecordDatasetBase(unittest.TestCase):
+    def setUp(self):
+        paddle.disable_static()
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.files = []
+        for shard in range(NUM_SHARDS):
+            path = os.path.join(self.temp_dir.name, f'part-{shard}.rec')
+            with RecordFileWriter(path) as writer:
+                for i in range(RECORDS_PER_SHARD):
+                    idx = shard * RECORDS_PER_SHARD + i
+                    writer.write(
+                        (np.full([2, 3], idx, dtype='float32'), np.int64(idx))
+                    )
+                self.assertEqual(len(writer), RECORDS_PER_SHARD)
+            self.files.append(path)
+        self.total = NUM_SHARDS * RECORDS_PER_SHARD
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+
+class TestRecordFileWriter(TestRecordDatasetBase):
+    def test_no_tmp_file(self):
+        for path in self.files:
+            self.assertTrue(os.path.exists(path))
+            self.assertFalse(os.path.exists(path + '.tmp'))
+
+    def test_discard_on_error(self):
+        path = os.path.join(self.temp_dir.name, 'error.rec')
+        with self.assertRaises(ValueError):
+            with RecordFileWriter(path) as writer:
+                writer.write(1)
+                raise ValueError("error")
+        self.assertFalse(os.path.exists(path))
+        self.assertFalse(os.path.exists(path + '.tmp'))
+
+    def test_write_bytes(self):
+        path = os.path.join(self.temp_dir.name, 'bytes.rec')
+        with RecordFileWriter(path) as writer:
+            writer.write_bytes(b'abc')
+            writer.write_bytes(b'')
+            writer.write_bytes(b'de')
+        dataset = RecordDataset(path, deserializer=bytes)
+        self.assertEqual([dataset[i] for i in range(3)], [b'abc', b'', b'de'])
+
+    def test_invalid_file(self):
+        path = os.path.join(self.temp_dir.name, 'invalid.rec')
+        with open(path, 'wb') as f:
+            f.write(b'0' * 64)
+        with self.assertRaises(ValueError):
+            RecordDataset(path)
+
+
+class TestRecordDataset(TestRecordDatasetBase):
+    def test_random_access(self):
+        dataset = RecordDataset(self.files)
+        self.assertEqual(len(dataset), self.total)
+        for idx in np.random.permutation(self.total):
+            image, label = dataset[idx]
+            self.assertEqual(label, idx)
+            np.testing.assert_array_equal(image, np.full([2, 3], idx))
+        self.assertEqual(dataset[-1][1], self.total - 1)
+        with self.assertRaises(IndexError):
+            dataset[self.total]
+
+    def test_pickle(self):
+        dataset = RecordDataset(self.files)
+        dataset[0]
+        dataset = pickle.loads(pickle.dumps(dataset))
+        self.assertEqual(dataset[15][1], 15)
+
+    def test_distributed_batch_sampler(self):
+        dataset = RecordDataset(self.files)
+        labels = []
+        for rank in range(2):
+            sampler = DistributedBatchSampler(
+                dataset, batch_size=4, num_replicas=2, rank=rank, shuffle=True
+            )
+            for batch in sampler:
+                labels.extend(dataset[i][1] for i in batch)
+        self.assertEqual(sorted(labels), list(range(self.total)))
+
+    def test_dataloader(self):
+        if sys.platform == 'darwin' or sys.platform == 'win32':
+            return
+        dataset = RecordDataset(self.files)
+        loader = DataLoader(dataset, batch_size=5, num_workers=2)
+        labels = []
+        for image, label in loader:
+            labels.extend(label.numpy().tolist())
+        self.assertEqual(labels, list(range(self.total)))
+
+
+class TestRecordIterableDataset(TestRecordDatasetBase):
+    def read_labels(self, dataset):
+        return [int(label) for _, label in dataset]
+
+    def test_sequential(self):
+        dataset = RecordIterableDataset(self.files, num_replicas=1, rank=0)
+        self.assertEqual(self.read_labels(dataset), list(range(self.total)))
+
+    def test_shuffle(self):
+        dataset = RecordIterableDataset(
+            self.files, shuffle=True, seed=1, num_replicas=1, rank=0
+        )
+        epoch0 = self.read_labels(dataset)
+        self.assertEqual(sorted(epoch0), list(range(self.total)))
+        self.assertEqual(epoch0, self.read_labels(dataset))
+        dataset.set_epoch(1)
+        epoch1 = self.read_labels(dataset)
+        self.assertEqual(sorted(epoch1), list(range(self.total)))
+        self.assertNotEqual(epoch0, epoch1)
+
+    def test_ranks(self):
+        labels = []
+        for rank in range(4):
+            dataset = RecordIterableDataset(
+                self.files, shuffle=True, num_replicas=4, rank=rank
+            )
+            rank_labels = self.read_labels(dataset)
+            # 30 records are padded to 32
+            self.assertEqual(len(rank_labels), 8)
+            labels.extend(rank_labels)
+        self.assertEqual(sorted(set(labels)), list(range(self.total)))
+
+    def test_resume(self):
+        dataset = RecordIterableDataset(
+            self.files, shuffle=True, num_replicas=2, rank=1
+        )
+        dataset.set_epoch(3)
+        expected = self.read_labels(dataset)
+
+        dataset.set_epoch(3)
+        labels = []
+        for _, label in dataset:
+            labels.append(int(label))
+            if len(labels) == 6:
+                break
+        state = dataset.state_dict()
+        self.assertEqual(state, {'epoch': 3, 'consumed': 6})
+
+        resumed = RecordIterableDataset(
+            self.files, shuffle=True, num_replicas=2, rank=1
+        )
+        resumed.set_state_dict(state)
+        labels.extend(self.read_labels(resumed))
+        self.assertEqual(labels, expected)
+
+    def test_dataloader_workers(self):
+        if sys.platform == 'darwin' or sys.platform == 'win32':
+            return
+        dataset = RecordIterableDataset(
+            self.files, shuffle=True, batch_size=4, num_replicas=1, rank=0
+        )
+        expected = self.read_labels(dataset)
+
+        loader = DataLoader(dataset, batch_size=4, num_workers=3)
+        labels = []
+        for _, label in loader:
+            labels.extend(label.numpy().tolist())
+        self.assertEqual(labels, expected)
+
+        # resume after 2 steps
+        dataset.set_state_dict({'epoch': 0, 'consumed': 2 * 4})
+        loader = DataLoader(dataset, batch_size=4, num_workers=3)
+        labels = []
+        for _, label in loader:
+            labels.extend(label.numpy().tolist())
+        self.assertEqual(labels, expected[8:])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,106 @@
+# Copyright (c) 2023 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import threading
+import unittest
+from unittest import mock
+
+from test_case_base import (
+    TestCaseBase,
+    test_instruction_translator_cache_context,
+)
+
+import paddle
+from paddle.jit.sot import symbolic_translate
+from paddle.jit.sot.opcode_translator.executor import executor_cache
+from paddle.jit.sot.utils import InnerError
+
+
+def foo(x, y):
+    z = x + y
+    return z * 2 + 1
+
+
+def bar(x):
+    return x.sum() * 3
+
+
+class TestAsyncTranslate(TestCaseBase):
+    def setUp(self):
+        self.env = mock.patch.dict(os.environ, {"SOT_ASYNC_TRANSLATE": "True"})
+        self.env.start()
+
+    def tearDown(self):
+        self.env.stop()
+
+    def test_eager_fallback_before_ready(self):
+        x = paddle.rand([2, 3])
+        y = paddle.rand([2, 3])
+        ready = threading.Event()
+        start_translate = executor_cache.start_translate
+
+        def slow_translate(frame, **kwargs):
+            ready.wait()
+            return start_translate(frame, **kwargs)
+
+        with test_instruction_translator_cache_context() as cache:
+            with mock.patch.object(
+                executor_cache, "start_translate", side_effect=slow_translate
+            ):
+                # translation is blocked, the calls run eagerly
+                self.assert_results(foo, x, y)
+                self.assert_results(foo, x, y)
+                self.assertNotIn(foo.__code__, cache.cache)
+                ready.set()
+                cache.wait()
+            self.assertEqual(len(cache.cache[foo.__code__]), 1)
+            self.assertEqual(cache.translate_count, 1)
+
+            self.assert_results(foo, x, y)
+            self.assertEqual(cache.translate_count, 1)
+
+    def test_guard_miss(self):
+        with test_instruction_translator_cache_context() as cache:
+            self.assert_results(bar, paddle.rand([2, 3]))
+            cache.wait()
+            self.assertEqual(cache.translate_count, 1)
+
+            self.assert_results(bar, paddle.rand([4, 3]))
+            cache.wait()
+            self.assertEqual(cache.translate_count, 2)
+            self.assertEqual(len(cache.cache[bar.__code__]), 2)
+
+            self.assert_results(bar, paddle.rand([4, 3]))
+            self.assertEqual(cache.translate_count, 2)
+
+    def test_translate_error(self):
+        x = paddle.rand([2, 3])
+        with test_instruction_translator_cache_context() as cache:
+            with mock.patch.object(
+                executor_cache,
+                "start_translate",
+                side_effect=InnerError("translate error"),
+            ):
+                self.assert_results(bar, x)
+                cache.wait()
+            # the code runs eagerly from now on
+            (entry,) = cache.cache[bar.__code__].entries()
+            self.assertIsNone(entry.custom_code.code)
+            self.assertTrue(entry.custom_code.disable_eval_frame)
+            self.assertEqual(symbolic_translate(bar)(x).numpy(), bar(x).numpy())
+
+
+if __name__ == "__main__":
+    unittest.main()
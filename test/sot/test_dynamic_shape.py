@@ -0,0 +1,100 @@
+# Copyright (c) 2023 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import unittest
+from unittest import mock
+
+from test_case_base import (
+    TestCaseBase,
+    test_instruction_translator_cache_context,
+)
+
+import paddle
+from paddle.jit.sot import mark_dynamic
+
+
+def auto_dynamic_func(x, y):
+    out = paddle.nn.functional.relu(x) * 2
+    return out + y
+
+
+def hinted_func(x, y):
+    out = paddle.nn.functional.relu(x) * 2
+    return out + y
+
+
+def bucketed_func(x, y):
+    out = paddle.nn.functional.relu(x) * 2
+    return out + y
+
+
+def shape_func(x):
+    out = x + 1
+    return out.reshape([x.shape[0], -1]).sum(axis=1)
+
+
+class TestDynamicShape(TestCaseBase):
+    def check_seq_lens(self, func, seq_lens):
+        for seq_len in seq_lens:
+            x = paddle.rand([2, seq_len, 8])
+            y = paddle.rand([8])
+            self.assert_results(func, x, y)
+
+    def test_auto_dynamic_shape(self):
+        with mock.patch.dict(os.environ, {"SOT_AUTO_DYNAMIC_SHAPE": "True"}):
+            with test_instruction_translator_cache_context() as cache:
+                self.check_seq_lens(auto_dynamic_func, [4])
+                self.assertEqual(cache.translate_count, 1)
+                # dim 1 is marked dynamic when a new size is seen
+                self.check_seq_lens(auto_dynamic_func, [6, 8, 10, 12])
+                self.assertEqual(cache.translate_count, 2)
+
+    def test_auto_dynamic_shape_disabled(self):
+        with test_instruction_translator_cache_context() as cache:
+            self.check_seq_lens(auto_dynamic_func, [4, 6, 8])
+            self.assertEqual(cache.translate_count, 3)
+
+    def test_mark_dynamic(self):
+        mark_dynamic(hinted_func, "x", dims=[1])
+        with test_instruction_translator_cache_context() as cache:
+            self.check_seq_lens(hinted_func, [4, 6, 8])
+            self.assertEqual(cache.translate_count, 1)
+            # other dims are still static
+            self.assert_results(
+                hinted_func, paddle.rand([3, 4, 8]), paddle.rand([8])
+            )
+            self.assertEqual(cache.translate_count, 2)
+
+    def test_buckets(self):
+        mark_dynamic(bucketed_func, "x", dims=1, buckets=[8])
+        with test_instruction_translator_cache_context() as cache:
+            self.check_seq_lens(bucketed_func, [4, 6, 8])
+            self.assertEqual(cache.translate_count, 1)
+            self.check_seq_lens(bucketed_func, [10, 12])
+            self.assertEqual(cache.translate_count, 2)
+
+    def test_dynamic_shape_access(self):
+        mark_dynamic(shape_func, "x", dims=0)
+        with test_instruction_translator_cache_context():
+            for batch_size in [2, 3]:
+                self.assert_results(shape_func, paddle.rand([batch_size, 4]))
+
+    def test_invalid_name(self):
+        with self.assertRaises(ValueError):
+            mark_dynamic(hinted_func, "z", dims=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
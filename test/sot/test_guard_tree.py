@@ -0,0 +1,165 @@
+# Copyright (c) 2023 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+
+import inspect
+import unittest
+
+from paddle.jit.sot.opcode_translator.custom_code import CustomCode
+from paddle.jit.sot.opcode_translator.executor.guard import (
+    StringifyExpression,
+    equal_stringify_guard,
+    make_guard,
+)
+from paddle.jit.sot.opcode_translator.executor.guard_tree import GuardTree
+from paddle.jit.sot.utils import tmp_name_guard
+
+
+def make_frame(x, y):
+    return inspect.currentframe()
+
+
+def local_tracer(name):
+    return StringifyExpression(f"frame.f_locals['{name}']", [], {})
+
+
+def build_guard(x_value, y_len, with_type_guard=True):
+    with tmp_name_guard():
+        x = local_tracer("x")
+        y = local_tracer("y")
+        guards = [
+            equal_stringify_guard(x, x_value),
+            equal_stringify_guard(
+                StringifyExpression("len({})", [y], {}), y_len
+            ),
+        ]
+        if with_type_guard:
+            guards.insert(
+                0,
+                equal_stringify_guard(
+                    StringifyExpression("id(type({}))", [x], {}),
+                    id(type(x_value)),
+                ),
+            )
+        return make_guard(guards)
+
+
+def fake_code(i):
+    return CustomCode(None, bool(i % 2))
+
+
+class TestGuardTree(unittest.TestCase):
+    def test_dispatch_by_value(self):
+        tree = GuardTree()
+        codes = [fake_code(i) for i in range(5)]
+        for i, code in enumerate(codes):
+            tree.add(code, build_guard(i, 2))
+        self.assertEqual(len(tree), 5)
+        for i, code in enumerate(codes):
+            entry = tree.lookup(make_frame(i, [1, 2]))
+            self.assertIs(entry.custom_code, code)
+        self.assertIsNone(tree.lookup(make_frame(10, [1, 2])))
+        self.assertIsNone(tree.lookup(make_frame(1, [1, 2, 3])))
+        self.assertIsNone(tree.lookup(make_frame("1", [1, 2])))
+
+    def test_shared_prefix(self):
+        tree = GuardTree()
+        for i in range(5):
+            tree.add(fake_code(i), build_guard(i, 2))
+        # type guards of all entries are merged into one branch
+        self.assertEqual(len(tree._root.dispatch), 1)
+        ((_, branches),) = tree._root.dispatch.values()
+        self.assertEqual(len(branches), 1)
+
+    def test_guard_order(self):
+        tree = GuardTree()
+        code_1 = fake_code(1)
+        code_2 = fake_code(2)
+        tree.add(code_1, build_guard(1, 2))
+        # entry without type guard matches more frames
+        tree.add(code_2, build_guard(1, 3, with_type_guard=False))
+        self.assertIs(tree.lookup(make_frame(1, [1, 2])).custom_code, code_1)
+        self.assertIs(
+            tree.lookup(make_frame(1.0, [1, 2, 3])).custom_code, code_2
+        )
+
+    def test_lru_eviction(self):
+        tree = GuardTree(max_size=2)
+        codes = [fake_code(i) for i in range(3)]
+        tree.add(codes[0], build_guard(0, 2))
+        tree.add(codes[1], build_guard(1, 2))
+        # code 0 is used recently, so code 1 is evicted
+        self.assertIs(tree.lookup(make_frame(0, [1, 2])).custom_code, codes[0])
+        tree.add(codes[2], build_guard(2, 2))
+        self.assertEqual(
+            [entry.custom_code for entry in tree.entries()],
+            [codes[0], codes[2]],
+        )
+        self.assertIsNone(tree.lookup(make_frame(1, [1, 2])))
+        self.assertIs(tree.lookup(make_frame(2, [1, 2])).custom_code, codes[2])
+
+    def test_entry_on_ancestor_checked_last(self):
+        tree = GuardTree()
+        code = fake_code(0)
+        fallback_code = fake_code(1)
+        tree.add(code, build_guard(0, 2))
+        # e.g. the dummy guard of a fallback code is stored on root
+        tree.add(fallback_code, make_guard([]))
+        self.assertIs(tree.lookup(make_frame(0, [1, 2])).custom_code, code)
+        self.assertIs(
+            tree.lookup(make_frame(1, [1, 2])).custom_code, fallback_code
+        )
+
+    def test_ranks_released_on_eviction(self):
+        tree = GuardTree(max_size=1)
+        for i in range(5):
+            tree.add(fake_code(i), build_guard(i, i, with_type_guard=False))
+            # lhs of x and len(y) are used by the only entry in tree
+            self.assertEqual(len(tree._ranks), 2)
+        tree.add(fake_code(0), make_guard([]))
+        self.assertEqual(len(tree._ranks), 0)
+
+    def test_remove_empty_nodes(self):
+        tree = GuardTree(max_size=1)
+        tree.add(fake_code(0), build_guard(0, 2))
+        tree.add(fake_code(1), build_guard("a", 3))
+        ((_, branches),) = tree._root.dispatch.values()
+        self.assertEqual(list(branches.keys()), [id(str)])
+
+    def test_opaque_guard(self):
+        tree = GuardTree()
+        code_1 = fake_code(1)
+        code_2 = fake_code(2)
+        tree.add(code_1, lambda frame: False)
+        tree.add(code_2, lambda frame: frame.f_locals["x"] > 0)
+        self.assertIs(tree.lookup(make_frame(1, [])).custom_code, code_2)
+        self.assertIsNone(tree.lookup(make_frame(-1, [])))
+        # guard raises error is regarded as missed
+        self.assertIsNone(tree.lookup(make_frame(None, [])))
+
+    def test_guard_error(self):
+        tree = GuardTree()
+        tree.add(fake_code(0), build_guard(0, 2))
+        self.assertIsNone(tree.lookup(make_frame(0, None)))
+
+    def test_empty_guard(self):
+        tree = GuardTree()
+        code = fake_code(0)
+        tree.add(code, make_guard([]))
+        self.assertIs(tree.lookup(make_frame(0, None)).custom_code, code)
+
+
+if __name__ == '__main__':
+    unittest.main()
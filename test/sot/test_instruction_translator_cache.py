@@ -28,6 +28,12 @@ from test_case_base import (
 from paddle.jit.sot.opcode_translator.custom_code import CustomCode
 from paddle.jit.sot.opcode_translator.executor.executor_cache import (
     OpcodeExecutorCache,
+    dummy_guard,
+)
+from paddle.jit.sot.opcode_translator.executor.guard import (
+    StringifyExpression,
+    equal_stringify_guard,
+    make_guard,
 )
 
 
@@ -150,6 +156,50 @@ class TestOpcodeExecutorCache(unittest.TestCase):
             self.assertEqual(ctx.translate_count, 2)
 
 
+def fake_frame_with_shape(shape):
+    frame = inspect.currentframe()
+    assert frame is not None
+    return frame
+
+
+def mock_start_translate_with_fallback(frame: types.FrameType, **kwargs):
+    shape = frame.f_locals["shape"]
+    if shape == [2, 3]:
+        guard = make_guard(
+            [
+                equal_stringify_guard(
+                    StringifyExpression("frame.f_locals['shape']", [], {}),
+                    shape,
+                )
+            ]
+        )
+        return CustomCode(FRAME_2.f_code, False), guard
+    # fallback without disabling eval frame
+    return CustomCode(None, False), dummy_guard
+
+
+class TestCacheFallbackNotShadow(unittest.TestCase):
+    @patch(
+        "paddle.jit.sot.opcode_translator.executor.executor_cache.start_translate",
+        mock_start_translate_with_fallback,
+    )
+    def test_compiled_code_after_fallback(self):
+        with test_instruction_translator_cache_context():
+            translated_code = OpcodeExecutorCache()(
+                fake_frame_with_shape([2, 3])
+            )
+            self.assertEqual(translated_code.code, FRAME_2.f_code)
+            translated_code = OpcodeExecutorCache()(
+                fake_frame_with_shape([4, 5])
+            )
+            self.assertIsNone(translated_code.code)
+            # the dummy guard of fallback does not shadow the compiled code
+            translated_code = OpcodeExecutorCache()(
+                fake_frame_with_shape([2, 3])
+            )
+            self.assertEqual(translated_code.code, FRAME_2.f_code)
+
+
 def foo(x):
     return x + 1
 
@@ -0,0 +1,108 @@
+# Copyright (c) 2023 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import unittest
+
+from test_case_base import (
+    TestCaseBase,
+    test_instruction_translator_cache_context,
+)
+
+import paddle
+from paddle.jit.sot import symbolic_translate
+from paddle.jit.sot.profiler import SotReport
+
+
+def print_break_graph(x, y):
+    z = x + y
+    print(x, z)
+    out = y * z * 2
+    return out
+
+
+def ifelse_func(x, y):
+    if x > 0:
+        y = y + 1
+    else:
+        y = y + 2
+    return y
+
+
+class TestSotReport(TestCaseBase):
+    def find_function(self, report, name):
+        for function in report["functions"]:
+            if function["name"] == name:
+                return function
+        self.fail(f"{name} is not found in report")
+
+    def test_call_break(self):
+        x = paddle.to_tensor(2)
+        y = paddle.to_tensor(3)
+        with test_instruction_translator_cache_context():
+            with SotReport() as report:
+                symbolic_translate(print_break_graph)(x, y)
+                symbolic_translate(print_break_graph)(x, y)
+        self.assertFalse(report.enabled)
+
+        summary = report.to_dict()
+        function = self.find_function(summary, "print_break_graph")
+        self.assertEqual(function["translate_count"], 1)
+        self.assertEqual(function["cache_hit"], 1)
+        self.assertEqual(function["cache_miss"], 1)
+        self.assertGreater(function["translate_time"], 0)
+        self.assertGreaterEqual(function["subgraph_count"], 1)
+        (graph_break,) = function["graph_breaks"]
+        self.assertEqual(graph_break["kind"], "call")
+        self.assertEqual(graph_break["count"], 1)
+        lineno = print_break_graph.__code__.co_firstlineno + 2
+        self.assertTrue(graph_break["location"].endswith(f":{lineno}"))
+        self.assertEqual(summary["graph_break_count"], 1)
+
+    def test_jump_break(self):
+        y = paddle.to_tensor([2.0])
+        with test_instruction_translator_cache_context():
+            with SotReport() as report:
+                symbolic_translate(ifelse_func)(paddle.to_tensor([1.0]), y)
+                symbolic_translate(ifelse_func)(paddle.to_tensor([-1.0]), y)
+
+        function = self.find_function(report.to_dict(), "ifelse_func")
+        (graph_break,) = function["graph_breaks"]
+        self.assertEqual(graph_break["kind"], "jump")
+        self.assertEqual(graph_break["count"], 1)
+
+    def test_format(self):
+        x = paddle.to_tensor(2)
+        y = paddle.to_tensor(3)
+        with test_instruction_translator_cache_context():
+            with SotReport() as report:
+                symbolic_translate(print_break_graph)(x, y)
+        loaded = json.loads(report.to_json())
+        self.assertEqual(loaded, json.loads(json.dumps(report.to_dict())))
+        table = report.to_table()
+        self.assertIn("print_break_graph", table)
+        self.assertIn("Graph breaks:", table)
+
+    def test_disabled(self):
+        report = SotReport()
+        report.clear()
+        x = paddle.to_tensor(2)
+        y = paddle.to_tensor(3)
+        with test_instruction_translator_cache_context():
+            symbolic_translate(print_break_graph)(x, y)
+        self.assertEqual(report.to_dict()["functions"], [])
+
+
+if __name__ == "__main__":
+    unittest.main()